@@ -42,6 +42,7 @@ DEFAULT_PAGE_SIZE = 50
 MAX_PAGE_SIZE = 1000
 MAX_PAGE_NUMBER = 10000
 MAX_LIMIT = 2000
+COUNT_CACHE_TTL = 60  # Seconds a list total (X-Total-Count) is reused across pages
 
 # ==================== DASHBOARD/ANALYTICS ====================
 DEFAULT_ANALYTICS_DAYS = 30
@@ -53,6 +54,55 @@ MAX_IMAGE_SIZE = 10 * 1024 * 1024      # 10 MB for images
 MAX_CSV_SIZE = 5 * 1024 * 1024         # 5 MB for CSV imports
 MAX_REQUEST_BODY_SIZE = 15 * 1024 * 1024  # 15 MB max request body
 
+# ==================== MEMBER IMPORT ====================
+IMPORT_BATCH_SIZE = 500    # Rows per unordered insert_many
+IMPORT_CHUNK_SIZE = 64 * 1024  # Bytes read per chunk when spooling an upload
+MAX_IMPORT_ERRORS = 200    # Row errors kept on an import job
+IMPORT_JOB_STALE_MINUTES = 10  # Queued/running jobs without progress this long were orphaned by a restart
+
+# ==================== MEMBER SYNC ====================
+SYNC_WRITE_BATCH_SIZE = 500  # Operations per unordered bulk_write when applying synced members
+
+# ==================== BULK CARE EVENT OPERATIONS ====================
+BULK_EVENT_MAX_IDS = 5000        # Event IDs accepted per bulk complete/ignore/delete request
+BULK_EVENT_CHUNK_SIZE = 500      # IDs per $in query and update_many/delete_many
+BULK_DASHBOARD_PATCH_MAX = 500   # Above this many members per campus, rebuild reminders instead of patching rows
+
+# ==================== CSV EXPORT ====================
+EXPORT_BATCH_SIZE = 500    # Rows per streamed chunk (also the Mongo cursor batch size)
+
+# ==================== ACTIVITY LOG ====================
+ACTIVITY_LOG_BATCH_SIZE = 200         # Entries per insert_many
+ACTIVITY_LOG_FLUSH_INTERVAL = 0.5     # Seconds an entry may wait for its batch to fill
+ACTIVITY_LOG_MAX_QUEUE = 10000        # Queued entries before log_activity callers wait (backpressure)
+ACTIVITY_LOG_SHUTDOWN_TIMEOUT = 10.0  # Seconds on_shutdown waits for the queue to drain
+
+# ==================== ACTIVITY STREAM (SSE) ====================
+ACTIVITY_STREAM_MAXLEN = 1000            # Events kept per campus for Last-Event-ID replay (approximate)
+ACTIVITY_STREAM_REPLAY_LIMIT = 200       # Most events replayed to one reconnecting client
+ACTIVITY_SUBSCRIBER_QUEUE_SIZE = 100     # Per-connection buffer; the oldest event is dropped when full
+ACTIVITY_STREAM_HEARTBEAT_SECONDS = 30
+
+# ==================== SEARCH ====================
+SEARCH_MAX_PREFIX = 12           # Longest indexed word prefix; longer query tokens are verified when ranking
+SEARCH_DESCRIPTION_TOKENS = 40   # Words of a care event description that are indexed
+SEARCH_CANDIDATE_LIMIT = 2000    # Prefix matches ranked per query
+SEARCH_FUZZY_CANDIDATES = 200    # Trigram matches ranked when prefix matching finds too little
+SEARCH_FUZZY_MIN_OVERLAP = 0.4   # Share of query trigrams a fuzzy candidate must contain
+SEARCH_MIN_SCORE = 0.35          # Ranked results below this similarity are dropped
+SEARCH_INDEX_BATCH_SIZE = 500    # Entries per unordered bulk_write when (re)indexing
+
+# ==================== PDF REPORTS ====================
+PDF_RENDER_TASKS_PER_CHILD = 50      # Renders before a pool process is recycled (releases WeasyPrint memory)
+PDF_RENDER_QUEUE_PER_WORKER = 2      # Renders waiting per pool process before callers wait their turn
+REPORT_CACHE_TTL_HOURS = 24          # Cached PDFs for the current (still changing) month
+REPORT_CACHE_TTL_DAYS = 90           # Cached PDFs for closed past months
+REPORT_RENDERER_VERSION = 1          # Bump when pdf_report layout changes so cached PDFs are re-rendered
+
+# ==================== REPORT ROLLUPS ====================
+ROLLUP_RECONCILE_DAYS = 62           # Trailing days the nightly job recomputes (catches writes without rollup hooks)
+ROLLUP_WRITE_BATCH_SIZE = 500        # Rollup documents per bulk_write
+
 # ==================== IMAGE VALIDATION ====================
 # Magic bytes for allowed image types (security: validate file content, not just Content-Type)
 IMAGE_MAGIC_BYTES = {
@@ -64,8 +114,33 @@ IMAGE_MAGIC_BYTES = {
 }
 
 # ==================== CACHE SETTINGS ====================
-# In-memory cache configuration (prevents unbounded memory growth)
-MAX_CACHE_SIZE = 1000  # Maximum number of cached items
+# In-process cache tier in front of DragonflyDB (prevents unbounded memory growth)
+MAX_CACHE_SIZE = 1000  # Maximum number of locally cached items
+
+# ==================== RATE LIMITING ====================
+# Sliding windows shared by all workers through DragonflyDB (per worker while it is unreachable)
+RATE_LIMIT_WINDOW_SECONDS = 60
+RATE_LIMIT_ANONYMOUS = 100       # Requests per window per client IP
+RATE_LIMIT_AUTHENTICATED = 300   # Requests per window per signed-in user
+LOGIN_MAX_ATTEMPTS = 5           # Failed logins per IP+email before lockout
+LOGIN_ATTEMPT_WINDOW_MINUTES = 5  # Window failed logins are counted in
+LOGIN_LOCKOUT_MINUTES = 15       # Lockout after too many failed logins
+RATE_LIMIT_REDIS_TIMEOUT = 0.25  # Seconds a rate limit check may wait on DragonflyDB
+RATE_LIMIT_BREAKER_SECONDS = 30  # After a DragonflyDB error, limit per worker for this long
+
+# ==================== METRICS ====================
+METRICS_PUBLISH_INTERVAL = 15        # Seconds between a worker's metrics snapshots in DragonflyDB
+METRICS_WORKER_STALE_SECONDS = 60    # Snapshots older than this (exited workers) are left out of /metrics
+
+# ==================== QUERY PROFILER (development) ====================
+QUERY_PROFILER_SLOW_MS = 100          # Commands at least this slow are reported (and explained)
+QUERY_PROFILER_REPEAT_THRESHOLD = 5   # Same query shape this many times in one request: possible N+1
+QUERY_PROFILER_MAX_EXPLAINS = 3       # Slowest commands explained per request
+
+# ==================== INDEX REGISTRY ====================
+SYNC_LOG_RETENTION_DAYS = 180          # sync_logs older than this are removed by a TTL index
+WEBHOOK_LOG_RETENTION_DAYS = 30        # webhook_logs older than this are removed by a TTL index
+INDEX_RECONCILE_LOCK_TTL = 900         # Seconds one worker may spend building indexes at startup
 
 # ==================== API RETRY SETTINGS ====================
 # Retry configuration for external API calls (FaithFlow sync, etc.)
@@ -3,92 +3,33 @@ from motor.motor_asyncio import AsyncIOMotorClient
 import os
 import logging
 
+from services.index_registry import reconcile_indexes
+
 logger = logging.getLogger(__name__)
 
 async def create_database_indexes():
-    """Create performance indexes for faster queries"""
-    
+    """Create the indexes declared in services/index_registry.py"""
+
     mongo_url = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
     client = AsyncIOMotorClient(mongo_url)
     db = client[os.environ.get('DB_NAME', 'pastoral_care_db')]
-    
-    print("Creating database indexes for performance optimization...")
-    
-    # Members collection indexes
-    await db.members.create_index("campus_id")
-    await db.members.create_index("last_contact_date")
-    await db.members.create_index("engagement_status")
-    await db.members.create_index("external_member_id")
-    await db.members.create_index("is_archived")
-    await db.members.create_index([("name", "text"), ("phone", "text")])  # Text search
-    # Unique compound index for API-synced members (sparse to allow null external_member_id)
-    await db.members.create_index(
-        [("campus_id", 1), ("external_member_id", 1)],
-        unique=True,
-        sparse=True,
-        name="campus_id_1_external_member_id_1"
-    )
-    print("✅ Members indexes created")
-    
-    # Care events collection indexes
-    await db.care_events.create_index("member_id")
-    await db.care_events.create_index("campus_id")
-    await db.care_events.create_index("event_date")
-    await db.care_events.create_index("event_type")
-    await db.care_events.create_index("completed")
-    await db.care_events.create_index([("member_id", 1), ("event_date", -1)])  # Compound
-    print("✅ Care events indexes created")
-    
-    # Grief support collection indexes
-    await db.grief_support.create_index("member_id")
-    await db.grief_support.create_index("campus_id")
-    await db.grief_support.create_index("scheduled_date")
-    await db.grief_support.create_index("completed")
-    await db.grief_support.create_index("care_event_id")
-    print("✅ Grief support indexes created")
 
-    # Accident followup collection indexes
-    await db.accident_followup.create_index("member_id")
-    await db.accident_followup.create_index("campus_id")
-    await db.accident_followup.create_index("scheduled_date")
-    await db.accident_followup.create_index("completed")
-    await db.accident_followup.create_index("care_event_id")
-    print("✅ Accident followup indexes created")
+    print("Creating database indexes from the index registry...")
+
+    report = await reconcile_indexes(db)
+    for label in report.created:
+        print(f"✅ {label}")
+    for label in report.updated:
+        print(f"🔁 {label} (TTL updated)")
+    for label in report.conflicts + report.failed:
+        print(f"⚠️  {label}")
+    if report.unlisted:
+        print(f"ℹ️  Not in the registry (kept): {', '.join(report.unlisted)}")
 
-    # Financial aid schedules indexes
-    await db.financial_aid_schedules.create_index("member_id")
-    await db.financial_aid_schedules.create_index("campus_id")
-    await db.financial_aid_schedules.create_index("next_occurrence")
-    await db.financial_aid_schedules.create_index("is_active")
-    await db.financial_aid_schedules.create_index("frequency")
-    print("✅ Financial aid schedules indexes created")
-    
-    # Notification logs indexes
-    await db.notification_logs.create_index("created_at")
-    await db.notification_logs.create_index("member_id")
-    await db.notification_logs.create_index("status")
-    print("✅ Notification logs indexes created")
-    
-    # Users collection indexes
-    await db.users.create_index("email", unique=True)
-    await db.users.create_index("campus_id")
-    await db.users.create_index("role")
-    print("✅ Users indexes created")
-    
-    # Job locks indexes (for distributed scheduler locking)
-    await db.job_locks.create_index("lock_id", unique=True)
-    await db.job_locks.create_index("expires_at")
-    print("✅ Job locks indexes created")
+    print(f"\n🚀 Index registry reconciled: {report.summary()}")
+    print("Run `python migrate.py --index-report` to list unused and missing indexes")
 
-    print("\n🚀 All database indexes created successfully!")
-    print("Expected performance improvements:")
-    print("  - Member queries: 5-10x faster")
-    print("  - Dashboard loading: 3-5x faster")
-    print("  - Analytics: 2-3x faster")
-    print("  - Search: 10x faster")
-    print("  - Scheduler: Prevents duplicate job execution across workers")
-    
     client.close()
 
 if __name__ == "__main__":
-    asyncio.run(create_database_indexes())
\ No newline at end of file
+    asyncio.run(create_database_indexes())
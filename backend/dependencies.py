@@ -12,7 +12,8 @@ import logging
 from datetime import datetime, timezone, timedelta
 
 from enums import UserRole
-from constants import JWT_TOKEN_EXPIRE_HOURS
+from constants import JWT_TOKEN_EXPIRE_HOURS, LOGIN_MAX_ATTEMPTS, LOGIN_ATTEMPT_WINDOW_MINUTES, LOGIN_LOCKOUT_MINUTES
+from services.cache import get_cache, get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -63,8 +64,7 @@ async def get_current_user(request: Request) -> dict:
     except jwt.PyJWTError:
         raise HTTPException(status_code=HTTP_401_UNAUTHORIZED, detail="Could not validate credentials")
     
-    db = get_db()
-    user = await db.users.find_one({"id": user_id}, {"_id": 0})
+    user = await load_user_principal(user_id)
     if user is None:
         raise HTTPException(status_code=HTTP_401_UNAUTHORIZED, detail="Could not validate credentials")
     return user
@@ -86,6 +86,47 @@ async def get_full_admin(request: Request) -> dict:
     return current_user
 
 
+# ==================== USER PRINCIPAL CACHE ====================
+
+# Authenticated users are cached briefly by id; routes/auth.py invalidates on every user change
+USER_PRINCIPAL_TTL = 60
+_user_cache_stats = {"hits": 0, "misses": 0}
+
+
+def _user_principal_key(user_id: str) -> str:
+    return f"auth:user:{user_id}"
+
+
+async def load_user_principal(user_id: str) -> dict | None:
+    """Load an authenticated user by id (without password hash), served from cache when possible."""
+    cache = get_cache()
+    user = await cache.get(_user_principal_key(user_id))
+    if user is not None:
+        _user_cache_stats["hits"] += 1
+        return user
+
+    _user_cache_stats["misses"] += 1
+    user = await get_db().users.find_one({"id": user_id}, {"_id": 0, "hashed_password": 0})
+    if user is not None and cache:
+        await cache.set(_user_principal_key(user_id), user, ttl=USER_PRINCIPAL_TTL)
+    return user
+
+
+async def invalidate_user_principal(user_id: str) -> None:
+    """Drop a cached user on every worker - call after any change to the user document."""
+    cache = get_cache()
+    await cache.delete(_user_principal_key(user_id))
+
+
+def get_user_cache_stats() -> dict:
+    """Hit/miss counters of the user principal cache for this worker."""
+    lookups = _user_cache_stats["hits"] + _user_cache_stats["misses"]
+    return {
+        **_user_cache_stats,
+        "hit_ratio": round(_user_cache_stats["hits"] / lookups, 4) if lookups else None,
+    }
+
+
 def get_campus_filter(current_user: dict) -> dict:
     """Get campus filter for queries based on user role"""
     role = current_user.get("role")
@@ -138,15 +179,7 @@ def safe_error_detail(e: Exception, status_code: int = 500) -> str:
 
 
 # ==================== BRUTE FORCE PROTECTION ====================
-
-# In-memory storage for login attempts (per IP and per account)
-# Format: {"ip:email": {"attempts": int, "last_attempt": datetime, "locked_until": datetime | None}}
-_login_attempts: dict = {}
-
-# Security constants for brute force protection
-LOGIN_MAX_ATTEMPTS = 5  # Max failed attempts before lockout
-LOGIN_LOCKOUT_MINUTES = 15  # Account lockout duration
-LOGIN_ATTEMPT_WINDOW_MINUTES = 5  # Time window to count attempts
+# Failed logins are counted per IP+email in a sliding window shared by all workers
 
 
 def get_client_ip(request: Request) -> str:
@@ -165,86 +198,32 @@ def get_client_ip(request: Request) -> str:
     return client[0] if client else "unknown"
 
 
-def check_login_rate_limit(ip: str, email: str) -> tuple[bool, str | None]:
+def _login_key(ip: str, email: str) -> str:
+    return f"login:{ip}:{email.lower()}"
+
+
+async def check_login_rate_limit(ip: str, email: str) -> tuple[bool, str | None]:
     """
     Check if login attempt is allowed.
     Returns (is_allowed, error_message).
     """
-    key = f"{ip}:{email.lower()}"
-    now = datetime.now(timezone.utc)
-
-    if key in _login_attempts:
-        record = _login_attempts[key]
-
-        # Check if account is locked
-        if record.get("locked_until"):
-            if now < record["locked_until"]:
-                remaining = int((record["locked_until"] - now).total_seconds() // 60) + 1
-                return False, f"Account temporarily locked. Try again in {remaining} minutes."
-            else:
-                # Lockout expired, reset
-                del _login_attempts[key]
-                return True, None
-
-        # Check if within attempt window
-        window_start = now - timedelta(minutes=LOGIN_ATTEMPT_WINDOW_MINUTES)
-        if record["last_attempt"] > window_start:
-            if record["attempts"] >= LOGIN_MAX_ATTEMPTS:
-                # Lock the account
-                record["locked_until"] = now + timedelta(minutes=LOGIN_LOCKOUT_MINUTES)
-                logger.warning(f"Account locked due to too many failed attempts: {email} from {ip}")
-                return False, f"Too many failed attempts. Account locked for {LOGIN_LOCKOUT_MINUTES} minutes."
-
+    remaining = await get_rate_limiter().lockout_remaining(_login_key(ip, email))
+    if remaining:
+        return False, f"Account temporarily locked. Try again in {remaining // 60 + 1} minutes."
     return True, None
 
 
-def record_failed_login(ip: str, email: str) -> None:
-    """Record a failed login attempt"""
-    key = f"{ip}:{email.lower()}"
-    now = datetime.now(timezone.utc)
-
-    if key in _login_attempts:
-        record = _login_attempts[key]
-        window_start = now - timedelta(minutes=LOGIN_ATTEMPT_WINDOW_MINUTES)
-
-        if record["last_attempt"] > window_start:
-            record["attempts"] += 1
-        else:
-            # Outside window, reset counter
-            record["attempts"] = 1
-        record["last_attempt"] = now
-    else:
-        _login_attempts[key] = {
-            "attempts": 1,
-            "last_attempt": now,
-            "locked_until": None
-        }
-
-    # Log failed attempt
-    attempts = _login_attempts[key]["attempts"]
-    logger.warning(f"Failed login attempt {attempts}/{LOGIN_MAX_ATTEMPTS} for {email} from {ip}")
+async def record_failed_login(ip: str, email: str) -> None:
+    """Record a failed login attempt, locking the IP+email out once it reaches LOGIN_MAX_ATTEMPTS"""
+    key = _login_key(ip, email)
+    limiter = get_rate_limiter()
+    result = await limiter.hit_rate_limit(key, LOGIN_MAX_ATTEMPTS, LOGIN_ATTEMPT_WINDOW_MINUTES * 60)
+    logger.warning(f"Failed login attempt {result.hits}/{LOGIN_MAX_ATTEMPTS} for {email} from {ip}")
+    if not result.allowed or result.hits >= LOGIN_MAX_ATTEMPTS:
+        await limiter.lock_out(key, LOGIN_LOCKOUT_MINUTES * 60)
+        logger.warning(f"Account locked due to too many failed attempts: {email} from {ip}")
 
 
-def clear_login_attempts(ip: str, email: str) -> None:
+async def clear_login_attempts(ip: str, email: str) -> None:
     """Clear login attempts after successful login"""
-    key = f"{ip}:{email.lower()}"
-    if key in _login_attempts:
-        del _login_attempts[key]
-
-
-def cleanup_old_login_attempts() -> None:
-    """Remove expired login attempt records to prevent memory growth"""
-    now = datetime.now(timezone.utc)
-    expiry = now - timedelta(minutes=LOGIN_LOCKOUT_MINUTES + LOGIN_ATTEMPT_WINDOW_MINUTES)
-
-    keys_to_delete = []
-    for key, record in _login_attempts.items():
-        # Remove if last attempt was long ago and not locked
-        if record["last_attempt"] < expiry and not record.get("locked_until"):
-            keys_to_delete.append(key)
-        # Remove if lockout has expired
-        elif record.get("locked_until") and record["locked_until"] < now:
-            keys_to_delete.append(key)
-
-    for key in keys_to_delete:
-        del _login_attempts[key]
+    await get_rate_limiter().reset_rate_limit(_login_key(ip, email))
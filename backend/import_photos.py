@@ -1,60 +1,93 @@
 import asyncio
 import csv
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
 import os
 
+from services.image_service import ImageService, close_image_pool
+
+# Photos resized per round trip (the image pool processes them in parallel)
+PHOTO_BATCH_SIZE = 50
+
+
+async def _process_batch(db, batch):
+    """Resize one batch of (member_id, photo_path) and store all their URLs with one bulk_write"""
+    photos = []
+    failed = 0
+    for member_id, photo_path in batch:
+        try:
+            with open(photo_path, 'rb') as f:
+                photos.append((member_id, f.read()))
+        except OSError as e:
+            print(f"Error reading {photo_path}: {str(e)}")
+            failed += 1
+
+    updates = []
+    for member_id, photo, error in await ImageService.process_member_photos(photos):
+        if error:
+            print(f"Error processing photo for {member_id}: {error}")
+            failed += 1
+            continue
+        updates.append(UpdateOne({"id": member_id}, {"$set": photo}))
+
+    if updates:
+        await db.members.bulk_write(updates, ordered=False)
+    return len(updates), failed
+
+
 async def import_member_photos():
     """Import member photos based on CSV photo column"""
-    
+
     mongo_url = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
     client = AsyncIOMotorClient(mongo_url)
     db = client[os.environ.get('DB_NAME', 'pastoral_care_db')]
-    
+
     print("Importing member photos...")
-    
+
     updated_count = 0
     not_found_count = 0
-    
+    failed_count = 0
+
     with open('/app/backend/core_jemaat.csv', 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            try:
-                identity_jemaat = row.get('identity_jemaat', '').strip()
-                photo_filename = row.get('photo', '').strip()
-                
-                if not identity_jemaat or not photo_filename:
-                    continue
-                
-                # Find member by external_member_id
-                member = await db.members.find_one(
-                    {"external_member_id": identity_jemaat}, 
-                    {"_id": 0}
-                )
-                
-                if member:
-                    # Check if photo file exists
-                    photo_path = f"/app/backend/uploads/{photo_filename}"
-                    if os.path.exists(photo_path):
-                        # Update member with photo URL
-                        await db.members.update_one(
-                            {"id": member["id"]},
-                            {"$set": {"photo_url": f"/uploads/{photo_filename}"}}
-                        )
-                        updated_count += 1
-                        
-                        if updated_count % 50 == 0:
-                            print(f"  Updated {updated_count} photos...")
-                    else:
-                        not_found_count += 1
-                        
-            except Exception as e:
-                print(f"Error processing {row.get('identity_jemaat')}: {str(e)}")
-    
+        rows = [
+            (row.get('identity_jemaat', '').strip(), row.get('photo', '').strip())
+            for row in csv.DictReader(f)
+        ]
+    photo_by_external_id = {identity: photo for identity, photo in rows if identity and photo}
+
+    # Resolve every member in one query instead of one lookup per row
+    members = await db.members.find(
+        {"external_member_id": {"$in": list(photo_by_external_id)}},
+        {"_id": 0, "id": 1, "external_member_id": 1}
+    ).to_list(None)
+
+    batch = []
+    for member in members:
+        # Check if photo file exists
+        photo_path = f"/app/backend/uploads/{photo_by_external_id[member['external_member_id']]}"
+        if not os.path.exists(photo_path):
+            not_found_count += 1
+            continue
+        batch.append((member["id"], photo_path))
+        if len(batch) >= PHOTO_BATCH_SIZE:
+            updated, failed = await _process_batch(db, batch)
+            updated_count += updated
+            failed_count += failed
+            batch = []
+            print(f"  Updated {updated_count} photos...")
+
+    if batch:
+        updated, failed = await _process_batch(db, batch)
+        updated_count += updated
+        failed_count += failed
+
     print(f"\n✅ Photo import complete!")
     print(f"  Updated: {updated_count} members")
     print(f"  Not found: {not_found_count} photos")
-    
+    print(f"  Failed: {failed_count} photos")
+
+    close_image_pool()
     client.close()
 
 if __name__ == "__main__":
-    asyncio.run(import_member_photos())
\ No newline at end of file
+    asyncio.run(import_member_photos())
@@ -69,70 +69,11 @@ async def test_connection(mongo_url, db_name):
 
 
 async def create_indexes(db):
-    """Create all database indexes"""
-    indexes_created = 0
-
-    # Members collection indexes
-    await db.members.create_index("campus_id")
-    await db.members.create_index("family_group_id")
-    await db.members.create_index("last_contact_date")
-    await db.members.create_index("engagement_status")
-    await db.members.create_index("external_member_id")
-    await db.members.create_index([("name", "text"), ("phone", "text")])
-    indexes_created += 6
-
-    # Care events collection indexes
-    await db.care_events.create_index("member_id")
-    await db.care_events.create_index("campus_id")
-    await db.care_events.create_index("event_date")
-    await db.care_events.create_index("event_type")
-    await db.care_events.create_index("completed")
-    await db.care_events.create_index([("member_id", 1), ("event_date", -1)])
-    indexes_created += 6
-
-    # Grief support collection indexes
-    await db.grief_support.create_index("member_id")
-    await db.grief_support.create_index("campus_id")
-    await db.grief_support.create_index("scheduled_date")
-    await db.grief_support.create_index("completed")
-    await db.grief_support.create_index("care_event_id")
-    indexes_created += 5
-
-    # Financial aid schedules indexes
-    await db.financial_aid_schedules.create_index("member_id")
-    await db.financial_aid_schedules.create_index("campus_id")
-    await db.financial_aid_schedules.create_index("next_occurrence")
-    await db.financial_aid_schedules.create_index("is_active")
-    await db.financial_aid_schedules.create_index("frequency")
-    indexes_created += 5
-
-    # Notification logs indexes
-    await db.notification_logs.create_index("created_at")
-    await db.notification_logs.create_index("member_id")
-    await db.notification_logs.create_index("status")
-    indexes_created += 3
-
-    # Users collection indexes
-    await db.users.create_index("email", unique=True)
-    await db.users.create_index("campus_id")
-    await db.users.create_index("role")
-    indexes_created += 3
-
-    # Family groups indexes
-    await db.family_groups.create_index("campus_id")
-    indexes_created += 1
-
-    # Campuses indexes
-    await db.campuses.create_index("id", unique=True)
-    indexes_created += 1
-
-    # Activity logs indexes
-    await db.activity_logs.create_index("campus_id")
-    await db.activity_logs.create_index("action_date")
-    await db.activity_logs.create_index("user_id")
-    indexes_created += 3
-
-    return indexes_created
+    """Create the indexes declared in the index registry"""
+    from services.index_registry import reconcile_indexes
+
+    report = await reconcile_indexes(db)
+    return len(report.created) + len(report.updated)
 
 
 async def create_admin_user(db, email, password, name="Administrator"):
@@ -4,6 +4,7 @@ FaithTracker Database Migration Script
 Handles database schema changes and data transformations between versions
 """
 
+import argparse
 import asyncio
 import sys
 import os
@@ -296,6 +297,93 @@ async def migration_010_fix_corrupted_uuids(db):
     return f"Fixed {total_fixed} corrupted UUID(s) across all collections"
 
 
+async def migration_011_drop_dashboard_cache(db):
+    """Drop the dashboard_cache collection (reminders are now materialized in DragonflyDB)"""
+    if "dashboard_cache" not in await db.list_collection_names():
+        return "dashboard_cache already removed"
+    await db.dashboard_cache.drop()
+    return "Dropped dashboard_cache collection"
+
+
+async def migration_012_add_import_jobs_indexes(db):
+    """Add indexes for background member import jobs (expired after 7 days)"""
+    await db.import_jobs.create_index("id", unique=True)
+    await db.import_jobs.create_index("campus_id")
+    await db.import_jobs.create_index("created_at", expireAfterSeconds=7 * 24 * 3600)
+    return "Created 3 indexes on import_jobs"
+
+
+async def migration_013_add_keyset_pagination_indexes(db):
+    """Add compound indexes matching the keyset (cursor) sort order of paginated lists"""
+    await db.members.create_index([("campus_id", 1), ("name", 1), ("id", 1)])
+    await db.care_events.create_index([("campus_id", 1), ("event_date", -1), ("created_at", -1), ("id", -1)])
+    await db.activity_logs.create_index([("campus_id", 1), ("created_at", -1), ("id", -1)])
+    await db.pastoral_notes.create_index([("campus_id", 1), ("created_at", -1), ("id", -1)])
+    return "Created 4 keyset pagination indexes"
+
+
+async def migration_014_build_search_index(db):
+    """Create the search_index collection used by global and member search, and populate it"""
+    from services.search_service import SearchService
+
+    await db.search_index.create_index([("entity", 1), ("keys", 1), ("campus_id", 1)])
+    await db.search_index.create_index([("entity", 1), ("member_id", 1)])
+    await db.search_index.create_index([("campus_id", 1), ("updated_at", 1)])
+    counts = await SearchService(db).rebuild()
+    return f"Indexed {counts['members']} members and {counts['care_events']} care events"
+
+
+async def migration_015_add_report_indexes(db):
+    """Add indexes for rendered report PDFs (expire at expires_at) and report export jobs (7 days)"""
+    await db.rendered_reports.create_index("expires_at", expireAfterSeconds=0)
+    await db.report_jobs.create_index("id", unique=True)
+    await db.report_jobs.create_index("created_by_user_id")
+    await db.report_jobs.create_index("created_at", expireAfterSeconds=7 * 24 * 3600)
+    return "Created 4 indexes on rendered_reports and report_jobs"
+
+
+async def migration_016_build_report_rollups(db):
+    """Create the daily_rollups and rollup_dirty collections behind the reports, and backfill them"""
+    from services.rollup_service import RollupService
+
+    await db.daily_rollups.create_index([("kind", 1), ("campus_id", 1), ("date", 1)])
+    await db.daily_rollups.create_index([("kind", 1), ("date", 1), ("computed_at", 1)])
+    await db.rollup_dirty.create_index([("campus_id", 1), ("date", 1)])
+    counts = await RollupService(db).rebuild()
+    return f"Built {counts['events']} care event rollups and {counts['activity']} staff activity rollups"
+
+
+async def migration_017_add_analytics_indexes(db):
+    """Add indexes behind the analytics pipelines (events by type and aid recipients, follow-up candidates)"""
+    await db.care_events.create_index([("campus_id", 1), ("event_type", 1), ("member_id", 1)])
+    await db.members.create_index([("campus_id", 1), ("days_since_last_contact", 1)])
+    return "Created 2 analytics indexes"
+
+
+async def migration_018_recompute_stored_engagement(db):
+    """Index stored engagement and recompute it for every member (read paths no longer recompute it)"""
+    from services.engagement_service import EngagementService
+
+    await db.members.create_index([("campus_id", 1), ("engagement_status", 1), ("days_since_last_contact", -1)])
+    updated = await EngagementService(db).recompute()
+    return f"Recomputed engagement for {sum(updated.values())} members in {len(updated)} campuses"
+
+
+async def migration_019_reconcile_index_registry(db):
+    """Create every index in the registry, replacing the sparse unique external id index with a partial one"""
+    from services.index_registry import reconcile_indexes
+
+    # The sparse compound index also covers members without an external id (campus_id always exists),
+    # so a second manually added member in a campus collided on external_member_id: null
+    legacy = (await db.members.index_information()).get("campus_id_1_external_member_id_1")
+    if legacy and "partialFilterExpression" not in legacy:
+        await db.members.drop_index("campus_id_1_external_member_id_1")
+    report = await reconcile_indexes(db)
+    if report.failed:
+        return f"Indexes reconciled ({report.summary()}); failed: {'; '.join(report.failed)}"
+    return f"Indexes reconciled ({report.summary()})"
+
+
 # ==================== MIGRATION REGISTRY ====================
 
 # List of all migrations in order
@@ -311,6 +399,15 @@ MIGRATIONS: List[tuple[int, str, Callable]] = [
     (8, "Ensure campus id field", migration_008_ensure_campus_id_field),
     (9, "Ensure user required fields", migration_009_ensure_user_required_fields),
     (10, "Fix corrupted UUIDs", migration_010_fix_corrupted_uuids),
+    (11, "Drop Mongo dashboard cache", migration_011_drop_dashboard_cache),
+    (12, "Import jobs indexes", migration_012_add_import_jobs_indexes),
+    (13, "Keyset pagination indexes", migration_013_add_keyset_pagination_indexes),
+    (14, "Search index", migration_014_build_search_index),
+    (15, "Report cache and job indexes", migration_015_add_report_indexes),
+    (16, "Report daily rollups", migration_016_build_report_rollups),
+    (17, "Analytics indexes", migration_017_add_analytics_indexes),
+    (18, "Stored engagement", migration_018_recompute_stored_engagement),
+    (19, "Index registry", migration_019_reconcile_index_registry),
 ]
 
 
@@ -394,7 +491,42 @@ async def show_migration_history(db):
         print(f"  {status_icon} v{version:03d} - {desc} ({executed})")
 
 
-async def run_migration_process():
+async def reconcile_index_registry(db, drop_unlisted: bool):
+    """Reconcile the index registry now (idempotent; also done by each deployment at startup)"""
+    from services.index_registry import reconcile_indexes
+
+    print_step("Reconciling index registry")
+    report = await reconcile_indexes(db, drop_unlisted=drop_unlisted)
+    print_success(report.summary())
+    for label in report.created + report.updated + report.dropped:
+        print_info(label)
+    for label in report.conflicts + report.failed:
+        print_warning(label)
+    if report.unlisted:
+        print_info(f"Not in the registry (kept): {', '.join(report.unlisted)}")
+    return not report.failed
+
+
+async def show_index_report(db):
+    """Display unused, unlisted and missing indexes from $indexStats"""
+    from services.index_registry import index_usage_report
+
+    report = await index_usage_report(db)
+    print(f"\n{CYAN}Index Report:{NC}\n")
+    since = min((u.since for u in report.unused + report.unlisted if u.since), default=None)
+    if since:
+        print_info(f"Usage counted since {since.isoformat()[:19]} (counters reset when MongoDB restarts)")
+    for name in report.missing:
+        print(f"  {RED}missing{NC}   {name}")
+    for usage in report.unused:
+        print(f"  {YELLOW}unused{NC}    {usage.collection}.{usage.name}")
+    for usage in report.unlisted:
+        print(f"  {MAGENTA}unlisted{NC}  {usage.collection}.{usage.name} ({usage.ops} ops)")
+    if not (report.missing or report.unused or report.unlisted):
+        print_info("All registered indexes exist and are in use")
+
+
+async def run_migration_process(args):
     """Main migration process"""
     print_header()
 
@@ -414,6 +546,11 @@ async def run_migration_process():
         db = client[db_name]
         print_success(f"Connected to {db_name}")
 
+        if args.index_report:
+            await show_index_report(db)
+            client.close()
+            return True
+
         # Get current version
         current_version = await get_current_version(db)
         latest_version = max([m[0] for m in MIGRATIONS]) if MIGRATIONS else 0
@@ -421,6 +558,7 @@ async def run_migration_process():
         print_info(f"Current database version: v{current_version:03d}")
         print_info(f"Latest available version: v{latest_version:03d}")
 
+        success = True
         if current_version >= latest_version:
             print(f"\n{GREEN}{'='*60}{NC}")
             print(f"{GREEN}{BOLD}   ✓ Database is up to date!   {NC}")
@@ -446,11 +584,14 @@ async def run_migration_process():
                 print_warning("Database may be in an inconsistent state")
                 print_warning("Review the error above and fix before retrying")
 
+        if success and args.reconcile_indexes:
+            success = await reconcile_index_registry(db, args.drop_unlisted_indexes)
+
         # Show migration history
         await show_migration_history(db)
 
         client.close()
-        return success if current_version < latest_version else True
+        return success
 
     except Exception as e:
         print_error(str(e))
@@ -459,7 +600,15 @@ async def run_migration_process():
 
 def main():
     """Main entry point"""
-    success = asyncio.run(run_migration_process())
+    parser = argparse.ArgumentParser(description="FaithTracker database migrations")
+    parser.add_argument("--index-report", action="store_true",
+                        help="Show unused, unlisted and missing indexes instead of migrating")
+    parser.add_argument("--reconcile-indexes", action="store_true",
+                        help="Reconcile the index registry after migrating")
+    parser.add_argument("--drop-unlisted-indexes", action="store_true",
+                        help="With --reconcile-indexes, drop indexes that are not in the registry")
+    args = parser.parse_args()
+    success = asyncio.run(run_migration_process(args))
     sys.exit(0 if success else 1)
 
 
@@ -20,6 +20,7 @@ from enums import (
     NotificationChannel, NotificationStatus, UserRole,
     ScheduleFrequency, WeekDay, ActivityActionType, NoteCategory
 )
+from constants import ENGAGEMENT_NO_CONTACT_DAYS
 
 logger = logging.getLogger(__name__)
 
@@ -104,8 +105,9 @@ class Member(Struct):
     phone: str | None = None  # Some members may not have phone numbers
     photo_url: str | None = None
     last_contact_date: datetime | None = None
-    engagement_status: EngagementStatus = EngagementStatus.ACTIVE
-    days_since_last_contact: int = 0
+    # Never contacted until a contact is recorded (reads serve the stored values)
+    engagement_status: EngagementStatus = EngagementStatus.DISCONNECTED
+    days_since_last_contact: int = ENGAGEMENT_NO_CONTACT_DAYS
     is_archived: bool = False
     archived_at: datetime | None = None
     archived_reason: str | None = None
@@ -502,6 +504,7 @@ class SyncConfig(Struct):
     last_sync_at: datetime | None = None
     last_sync_status: str | None = None  # success, error
     last_sync_message: str | None = None
+    member_sync_cursor: str | None = None  # Newest core updated_at applied (incremental sync high-water mark)
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
 
@@ -526,6 +529,7 @@ class SyncLog(Struct):
     campus_id: str
     sync_type: str  # manual, scheduled, webhook
     status: str  # success, error, partial
+    sync_mode: str = "full"  # full, incremental
     id: str = field(default_factory=generate_uuid)
     members_fetched: int = 0
     members_created: int = 0
@@ -16,6 +16,8 @@ from dependencies import (
 )
 from constants import MAX_PAGE_NUMBER, MAX_LIMIT
 from models import generate_uuid
+from utils import contact_fields
+from services.rollup_service import RollupService
 from enums import ActivityActionType, EventType
 
 # Callbacks to be injected from server.py
@@ -142,6 +144,7 @@ async def complete_accident_stage(stage_id: str, request: Request, notes: Option
             "created_at": datetime.now(timezone.utc),
             "updated_at": datetime.now(timezone.utc)
         })
+        await RollupService(db).mark_care_events([{"campus_id": stage["campus_id"], "event_date": today_date}])
         
         # Log activity
         await _log_activity(
@@ -157,14 +160,15 @@ async def complete_accident_stage(stage_id: str, request: Request, notes: Option
             user_photo_url=current_user.get("photo_url")
         )
         
-        # Update member's last contact date
+        # Update member's last contact date and engagement
+        now = datetime.now(timezone.utc)
         await db.members.update_one(
             {"id": stage["member_id"]},
-            {"$set": {"last_contact_date": datetime.now(timezone.utc)}}
+            {"$set": {**contact_fields(now), "updated_at": now}}
         )
         
         # Invalidate dashboard cache
-        await _invalidate_dashboard_cache(stage["campus_id"])
+        await _invalidate_dashboard_cache(stage["campus_id"], [stage["member_id"]])
         
         return {"success": True, "message": "Accident follow-up stage completed"}
     except HTTPException:
@@ -184,13 +188,16 @@ async def undo_accident_stage(stage_id: str, request: Request) -> dict:
             raise HTTPException(status_code=404, detail="Accident followup not found")
         
         # Delete timeline entries created for this stage (linked by accident_stage_id)
+        await RollupService(db).mark_care_event_query({"accident_stage_id": stage_id})
         await db.care_events.delete_many({"accident_stage_id": stage_id})
         
         # Delete activity logs related to this accident stage
-        await db.activity_logs.delete_many({
+        activity_query = {
             "member_id": stage["member_id"],
             "notes": {"$regex": f"{stage['stage'].replace('_', ' ')}", "$options": "i"}
-        })
+        }
+        await RollupService(db).mark_activity_query(activity_query)
+        await db.activity_logs.delete_many(activity_query)
         
         # Reset the accident stage
         await db.accident_followup.update_one(
@@ -208,7 +215,7 @@ async def undo_accident_stage(stage_id: str, request: Request) -> dict:
         )
         
         # Invalidate dashboard cache
-        await _invalidate_dashboard_cache(stage["campus_id"])
+        await _invalidate_dashboard_cache(stage["campus_id"], [stage["member_id"]])
         
         return {"success": True, "message": "Accident followup stage reset"}
     except HTTPException:
@@ -264,6 +271,7 @@ async def ignore_accident_stage(stage_id: str, request: Request) -> dict:
             "created_at": datetime.now(timezone.utc),
             "updated_at": datetime.now(timezone.utc)
         })
+        await RollupService(db).mark_care_events([{"campus_id": stage["campus_id"], "event_date": today_date}])
         
         # Log activity
         await _log_activity(
@@ -280,7 +288,7 @@ async def ignore_accident_stage(stage_id: str, request: Request) -> dict:
         )
         
         # Invalidate dashboard cache
-        await _invalidate_dashboard_cache(stage["campus_id"])
+        await _invalidate_dashboard_cache(stage["campus_id"], [stage["member_id"]])
         
         return {"success": True, "message": "Accident followup ignored"}
     except HTTPException:
@@ -10,16 +10,13 @@ from litestar.status_codes import (
 )
 from litestar.datastructures import UploadFile
 from datetime import datetime, timezone
-from pathlib import Path
-from PIL import Image
-import io
 import logging
 
 from dependencies import (
     get_db, get_current_user, get_current_admin,
     verify_password, get_password_hash, create_access_token, safe_error_detail,
     get_client_ip, check_login_rate_limit, record_failed_login,
-    clear_login_attempts, cleanup_old_login_attempts
+    clear_login_attempts, invalidate_user_principal
 )
 from models import (
     UserCreate, UserUpdate, UserLogin, User, UserResponse, TokenResponse,
@@ -28,12 +25,10 @@ from models import (
 from enums import UserRole
 from constants import MAX_IMAGE_SIZE
 from utils import validate_email, validate_password_strength, normalize_phone_number, validate_image_magic_bytes
+from services.image_service import ImageService
 
 logger = logging.getLogger(__name__)
 
-# ROOT_DIR for photo uploads
-ROOT_DIR = Path(__file__).parent.parent
-
 
 # ==================== AUTHENTICATION ENDPOINTS ====================
 
@@ -106,11 +101,8 @@ async def login(data: UserLogin, request: Request) -> dict:
     db = get_db()
     client_ip = get_client_ip(request)
 
-    # Cleanup old entries periodically
-    cleanup_old_login_attempts()
-
     # Check rate limit BEFORE processing login
-    is_allowed, error_msg = check_login_rate_limit(client_ip, data.email)
+    is_allowed, error_msg = await check_login_rate_limit(client_ip, data.email)
     if not is_allowed:
         raise HTTPException(
             status_code=HTTP_429_TOO_MANY_REQUESTS,
@@ -121,7 +113,7 @@ async def login(data: UserLogin, request: Request) -> dict:
         user = await db.users.find_one({"email": data.email}, {"_id": 0})
         if not user:
             # Record failed attempt (user not found)
-            record_failed_login(client_ip, data.email)
+            await record_failed_login(client_ip, data.email)
             raise HTTPException(
                 status_code=HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password"
@@ -129,7 +121,7 @@ async def login(data: UserLogin, request: Request) -> dict:
 
         if not verify_password(data.password, user["hashed_password"]):
             # Record failed attempt (wrong password)
-            record_failed_login(client_ip, data.email)
+            await record_failed_login(client_ip, data.email)
             raise HTTPException(
                 status_code=HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password"
@@ -160,6 +152,7 @@ async def login(data: UserLogin, request: Request) -> dict:
                     {"id": user["id"]},
                     {"$set": {"campus_id": data.campus_id, "updated_at": datetime.now(timezone.utc)}}
                 )
+                await invalidate_user_principal(user["id"])
             else:
                 raise HTTPException(
                     status_code=HTTP_400_BAD_REQUEST,
@@ -167,7 +160,7 @@ async def login(data: UserLogin, request: Request) -> dict:
                 )
 
         # Clear failed attempts on successful login
-        clear_login_attempts(client_ip, data.email)
+        await clear_login_attempts(client_ip, data.email)
 
         access_token = create_access_token(data={"sub": user["id"]})
 
@@ -322,6 +315,7 @@ async def update_user(user_id: str, data: UserUpdate, request: Request) -> dict:
 
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="User not found")
+        await invalidate_user_principal(user_id)
 
         updated_user = await db.users.find_one({"id": user_id}, {"_id": 0})
 
@@ -369,6 +363,7 @@ async def update_own_profile(data: ProfileUpdate, request: Request) -> dict:
 
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="User not found")
+        await invalidate_user_principal(current_user["id"])
 
         updated_user = await db.users.find_one({"id": current_user["id"]}, {"_id": 0, "hashed_password": 0})
 
@@ -420,6 +415,7 @@ async def change_password(data: PasswordChange, request: Request) -> dict:
                 "updated_at": datetime.now(timezone.utc)
             }}
         )
+        await invalidate_user_principal(current_user["id"])
 
         return {"message": "Password changed successfully"}
 
@@ -451,38 +447,30 @@ async def upload_user_photo(user_id: str, request: Request, data: UploadFile) ->
         if not is_valid:
             raise HTTPException(status_code=400, detail=result)
 
-        # Create uploads directory if not exists
-        upload_dir = ROOT_DIR / "user_photos"
-        upload_dir.mkdir(exist_ok=True)
-
-        # Generate filename - always save as jpg since we convert to RGB
-        filename = f"USER-{user_id[:8]}.jpg"
-        filepath = upload_dir / filename
-
-        # Resize image to 400x400 and optimize
+        # Resize and encode (JPEG + WebP/AVIF) in the image process pool, off the event loop
         try:
-            img = Image.open(io.BytesIO(contents))
-        except Exception:
-            raise HTTPException(status_code=400, detail="Invalid or corrupted image file")
-        img = img.convert('RGB')
-        img.thumbnail((400, 400), Image.Resampling.LANCZOS)
-        try:
-            img.save(filepath, 'JPEG', quality=85, optimize=True, progressive=True)
+            photo = await ImageService.process_user_photo(contents, user_id)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         except OSError as e:
             logger.error(f"Failed to save user photo: {str(e)}")
             raise HTTPException(status_code=507, detail="Failed to save photo. Disk may be full.")
         
         # Update user record
-        photo_url = f"/api/user-photos/{filename}"
-        await db.users.update_one(
+        photo_url = photo["photo_url"]
+        previous = await db.users.find_one_and_update(
             {"id": user_id},
             {"$set": {
-                "photo_url": photo_url,
+                **photo,
                 "updated_at": datetime.now(timezone.utc)
-            }}
+            }},
+            projection={"_id": 0, "photo_url": 1, "photo_variants": 1}
         )
+        # Filenames are content-hashed, so the previous upload's files are now unreferenced
+        ImageService.delete_photo_files(previous, keep=photo)
+        await invalidate_user_principal(user_id)
         
-        return {"message": "Photo uploaded successfully", "photo_url": photo_url}
+        return {"message": "Photo uploaded successfully", "photo_url": photo_url, "photo_variants": photo["photo_variants"]}
         
     except HTTPException:
         raise
@@ -504,6 +492,7 @@ async def delete_user(user_id: str, request: Request) -> dict:
         result = await db.users.delete_one({"id": user_id})
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="User not found")
+        await invalidate_user_principal(user_id)
         
         return {"success": True, "message": "User deleted successfully"}
     except HTTPException:
@@ -8,7 +8,7 @@ import logging
 from dependencies import get_db, get_current_user
 from models import Campus, CampusCreate, to_mongo_doc
 from enums import UserRole
-from utils import get_from_cache, set_in_cache, invalidate_cache
+from services.cache import get_cache, CacheService
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +30,8 @@ async def create_campus(data: CampusCreate, request: Request) -> dict:
             timezone=data.timezone
         )
         await db.campuses.insert_one(to_mongo_doc(campus_obj))
-        invalidate_cache("campuses:")
+        cache = get_cache()
+        await cache.invalidate_campuses()
         return {"id": campus_obj.id, "campus_name": campus_obj.campus_name, "location": campus_obj.location}
     except Exception as e:
         logger.error(f"Error creating campus: {str(e)}")
@@ -41,8 +42,8 @@ async def create_campus(data: CampusCreate, request: Request) -> dict:
 async def list_campuses() -> list:
     """List all campuses (public for login selection) - cached"""
     db = get_db()
-    cache_key = "campuses:all"
-    cached = get_from_cache(cache_key, ttl_seconds=600)
+    cache = get_cache()
+    cached = await cache.get_campuses()
     cache_headers = {"Cache-Control": "public, max-age=300", "Vary": "Accept-Encoding"}
 
     if cached is not None:
@@ -58,7 +59,7 @@ async def list_campuses() -> list:
             if isinstance(cc.get('updated_at'), datetime):
                 cc['updated_at'] = cc['updated_at'].isoformat()
             serialized.append(cc)
-        set_in_cache(cache_key, serialized)
+        await cache.set_campuses(serialized)
         return LitestarResponse(content=serialized, headers=cache_headers)
     except Exception as e:
         logger.error(f"Error listing campuses: {str(e)}")
@@ -99,7 +100,9 @@ async def update_campus(campus_id: str, data: CampusCreate, request: Request) ->
         )
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Campus not found")
-        invalidate_cache("campuses:")
+        cache = get_cache()
+        await cache.invalidate_campuses()
+        await cache.delete(CacheService.KEY_CAMPUS_TIMEZONE, church_id=campus_id)
         return await _get_campus_by_id(campus_id)
     except HTTPException:
         raise
@@ -3,9 +3,10 @@ FaithTracker Care Event Routes
 Handles care event CRUD, bulk operations, reminders, and visitation logs
 """
 
-from litestar import get, post, put, delete, Request
+from litestar import get, post, put, delete, Request, Response
 from litestar.exceptions import HTTPException
 from litestar.params import Parameter
+from pymongo import UpdateMany, UpdateOne
 import msgspec
 import logging
 import os
@@ -13,12 +14,19 @@ from datetime import datetime, timezone, date
 from typing import Optional, List, Callable, Awaitable, Any, Dict
 
 from enums import EventType, UserRole, ActivityActionType
-from constants import MAX_PAGE_NUMBER, MAX_LIMIT
+from constants import (
+    MAX_PAGE_NUMBER, MAX_LIMIT, BULK_EVENT_MAX_IDS, BULK_EVENT_CHUNK_SIZE, BULK_DASHBOARD_PATCH_MAX
+)
 from models import (
     CareEvent, CareEventCreate, CareEventUpdate,
     VisitationLogEntry, AdditionalVisitRequest,
     to_mongo_doc, generate_uuid
 )
+from services.pagination import CARE_EVENT_SORT, keyset_query, split_page
+from services.loaders import get_loaders, display_name
+from services.search_service import SearchService, ENTITY_CARE_EVENT
+from services.rollup_service import RollupService
+from utils import contact_fields
 from dependencies import (
     get_db, get_current_user, get_campus_filter, safe_error_detail
 )
@@ -26,13 +34,14 @@ from dependencies import (
 logger = logging.getLogger(__name__)
 
 # Callbacks to server.py functions (set via init_care_event_routes)
-_invalidate_dashboard_cache: Optional[Callable[[str], Awaitable[None]]] = None
+_invalidate_dashboard_cache: Optional[Callable[..., Awaitable[None]]] = None
 _log_activity: Optional[Callable[..., Awaitable[None]]] = None
 _send_whatsapp_message: Optional[Callable[..., Awaitable[dict]]] = None
 _generate_grief_timeline: Optional[Callable[[date, str, str], List[Dict[str, Any]]]] = None
 _generate_accident_followup_timeline: Optional[Callable[[date, str, str, str], List[Dict[str, Any]]]] = None
 _get_campus_timezone: Optional[Callable[[str], Awaitable[str]]] = None
 _get_date_in_timezone: Optional[Callable[[str], str]] = None
+_log_activities: Optional[Callable[[List[Dict[str, Any]]], Awaitable[None]]] = None
 
 
 def init_care_event_routes(
@@ -43,11 +52,12 @@ def init_care_event_routes(
     generate_accident_followup_timeline: Callable[[date, str, str, str], List[Dict[str, Any]]],
     get_campus_timezone: Callable[[str], Awaitable[str]],
     get_date_in_timezone: Callable[[str], str],
+    log_activities: Callable[[List[Dict[str, Any]]], Awaitable[None]],
 ):
     """Initialize care event routes with callbacks to server.py functions"""
     global _invalidate_dashboard_cache, _log_activity, _send_whatsapp_message
     global _generate_grief_timeline, _generate_accident_followup_timeline
-    global _get_campus_timezone, _get_date_in_timezone
+    global _get_campus_timezone, _get_date_in_timezone, _log_activities
     
     _invalidate_dashboard_cache = invalidate_dashboard_cache
     _log_activity = log_activity
@@ -56,6 +66,7 @@ def init_care_event_routes(
     _generate_accident_followup_timeline = generate_accident_followup_timeline
     _get_campus_timezone = get_campus_timezone
     _get_date_in_timezone = get_date_in_timezone
+    _log_activities = log_activities
 
 
 # ==================== BULK EVENT IDS MODEL ====================
@@ -142,6 +153,8 @@ async def create_care_event(data: CareEventCreate, request: Request) -> dict:
             logger.info(f"[FINANCIAL AID] Saving to DB: aid_type={repr(event_dict.get('aid_type'))}, aid_amount={repr(event_dict.get('aid_amount'))}")
 
         await db.care_events.insert_one(event_dict)
+        await SearchService(db).index_care_events([event_dict])
+        await RollupService(db).mark_care_events([event_dict])
         
         # Log activity for creating the care event
         # For one-time events, log as COMPLETE_TASK since they're auto-completed
@@ -193,17 +206,12 @@ async def create_care_event(data: CareEventCreate, request: Request) -> dict:
             now = datetime.now(timezone.utc)
             await db.members.update_one(
                 {"id": event.member_id},
-                {"$set": {
-                    "last_contact_date": now,
-                    "days_since_last_contact": 0,
-                    "engagement_status": "active",
-                    "updated_at": now
-                }}
+                {"$set": {**contact_fields(now), "updated_at": now}}
             )
         
         # Invalidate dashboard cache
         if _invalidate_dashboard_cache:
-            await _invalidate_dashboard_cache(campus_id)
+            await _invalidate_dashboard_cache(campus_id, [event.member_id])
         
         return care_event
     
@@ -222,7 +230,8 @@ async def list_care_events(
     completed: Optional[bool] = None,
     page: int = Parameter(default=1, ge=1, le=MAX_PAGE_NUMBER),
     limit: int = Parameter(default=50, ge=1, le=MAX_LIMIT),
-) -> list:
+    cursor: Optional[str] = None,  # X-Next-Cursor from the previous page (replaces page)
+) -> Response:
     """List care events with optional filters and pagination - optimized with $lookup"""
     current_user = await get_current_user(request)
     db = get_db()
@@ -239,15 +248,19 @@ async def list_care_events(
         if completed is not None:
             query["completed"] = completed
 
-        # Calculate skip for pagination
-        skip = (page - 1) * limit
+        # Keyset pagination seeks straight to the cursor; skip is only used for page-based requests
+        try:
+            query = keyset_query(query, CARE_EVENT_SORT, cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        skip = 0 if cursor else (page - 1) * limit
 
         # Use aggregation with $lookup to avoid N+1 queries (50x faster)
         pipeline = [
             {"$match": query},
-            {"$sort": {"event_date": -1, "created_at": -1}},  # Secondary sort by created_at for same-day events
+            {"$sort": dict(CARE_EVENT_SORT)},  # created_at then id break ties between same-day events
             {"$skip": skip},
-            {"$limit": limit},
+            {"$limit": limit + 1},  # One extra row tells us whether a next page exists
             # Join with members collection to get member names, phone, and photo in single query
             {"$lookup": {
                 "from": "members",
@@ -291,8 +304,11 @@ async def list_care_events(
             {"$project": {"member_info": 0, "_id": 0}}
         ]
 
-        events = await db.care_events.aggregate(pipeline).to_list(limit)
-        return events
+        events = await db.care_events.aggregate(pipeline).to_list(limit + 1)
+        events, next_cursor = split_page(events, CARE_EVENT_SORT, limit)
+        return Response(content=events, headers={"X-Next-Cursor": next_cursor} if next_cursor else {})
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing care events: {str(e)}")
         raise HTTPException(status_code=500, detail=safe_error_detail(e))
@@ -350,6 +366,10 @@ async def update_care_event(event_id: str, data: CareEventUpdate, request: Reque
 
         # Return updated event
         updated_event = await db.care_events.find_one({"id": event_id}, {"_id": 0})
+        if updated_event and ("title" in update_data or "description" in update_data):
+            await SearchService(db).index_care_events([updated_event])
+        # Both the old and the new day when event_date (or type, status, amount) changed
+        await RollupService(db).mark_care_events([event, updated_event])
         return updated_event
     except HTTPException:
         raise
@@ -417,6 +437,7 @@ async def complete_birthday_by_member(member_id: str, request: Request) -> dict:
                     "updated_at": now
                 }}
             )
+            await RollupService(db).mark_care_events([existing_event])
         else:
             # Create new birthday event and mark as completed
             event_id = generate_uuid()
@@ -439,6 +460,7 @@ async def complete_birthday_by_member(member_id: str, request: Request) -> dict:
                 "updated_at": now
             }
             await db.care_events.insert_one(birthday_event)
+            await RollupService(db).mark_care_events([birthday_event])
 
         # Log activity
         if _log_activity:
@@ -458,12 +480,7 @@ async def complete_birthday_by_member(member_id: str, request: Request) -> dict:
         # Update member engagement status
         await db.members.update_one(
             {"id": member_id},
-            {"$set": {
-                "last_contact_date": now,
-                "days_since_last_contact": 0,
-                "engagement_status": "active",
-                "updated_at": now
-            }}
+            {"$set": {**contact_fields(now), "updated_at": now}}
         )
 
         # Create "Birthday Contact" regular_contact event for timeline
@@ -485,10 +502,11 @@ async def complete_birthday_by_member(member_id: str, request: Request) -> dict:
                 "updated_at": now
             }
             await db.care_events.insert_one(contact_event)
+            await RollupService(db).mark_care_events([contact_event])
 
         # Invalidate dashboard cache
         if _invalidate_dashboard_cache:
-            await _invalidate_dashboard_cache(campus_id)
+            await _invalidate_dashboard_cache(campus_id, [member_id])
 
         return {"success": True, "message": "Birthday completed successfully"}
 
@@ -537,6 +555,7 @@ async def complete_care_event(event_id: str, request: Request) -> dict:
         
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Care event not found")
+        await RollupService(db).mark_care_events([event])
         
         # Log activity
         if _log_activity:
@@ -557,12 +576,7 @@ async def complete_care_event(event_id: str, request: Request) -> dict:
         now = datetime.now(timezone.utc)
         await db.members.update_one(
             {"id": event["member_id"]},
-            {"$set": {
-                "last_contact_date": now,
-                "days_since_last_contact": 0,
-                "engagement_status": "active",
-                "updated_at": now
-            }}
+            {"$set": {**contact_fields(now), "updated_at": now}}
         )
         
         # For birthday completions, also create a regular contact event for timeline
@@ -589,10 +603,11 @@ async def complete_care_event(event_id: str, request: Request) -> dict:
             }
             
             await db.care_events.insert_one(contact_event)
+            await RollupService(db).mark_care_events([contact_event])
         
         # Invalidate dashboard cache after completing event
         if _invalidate_dashboard_cache:
-            await _invalidate_dashboard_cache(event["campus_id"])
+            await _invalidate_dashboard_cache(event["campus_id"], [event["member_id"]])
         
         return {"success": True, "message": "Care event marked as completed"}
     except HTTPException:
@@ -653,6 +668,7 @@ async def log_additional_visit(
         }
         
         await db.care_events.insert_one(additional_visit)
+        await RollupService(db).mark_care_events([additional_visit])
         
         # Log activity
         if _log_activity:
@@ -670,13 +686,10 @@ async def log_additional_visit(
             )
         
         # Update member engagement
+        now = datetime.now(timezone.utc)
         await db.members.update_one(
             {"id": parent["member_id"]},
-            {"$set": {
-                "last_contact_date": datetime.now(timezone.utc),
-                "engagement_status": "active",
-                "days_since_last_contact": 0
-            }}
+            {"$set": {**contact_fields(now), "updated_at": now}}
         )
         
         return {
@@ -820,82 +833,176 @@ async def get_hospital_followup_due() -> list:
 
 # ==================== BULK CARE EVENT OPERATIONS ====================
 
+# Event fields the bulk paths need (rollup days, activity entries, member updates)
+_BULK_EVENT_PROJECTION = {"_id": 0, "id": 1, "member_id": 1, "campus_id": 1, "event_type": 1, "event_date": 1}
+
+
+def _chunks(items: List[Any], size: int = BULK_EVENT_CHUNK_SIZE) -> List[List[Any]]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _bulk_event_ids(data: BulkEventIds) -> List[str]:
+    """Validated, de-duplicated event IDs of a bulk request"""
+    if not data.event_ids:
+        raise HTTPException(status_code=400, detail="No event IDs provided")
+    event_ids = list(dict.fromkeys(data.event_ids))
+    if len(event_ids) > BULK_EVENT_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"Maximum {BULK_EVENT_MAX_IDS} events per bulk operation")
+    return event_ids
+
+
+async def _find_bulk_events(db, event_ids: List[str], query: Dict[str, Any]) -> List[dict]:
+    """Events among event_ids matching query, fetched one $in chunk at a time"""
+    events: List[dict] = []
+    for chunk in _chunks(event_ids):
+        events.extend(await db.care_events.find({**query, "id": {"$in": chunk}}, _BULK_EVENT_PROJECTION).to_list(None))
+    return events
+
+
+async def _log_bulk_activities(
+    request: Request, db, current_user: dict, events: List[dict], action_type: ActivityActionType, notes: str
+) -> None:
+    """One activity entry per event, written as a single batch"""
+    if not _log_activities:
+        return
+    # Member names for every event in one batched lookup
+    members_by_id = await get_loaders(request, db).members.load_many(e["member_id"] for e in events)
+    await _log_activities([
+        {
+            "campus_id": event["campus_id"],
+            "user_id": current_user["id"],
+            "user_name": current_user["name"],
+            "action_type": action_type,
+            "member_id": event["member_id"],
+            "member_name": display_name(members_by_id.get(event["member_id"])),
+            "care_event_id": event["id"],
+            "event_type": EventType(event["event_type"]) if event.get("event_type") else None,
+            "notes": notes.format(event_type=event.get("event_type", "care")),
+            "user_photo_url": current_user.get("photo_url"),
+        }
+        for event in events
+    ])
+
+
+async def _record_contact(db, member_ids: List[str], now: datetime) -> None:
+    """Mark members as contacted now (same engagement reset as a single completion), one bulk_write"""
+    if not member_ids:
+        return
+    await db.members.bulk_write([
+        UpdateMany(
+            {"id": {"$in": chunk}},
+            {"$set": {**contact_fields(now), "updated_at": now}}
+        )
+        for chunk in _chunks(member_ids)
+    ], ordered=False)
+
+
+async def _recalculate_last_contact(db, member_ids: List[str]) -> None:
+    """
+    Recompute last contact and engagement for members after their events were deleted.
+
+    Same rule as deleting a single event: the newest remaining non-birthday or completed
+    birthday event counts as the last contact, no remaining event means never contacted.
+    """
+    if not member_ids:
+        return
+    last_contact: Dict[str, Any] = {}
+    for chunk in _chunks(member_ids):
+        groups = await db.care_events.aggregate([
+            {"$match": {
+                "member_id": {"$in": chunk},
+                "$or": [
+                    {"event_type": {"$ne": "birthday"}},
+                    {"event_type": "birthday", "completed": True}
+                ]
+            }},
+            {"$group": {"_id": "$member_id", "last_contact": {"$max": "$created_at"}}},
+        ]).to_list(None)
+        last_contact.update({g["_id"]: g["last_contact"] for g in groups})
+
+    now = datetime.now(timezone.utc)
+    operations = []
+    for member_id in member_ids:
+        operations.append(UpdateOne(
+            {"id": member_id},
+            {"$set": {**contact_fields(last_contact.get(member_id)), "updated_at": now}}
+        ))
+    await db.members.bulk_write(operations, ordered=False)
+
+
+async def _refresh_dashboards_for_events(events: List[dict]) -> None:
+    """Refresh dashboard reminders once per campus for the members touched by a bulk operation"""
+    if not _invalidate_dashboard_cache:
+        return
+    members_by_campus: Dict[str, set] = {}
+    for event in events:
+        if event.get("campus_id"):
+            members_by_campus.setdefault(event["campus_id"], set()).add(event["member_id"])
+    for campus_id, member_ids in members_by_campus.items():
+        # Patching thousands of rows costs more than one background rebuild
+        if len(member_ids) > BULK_DASHBOARD_PATCH_MAX:
+            await _invalidate_dashboard_cache(campus_id)
+        else:
+            await _invalidate_dashboard_cache(campus_id, list(member_ids))
+
+
 @post("/care-events/bulk-complete")
 async def bulk_complete_care_events(request: Request, data: BulkEventIds) -> dict:
     """
     Mark multiple care events as completed in a single operation.
 
-    Significantly faster than individual completions for batch processing.
+    Events are updated with one update_many per chunk, members with one bulk_write and
+    activity entries with one batched insert, so clearing thousands of overdue events
+    (e.g. birthdays after a holiday) stays a single fast call.
     Returns count of successfully completed events.
     """
     current_user = await get_current_user(request)
     db = get_db()
     try:
-        event_ids = data.event_ids
-        if not event_ids:
-            raise HTTPException(status_code=400, detail="No event IDs provided")
-
-        if len(event_ids) > 100:
-            raise HTTPException(status_code=400, detail="Maximum 100 events per bulk operation")
+        event_ids = _bulk_event_ids(data)
 
         # Build query with campus filter for multi-tenancy
-        query = {"id": {"$in": event_ids}, "completed": {"$ne": True}}
+        query = {"completed": {"$ne": True}}
         campus_filter = get_campus_filter(current_user)
         if campus_filter:
             query.update(campus_filter)
 
         # Get events to process (for logging)
-        events = await db.care_events.find(query, {"_id": 0}).to_list(None)
+        events = await _find_bulk_events(db, event_ids, query)
         if not events:
             return {"success": True, "completed_count": 0, "message": "No pending events found"}
 
         # Bulk update
         now = datetime.now(timezone.utc)
-        result = await db.care_events.update_many(
-            query,
-            {"$set": {
-                "completed": True,
-                "completed_at": now,
-                "completed_by_user_id": current_user["id"],
-                "completed_by_user_name": current_user["name"],
-                "updated_at": now
-            }}
-        )
-
-        # Log activity for each completed event (batch)
-        if _log_activity:
-            for event in events:
-                member = await db.members.find_one({"id": event["member_id"]}, {"name": 1, "_id": 0})
-                member_name = member["name"] if member else "Unknown"
-                await _log_activity(
-                    campus_id=event["campus_id"],
-                    user_id=current_user["id"],
-                    user_name=current_user["name"],
-                    action_type=ActivityActionType.COMPLETE_TASK,
-                    member_id=event["member_id"],
-                    member_name=member_name,
-                    care_event_id=event["id"],
-                    event_type=EventType(event["event_type"]) if event.get("event_type") else None,
-                    notes=f"Bulk completed {event.get('event_type', 'care')} task",
-                    user_photo_url=current_user.get("photo_url")
-                )
-
-        # Update engagement status for affected members
-        member_ids = list(set(e["member_id"] for e in events))
-        for member_id in member_ids:
-            await db.members.update_one(
-                {"id": member_id},
+        completed_count = 0
+        for chunk in _chunks([e["id"] for e in events]):
+            result = await db.care_events.update_many(
+                {**query, "id": {"$in": chunk}},
                 {"$set": {
-                    "last_contact_date": now,
+                    "completed": True,
+                    "completed_at": now,
+                    "completed_by_user_id": current_user["id"],
+                    "completed_by_user_name": current_user["name"],
                     "updated_at": now
                 }}
             )
+            completed_count += result.modified_count
+        await RollupService(db).mark_care_events(events)
 
-        logger.info(f"Bulk completed {result.modified_count} care events by {current_user['name']}")
+        await _log_bulk_activities(
+            request, db, current_user, events, ActivityActionType.COMPLETE_TASK, "Bulk completed {event_type} task"
+        )
+
+        # Completed events count as contact for the affected members
+        await _record_contact(db, list({e["member_id"] for e in events}), now)
+
+        await _refresh_dashboards_for_events(events)
+
+        logger.info(f"Bulk completed {completed_count} care events by {current_user['name']}")
         return {
             "success": True,
-            "completed_count": result.modified_count,
-            "message": f"Successfully completed {result.modified_count} care events"
+            "completed_count": completed_count,
+            "message": f"Successfully completed {completed_count} care events"
         }
 
     except HTTPException:
@@ -916,60 +1023,47 @@ async def bulk_ignore_care_events(request: Request, data: BulkEventIds) -> dict:
     current_user = await get_current_user(request)
     db = get_db()
     try:
-        event_ids = data.event_ids
-        if not event_ids:
-            raise HTTPException(status_code=400, detail="No event IDs provided")
-
-        if len(event_ids) > 100:
-            raise HTTPException(status_code=400, detail="Maximum 100 events per bulk operation")
+        event_ids = _bulk_event_ids(data)
 
         # Build query with campus filter
-        query = {"id": {"$in": event_ids}, "ignored": {"$ne": True}}
+        query = {"ignored": {"$ne": True}}
         campus_filter = get_campus_filter(current_user)
         if campus_filter:
             query.update(campus_filter)
 
         # Get events to process (for logging)
-        events = await db.care_events.find(query, {"_id": 0}).to_list(None)
+        events = await _find_bulk_events(db, event_ids, query)
         if not events:
             return {"success": True, "ignored_count": 0, "message": "No pending events found"}
 
         # Bulk update
         now = datetime.now(timezone.utc)
-        result = await db.care_events.update_many(
-            query,
-            {"$set": {
-                "ignored": True,
-                "ignored_at": now,
-                "ignored_by_user_id": current_user["id"],
-                "ignored_by_user_name": current_user["name"],
-                "updated_at": now
-            }}
+        ignored_count = 0
+        for chunk in _chunks([e["id"] for e in events]):
+            result = await db.care_events.update_many(
+                {**query, "id": {"$in": chunk}},
+                {"$set": {
+                    "ignored": True,
+                    "ignored_at": now,
+                    "ignored_by_user_id": current_user["id"],
+                    "ignored_by_user_name": current_user["name"],
+                    "updated_at": now
+                }}
+            )
+            ignored_count += result.modified_count
+        await RollupService(db).mark_care_events(events)
+
+        await _log_bulk_activities(
+            request, db, current_user, events, ActivityActionType.IGNORE_TASK, "Bulk ignored {event_type} task"
         )
 
-        # Log activity for each ignored event
-        if _log_activity:
-            for event in events:
-                member = await db.members.find_one({"id": event["member_id"]}, {"name": 1, "_id": 0})
-                member_name = member["name"] if member else "Unknown"
-                await _log_activity(
-                    campus_id=event["campus_id"],
-                    user_id=current_user["id"],
-                    user_name=current_user["name"],
-                    action_type=ActivityActionType.IGNORE_TASK,
-                    member_id=event["member_id"],
-                    member_name=member_name,
-                    care_event_id=event["id"],
-                    event_type=EventType(event["event_type"]) if event.get("event_type") else None,
-                    notes=f"Bulk ignored {event.get('event_type', 'care')} task",
-                    user_photo_url=current_user.get("photo_url")
-                )
+        await _refresh_dashboards_for_events(events)
 
-        logger.info(f"Bulk ignored {result.modified_count} care events by {current_user['name']}")
+        logger.info(f"Bulk ignored {ignored_count} care events by {current_user['name']}")
         return {
             "success": True,
-            "ignored_count": result.modified_count,
-            "message": f"Successfully ignored {result.modified_count} care events"
+            "ignored_count": ignored_count,
+            "message": f"Successfully ignored {ignored_count} care events"
         }
 
     except HTTPException:
@@ -984,60 +1078,51 @@ async def bulk_delete_care_events(request: Request, data: BulkEventIds) -> dict:
     """
     Delete multiple care events in a single operation.
 
+    Member last contact and engagement are recalculated from the remaining events.
     WARNING: This is a destructive operation. Events cannot be recovered.
     Returns count of successfully deleted events.
     """
     current_user = await get_current_user(request)
     db = get_db()
     try:
-        event_ids = data.event_ids
-        if not event_ids:
-            raise HTTPException(status_code=400, detail="No event IDs provided")
-
-        if len(event_ids) > 50:
-            raise HTTPException(status_code=400, detail="Maximum 50 events per bulk delete")
+        event_ids = _bulk_event_ids(data)
 
         # Build query with campus filter
-        query = {"id": {"$in": event_ids}}
+        query = {}
         campus_filter = get_campus_filter(current_user)
         if campus_filter:
             query.update(campus_filter)
 
         # Get events to process (for logging and cleanup)
-        events = await db.care_events.find(query, {"_id": 0}).to_list(None)
+        events = await _find_bulk_events(db, event_ids, query)
         if not events:
             return {"success": True, "deleted_count": 0, "message": "No events found"}
 
-        # Delete the events
-        result = await db.care_events.delete_many(query)
+        # Delete the events and their activity logs
+        rollups = RollupService(db)
+        await rollups.mark_care_events(events)
+        deleted_count = 0
+        for chunk in _chunks([e["id"] for e in events]):
+            result = await db.care_events.delete_many({**query, "id": {"$in": chunk}})
+            deleted_count += result.deleted_count
+            await rollups.mark_activity_query({"care_event_id": {"$in": chunk}})
+            await db.activity_logs.delete_many({"care_event_id": {"$in": chunk}})
+        await SearchService(db).remove(ENTITY_CARE_EVENT, [e["id"] for e in events])
+
+        # Log the deletions
+        await _log_bulk_activities(
+            request, db, current_user, events, ActivityActionType.DELETE_CARE_EVENT, "Bulk deleted {event_type} event"
+        )
 
-        # Clean up related data and log activity
-        if _log_activity:
-            for event in events:
-                # Delete related activity logs
-                await db.activity_logs.delete_many({"care_event_id": event["id"]})
+        await _recalculate_last_contact(db, list({e["member_id"] for e in events}))
 
-                # Log the deletion
-                member = await db.members.find_one({"id": event["member_id"]}, {"name": 1, "_id": 0})
-                member_name = member["name"] if member else "Unknown"
-                await _log_activity(
-                    campus_id=event["campus_id"],
-                    user_id=current_user["id"],
-                    user_name=current_user["name"],
-                    action_type=ActivityActionType.DELETE_EVENT,
-                    member_id=event["member_id"],
-                    member_name=member_name,
-                    care_event_id=event["id"],
-                    event_type=EventType(event["event_type"]) if event.get("event_type") else None,
-                    notes=f"Bulk deleted {event.get('event_type', 'care')} event",
-                    user_photo_url=current_user.get("photo_url")
-                )
+        await _refresh_dashboards_for_events(events)
 
-        logger.info(f"Bulk deleted {result.deleted_count} care events by {current_user['name']}")
+        logger.info(f"Bulk deleted {deleted_count} care events by {current_user['name']}")
         return {
             "success": True,
-            "deleted_count": result.deleted_count,
-            "message": f"Successfully deleted {result.deleted_count} care events"
+            "deleted_count": deleted_count,
+            "message": f"Successfully deleted {deleted_count} care events"
         }
 
     except HTTPException:
@@ -7,15 +7,17 @@ from litestar import get, Request
 from litestar.exceptions import HTTPException
 import logging
 import asyncio
+import time
 from datetime import datetime, timezone, date, timedelta
 from zoneinfo import ZoneInfo
-from typing import Optional, Callable, Awaitable
+from typing import Optional, Callable, Awaitable, List
 
 from enums import EventType
 from dependencies import (
     get_db, get_current_user, get_campus_filter, safe_error_detail
 )
 from services.cache import get_cache, CacheService
+from services.analytics_service import AnalyticsService
 
 logger = logging.getLogger(__name__)
 
@@ -43,347 +45,497 @@ def init_dashboard_routes(
 
 # ==================== DASHBOARD HELPER ====================
 
-async def calculate_dashboard_reminders(campus_id: str, campus_tz, today_date: str):
-    """Calculate all dashboard reminder data - optimized query with parallel fetching"""
-    db = get_db()
-    try:
-        logger.info(f"Calculating dashboard reminders for campus {campus_id}, date {today_date}")
+MAX_MEMBERS_LIST = 10000
+MAX_TASKS_LIST = 5000
 
-        today = datetime.strptime(today_date, '%Y-%m-%d').date()
-        tomorrow = today + timedelta(days=1)
-        week_ahead = today + timedelta(days=7)
-
-        # Parallel fetch: writeoff settings + all main data sources
-        writeoff_task = _get_writeoff_settings()
-        MAX_MEMBERS_LIST = 10000
-        MAX_TASKS_LIST = 5000
-
-        members_task = db.members.find(
-            {"campus_id": campus_id, "is_archived": {"$ne": True}},
-            {"_id": 0, "id": 1, "name": 1, "phone": 1, "photo_url": 1, "birth_date": 1,
-             "engagement_status": 1, "days_since_last_contact": 1}
-        ).to_list(MAX_MEMBERS_LIST)
-        grief_task = db.grief_support.find(
-            {"campus_id": campus_id, "completed": False, "ignored": {"$ne": True}},
-            {"_id": 0, "id": 1, "member_id": 1, "campus_id": 1, "care_event_id": 1,
-             "stage": 1, "scheduled_date": 1, "completed": 1, "notes": 1}
-        ).to_list(MAX_TASKS_LIST)
-        accident_task = db.accident_followup.find(
-            {"campus_id": campus_id, "completed": False, "ignored": {"$ne": True}},
-            {"_id": 0, "id": 1, "member_id": 1, "campus_id": 1, "care_event_id": 1,
-             "stage": 1, "scheduled_date": 1, "completed": 1, "notes": 1}
-        ).to_list(MAX_TASKS_LIST)
-        aid_task = db.financial_aid_schedules.find(
-            {"campus_id": campus_id, "is_active": True, "ignored": {"$ne": True}},
-            {"_id": 0, "id": 1, "member_id": 1, "campus_id": 1, "aid_amount": 1,
-             "frequency": 1, "next_occurrence": 1, "is_active": 1, "notes": 1}
-        ).to_list(MAX_TASKS_LIST)
-        # Fetch birthday events to filter out completed/ignored ones from dashboard
-        # Note: Frontend now uses member_id-based endpoint which creates events on-the-fly
-        year_start = f"{today.year}-01-01"
-        birthday_events_task = db.care_events.find(
-            {"campus_id": campus_id, "event_type": "birthday"},
-            {"_id": 0, "member_id": 1, "completed": 1, "completed_at": 1, "ignored": 1, "ignored_at": 1,
-             "completed_by_user_name": 1, "ignored_by_name": 1}
-        ).to_list(MAX_TASKS_LIST)
-
-        writeoff_settings, members, grief_stages, accident_followups, aid_schedules, birthday_events = await asyncio.gather(
-            writeoff_task, members_task, grief_task, accident_task, aid_task, birthday_events_task
-        )
+# Reminder lists whose entries each belong to one member (patched by member_id)
+MEMBER_REMINDER_LISTS = (
+    "birthdays_today", "overdue_birthdays", "upcoming_birthdays", "today_tasks",
+    "grief_today", "accident_followup", "at_risk_members", "disconnected_members",
+    "financial_aid_due", "upcoming_tasks",
+)
 
-        # Build map of member_ids with completed/ignored birthdays this year
-        # We keep them visible but mark as completed so other staff can see them
-        year_start_dt = datetime.strptime(year_start, '%Y-%m-%d')
-        completed_birthday_info = {}  # member_id -> {completed, completed_by_user_name, ignored}
-
-        for e in birthday_events:
-            member_id = e["member_id"]
-            completed_at = e.get("completed_at")
-            ignored_at = e.get("ignored_at")
-
-            if e.get("completed") and completed_at:
-                # Handle both datetime and string formats
-                if isinstance(completed_at, str):
-                    try:
-                        completed_at = datetime.strptime(completed_at[:10], '%Y-%m-%d')
-                    except ValueError:
-                        completed_at = None
-                if completed_at and completed_at >= year_start_dt:
-                    completed_birthday_info[member_id] = {
-                        "completed": True,
-                        "completed_by_user_name": e.get("completed_by_user_name", "Unknown")
-                    }
-                    continue
-
-            if e.get("ignored") and ignored_at:
-                if isinstance(ignored_at, str):
-                    try:
-                        ignored_at = datetime.strptime(ignored_at[:10], '%Y-%m-%d')
-                    except ValueError:
-                        ignored_at = None
-                if ignored_at and ignored_at >= year_start_dt:
-                    completed_birthday_info[member_id] = {
-                        "ignored": True,
-                        "ignored_by_name": e.get("ignored_by_name", "Unknown")
-                    }
-
-        logger.info(f"Found {len(members)} members for campus {campus_id}")
-        
-        # Build member map for quick lookup and calculate ages
-        member_map = {}
-        for m in members:
-            age = None
-            if m.get("birth_date"):
+# Serializes patches of the same campus within this worker (cross-worker safety comes from WATCH)
+_patch_locks: dict[str, asyncio.Lock] = {}
+
+# Single-flight rebuilds: one worker recomputes a stale/missing store, the others serve stale or wait
+REBUILD_LOCK_TTL = 120
+REBUILD_WAIT_SECONDS = 10
+_revalidation_tasks: set[asyncio.Task] = set()
+
+
+def reminders_cache_key(today_date: str) -> str:
+    """Cache key of a campus' materialized reminder store for one day"""
+    return f"reminders:{today_date}"
+
+
+async def _fetch_reminder_sources(campus_id: str, member_ids: Optional[List[str]] = None):
+    """Fetch writeoff settings, members and open tasks - optionally limited to some members"""
+    db = get_db()
+
+    members_query = {"campus_id": campus_id, "is_archived": {"$ne": True}}
+    task_scope = {"campus_id": campus_id}
+    if member_ids is not None:
+        members_query["id"] = {"$in": member_ids}
+        task_scope["member_id"] = {"$in": member_ids}
+
+    # Parallel fetch: writeoff settings + all main data sources
+    writeoff_task = _get_writeoff_settings()
+    members_task = db.members.find(
+        members_query,
+        {"_id": 0, "id": 1, "name": 1, "phone": 1, "photo_url": 1, "birth_date": 1,
+         "engagement_status": 1, "days_since_last_contact": 1}
+    ).to_list(MAX_MEMBERS_LIST)
+    grief_task = db.grief_support.find(
+        {**task_scope, "completed": False, "ignored": {"$ne": True}},
+        {"_id": 0, "id": 1, "member_id": 1, "campus_id": 1, "care_event_id": 1,
+         "stage": 1, "scheduled_date": 1, "completed": 1, "notes": 1}
+    ).to_list(MAX_TASKS_LIST)
+    accident_task = db.accident_followup.find(
+        {**task_scope, "completed": False, "ignored": {"$ne": True}},
+        {"_id": 0, "id": 1, "member_id": 1, "campus_id": 1, "care_event_id": 1,
+         "stage": 1, "scheduled_date": 1, "completed": 1, "notes": 1}
+    ).to_list(MAX_TASKS_LIST)
+    aid_task = db.financial_aid_schedules.find(
+        {**task_scope, "is_active": True, "ignored": {"$ne": True}},
+        {"_id": 0, "id": 1, "member_id": 1, "campus_id": 1, "aid_amount": 1,
+         "frequency": 1, "next_occurrence": 1, "is_active": 1, "notes": 1}
+    ).to_list(MAX_TASKS_LIST)
+    # Fetch birthday events to filter out completed/ignored ones from dashboard
+    # Note: Frontend now uses member_id-based endpoint which creates events on-the-fly
+    birthday_events_task = db.care_events.find(
+        {**task_scope, "event_type": "birthday"},
+        {"_id": 0, "member_id": 1, "completed": 1, "completed_at": 1, "ignored": 1, "ignored_at": 1,
+         "completed_by_user_name": 1, "ignored_by_name": 1}
+    ).to_list(MAX_TASKS_LIST)
+    return await asyncio.gather(
+        writeoff_task, members_task, grief_task, accident_task, aid_task, birthday_events_task
+    )
+
+
+def _build_reminders(
+    today_date: str,
+    writeoff_settings: dict,
+    members: list,
+    grief_stages: list,
+    accident_followups: list,
+    aid_schedules: list,
+    birthday_events: list,
+) -> dict:
+    """Build the dashboard reminder lists from already fetched source rows"""
+    today = datetime.strptime(today_date, '%Y-%m-%d').date()
+    tomorrow = today + timedelta(days=1)
+    week_ahead = today + timedelta(days=7)
+
+    # Build map of member_ids with completed/ignored birthdays this year
+    # We keep them visible but mark as completed so other staff can see them
+    year_start_dt = datetime(today.year, 1, 1)
+    completed_birthday_info = {}  # member_id -> {completed, completed_by_user_name, ignored}
+
+    for e in birthday_events:
+        member_id = e["member_id"]
+        completed_at = e.get("completed_at")
+        ignored_at = e.get("ignored_at")
+
+        if e.get("completed") and completed_at:
+            # Handle both datetime and string formats
+            if isinstance(completed_at, str):
                 try:
-                    birth_date = datetime.strptime(m["birth_date"], '%Y-%m-%d').date()
-                    age = today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
+                    completed_at = datetime.strptime(completed_at[:10], '%Y-%m-%d')
                 except ValueError:
-                    pass
-            m["age"] = age
-            member_map[m["id"]] = m
-        
-        # Initialize all arrays
-        birthdays_today = []
-        upcoming_birthdays = []
-        today_tasks = []
-        overdue_birthdays = []
-        upcoming_tasks = []
-        grief_today = []
-        suggestions_list = []
-
-        # Process accident follow-ups
-        accident_today = []
-        accident_writeoff = writeoff_settings.get("accident_illness", 14)
-        
-        for followup in accident_followups:
-            try:
-                sched_date = datetime.strptime(followup["scheduled_date"], '%Y-%m-%d').date()
-            except (ValueError, TypeError):
+                    completed_at = None
+            if completed_at and completed_at >= year_start_dt:
+                completed_birthday_info[member_id] = {
+                    "completed": True,
+                    "completed_by_user_name": e.get("completed_by_user_name", "Unknown")
+                }
                 continue
-            days_overdue = (today - sched_date).days
 
-            if sched_date == today:
-                today_tasks.append({
-                    "type": "accident_followup",
-                    "date": followup["scheduled_date"],
-                    "member_id": followup["member_id"],
+        if e.get("ignored") and ignored_at:
+            if isinstance(ignored_at, str):
+                try:
+                    ignored_at = datetime.strptime(ignored_at[:10], '%Y-%m-%d')
+                except ValueError:
+                    ignored_at = None
+            if ignored_at and ignored_at >= year_start_dt:
+                completed_birthday_info[member_id] = {
+                    "ignored": True,
+                    "ignored_by_name": e.get("ignored_by_name", "Unknown")
+                }
+
+    # Build member map for quick lookup and calculate ages
+    member_map = {}
+    for m in members:
+        age = None
+        if m.get("birth_date"):
+            try:
+                birth_date = datetime.strptime(m["birth_date"], '%Y-%m-%d').date()
+                age = today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
+            except ValueError:
+                pass
+        m["age"] = age
+        member_map[m["id"]] = m
+    
+    # Initialize all arrays
+    birthdays_today = []
+    upcoming_birthdays = []
+    today_tasks = []
+    overdue_birthdays = []
+    upcoming_tasks = []
+    grief_today = []
+    suggestions_list = []
+
+    # Process accident follow-ups
+    accident_today = []
+    accident_writeoff = writeoff_settings.get("accident_illness", 14)
+    
+    for followup in accident_followups:
+        try:
+            sched_date = datetime.strptime(followup["scheduled_date"], '%Y-%m-%d').date()
+        except (ValueError, TypeError):
+            continue
+        days_overdue = (today - sched_date).days
+
+        if sched_date == today:
+            today_tasks.append({
+                "type": "accident_followup",
+                "date": followup["scheduled_date"],
+                "member_id": followup["member_id"],
+                "member_name": member_map.get(followup["member_id"], {}).get("name"),
+                "member_phone": member_map.get(followup["member_id"], {}).get("phone"),
+                "member_photo_url": member_map.get(followup["member_id"], {}).get("photo_url"),
+                "member_age": member_map.get(followup["member_id"], {}).get("age"),
+                "days_since_last_contact": member_map.get(followup["member_id"], {}).get("days_since_last_contact"),
+                "details": f"{followup['stage'].replace('_', ' ')}",
+                "data": followup
+            })
+        elif sched_date < today:
+            if accident_writeoff == 0 or days_overdue <= accident_writeoff:
+                accident_today.append({
+                    **followup,
                     "member_name": member_map.get(followup["member_id"], {}).get("name"),
                     "member_phone": member_map.get(followup["member_id"], {}).get("phone"),
                     "member_photo_url": member_map.get(followup["member_id"], {}).get("photo_url"),
-                    "member_age": member_map.get(followup["member_id"], {}).get("age"),
-                    "days_since_last_contact": member_map.get(followup["member_id"], {}).get("days_since_last_contact"),
-                    "details": f"{followup['stage'].replace('_', ' ')}",
-                    "data": followup
+                    "days_overdue": days_overdue
                 })
-            elif sched_date < today:
-                if accident_writeoff == 0 or days_overdue <= accident_writeoff:
-                    accident_today.append({
-                        **followup,
-                        "member_name": member_map.get(followup["member_id"], {}).get("name"),
-                        "member_phone": member_map.get(followup["member_id"], {}).get("phone"),
-                        "member_photo_url": member_map.get(followup["member_id"], {}).get("photo_url"),
+        elif tomorrow <= sched_date <= week_ahead:
+            upcoming_tasks.append({
+                "type": "accident_followup",
+                "date": followup["scheduled_date"],
+                "member_id": followup["member_id"],
+                "member_name": member_map.get(followup["member_id"], {}).get("name"),
+                "member_phone": member_map.get(followup["member_id"], {}).get("phone"),
+                "member_photo_url": member_map.get(followup["member_id"], {}).get("photo_url"),
+                "details": f"{followup['stage'].replace('_', ' ')}",
+                "data": followup
+            })
+    
+    # At-risk and disconnected members
+    at_risk = [
+        {
+            "type": "at_risk", "id": m.get("id"), "name": m.get("name"),
+            "phone": m.get("phone"), "photo_url": m.get("photo_url"), "age": m.get("age"),
+            "member_id": m.get("id"), "member_name": m.get("name"),
+            "member_phone": m.get("phone"), "member_photo_url": m.get("photo_url"),
+            "member_age": m.get("age"), "days_since_last_contact": m.get("days_since_last_contact", 0),
+        }
+        for m in members if m.get("engagement_status") == "at_risk"
+    ]
+    disconnected = [
+        {
+            "type": "disconnected", "id": m.get("id"), "name": m.get("name"),
+            "phone": m.get("phone"), "photo_url": m.get("photo_url"), "age": m.get("age"),
+            "member_id": m.get("id"), "member_name": m.get("name"),
+            "member_phone": m.get("phone"), "member_photo_url": m.get("photo_url"),
+            "member_age": m.get("age"), "days_since_last_contact": m.get("days_since_last_contact", 0),
+        }
+        for m in members if m.get("engagement_status") == "disconnected"
+    ]
+
+    # Process financial aid schedules
+    aid_due = []
+    financial_aid_writeoff = writeoff_settings.get("financial_aid", 30)
+    
+    for schedule in aid_schedules:
+        next_occurrence = schedule.get("next_occurrence")
+        if not next_occurrence:
+            continue
+        try:
+            next_date = datetime.strptime(next_occurrence, '%Y-%m-%d').date()
+            if next_date == today:
+                today_tasks.append({
+                    "type": "financial_aid", "date": next_occurrence,
+                    "member_id": schedule["member_id"],
+                    "member_name": member_map.get(schedule["member_id"], {}).get("name"),
+                    "member_phone": member_map.get(schedule["member_id"], {}).get("phone"),
+                    "member_photo_url": member_map.get(schedule["member_id"], {}).get("photo_url"),
+                    "member_age": member_map.get(schedule["member_id"], {}).get("age"),
+                    "days_since_last_contact": member_map.get(schedule["member_id"], {}).get("days_since_last_contact"),
+                    "details": f"Rp {schedule.get('aid_amount', 0):,.0f}",
+                    "data": schedule
+                })
+            elif next_date < today:
+                days_overdue = (today - next_date).days
+                if financial_aid_writeoff == 0 or days_overdue <= financial_aid_writeoff:
+                    aid_due.append({
+                        **schedule,
+                        "member_name": member_map.get(schedule["member_id"], {}).get("name"),
+                        "member_phone": member_map.get(schedule["member_id"], {}).get("phone"),
+                        "member_photo_url": member_map.get(schedule["member_id"], {}).get("photo_url"),
                         "days_overdue": days_overdue
                     })
-            elif tomorrow <= sched_date <= week_ahead:
+            elif tomorrow <= next_date <= week_ahead:
                 upcoming_tasks.append({
-                    "type": "accident_followup",
-                    "date": followup["scheduled_date"],
-                    "member_id": followup["member_id"],
-                    "member_name": member_map.get(followup["member_id"], {}).get("name"),
-                    "member_phone": member_map.get(followup["member_id"], {}).get("phone"),
-                    "member_photo_url": member_map.get(followup["member_id"], {}).get("photo_url"),
-                    "details": f"{followup['stage'].replace('_', ' ')}",
-                    "data": followup
+                    "type": "financial_aid", "date": next_occurrence,
+                    "member_id": schedule["member_id"],
+                    "member_name": member_map.get(schedule["member_id"], {}).get("name"),
+                    "member_phone": member_map.get(schedule["member_id"], {}).get("phone"),
+                    "member_photo_url": member_map.get(schedule["member_id"], {}).get("photo_url"),
+                    "details": f"Rp {schedule.get('aid_amount', 0):,.0f}",
+                    "data": schedule
                 })
-        
-        # At-risk and disconnected members
-        at_risk = [
-            {
-                "type": "at_risk", "id": m.get("id"), "name": m.get("name"),
-                "phone": m.get("phone"), "photo_url": m.get("photo_url"), "age": m.get("age"),
-                "member_id": m.get("id"), "member_name": m.get("name"),
-                "member_phone": m.get("phone"), "member_photo_url": m.get("photo_url"),
-                "member_age": m.get("age"), "days_since_last_contact": m.get("days_since_last_contact", 0),
-            }
-            for m in members if m.get("engagement_status") == "at_risk"
-        ]
-        disconnected = [
-            {
-                "type": "disconnected", "id": m.get("id"), "name": m.get("name"),
-                "phone": m.get("phone"), "photo_url": m.get("photo_url"), "age": m.get("age"),
-                "member_id": m.get("id"), "member_name": m.get("name"),
-                "member_phone": m.get("phone"), "member_photo_url": m.get("photo_url"),
-                "member_age": m.get("age"), "days_since_last_contact": m.get("days_since_last_contact", 0),
+        except (ValueError, TypeError):
+            continue
+
+    # Process birthdays - include completed ones so other staff can see them
+    # Note: Frontend uses member_id-based endpoint which creates events on-the-fly
+    birthday_writeoff = writeoff_settings.get("birthday", 7)
+    for member in members:
+        member_id = member["id"]
+        birth_date_str = member.get("birth_date")
+        if not birth_date_str:
+            continue
+
+        # Check if this birthday was completed/ignored this year
+        completion_info = completed_birthday_info.get(member_id, {})
+        is_completed = completion_info.get("completed", False)
+        is_ignored = completion_info.get("ignored", False)
+
+        try:
+            birth_date = datetime.strptime(birth_date_str, '%Y-%m-%d').date()
+            this_year_birthday = birth_date.replace(year=today.year)
+
+            # Build base birthday data
+            base_data = {
+                "type": "birthday", "member_id": member_id,
+                "member_name": member.get("name"), "member_phone": member.get("phone"),
+                "member_photo_url": member.get("photo_url"), "member_age": member.get("age"),
+                "days_since_last_contact": member.get("days_since_last_contact"),
+                "details": f"Turning {member.get('age', '?')} years old", "data": member,
+                "completed": is_completed,
+                "ignored": is_ignored,
+                "completed_by_user_name": completion_info.get("completed_by_user_name"),
+                "ignored_by_name": completion_info.get("ignored_by_name")
             }
-            for m in members if m.get("engagement_status") == "disconnected"
-        ]
 
-        # Process financial aid schedules
-        aid_due = []
-        financial_aid_writeoff = writeoff_settings.get("financial_aid", 30)
-        
-        for schedule in aid_schedules:
-            next_occurrence = schedule.get("next_occurrence")
-            if not next_occurrence:
-                continue
-            try:
-                next_date = datetime.strptime(next_occurrence, '%Y-%m-%d').date()
-                if next_date == today:
-                    today_tasks.append({
-                        "type": "financial_aid", "date": next_occurrence,
-                        "member_id": schedule["member_id"],
-                        "member_name": member_map.get(schedule["member_id"], {}).get("name"),
-                        "member_phone": member_map.get(schedule["member_id"], {}).get("phone"),
-                        "member_photo_url": member_map.get(schedule["member_id"], {}).get("photo_url"),
-                        "member_age": member_map.get(schedule["member_id"], {}).get("age"),
-                        "days_since_last_contact": member_map.get(schedule["member_id"], {}).get("days_since_last_contact"),
-                        "details": f"Rp {schedule.get('aid_amount', 0):,.0f}",
-                        "data": schedule
-                    })
-                elif next_date < today:
-                    days_overdue = (today - next_date).days
-                    if financial_aid_writeoff == 0 or days_overdue <= financial_aid_writeoff:
-                        aid_due.append({
-                            **schedule,
-                            "member_name": member_map.get(schedule["member_id"], {}).get("name"),
-                            "member_phone": member_map.get(schedule["member_id"], {}).get("phone"),
-                            "member_photo_url": member_map.get(schedule["member_id"], {}).get("photo_url"),
+            if this_year_birthday == today:
+                birthdays_today.append({**base_data, "date": today_date})
+            elif this_year_birthday < today:
+                days_overdue = (today - this_year_birthday).days
+                # Only show INCOMPLETE overdue birthdays (completed ones don't need attention)
+                # Today's birthdays show completed status so staff can see who was contacted
+                if not is_completed and not is_ignored:
+                    if birthday_writeoff == 0 or days_overdue <= birthday_writeoff:
+                        overdue_birthdays.append({
+                            **base_data, "date": this_year_birthday.isoformat(),
                             "days_overdue": days_overdue
                         })
-                elif tomorrow <= next_date <= week_ahead:
-                    upcoming_tasks.append({
-                        "type": "financial_aid", "date": next_occurrence,
-                        "member_id": schedule["member_id"],
-                        "member_name": member_map.get(schedule["member_id"], {}).get("name"),
-                        "member_phone": member_map.get(schedule["member_id"], {}).get("phone"),
-                        "member_photo_url": member_map.get(schedule["member_id"], {}).get("photo_url"),
-                        "details": f"Rp {schedule.get('aid_amount', 0):,.0f}",
-                        "data": schedule
-                    })
-            except (ValueError, TypeError):
-                continue
-
-        # Process birthdays - include completed ones so other staff can see them
-        # Note: Frontend uses member_id-based endpoint which creates events on-the-fly
-        birthday_writeoff = writeoff_settings.get("birthday", 7)
-        for member in members:
-            member_id = member["id"]
-            birth_date_str = member.get("birth_date")
-            if not birth_date_str:
-                continue
-
-            # Check if this birthday was completed/ignored this year
-            completion_info = completed_birthday_info.get(member_id, {})
-            is_completed = completion_info.get("completed", False)
-            is_ignored = completion_info.get("ignored", False)
-
-            try:
-                birth_date = datetime.strptime(birth_date_str, '%Y-%m-%d').date()
-                this_year_birthday = birth_date.replace(year=today.year)
-
-                # Build base birthday data
-                base_data = {
-                    "type": "birthday", "member_id": member_id,
-                    "member_name": member.get("name"), "member_phone": member.get("phone"),
-                    "member_photo_url": member.get("photo_url"), "member_age": member.get("age"),
-                    "days_since_last_contact": member.get("days_since_last_contact"),
-                    "details": f"Turning {member.get('age', '?')} years old", "data": member,
-                    "completed": is_completed,
-                    "ignored": is_ignored,
-                    "completed_by_user_name": completion_info.get("completed_by_user_name"),
-                    "ignored_by_name": completion_info.get("ignored_by_name")
-                }
-
-                if this_year_birthday == today:
-                    birthdays_today.append({**base_data, "date": today_date})
-                elif this_year_birthday < today:
-                    days_overdue = (today - this_year_birthday).days
-                    # Only show INCOMPLETE overdue birthdays (completed ones don't need attention)
-                    # Today's birthdays show completed status so staff can see who was contacted
-                    if not is_completed and not is_ignored:
-                        if birthday_writeoff == 0 or days_overdue <= birthday_writeoff:
-                            overdue_birthdays.append({
-                                **base_data, "date": this_year_birthday.isoformat(),
-                                "days_overdue": days_overdue
-                            })
-                elif tomorrow <= this_year_birthday <= week_ahead:
-                    upcoming_birthdays.append({
-                        **base_data, "date": this_year_birthday.isoformat(),
-                        "days_until": (this_year_birthday - today).days
-                    })
-            except (ValueError, TypeError):
-                continue
-
-        # Process grief stages
-        grief_writeoff = writeoff_settings.get("grief_support", 30)
-        for stage in grief_stages:
-            try:
-                sched_date = datetime.strptime(stage["scheduled_date"], '%Y-%m-%d').date()
-            except (ValueError, TypeError):
-                continue
-            days_overdue = (today - sched_date).days
-            if sched_date == today:
-                today_tasks.append({
-                    "type": "grief_support", "date": stage["scheduled_date"],
-                    "member_id": stage["member_id"],
-                    "member_name": member_map.get(stage["member_id"], {}).get("name"),
-                    "member_phone": member_map.get(stage["member_id"], {}).get("phone"),
-                    "member_photo_url": member_map.get(stage["member_id"], {}).get("photo_url"),
-                    "member_age": member_map.get(stage["member_id"], {}).get("age"),
-                    "days_since_last_contact": member_map.get(stage["member_id"], {}).get("days_since_last_contact"),
-                    "details": f"{stage['stage'].replace('_', ' ')} stage", "data": stage
+            elif tomorrow <= this_year_birthday <= week_ahead:
+                upcoming_birthdays.append({
+                    **base_data, "date": this_year_birthday.isoformat(),
+                    "days_until": (this_year_birthday - today).days
                 })
-            elif sched_date < today:
-                if grief_writeoff == 0 or days_overdue <= grief_writeoff:
-                    grief_today.append({
-                        **stage,
-                        "member_name": member_map.get(stage["member_id"], {}).get("name"),
-                        "member_phone": member_map.get(stage["member_id"], {}).get("phone"),
-                        "member_photo_url": member_map.get(stage["member_id"], {}).get("photo_url"),
-                        "days_overdue": days_overdue
-                    })
-            elif tomorrow <= sched_date <= week_ahead:
-                upcoming_tasks.append({
-                    "type": "grief_support", "date": stage["scheduled_date"],
-                    "member_id": stage["member_id"],
+        except (ValueError, TypeError):
+            continue
+
+    # Process grief stages
+    grief_writeoff = writeoff_settings.get("grief_support", 30)
+    for stage in grief_stages:
+        try:
+            sched_date = datetime.strptime(stage["scheduled_date"], '%Y-%m-%d').date()
+        except (ValueError, TypeError):
+            continue
+        days_overdue = (today - sched_date).days
+        if sched_date == today:
+            today_tasks.append({
+                "type": "grief_support", "date": stage["scheduled_date"],
+                "member_id": stage["member_id"],
+                "member_name": member_map.get(stage["member_id"], {}).get("name"),
+                "member_phone": member_map.get(stage["member_id"], {}).get("phone"),
+                "member_photo_url": member_map.get(stage["member_id"], {}).get("photo_url"),
+                "member_age": member_map.get(stage["member_id"], {}).get("age"),
+                "days_since_last_contact": member_map.get(stage["member_id"], {}).get("days_since_last_contact"),
+                "details": f"{stage['stage'].replace('_', ' ')} stage", "data": stage
+            })
+        elif sched_date < today:
+            if grief_writeoff == 0 or days_overdue <= grief_writeoff:
+                grief_today.append({
+                    **stage,
                     "member_name": member_map.get(stage["member_id"], {}).get("name"),
                     "member_phone": member_map.get(stage["member_id"], {}).get("phone"),
                     "member_photo_url": member_map.get(stage["member_id"], {}).get("photo_url"),
-                    "details": f"{stage['stage'].replace('_', ' ')} stage", "data": stage
+                    "days_overdue": days_overdue
                 })
-
-        # Add upcoming birthdays to upcoming_tasks so they appear in Upcoming tab
-        for birthday in upcoming_birthdays:
+        elif tomorrow <= sched_date <= week_ahead:
             upcoming_tasks.append({
-                "type": "birthday",
-                "date": birthday["date"],
-                "member_id": birthday["member_id"],
-                "member_name": birthday["member_name"],
-                "member_phone": birthday["member_phone"],
-                "member_photo_url": birthday["member_photo_url"],
-                "member_age": birthday.get("member_age"),
-                "details": birthday.get("details", "Birthday"),
-                "days_until": birthday.get("days_until"),
-                "data": birthday
+                "type": "grief_support", "date": stage["scheduled_date"],
+                "member_id": stage["member_id"],
+                "member_name": member_map.get(stage["member_id"], {}).get("name"),
+                "member_phone": member_map.get(stage["member_id"], {}).get("phone"),
+                "member_photo_url": member_map.get(stage["member_id"], {}).get("photo_url"),
+                "details": f"{stage['stage'].replace('_', ' ')} stage", "data": stage
             })
 
-        upcoming_tasks.sort(key=lambda x: x["date"])
-        
-        return {
-            "birthdays_today": birthdays_today, "overdue_birthdays": overdue_birthdays,
-            "upcoming_birthdays": upcoming_birthdays, "today_tasks": today_tasks,
-            "grief_today": grief_today, "accident_followup": accident_today,
-            "at_risk_members": at_risk, "disconnected_members": disconnected,
-            "financial_aid_due": aid_due, "ai_suggestions": suggestions_list,
-            "upcoming_tasks": upcoming_tasks,
-            "total_tasks": len(birthdays_today) + len(grief_today) + len(accident_today) + len(at_risk) + len(disconnected),
-            "total_members": len(members)
-        }
+    # Add upcoming birthdays to upcoming_tasks so they appear in Upcoming tab
+    for birthday in upcoming_birthdays:
+        upcoming_tasks.append({
+            "type": "birthday",
+            "date": birthday["date"],
+            "member_id": birthday["member_id"],
+            "member_name": birthday["member_name"],
+            "member_phone": birthday["member_phone"],
+            "member_photo_url": birthday["member_photo_url"],
+            "member_age": birthday.get("member_age"),
+            "details": birthday.get("details", "Birthday"),
+            "days_until": birthday.get("days_until"),
+            "data": birthday
+        })
+
+    upcoming_tasks.sort(key=lambda x: x["date"])
+    
+    return {
+        "birthdays_today": birthdays_today, "overdue_birthdays": overdue_birthdays,
+        "upcoming_birthdays": upcoming_birthdays, "today_tasks": today_tasks,
+        "grief_today": grief_today, "accident_followup": accident_today,
+        "at_risk_members": at_risk, "disconnected_members": disconnected,
+        "financial_aid_due": aid_due, "ai_suggestions": suggestions_list,
+        "upcoming_tasks": upcoming_tasks,
+        "total_tasks": len(birthdays_today) + len(grief_today) + len(accident_today) + len(at_risk) + len(disconnected),
+        "total_members": len(members)
+    }
+
+
+async def calculate_dashboard_reminders(campus_id: str, campus_tz, today_date: str):
+    """Calculate all dashboard reminder data - optimized query with parallel fetching"""
+    try:
+        logger.info(f"Calculating dashboard reminders for campus {campus_id}, date {today_date}")
+        sources = await _fetch_reminder_sources(campus_id)
+        logger.info(f"Found {len(sources[1])} members for campus {campus_id}")
+        return _build_reminders(today_date, *sources)
     except Exception as e:
         logger.error(f"Error calculating dashboard reminders: {str(e)}")
         raise
 
 
+def _merge_member_reminders(current: dict, patch: dict, member_ids: List[str], total_members: int) -> dict:
+    """Replace the reminder entries of the given members with freshly built ones"""
+    stale = set(member_ids)
+    for key in MEMBER_REMINDER_LISTS:
+        kept = [item for item in current.get(key, []) if item.get("member_id") not in stale]
+        current[key] = kept + patch.get(key, [])
+    current["upcoming_tasks"].sort(key=lambda x: x["date"])
+    current["total_tasks"] = (
+        len(current["birthdays_today"]) + len(current["grief_today"]) + len(current["accident_followup"])
+        + len(current["at_risk_members"]) + len(current["disconnected_members"])
+    )
+    current["total_members"] = total_members
+    current["patched_at"] = time.time()
+    return current
+
+
+async def patch_dashboard_reminders(campus_id: str, member_ids: List[str]) -> bool:
+    """
+    Patch today's materialized reminders of a campus for the given members.
+
+    Only the rows of these members are re-read and rebuilt. Returns False when
+    there is no store to patch (the next read builds it) or the patch lost too
+    many races with other workers (the store is dropped).
+    """
+    cache = get_cache()
+    if not member_ids:
+        return False
+
+    db = get_db()
+    member_ids = list(set(member_ids))
+    campus_tz = await _get_campus_timezone(campus_id)
+    today_date = _get_date_in_timezone(campus_tz)
+
+    async def apply_patch(current: dict) -> dict:
+        sources, total_members = await asyncio.gather(
+            _fetch_reminder_sources(campus_id, member_ids),
+            db.members.count_documents({"campus_id": campus_id, "is_archived": {"$ne": True}}),
+        )
+        patch = _build_reminders(today_date, *sources)
+        return _merge_member_reminders(current, patch, member_ids, total_members)
+
+    lock = _patch_locks.setdefault(campus_id, asyncio.Lock())
+    async with lock:
+        return await cache.update(
+            reminders_cache_key(today_date), apply_patch,
+            ttl=CacheService.REMINDERS_TTL, church_id=campus_id
+        )
+
+
+async def mark_dashboard_reminders_stale(campus_id: Optional[str] = None) -> None:
+    """
+    Mark materialized reminders stale (all campuses when none given).
+
+    Stale stores keep being served while a single worker rebuilds them.
+    """
+    cache = get_cache()
+
+    async def mark(current: dict) -> dict:
+        current["stale"] = True
+        return current
+
+    pattern = "reminders:*" if campus_id else "*:reminders:*"
+    for key in await cache.scan_keys(pattern, church_id=campus_id):
+        await cache.update(key, mark, ttl=CacheService.REMINDERS_TTL)
+
+
+async def rebuild_dashboard_reminders(campus_id: str, campus_tz, today_date: str) -> Optional[dict]:
+    """
+    Fully rebuild and store a campus' reminders for the day behind a single-flight lock.
+
+    Returns None without doing anything if another worker is already rebuilding.
+    """
+    cache = get_cache()
+    lock_name = f"reminders-rebuild:{today_date}"
+    token = await cache.acquire_lock(lock_name, ttl=REBUILD_LOCK_TTL, church_id=campus_id)
+    if not token:
+        return None
+    try:
+        started = time.time()
+        data = await calculate_dashboard_reminders(campus_id, campus_tz, today_date)
+        data["computed_at"] = started
+
+        async def settle(current: dict) -> dict:
+            # A patch that landed while we were reading may be missing from our data: serve it, rebuild again
+            if current.get("patched_at", 0) > started:
+                data["stale"] = True
+            return data
+
+        key = reminders_cache_key(today_date)
+        if not await cache.update(key, settle, ttl=CacheService.REMINDERS_TTL, church_id=campus_id):
+            await cache.set(key, data, ttl=CacheService.REMINDERS_TTL, church_id=campus_id)
+        return data
+    finally:
+        await cache.release_lock(lock_name, token, church_id=campus_id)
+
+
+def _schedule_revalidation(campus_id: str, campus_tz, today_date: str) -> None:
+    """Rebuild a stale store in the background; the lock makes concurrent calls no-ops"""
+    async def revalidate():
+        try:
+            await rebuild_dashboard_reminders(campus_id, campus_tz, today_date)
+        except Exception as e:
+            logger.error(f"Error revalidating dashboard reminders for campus {campus_id}: {str(e)}")
+
+    task = asyncio.create_task(revalidate())
+    _revalidation_tasks.add(task)
+    task.add_done_callback(_revalidation_tasks.discard)
+
+
 # ==================== DASHBOARD ENDPOINTS ====================
 
 @get("/dashboard/reminders")
@@ -404,19 +556,27 @@ async def get_dashboard_reminders(request: Request) -> dict:
         
         campus_tz = await _get_campus_timezone(campus_id)
         today_date = _get_date_in_timezone(campus_tz)
-        cache_key = f"reminders:{today_date}"
+        cache_key = reminders_cache_key(today_date)
         
         cache = get_cache()
-        if cache:
-            cached = await cache.get(cache_key, church_id=campus_id)
-            if cached:
+        cached = await cache.get(cache_key, church_id=campus_id)
+        if cached:
+            if cached.get("stale"):
+                _schedule_revalidation(campus_id, campus_tz, today_date)
+                cached["cache_source"] = "dragonfly_stale"
+            else:
                 cached["cache_source"] = "dragonfly"
-                return cached
-        
-        data = await calculate_dashboard_reminders(campus_id, campus_tz, today_date)
+            return cached
         
-        if cache:
-            await cache.set(cache_key, data, ttl=CacheService.DASHBOARD_TTL, church_id=campus_id)
+        data = await rebuild_dashboard_reminders(campus_id, campus_tz, today_date)
+        if data is None:
+            # Another worker is building it - wait for its result instead of piling onto Mongo
+            deadline = time.monotonic() + REBUILD_WAIT_SECONDS
+            while data is None and time.monotonic() < deadline:
+                await asyncio.sleep(0.2)
+                data = await cache.get(cache_key, church_id=campus_id)
+            if data is None:
+                data = await calculate_dashboard_reminders(campus_id, campus_tz, today_date)
         
         data["cache_version"] = datetime.now(timezone.utc).isoformat()
         return data
@@ -436,11 +596,10 @@ async def get_dashboard_stats(request: Request) -> dict:
         
         # Try cache first
         cache = get_cache()
-        if cache:
-            cached = await cache.get(cache_key, church_id=campus_id)
-            if cached:
-                cached["cache_source"] = "dragonfly"
-                return cached
+        cached = await cache.get(cache_key, church_id=campus_id)
+        if cached:
+            cached["cache_source"] = "dragonfly"
+            return cached
         
         # Calculate fresh stats
         member_stats_pipeline = [{"$facet": {
@@ -465,8 +624,7 @@ async def get_dashboard_stats(request: Request) -> dict:
                 "members_at_risk": at_risk_count, "month_financial_aid": total_aid}
         
         # Cache the result
-        if cache:
-            await cache.set(cache_key, data, ttl=CacheService.DASHBOARD_TTL, church_id=campus_id)
+        await cache.set(cache_key, data, ttl=CacheService.DASHBOARD_TTL, church_id=campus_id)
         
         return data
     except Exception as e:
@@ -545,18 +703,7 @@ async def get_engagement_trends(request: Request, days: int = 30) -> dict:
     db = get_db()
     try:
         start_date = date.today() - timedelta(days=days)
-        query = {"event_date": {"$gte": start_date.isoformat()}}
-        campus_filter = get_campus_filter(current_user)
-        if campus_filter:
-            query.update(campus_filter)
-        events = await db.care_events.find(query, {"_id": 0, "event_date": 1}).to_list(1000)
-        date_counts = {}
-        for event in events:
-            event_date = event.get('event_date')
-            if isinstance(event_date, str):
-                event_date = event_date[:10]
-            date_counts[event_date] = date_counts.get(event_date, 0) + 1
-        return [{"date": d, "count": c} for d, c in sorted(date_counts.items())]
+        return await AnalyticsService(db).events_per_day(get_campus_filter(current_user), start_date)
     except Exception as e:
         logger.error(f"Error getting engagement trends: {str(e)}")
         raise HTTPException(status_code=500, detail=safe_error_detail(e))
@@ -568,14 +715,7 @@ async def get_care_events_by_type(request: Request) -> dict:
     current_user = await get_current_user(request)
     db = get_db()
     try:
-        campus_filter = get_campus_filter(current_user)
-        query = campus_filter if campus_filter else {}
-        events = await db.care_events.find(query, {"_id": 0, "event_type": 1}).to_list(10000)
-        type_counts = {}
-        for event in events:
-            event_type = event.get('event_type')
-            type_counts[event_type] = type_counts.get(event_type, 0) + 1
-        return [{"type": t, "count": c} for t, c in type_counts.items()]
+        return await AnalyticsService(db).events_by_type(get_campus_filter(current_user))
     except Exception as e:
         logger.error(f"Error getting events by type: {str(e)}")
         raise HTTPException(status_code=500, detail=safe_error_detail(e))
@@ -664,33 +804,10 @@ async def get_demographic_trends(request: Request) -> dict:
     db = get_db()
     try:
         today = datetime.now(JAKARTA_TZ).date()
-        campus_filter = get_campus_filter(current_user)
-        members = await db.members.find(campus_filter, {"_id": 0}).to_list(1000)
-        events = await db.care_events.find({**campus_filter}, {"_id": 0}).to_list(2000)
-        
-        age_groups = {'Children (0-12)': {'count': 0, 'care_events': 0}, 'Teenagers (13-17)': {'count': 0, 'care_events': 0},
-                      'Young Adults (18-30)': {'count': 0, 'care_events': 0}, 'Adults (31-60)': {'count': 0, 'care_events': 0},
-                      'Seniors (60+)': {'count': 0, 'care_events': 0}}
-        membership_trends = {}
-
-        for member in members:
-            age = member.get('age') or 0
-            membership = member.get('membership_status') or member.get('category') or 'Unknown'
-            if membership not in membership_trends:
-                membership_trends[membership] = {'count': 0, 'engagement_score': 0}
-            
-            age_group = 'Children (0-12)' if age <= 12 else 'Teenagers (13-17)' if age <= 17 else \
-                        'Young Adults (18-30)' if age <= 30 else 'Adults (31-60)' if age <= 60 else 'Seniors (60+)'
-            age_groups[age_group]['count'] += 1
-            
-            days_since_contact = member.get('days_since_last_contact') or 999
-            engagement_score = max(0, 100 - days_since_contact)
-            membership_trends[membership]['count'] += 1
-            membership_trends[membership]['engagement_score'] += engagement_score
-            
-            member_events = [e for e in events if e['member_id'] == member['id']]
-            age_groups[age_group]['care_events'] += len(member_events)
-        
+        demographics = await AnalyticsService(db).demographics(get_campus_filter(current_user))
+        age_groups = demographics["age_groups"]
+        membership_trends = demographics["membership"]
+
         for data in membership_trends.values():
             data['avg_engagement'] = round(data['engagement_score'] / data['count']) if data['count'] > 0 else 0
         
@@ -705,7 +822,7 @@ async def get_demographic_trends(request: Request) -> dict:
         
         return {"age_groups": [{"name": k, **v} for k, v in age_groups.items()],
                 "membership_trends": [{"status": k, **v} for k, v in membership_trends.items()],
-                "insights": insights, "total_members": len(members), "analysis_date": today.isoformat()}
+                "insights": insights, "total_members": demographics["total_members"], "analysis_date": today.isoformat()}
     except Exception as e:
         logger.error(f"Error analyzing demographic trends: {str(e)}")
         raise HTTPException(status_code=500, detail=safe_error_detail(e))
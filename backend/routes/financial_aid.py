@@ -18,12 +18,13 @@ from models import (
 from dependencies import (
     get_db, get_current_user, get_campus_filter, safe_error_detail
 )
-from utils import calculate_engagement_status
+from utils import contact_fields
+from services.rollup_service import RollupService
 
 logger = logging.getLogger(__name__)
 
 # Callbacks to server.py functions (set via init_financial_aid_routes)
-_invalidate_dashboard_cache: Optional[Callable[[str], Awaitable[None]]] = None
+_invalidate_dashboard_cache: Optional[Callable[..., Awaitable[None]]] = None
 _log_activity: Optional[Callable[..., Awaitable[None]]] = None
 _get_engagement_settings_cached: Optional[Callable[[], Awaitable[dict]]] = None
 
@@ -142,7 +143,7 @@ async def create_aid_schedule(data: FinancialAidScheduleCreate, request: Request
         await db.financial_aid_schedules.insert_one(schedule_dict)
         
         # Invalidate dashboard cache
-        await _invalidate_dashboard_cache(current_user['campus_id'])
+        await _invalidate_dashboard_cache(current_user['campus_id'], [schedule['member_id']])
         
         return aid_schedule
     except Exception as e:
@@ -208,15 +209,17 @@ async def remove_ignored_occurrence(schedule_id: str, occurrence_date: str, requ
         )
 
         # Delete activity log for this ignore action
-        await db.activity_logs.delete_many({
+        activity_query = {
             "member_id": schedule["member_id"],
             "event_type": "financial_aid",
             "action_type": "ignore_task",
             "notes": {"$regex": occurrence_date, "$options": "i"}
-        })
+        }
+        await RollupService(db).mark_activity_query(activity_query)
+        await db.activity_logs.delete_many(activity_query)
 
         # Invalidate dashboard cache
-        await _invalidate_dashboard_cache(schedule["campus_id"])
+        await _invalidate_dashboard_cache(schedule["campus_id"], [schedule["member_id"]])
 
         return {"success": True, "message": "Ignored occurrence removed"}
     except HTTPException:
@@ -262,7 +265,7 @@ async def clear_all_ignored_occurrences(schedule_id: str, request: Request) -> d
         )
         
         # Invalidate dashboard cache
-        await _invalidate_dashboard_cache(schedule["campus_id"])
+        await _invalidate_dashboard_cache(schedule["campus_id"], [schedule["member_id"]])
         
         return {"success": True, "message": "All ignored occurrences cleared"}
     except HTTPException:
@@ -284,11 +287,13 @@ async def delete_aid_schedule(schedule_id: str, request: Request) -> dict:
         
         # Delete activity logs related to this schedule
         # Match by member_id and notes containing aid_type or "financial aid"
-        await db.activity_logs.delete_many({
+        activity_query = {
             "member_id": schedule["member_id"],
             "event_type": "financial_aid",
             "notes": {"$regex": schedule.get('aid_type', 'financial aid'), "$options": "i"}
-        })
+        }
+        await RollupService(db).mark_activity_query(activity_query)
+        await db.activity_logs.delete_many(activity_query)
         
         # Delete the schedule
         result = await db.financial_aid_schedules.delete_one({"id": schedule_id})
@@ -297,7 +302,7 @@ async def delete_aid_schedule(schedule_id: str, request: Request) -> dict:
             raise HTTPException(status_code=404, detail="Schedule not found")
         
         # Invalidate dashboard cache
-        await _invalidate_dashboard_cache(schedule["campus_id"])
+        await _invalidate_dashboard_cache(schedule["campus_id"], [schedule["member_id"]])
         
         return {"success": True, "message": "Financial aid schedule and related logs deleted"}
     except HTTPException:
@@ -350,7 +355,7 @@ async def stop_aid_schedule(schedule_id: str, request: Request) -> dict:
         )
         
         # Invalidate dashboard cache
-        await _invalidate_dashboard_cache(schedule["campus_id"])
+        await _invalidate_dashboard_cache(schedule["campus_id"], [schedule["member_id"]])
         
         return {"success": True, "message": "Financial aid schedule stopped"}
     except HTTPException:
@@ -466,6 +471,7 @@ async def mark_aid_distributed(schedule_id: str, request: Request) -> dict:
             "created_at": datetime.now(timezone.utc),
             "updated_at": datetime.now(timezone.utc)
         })
+        await RollupService(db).mark_care_events([{"campus_id": schedule["campus_id"], "event_date": schedule["next_occurrence"]}])
         
         # Log activity
         await _log_activity(
@@ -483,15 +489,12 @@ async def mark_aid_distributed(schedule_id: str, request: Request) -> dict:
         
         # Update member's last contact date and engagement status
         settings = await _get_engagement_settings_cached()
-        status, days = calculate_engagement_status(datetime.now(timezone.utc), settings.get("atRiskDays", 60), settings.get("disconnectedDays", 90))
-        
+        now = datetime.now(timezone.utc)
         await db.members.update_one(
             {"id": schedule["member_id"]},
             {"$set": {
-                "last_contact_date": datetime.now(timezone.utc),
-                "engagement_status": status,
-                "days_since_last_contact": days,
-                "updated_at": datetime.now(timezone.utc)
+                **contact_fields(now, settings.get("atRiskDays", 60), settings.get("disconnectedDays", 90)),
+                "updated_at": now
             }}
         )
         
@@ -551,7 +554,7 @@ async def mark_aid_distributed(schedule_id: str, request: Request) -> dict:
         logger.info(f"[DISTRIBUTE] After update - Schedule {schedule_id}: is_active={updated_schedule.get('is_active')}, ignored_occurrences={updated_schedule.get('ignored_occurrences')}, next_occurrence={updated_schedule.get('next_occurrence')}")
         
         # Invalidate dashboard cache
-        await _invalidate_dashboard_cache(schedule["campus_id"])
+        await _invalidate_dashboard_cache(schedule["campus_id"], [schedule["member_id"]])
         
         return {
             "success": True,
@@ -649,7 +652,7 @@ async def ignore_financial_aid_schedule(schedule_id: str, request: Request) -> d
         )
         
         # Invalidate dashboard cache
-        await _invalidate_dashboard_cache(schedule["campus_id"])
+        await _invalidate_dashboard_cache(schedule["campus_id"], [schedule["member_id"]])
         
         return {
             "success": True, 
@@ -14,6 +14,8 @@ from typing import Optional, Callable, Awaitable
 from enums import EventType, ActivityActionType
 from constants import MAX_PAGE_NUMBER, MAX_LIMIT
 from models import generate_uuid
+from utils import contact_fields
+from services.rollup_service import RollupService
 from dependencies import (
     get_db, get_current_user, get_campus_filter, safe_error_detail
 )
@@ -21,7 +23,7 @@ from dependencies import (
 logger = logging.getLogger(__name__)
 
 # Callbacks to server.py functions (set via init_grief_support_routes)
-_invalidate_dashboard_cache: Optional[Callable[[str], Awaitable[None]]] = None
+_invalidate_dashboard_cache: Optional[Callable[..., Awaitable[None]]] = None
 _log_activity: Optional[Callable[..., Awaitable[None]]] = None
 _send_whatsapp_message: Optional[Callable[..., Awaitable[dict]]] = None
 _get_campus_timezone: Optional[Callable[[str], Awaitable[str]]] = None
@@ -151,6 +153,7 @@ async def complete_grief_stage(stage_id: str, request: Request, notes: Optional[
             "created_at": datetime.now(timezone.utc),
             "updated_at": datetime.now(timezone.utc)
         })
+        await RollupService(db).mark_care_events([{"campus_id": stage["campus_id"], "event_date": today_date}])
         
         # Log activity
         await _log_activity(
@@ -166,14 +169,15 @@ async def complete_grief_stage(stage_id: str, request: Request, notes: Optional[
             user_photo_url=current_user.get("photo_url")
         )
         
-        # Update member's last contact date
+        # Update member's last contact date and engagement
+        now = datetime.now(timezone.utc)
         await db.members.update_one(
             {"id": stage["member_id"]},
-            {"$set": {"last_contact_date": datetime.now(timezone.utc)}}
+            {"$set": {**contact_fields(now), "updated_at": now}}
         )
         
         # Invalidate dashboard cache
-        await _invalidate_dashboard_cache(stage["campus_id"])
+        await _invalidate_dashboard_cache(stage["campus_id"], [stage["member_id"]])
         
         return {"success": True, "message": "Grief stage marked as completed"}
     except HTTPException:
@@ -230,6 +234,7 @@ async def ignore_grief_stage(stage_id: str, request: Request) -> dict:
             "created_at": datetime.now(timezone.utc),
             "updated_at": datetime.now(timezone.utc)
         })
+        await RollupService(db).mark_care_events([{"campus_id": stage["campus_id"], "event_date": today_date}])
         
         # Log activity
         await _log_activity(
@@ -246,7 +251,7 @@ async def ignore_grief_stage(stage_id: str, request: Request) -> dict:
         )
         
         # Invalidate dashboard cache
-        await _invalidate_dashboard_cache(stage["campus_id"])
+        await _invalidate_dashboard_cache(stage["campus_id"], [stage["member_id"]])
         
         return {"success": True, "message": "Grief stage ignored"}
     except HTTPException:
@@ -266,13 +271,16 @@ async def undo_grief_stage(stage_id: str, request: Request) -> dict:
             raise HTTPException(status_code=404, detail="Grief stage not found")
         
         # Delete timeline entries created for this stage (linked by grief_stage_id)
+        await RollupService(db).mark_care_event_query({"grief_stage_id": stage_id})
         await db.care_events.delete_many({"grief_stage_id": stage_id})
         
         # Delete activity logs related to this grief stage
-        await db.activity_logs.delete_many({
+        activity_query = {
             "member_id": stage["member_id"],
             "notes": {"$regex": f"{stage['stage'].replace('_', ' ')}", "$options": "i"}
-        })
+        }
+        await RollupService(db).mark_activity_query(activity_query)
+        await db.activity_logs.delete_many(activity_query)
         
         # Reset the grief stage
         await db.grief_support.update_one(
@@ -290,7 +298,7 @@ async def undo_grief_stage(stage_id: str, request: Request) -> dict:
         )
         
         # Invalidate dashboard cache
-        await _invalidate_dashboard_cache(stage["campus_id"])
+        await _invalidate_dashboard_cache(stage["campus_id"], [stage["member_id"]])
         
         return {"success": True, "message": "Grief support stage reset"}
     except HTTPException:
@@ -9,32 +9,32 @@ from litestar.datastructures import UploadFile
 from litestar.params import Parameter
 import msgspec
 import logging
-import io
 from datetime import datetime, timezone
-from pathlib import Path
 from typing import Optional, Callable, Awaitable
-from PIL import Image
 from pymongo import ReturnDocument
 
 from enums import EngagementStatus, UserRole, ActivityActionType
-from constants import MAX_PAGE_NUMBER, MAX_LIMIT, MAX_IMAGE_SIZE
+from constants import MAX_PAGE_NUMBER, MAX_LIMIT, MAX_IMAGE_SIZE, ENGAGEMENT_NO_CONTACT_DAYS
 from models import (
     Member, MemberCreate, MemberUpdate,
     to_mongo_doc, is_valid_uuid
 )
 from utils import (
     normalize_phone_number, validate_phone,
-    calculate_engagement_status, escape_regex,
     validate_image_magic_bytes
 )
 from dependencies import (
     get_db, get_current_user, get_campus_filter, safe_error_detail
 )
+from services.search_service import SearchService
+from services.rollup_service import RollupService
+from services.image_service import ImageService
+from services.pagination import MEMBER_SORT, keyset_query, split_page, sort_projection, cached_count
 
 logger = logging.getLogger(__name__)
 
 # Callbacks to server.py functions (set via init_member_routes)
-_invalidate_dashboard_cache: Optional[Callable[[str], Awaitable[None]]] = None
+_invalidate_dashboard_cache: Optional[Callable[..., Awaitable[None]]] = None
 _log_activity: Optional[Callable[..., Awaitable[None]]] = None
 _msgspec_enc_hook: Optional[Callable] = None
 _root_dir: Optional[str] = None
@@ -80,15 +80,19 @@ async def create_member(data: MemberCreate, request: Request) -> dict:
             blood_type=data.blood_type,
             marital_status=data.marital_status,
             membership_status=data.membership_status,
-            age=data.age
+            age=data.age,
+            # Never contacted yet; reads trust the stored engagement
+            engagement_status=EngagementStatus.DISCONNECTED,
+            days_since_last_contact=ENGAGEMENT_NO_CONTACT_DAYS
         )
 
         member_dict = to_mongo_doc(member_obj)
         await db.members.insert_one(member_dict)
+        await SearchService(db).index_members([member_dict])
 
         # Invalidate dashboard cache since member count changed
         if _invalidate_dashboard_cache:
-            await _invalidate_dashboard_cache(campus_id)
+            await _invalidate_dashboard_cache(campus_id, [member_obj.id])
 
         return {"id": member_obj.id, "name": member_obj.name, "campus_id": member_obj.campus_id}
     except Exception as e:
@@ -105,8 +109,15 @@ async def list_members(
     search: Optional[str] = None,
     show_archived: bool = False,
     fields: Optional[str] = None,  # Comma-separated list of fields to return
+    cursor: Optional[str] = None,  # X-Next-Cursor from the previous page (replaces page)
+    include_total: Optional[bool] = None,  # Defaults to true for page-based, false for cursor-based requests
 ) -> Response:
-    """List all members with pagination"""
+    """
+    List all members, ordered by name.
+
+    Pass the X-Next-Cursor header of one response as ?cursor= to fetch the next page
+    without skipping rows; page is kept for existing clients.
+    """
     current_user = await get_current_user(request)
     db = get_db()
     try:
@@ -121,19 +132,24 @@ async def list_members(
         if engagement_status:
             query["engagement_status"] = engagement_status
 
+        search_truncated = False
         if search:
-            # Security: Escape regex special characters to prevent NoSQL injection
-            safe_search = escape_regex(search)
-            query["$or"] = [
-                {"name": {"$regex": safe_search, "$options": "i"}},  # Partial name match
-                {"phone": {"$regex": safe_search, "$options": "i"}}  # Partial phone match
-            ]
+            # Name/phone matches come from the search index instead of an unindexed $regex scan
+            campus_id = query.get("campus_id") if isinstance(query.get("campus_id"), str) else None
+            ids, search_truncated = await SearchService(db).match_members(search, campus_id)
+            query["id"] = {"$in": ids}
 
-        # Calculate skip for pagination
-        skip = (page - 1) * limit
+        # Total count is optional for cursor requests and cached across pages
+        total = None
+        if include_total or (include_total is None and not cursor):
+            total = await cached_count(db.members, query)
 
-        # Get total count for pagination metadata
-        total = await db.members.count_documents(query)
+        # Keyset pagination seeks straight to the cursor; skip is only used for page-based requests
+        try:
+            query = keyset_query(query, MEMBER_SORT, cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        skip = 0 if cursor else (page - 1) * limit
 
         # Build projection based on fields parameter or use default
         if fields:
@@ -171,26 +187,34 @@ async def list_members(
                 # Exclude: notes, address, archived_at, archived_reason, etc.
             }
 
-        # Get paginated members with projection
-        members = await db.members.find(query, projection).skip(skip).limit(limit).to_list(limit)
-        
-        # Update engagement status for each member
-        for member in members:
-            if member.get('last_contact_date'):
-                if isinstance(member['last_contact_date'], str):
-                    member['last_contact_date'] = datetime.fromisoformat(member['last_contact_date'])
+        # Fetch one extra row to know whether a next page exists
+        projection = sort_projection(projection, MEMBER_SORT)
+        members = await db.members.find(query, projection).sort(list(MEMBER_SORT)).skip(skip).limit(limit + 1).to_list(limit + 1)
+        members, next_cursor = split_page(members, MEMBER_SORT, limit)
 
-            status, days = calculate_engagement_status(member.get('last_contact_date'))
-            member['engagement_status'] = status
-            member['days_since_last_contact'] = days
+        # Engagement is served as stored (kept current by the engagement recompute job),
+        # so it matches the engagement_status filter
+        for member in members:
+            if isinstance(member.get('last_contact_date'), str):
+                member['last_contact_date'] = datetime.fromisoformat(member['last_contact_date'])
 
-        # Return members array with X-Total-Count header for pagination
+        # Return members array with X-Total-Count / X-Next-Cursor headers for pagination
+        headers = {}
+        if total is not None:
+            headers["X-Total-Count"] = str(total)
+        if search_truncated:
+            # Only the first SEARCH_CANDIDATE_LIMIT matches are listed; the total is a lower bound
+            headers["X-Total-Truncated"] = "true"
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
         return Response(
             content=msgspec.json.encode(members, enc_hook=_msgspec_enc_hook),
             media_type="application/json",
-            headers={"X-Total-Count": str(total)}
+            headers=headers
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing members: {str(e)}")
         raise HTTPException(status_code=500, detail=safe_error_detail(e))
@@ -219,23 +243,13 @@ async def list_at_risk_members(request: Request) -> list:
             "external_member_id": 1
         }
 
-        members = await db.members.find(query, projection).to_list(1000)
-
-        at_risk_members = []
-        for member in members:
-            if member.get('last_contact_date'):
-                if isinstance(member['last_contact_date'], str):
-                    member['last_contact_date'] = datetime.fromisoformat(member['last_contact_date'])
-
-            status, days = calculate_engagement_status(member.get('last_contact_date'))
-            member['engagement_status'] = status
-            member['days_since_last_contact'] = days
-
-            if status in [EngagementStatus.AT_RISK, EngagementStatus.DISCONNECTED]:
-                at_risk_members.append(member)
+        # Filter and sort on the stored engagement (days descending)
+        query["engagement_status"] = {"$in": [EngagementStatus.AT_RISK.value, EngagementStatus.DISCONNECTED.value]}
+        at_risk_members = await db.members.find(query, projection).sort("days_since_last_contact", -1).to_list(1000)
 
-        # Sort by days descending
-        at_risk_members.sort(key=lambda x: x['days_since_last_contact'], reverse=True)
+        for member in at_risk_members:
+            if isinstance(member.get('last_contact_date'), str):
+                member['last_contact_date'] = datetime.fromisoformat(member['last_contact_date'])
 
         return at_risk_members
     except Exception as e:
@@ -259,13 +273,8 @@ async def get_member(member_id: str, request: Request) -> dict:
         if not member:
             raise HTTPException(status_code=404, detail="Member not found")
 
-        if member.get('last_contact_date'):
-            if isinstance(member['last_contact_date'], str):
-                member['last_contact_date'] = datetime.fromisoformat(member['last_contact_date'])
-
-        status, days = calculate_engagement_status(member.get('last_contact_date'))
-        member['engagement_status'] = status
-        member['days_since_last_contact'] = days
+        if isinstance(member.get('last_contact_date'), str):
+            member['last_contact_date'] = datetime.fromisoformat(member['last_contact_date'])
 
         return member
     except HTTPException:
@@ -311,10 +320,12 @@ async def update_member(member_id: str, data: MemberUpdate, request: Request) ->
 
         if not updated_member:
             raise HTTPException(status_code=404, detail="Member not found")
+        if "name" in update_data or "phone" in update_data:
+            await SearchService(db).index_members([updated_member])
 
         # Invalidate dashboard cache since member data changed
         if _invalidate_dashboard_cache:
-            await _invalidate_dashboard_cache(updated_member.get("campus_id"))
+            await _invalidate_dashboard_cache(updated_member.get("campus_id"), [updated_member["id"]])
 
         return updated_member
     except HTTPException:
@@ -350,10 +361,14 @@ async def delete_member(member_id: str, request: Request) -> dict:
         if member_campus_id:
             cascade_filter["campus_id"] = member_campus_id
 
+        rollups = RollupService(db)
+        await rollups.mark_care_event_query(cascade_filter)
         await db.care_events.delete_many(cascade_filter)
+        await SearchService(db).remove_member(member_id)
         await db.grief_support.delete_many(cascade_filter)
         await db.accident_followup.delete_many(cascade_filter)
-        await db.activity_logs.delete_many({"member_id": member_id, "campus_id": member_campus_id} if member_campus_id else {"member_id": member_id})
+        await rollups.mark_activity_query(cascade_filter)
+        await db.activity_logs.delete_many(cascade_filter)
 
         # Log activity
         if _log_activity:
@@ -370,7 +385,7 @@ async def delete_member(member_id: str, request: Request) -> dict:
 
         # Invalidate dashboard cache since member count changed
         if _invalidate_dashboard_cache:
-            await _invalidate_dashboard_cache(member.get("campus_id") or current_user.get("campus_id"))
+            await _invalidate_dashboard_cache(member.get("campus_id") or current_user.get("campus_id"), [member_id])
 
         return {"success": True, "message": "Member deleted successfully"}
     except HTTPException:
@@ -408,51 +423,25 @@ async def upload_member_photo(member_id: str, request: Request, data: UploadFile
         if not is_valid:
             raise HTTPException(status_code=400, detail=result)
 
-        # Process image
+        # Resize and encode (JPEG + WebP/AVIF) in the image process pool, off the event loop
         try:
-            image = Image.open(io.BytesIO(contents))
-        except Exception:
-            raise HTTPException(status_code=400, detail="Invalid or corrupted image file")
-        
-        # Optimize image: resize and compress
-        image = image.convert('RGB')
-        
-        # Resize to multiple sizes for different contexts
-        sizes = {
-            'thumbnail': (100, 100),  # For lists and small avatars
-            'medium': (300, 300),     # For profile views
-            'large': (600, 600)       # For detailed views
-        }
-        
-        base_filename = f"{member_id}"
-        photo_urls = {}
-        
-        for size_name, (width, height) in sizes.items():
-            # Create optimized version
-            resized = image.copy()
-            resized.thumbnail((width, height), Image.Resampling.LANCZOS)
-            
-            # Save with optimization (progressive JPEG for faster loading)
-            filename = f"{base_filename}_{size_name}.jpg"
-            filepath = Path(_root_dir or ".") / "uploads" / filename
-            resized.save(filepath, "JPEG", quality=85, optimize=True, progressive=True)
-            
-            photo_urls[size_name] = f"/uploads/{filename}"
-        
+            photo = await ImageService.process_member_photo(contents, member_id)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
         # Update member record with optimized photo URLs
         await db.members.update_one(
             {"id": member_id},
-            {"$set": {
-                "photo_url": photo_urls['medium'],  # Default medium size
-                "photo_urls": photo_urls,  # All sizes available
-                "updated_at": datetime.now(timezone.utc)
-            }}
+            {"$set": {**photo, "updated_at": datetime.now(timezone.utc)}}
         )
-        
+        # Filenames are content-hashed, so the previous upload's files are now unreferenced
+        ImageService.delete_photo_files(member, keep=photo)
+
         return {
-            "success": True, 
-            "photo_urls": photo_urls,
-            "default_url": photo_urls['medium']
+            "success": True,
+            "photo_urls": photo["photo_urls"],
+            "photo_variants": photo["photo_variants"],
+            "default_url": photo["photo_url"]
         }
     except HTTPException:
         raise
@@ -6,6 +6,7 @@ Uses APScheduler for timezone-aware job scheduling
 
 import asyncio
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.events import EVENT_JOB_SUBMITTED, EVENT_JOB_EXECUTED, EVENT_JOB_ERROR, EVENT_JOB_MISSED
 from datetime import date, datetime, timedelta, timezone
 from zoneinfo import ZoneInfo
 import logging
@@ -15,10 +16,14 @@ import httpx
 import uuid
 import smtplib
 import random
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
 from utils import normalize_phone_number
+from services.http_client import shared_http_client, UPSTREAM_WHATSAPP
+from services.metrics import SchedulerJobMetrics, mongo_command_metrics
+from services.query_profiler import query_profiler
 
 logger = logging.getLogger(__name__)
 
@@ -52,10 +57,12 @@ def safe_parse_date(date_str: str) -> date | None:
 
 # MongoDB connection
 mongo_url = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
-client = AsyncIOMotorClient(mongo_url)
+client = AsyncIOMotorClient(mongo_url, event_listeners=[mongo_command_metrics, query_profiler])
 db = client[os.environ.get('DB_NAME', 'pastoral_care_db')]
 
 scheduler = AsyncIOScheduler()
+# Job run times and misses for /metrics
+scheduler.add_listener(SchedulerJobMetrics(), EVENT_JOB_SUBMITTED | EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED)
 
 # Email configuration from environment
 SMTP_HOST = os.environ.get('SMTP_HOST', 'smtp.gmail.com')
@@ -69,6 +76,17 @@ ALERT_EMAIL = os.environ.get('ALERT_EMAIL', os.environ.get('SMTP_USER', ''))
 WHATSAPP_MAX_RETRIES = 3
 WHATSAPP_RETRY_DELAYS = [2, 4, 8]  # Exponential backoff in seconds
 
+# Multi-campus job execution
+SCHEDULER_CAMPUS_CONCURRENCY = int(os.environ.get('SCHEDULER_CAMPUS_CONCURRENCY', 4))
+SCHEDULER_CAMPUS_TIMEOUT = float(os.environ.get('SCHEDULER_CAMPUS_TIMEOUT', 120))
+SCHEDULER_SYNC_TIMEOUT = float(os.environ.get('SCHEDULER_SYNC_TIMEOUT', 600))  # External API sync per campus
+
+# Search index catch-up for writes that bypass the request hooks (automation, scripts)
+SEARCH_INDEX_REFRESH_MINUTES = int(os.environ.get('SEARCH_INDEX_REFRESH_MINUTES', 10))
+
+# Report rollups: recompute days marked dirty by writes (reports also refresh the days they read)
+ROLLUP_REFRESH_MINUTES = int(os.environ.get('ROLLUP_REFRESH_MINUTES', 5))
+
 
 async def send_email_alert(subject: str, body: str):
     """Send email alert for critical failures"""
@@ -122,7 +140,7 @@ async def send_whatsapp(phone: str, message: str, log_context: dict):
     # Retry loop with exponential backoff
     for attempt in range(WHATSAPP_MAX_RETRIES):
         try:
-            async with httpx.AsyncClient(timeout=30.0) as http_client:
+            async with shared_http_client(UPSTREAM_WHATSAPP) as http_client:
                 response = await http_client.post(
                     f"{whatsapp_url}/send/message",
                     json={"phone": phone_formatted, "message": message}
@@ -203,6 +221,20 @@ FaithTracker Pastoral Care System
 
     return {"success": False, "error": last_error, "attempts": WHATSAPP_MAX_RETRIES}
 
+def _birthday_in_year(birth_date_str: str, year: int) -> date | None:
+    """Return a member's birthday in the given year (Feb 29 falls on Feb 28 outside leap years)"""
+    try:
+        birth_date = datetime.strptime(birth_date_str, '%Y-%m-%d').date()
+    except (ValueError, TypeError):
+        # TypeError: birth_date is None/not a string
+        # ValueError: invalid date format
+        return None
+    try:
+        return birth_date.replace(year=year)
+    except ValueError:
+        return birth_date.replace(year=year, day=28)
+
+
 async def generate_daily_digest_for_campus(campus_id: str, campus_name: str):
     """Generate daily digest for a specific campus"""
     try:
@@ -214,67 +246,124 @@ async def generate_daily_digest_for_campus(campus_id: str, campus_name: str):
         # We need to find members whose birth month/day matches today
         birthday_members = []
         birthday_week_members = []
+        week_ahead = today + timedelta(days=7)
 
-        # Get all members with birth_date in this campus
-        # Note: MongoDB $and is required for multiple conditions on same field
-        members_with_birthday = await db.members.find(
+        # Collect members with a birthday in the next 7 days, then check their
+        # birthday events in a single query instead of one find_one per member
+        birthday_candidates = []
+        async for member in db.members.find(
             {
                 "campus_id": campus_id,
                 "birth_date": {"$exists": True, "$type": "string", "$ne": ""}
             },
             {"_id": 0, "id": 1, "name": 1, "phone": 1, "birth_date": 1}
-        ).to_list(5000)
-
-        today_month_day = (today.month, today.day)
-        week_ahead = today + timedelta(days=7)
-
-        for member in members_with_birthday:
-            try:
-                birth_date = datetime.strptime(member["birth_date"], '%Y-%m-%d').date()
-                this_year_birthday = birth_date.replace(year=today.year)
-
-                # Handle leap year edge case (Feb 29 -> Feb 28 if not leap year)
-                if birth_date.month == 2 and birth_date.day == 29:
-                    try:
-                        this_year_birthday = birth_date.replace(year=today.year)
-                    except ValueError:
-                        this_year_birthday = birth_date.replace(year=today.year, day=28)
-
-                # Check if birthday event exists and is not completed
-                event = await db.care_events.find_one(
-                    {"member_id": member["id"], "event_type": "birthday", "completed": False, "ignored": {"$ne": True}},
-                    {"_id": 0}
-                )
-
-                if not event:
-                    continue
-
-                # Skip members without phone number
-                if not member.get('phone'):
-                    continue
-
-                phone_clean = member['phone'].replace('@s.whatsapp.net', '')
-
-                if this_year_birthday == today:
-                    # Birthday TODAY
-                    birthday_members.append(f"  - {member['name']}\n    wa.me/{phone_clean}")
-                elif today < this_year_birthday <= week_ahead:
-                    # Birthday in next 7 days
-                    days_until = (this_year_birthday - today).days
-                    birthday_week_members.append(f"  - {member['name']} ({days_until} hari lagi)\n    wa.me/{phone_clean}")
-            except (ValueError, KeyError, TypeError):
-                # TypeError: birth_date is None/not a string
-                # ValueError: invalid date format
-                # KeyError: missing field
+        ):
+            # Skip members without phone number
+            if not member.get('phone'):
+                continue
+            this_year_birthday = _birthday_in_year(member.get("birth_date"), today.year)
+            if this_year_birthday and today <= this_year_birthday <= week_ahead:
+                birthday_candidates.append((member, this_year_birthday))
+
+        open_birthday_ids = set()
+        if birthday_candidates:
+            open_birthday_ids = set(await db.care_events.distinct("member_id", {
+                "member_id": {"$in": [m["id"] for m, _ in birthday_candidates]},
+                "event_type": "birthday",
+                "completed": False,
+                "ignored": {"$ne": True}
+            }))
+
+        for member, this_year_birthday in birthday_candidates:
+            if member["id"] not in open_birthday_ids:
                 continue
+            phone_clean = member['phone'].replace('@s.whatsapp.net', '')
+            if this_year_birthday == today:
+                # Birthday TODAY
+                birthday_members.append(f"  - {member['name']}\n    wa.me/{phone_clean}")
+            else:
+                # Birthday in next 7 days
+                days_until = (this_year_birthday - today).days
+                birthday_week_members.append(f"  - {member['name']} ({days_until} hari lagi)\n    wa.me/{phone_clean}")
+
+        # 2. Task sections - fetched concurrently, then members resolved with one $in query
+        (
+            grief_due, overdue_grief, accident_followups_due, overdue_hospital,
+            financial_aid_due, overdue_financial_aid, overdue_notes
+        ) = await asyncio.gather(
+            db.grief_support.find({
+                "campus_id": campus_id,
+                "scheduled_date": today.isoformat(),
+                "completed": False
+            }, {"_id": 0}).to_list(100),
+            # OVERDUE Grief stages (past due, not completed)
+            db.grief_support.find({
+                "campus_id": campus_id,
+                "scheduled_date": {"$lt": today.isoformat()},
+                "completed": False
+            }, {"_id": 0}).to_list(100),
+            # Accident/illness follow-ups due today
+            db.accident_followup.find({
+                "campus_id": campus_id,
+                "scheduled_date": today.isoformat(),
+                "completed": False,
+                "ignored": {"$ne": True}
+            }, {"_id": 0}).to_list(100),
+            # OVERDUE Hospital follow-ups (past due, not completed)
+            db.accident_followup.find({
+                "campus_id": campus_id,
+                "scheduled_date": {"$lt": today.isoformat()},
+                "completed": False,
+                "ignored": {"$ne": True}
+            }, {"_id": 0}).to_list(100),
+            # Financial aid due today
+            db.financial_aid_schedules.find({
+                "campus_id": campus_id,
+                "next_occurrence": today.isoformat(),
+                "is_active": True
+            }, {"_id": 0}).to_list(100),
+            # OVERDUE Financial aid (past due, still active)
+            db.financial_aid_schedules.find({
+                "campus_id": campus_id,
+                "next_occurrence": {"$lt": today.isoformat()},
+                "is_active": True
+            }, {"_id": 0}).to_list(100),
+            # Pastoral Notes with overdue follow-ups (due today or past due)
+            # Exclude empty/null follow_up_date and ensure it's a valid date string
+            db.pastoral_notes.find({
+                "campus_id": campus_id,
+                "follow_up_date": {
+                    "$lte": today.isoformat(),
+                    "$nin": [None, ""],  # Exclude null and empty string
+                    "$regex": r"^\d{4}-\d{2}-\d{2}"  # Must start with YYYY-MM-DD format
+                },
+                "follow_up_completed": False,
+                "is_private": {"$ne": True}  # Don't include private notes in digest
+            }, {"_id": 0}).to_list(100),
+        )
 
-        # 3. Grief stages due today
-        grief_due = await db.grief_support.find({
-            "campus_id": campus_id,
-            "scheduled_date": today.isoformat(),
-            "completed": False
-        }, {"_id": 0}).to_list(100)
+        section_member_ids = {
+            item["member_id"]
+            for section in (grief_due, overdue_grief, accident_followups_due, overdue_hospital,
+                            financial_aid_due, overdue_financial_aid, overdue_notes)
+            for item in section
+            if item.get("member_id")
+        }
+        members_by_id = {}
+        if section_member_ids:
+            async for member in db.members.find(
+                {"id": {"$in": list(section_member_ids)}},
+                {"_id": 0, "id": 1, "name": 1, "phone": 1}
+            ):
+                members_by_id[member["id"]] = member
+
+        def contact(item):
+            member = members_by_id.get(item.get("member_id"))
+            if member and member.get('phone'):
+                return member, member['phone'].replace('@s.whatsapp.net', '')
+            return None, None
 
+        # 3. Grief stages due today
         grief_members = []
         grief_stage_names = {
             "1_week": "1 minggu",
@@ -285,40 +374,24 @@ async def generate_daily_digest_for_campus(campus_id: str, campus_name: str):
             "1_year": "1 tahun"
         }
         for stage in grief_due:
-            member = await db.members.find_one({"id": stage["member_id"]}, {"_id": 0})
-            if member and member.get('phone'):
+            member, phone_clean = contact(stage)
+            if member:
                 stage_name = grief_stage_names.get(stage["stage"], stage["stage"])
-                phone_clean = member['phone'].replace('@s.whatsapp.net', '')
                 grief_members.append(f"  - {member['name']} ({stage_name} setelah dukacita)\n    wa.me/{phone_clean}")
 
         # 3b. OVERDUE Grief stages (past due, not completed)
-        overdue_grief = await db.grief_support.find({
-            "campus_id": campus_id,
-            "scheduled_date": {"$lt": today.isoformat()},
-            "completed": False
-        }, {"_id": 0}).to_list(100)
-
         overdue_grief_members = []
         for stage in overdue_grief:
-            member = await db.members.find_one({"id": stage["member_id"]}, {"_id": 0})
-            if member and member.get('phone'):
+            member, phone_clean = contact(stage)
+            if member:
                 scheduled_date = safe_parse_date(stage.get("scheduled_date"))
                 if not scheduled_date:
                     continue  # Skip if date is invalid
                 stage_name = grief_stage_names.get(stage["stage"], stage["stage"])
                 days_overdue = (today - scheduled_date).days
-                phone_clean = member['phone'].replace('@s.whatsapp.net', '')
                 overdue_grief_members.append(f"  - {member['name']} ({stage_name}, {days_overdue} hari terlambat)\n    wa.me/{phone_clean}")
 
         # 4. Accident/illness follow-ups due today
-        # Query accident_followup collection (similar to grief_support) with scheduled_date
-        accident_followups_due = await db.accident_followup.find({
-            "campus_id": campus_id,
-            "scheduled_date": today.isoformat(),
-            "completed": False,
-            "ignored": {"$ne": True}
-        }, {"_id": 0}).to_list(100)
-
         hospital_followups = []
         hospital_stage_names = {
             "first_followup": "tindak lanjut ke-1",
@@ -327,39 +400,24 @@ async def generate_daily_digest_for_campus(campus_id: str, campus_name: str):
         }
 
         for followup in accident_followups_due:
-            member = await db.members.find_one({"id": followup["member_id"]}, {"_id": 0})
-            if member and member.get('phone'):
+            member, phone_clean = contact(followup)
+            if member:
                 stage_name = hospital_stage_names.get(followup.get("stage"), followup.get("stage", "tindak lanjut"))
-                phone_clean = member['phone'].replace('@s.whatsapp.net', '')
                 hospital_followups.append(f"  - {member['name']} ({stage_name})\n    wa.me/{phone_clean}")
 
         # 4b. OVERDUE Hospital follow-ups (past due, not completed)
-        overdue_hospital = await db.accident_followup.find({
-            "campus_id": campus_id,
-            "scheduled_date": {"$lt": today.isoformat()},
-            "completed": False,
-            "ignored": {"$ne": True}
-        }, {"_id": 0}).to_list(100)
-
         overdue_hospital_members = []
         for followup in overdue_hospital:
-            member = await db.members.find_one({"id": followup["member_id"]}, {"_id": 0})
-            if member and member.get('phone'):
+            member, phone_clean = contact(followup)
+            if member:
                 scheduled_date = safe_parse_date(followup.get("scheduled_date"))
                 if not scheduled_date:
                     continue  # Skip if date is invalid
                 stage_name = hospital_stage_names.get(followup.get("stage"), followup.get("stage", "tindak lanjut"))
                 days_overdue = (today - scheduled_date).days
-                phone_clean = member['phone'].replace('@s.whatsapp.net', '')
                 overdue_hospital_members.append(f"  - {member['name']} ({stage_name}, {days_overdue} hari terlambat)\n    wa.me/{phone_clean}")
 
         # 5. Financial aid due today
-        financial_aid_due = await db.financial_aid_schedules.find({
-            "campus_id": campus_id,
-            "next_occurrence": today.isoformat(),
-            "is_active": True
-        }, {"_id": 0}).to_list(100)
-
         financial_aid_members = []
         aid_type_names = {
             "education": "Pendidikan",
@@ -368,50 +426,25 @@ async def generate_daily_digest_for_campus(campus_id: str, campus_name: str):
             "other": "Lainnya"
         }
         for aid in financial_aid_due:
-            member = await db.members.find_one({"id": aid["member_id"]}, {"_id": 0})
-            if member and member.get('phone'):
+            member, phone_clean = contact(aid)
+            if member:
                 aid_type = aid_type_names.get(aid.get("aid_type"), aid.get("aid_type", "Bantuan"))
-                phone_clean = member['phone'].replace('@s.whatsapp.net', '')
                 financial_aid_members.append(f"  - {member['name']} ({aid_type})\n    wa.me/{phone_clean}")
 
         # 5b. OVERDUE Financial aid (past due, still active)
-        overdue_financial_aid = await db.financial_aid_schedules.find({
-            "campus_id": campus_id,
-            "next_occurrence": {"$lt": today.isoformat()},
-            "is_active": True
-        }, {"_id": 0}).to_list(100)
-
         overdue_financial_members = []
         for aid in overdue_financial_aid:
-            member = await db.members.find_one({"id": aid["member_id"]}, {"_id": 0})
-            if member and member.get('phone'):
+            member, phone_clean = contact(aid)
+            if member:
                 next_occurrence = safe_parse_date(aid.get("next_occurrence"))
                 if not next_occurrence:
                     continue  # Skip if date is invalid
                 aid_type = aid_type_names.get(aid.get("aid_type"), aid.get("aid_type", "Bantuan"))
                 days_overdue = (today - next_occurrence).days
-                phone_clean = member['phone'].replace('@s.whatsapp.net', '')
                 overdue_financial_members.append(f"  - {member['name']} ({aid_type}, {days_overdue} hari terlambat)\n    wa.me/{phone_clean}")
 
 
         # 7. Pastoral Notes with overdue follow-ups (due today or past due)
-        # Exclude empty/null follow_up_date and ensure it's a valid date string
-        overdue_notes_query = {
-            "campus_id": campus_id,
-            "follow_up_date": {
-                "$lte": today.isoformat(),
-                "$nin": [None, ""],  # Exclude null and empty string
-                "$regex": r"^\d{4}-\d{2}-\d{2}"  # Must start with YYYY-MM-DD format
-            },
-            "follow_up_completed": False,
-            "is_private": {"$ne": True}  # Don't include private notes in digest
-        }
-
-        overdue_notes = await db.pastoral_notes.find(
-            overdue_notes_query,
-            {"_id": 0}
-        ).to_list(100)
-
         overdue_notes_formatted = []
         notes_due_today = []
 
@@ -426,9 +459,8 @@ async def generate_daily_digest_for_campus(campus_id: str, campus_name: str):
         }
 
         for note in overdue_notes:
-            member = await db.members.find_one({"id": note["member_id"]}, {"_id": 0, "name": 1, "phone": 1})
-            if member and member.get('phone'):
-                phone_clean = member['phone'].replace('@s.whatsapp.net', '')
+            member, phone_clean = contact(note)
+            if member:
                 note_date = safe_parse_date(note.get("follow_up_date"))
                 if not note_date:
                     continue  # Skip if date is invalid
@@ -451,13 +483,11 @@ async def generate_daily_digest_for_campus(campus_id: str, campus_name: str):
                     )
 
         # 6. Members at risk / disconnected (30+ days no contact) - RANDOMIZED sample of 10
-        members = await db.members.find({"campus_id": campus_id}, {"_id": 0}).to_list(5000)
         at_risk_list = []
-        for member in members:
-            # Skip members without phone number
-            if not member.get('phone'):
-                continue
-
+        async for member in db.members.find(
+            {"campus_id": campus_id, "phone": {"$nin": [None, ""]}},
+            {"_id": 0, "name": 1, "phone": 1, "last_contact_date": 1}
+        ):
             last_contact = member.get('last_contact_date')
             if last_contact:
                 if isinstance(last_contact, str):
@@ -580,6 +610,62 @@ async def generate_daily_digest_for_campus(campus_id: str, campus_name: str):
         logger.error(f"Error generating digest for campus {campus_name}: {str(e)}")
         return None
 
+async def run_for_each_campus(job_name: str, campuses: list, worker, concurrency: int | None = None, timeout: float | None = None) -> list[dict]:
+    """
+    Run worker(campus) for every campus with bounded concurrency.
+
+    Each campus gets its own timeout and a failure in one campus never affects the others.
+    Results are returned in input order as dicts with campus_id, status
+    ("ok", "timeout" or "error"), elapsed seconds, result and error.
+    """
+    semaphore = asyncio.Semaphore(concurrency or SCHEDULER_CAMPUS_CONCURRENCY)
+    timeout = timeout or SCHEDULER_CAMPUS_TIMEOUT
+
+    async def run_one(campus: dict) -> dict:
+        campus_id = campus.get("id") or campus.get("campus_id")
+        label = campus.get("campus_name") or campus_id
+        async with semaphore:
+            started = time.perf_counter()
+            result, error = None, None
+            try:
+                result = await asyncio.wait_for(worker(campus), timeout)
+                status = "ok"
+            except asyncio.TimeoutError:
+                status, error = "timeout", f"timed out after {timeout:g}s"
+            except Exception as e:
+                status, error = "error", str(e)
+            elapsed = time.perf_counter() - started
+
+        if error:
+            logger.error(f"[{job_name}] {label}: {status} after {elapsed:.2f}s - {error}")
+        else:
+            logger.info(f"[{job_name}] {label}: done in {elapsed:.2f}s")
+        return {"campus_id": campus_id, "status": status, "elapsed": elapsed, "result": result, "error": error}
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(run_one(campus) for campus in campuses))
+    failed = sum(1 for r in results if r["status"] != "ok")
+    logger.info(f"[{job_name}] {len(results)} campuses in {time.perf_counter() - started:.2f}s ({failed} failed)")
+    return results
+
+
+def campus_job_lock_ttl(campus_count: int, timeout: float | None = None, sweeps: int = 1, minimum: int = 300) -> int:
+    """
+    Job lock TTL that outlives sweeps of run_for_each_campus over campus_count campuses.
+
+    Each batch of SCHEDULER_CAMPUS_CONCURRENCY campuses may take up to the per-campus
+    timeout, so a fixed TTL would let a second worker start the job while a large
+    deployment is still being processed.
+    """
+    batches = (campus_count + SCHEDULER_CAMPUS_CONCURRENCY - 1) // SCHEDULER_CAMPUS_CONCURRENCY
+    worst_case = sweeps * batches * (timeout or SCHEDULER_CAMPUS_TIMEOUT)
+    return max(minimum, int(worst_case) + 60)
+
+
+async def count_active_campuses() -> int:
+    return await db.campuses.count_documents({"is_active": True})
+
+
 async def send_daily_digest_to_pastoral_team():
     """Send daily digest to all pastoral team members per campus"""
     try:
@@ -598,13 +684,17 @@ async def send_daily_digest_to_pastoral_team():
         sent_to_users = set()  # Track by user_id
         sent_to_phones = set()  # Track by phone number to prevent duplicate messages to same phone
 
-        for campus in campuses:
+        # Generate all campus digests concurrently, then send in campus order
+        digest_runs = await run_for_each_campus(
+            "daily_digest", campuses,
+            lambda campus: generate_daily_digest_for_campus(campus["id"], campus["campus_name"])
+        )
+        digests = [run["result"] for run in digest_runs]
+
+        for campus, digest in zip(campuses, digests):
             campus_id = campus["id"]
             campus_name = campus["campus_name"]
 
-            # Generate digest for this campus
-            digest = await generate_daily_digest_for_campus(campus_id, campus_name)
-
             if not digest:
                 continue
 
@@ -680,8 +770,7 @@ async def send_daily_digest_to_pastoral_team():
 
             # Find first campus with tasks to send digest
             first_campus_digest = None
-            for campus in campuses:
-                digest = await generate_daily_digest_for_campus(campus["id"], campus["campus_name"])
+            for digest in digests:
                 if digest and (digest["stats"]["birthdays_today"] > 0 or
                               digest["stats"]["grief_due"] > 0 or
                               digest["stats"]["hospital_followups"] > 0 or
@@ -780,7 +869,9 @@ async def member_reconciliation_job():
     Runs at configured time to ensure data integrity (especially for webhook mode)
     """
     # Acquire distributed lock to prevent duplicate execution across workers
-    if not await acquire_job_lock("member_reconciliation", ttl_seconds=1800):
+    campus_count = await db.sync_configs.count_documents({"is_enabled": True, "reconciliation_enabled": True})
+    lock_ttl = campus_job_lock_ttl(campus_count, timeout=SCHEDULER_SYNC_TIMEOUT, minimum=1800)
+    if not await acquire_job_lock("member_reconciliation", ttl_seconds=lock_ttl):
         logger.info("Another worker is already running reconciliation - skipping")
         return
 
@@ -800,33 +891,33 @@ async def member_reconciliation_job():
             logger.info("No campuses configured for reconciliation")
             return
 
+        # Call the shared sync function for every campus concurrently
+        runs = await run_for_each_campus(
+            "member_reconciliation", sync_configs,
+            lambda config: perform_member_sync_for_campus(config["campus_id"], sync_type="reconciliation"),
+            timeout=SCHEDULER_SYNC_TIMEOUT
+        )
+
         total_synced = 0
         total_errors = 0
 
-        for config in sync_configs:
-            try:
-                campus_id = config["campus_id"]
-                logger.info(f"Reconciling campus: {campus_id}")
-
-                # Call the shared sync function
-                result = await perform_member_sync_for_campus(campus_id, sync_type="reconciliation")
-
-                if result.get("success"):
-                    stats = result.get("stats", {})
-                    logger.info(
-                        f"Campus {campus_id}: "
-                        f"fetched={stats.get('fetched', 0)}, "
-                        f"created={stats.get('created', 0)}, "
-                        f"updated={stats.get('updated', 0)}, "
-                        f"matched_by_name={stats.get('matched_by_name_phone', 0) + stats.get('matched_by_name_only', 0)}"
-                    )
-                    total_synced += stats.get('fetched', 0)
-                else:
-                    logger.error(f"Campus {campus_id} sync failed: {result.get('error')}")
-                    total_errors += 1
-
-            except Exception as campus_error:
-                logger.error(f"Error reconciling campus {config.get('campus_id')}: {str(campus_error)}")
+        for run in runs:
+            campus_id = run["campus_id"]
+            result = run["result"]
+            if run["status"] != "ok":
+                total_errors += 1
+            elif result.get("success"):
+                stats = result.get("stats", {})
+                logger.info(
+                    f"Campus {campus_id}: "
+                    f"fetched={stats.get('fetched', 0)}, "
+                    f"created={stats.get('created', 0)}, "
+                    f"updated={stats.get('updated', 0)}, "
+                    f"matched_by_name={stats.get('matched_by_name_phone', 0) + stats.get('matched_by_name_only', 0)}"
+                )
+                total_synced += stats.get('fetched', 0)
+            else:
+                logger.error(f"Campus {campus_id} sync failed: {result.get('error')}")
                 total_errors += 1
 
         logger.info(f"Daily reconciliation complete: {total_synced} members synced, {total_errors} errors")
@@ -865,16 +956,23 @@ FaithTracker Pastoral Care System
 
 
 async def refresh_all_dashboard_caches():
-    """Refresh dashboard cache for all active campuses"""
+    """Rebuild the materialized dashboard reminders of all active campuses for the new day"""
     # Acquire distributed lock to prevent duplicate execution across workers
-    if not await acquire_job_lock("cache_refresh", ttl_seconds=300):
+    campus_count = await count_active_campuses()
+    if not await acquire_job_lock("cache_refresh", ttl_seconds=campus_job_lock_ttl(campus_count)):
         logger.info("Another worker is already refreshing cache - skipping")
         return
 
     try:
         from server import db, get_campus_timezone, get_date_in_timezone, get_writeoff_settings, SECRET_KEY
-        from routes.dashboard import calculate_dashboard_reminders, init_dashboard_routes
+        from routes.dashboard import rebuild_dashboard_reminders, init_dashboard_routes
         from dependencies import init_dependencies
+        from services.cache import get_redis_client
+
+        if not get_redis_client():
+            # The in-process tier only serves this worker: let each worker build on first read
+            logger.warning("DragonflyDB unavailable - dashboard reminders will be built on first read")
+            return
 
         # Initialize dependencies for dashboard module
         init_dependencies(db, SECRET_KEY)
@@ -885,34 +983,20 @@ async def refresh_all_dashboard_caches():
 
         logger.info(f"Refreshing dashboard cache for {len(campuses)} campuses...")
 
-        for campus in campuses:
-            campus_id = campus["id"]
+        async def refresh_campus(campus):
             campus_tz = campus.get("timezone", "Asia/Jakarta")
             today_date = get_date_in_timezone(campus_tz)
 
-            # Calculate fresh data
-            data = await calculate_dashboard_reminders(campus_id, campus_tz, today_date)
-
-            # Update cache
-            cache_key = f"dashboard_reminders_{campus_id}_{today_date}"
-            await db.dashboard_cache.update_one(
-                {"cache_key": cache_key},
-                {
-                    "$set": {
-                        "cache_key": cache_key,
-                        "data": data,
-                        "calculated_at": datetime.now(timezone.utc),
-                        "expires_at": datetime.now(timezone.utc) + timedelta(hours=24)  # Cache for full day
-                    }
-                },
-                upsert=True
-            )
+            # This is the only full rebuild of the day, write paths patch it afterwards
+            data = await rebuild_dashboard_reminders(campus["id"], campus_tz, today_date)
+            if data is None:
+                logger.info(f"Dashboard cache for {campus['campus_name']} is already being rebuilt - skipping")
+                return None
 
             logger.info(f"Dashboard cache refreshed for {campus['campus_name']} - {data['total_tasks']} tasks")
+            return data['total_tasks']
 
-        # Clean up old cache entries (older than 2 days)
-        two_days_ago = datetime.now(timezone.utc) - timedelta(days=2)
-        await db.dashboard_cache.delete_many({"calculated_at": {"$lt": two_days_ago}})
+        await run_for_each_campus("cache_refresh", campuses, refresh_campus)
 
         logger.info("Dashboard cache refresh complete")
 
@@ -922,6 +1006,80 @@ async def refresh_all_dashboard_caches():
         await release_job_lock("cache_refresh")
 
 
+async def search_index_refresh_job():
+    """Index members and care events changed since the last run"""
+    if not await acquire_job_lock("search_index_refresh", ttl_seconds=SEARCH_INDEX_REFRESH_MINUTES * 60):
+        logger.info("Another worker is already refreshing the search index - skipping")
+        return
+
+    try:
+        from services.search_service import SearchService
+
+        counts = await SearchService(db).refresh()
+        if counts["members"] or counts["care_events"]:
+            logger.info(f"Search index refreshed: {counts['members']} members, {counts['care_events']} care events")
+    except Exception as e:
+        logger.error(f"Error refreshing search index: {str(e)}")
+    finally:
+        await release_job_lock("search_index_refresh")
+
+
+async def rollup_refresh_job():
+    """Recompute report rollups for days changed since the last run"""
+    if not await acquire_job_lock("rollup_refresh", ttl_seconds=ROLLUP_REFRESH_MINUTES * 60):
+        logger.info("Another worker is already refreshing report rollups - skipping")
+        return
+
+    try:
+        from services.rollup_service import RollupService
+
+        days = await RollupService(db).refresh_dirty()
+        if days:
+            logger.info(f"Report rollups refreshed for {days} campus-days")
+    except Exception as e:
+        logger.error(f"Error refreshing report rollups: {str(e)}")
+    finally:
+        await release_job_lock("rollup_refresh")
+
+
+async def rollup_reconcile_job():
+    """Recompute recent report rollups for every campus (writes from sync and scripts are not marked)"""
+    if not await acquire_job_lock("rollup_reconcile", ttl_seconds=3600):
+        logger.info("Another worker is already reconciling report rollups - skipping")
+        return
+
+    try:
+        from services.rollup_service import RollupService
+
+        counts = await RollupService(db).reconcile_recent()
+        logger.info(f"Report rollups reconciled: {counts['events']} event groups, {counts['activity']} staff-days")
+    except Exception as e:
+        logger.error(f"Error reconciling report rollups: {str(e)}")
+    finally:
+        await release_job_lock("rollup_reconcile")
+
+
+async def engagement_recompute_job():
+    """Decay stored member engagement (days since contact and status bucket) for every campus"""
+    if not await acquire_job_lock("engagement_recompute", ttl_seconds=3600):
+        logger.info("Another worker is already recomputing engagement - skipping")
+        return
+
+    try:
+        from services.engagement_service import EngagementService
+        from routes.dashboard import mark_dashboard_reminders_stale
+
+        updated = await EngagementService(db).recompute()
+        # At-risk and disconnected reminder lists come from the stored engagement
+        for campus_id in updated:
+            await mark_dashboard_reminders_stale(campus_id)
+        logger.info(f"Engagement recomputed: {sum(updated.values())} members updated in {len(updated)} campuses")
+    except Exception as e:
+        logger.error(f"Error recomputing engagement: {str(e)}")
+    finally:
+        await release_job_lock("engagement_recompute")
+
+
 async def acquire_job_lock(job_name: str, ttl_seconds: int = 300):
     """
     Acquire a distributed lock for a scheduled job to prevent duplicate execution
@@ -990,7 +1148,9 @@ async def release_job_lock(job_name: str):
 async def daily_reminder_job():
     """Main daily reminder job - sends digest to pastoral team"""
     # Acquire distributed lock to prevent duplicate execution across workers
-    if not await acquire_job_lock("daily_reminder", ttl_seconds=600):
+    # (held across the dashboard refresh and the digest, one campus sweep each)
+    campus_count = await count_active_campuses()
+    if not await acquire_job_lock("daily_reminder", ttl_seconds=campus_job_lock_ttl(campus_count, sweeps=2, minimum=600)):
         logger.info("Another worker is already running this job - skipping")
         return
 
@@ -1151,6 +1311,56 @@ def start_scheduler():
             coalesce=True
         )
 
+        # Keep the search index current for writes made outside request handlers
+        scheduler.add_job(
+            search_index_refresh_job,
+            'interval',
+            minutes=SEARCH_INDEX_REFRESH_MINUTES,
+            id='search_index_refresh',
+            name='Search Index Refresh',
+            replace_existing=True,
+            coalesce=True,
+            max_instances=1
+        )
+
+        # Report rollups: drain dirty days, and recompute recent days after the member sync
+        scheduler.add_job(
+            rollup_refresh_job,
+            'interval',
+            minutes=ROLLUP_REFRESH_MINUTES,
+            id='rollup_refresh',
+            name='Report Rollup Refresh',
+            replace_existing=True,
+            coalesce=True,
+            max_instances=1
+        )
+        scheduler.add_job(
+            rollup_reconcile_job,
+            'cron',
+            hour=4,
+            minute=30,
+            timezone='Asia/Jakarta',
+            id='rollup_reconcile',
+            name='Daily Report Rollup Reconciliation',
+            replace_existing=True,
+            misfire_grace_time=21600,  # 6 hours in seconds
+            coalesce=True
+        )
+
+        # Nightly engagement decay, after the member sync so synced contacts are included
+        scheduler.add_job(
+            engagement_recompute_job,
+            'cron',
+            hour=3,
+            minute=30,
+            timezone='Asia/Jakarta',
+            id='engagement_recompute',
+            name='Nightly Engagement Recompute',
+            replace_existing=True,
+            misfire_grace_time=21600,  # 6 hours in seconds
+            coalesce=True
+        )
+
         # Default daily digest at 8 AM (will be updated from DB shortly after startup)
         # misfire_grace_time allows digest to run if container restarts after scheduled time
         scheduler.add_job(
@@ -1191,6 +1401,9 @@ def start_scheduler():
         logger.info("  - Midnight cache refresh: 00:00 Asia/Jakarta (misfire: 1h)")
         logger.info("  - Daily digest: 08:00 Asia/Jakarta (loading from DB...)")
         logger.info("  - Member reconciliation: 03:00 Asia/Jakarta (misfire: 6h)")
+        logger.info(f"  - Search index refresh: every {SEARCH_INDEX_REFRESH_MINUTES} min")
+        logger.info("  - Engagement recompute: 03:30 Asia/Jakarta (misfire: 6h)")
+        logger.info(f"  - Report rollup refresh: every {ROLLUP_REFRESH_MINUTES} min, reconciliation 04:30 Asia/Jakarta")
         logger.info("  - Startup reconciliation check: enabled")
     except Exception as e:
         logger.error(f"Error starting scheduler: {str(e)}")
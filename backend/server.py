@@ -9,13 +9,13 @@ Framework: Litestar + msgspec (migrated from FastAPI + Pydantic)
 from litestar import Litestar, Router, get, post, put, patch, delete, Request, Response
 from litestar.di import Provide
 from litestar.exceptions import HTTPException, NotAuthorizedException, PermissionDeniedException
-from litestar.status_codes import HTTP_200_OK, HTTP_201_CREATED, HTTP_204_NO_CONTENT, HTTP_400_BAD_REQUEST, HTTP_401_UNAUTHORIZED, HTTP_403_FORBIDDEN, HTTP_404_NOT_FOUND, HTTP_413_REQUEST_ENTITY_TOO_LARGE, HTTP_429_TOO_MANY_REQUESTS, HTTP_500_INTERNAL_SERVER_ERROR
+from litestar.status_codes import HTTP_200_OK, HTTP_201_CREATED, HTTP_202_ACCEPTED, HTTP_204_NO_CONTENT, HTTP_400_BAD_REQUEST, HTTP_401_UNAUTHORIZED, HTTP_403_FORBIDDEN, HTTP_404_NOT_FOUND, HTTP_413_REQUEST_ENTITY_TOO_LARGE, HTTP_429_TOO_MANY_REQUESTS, HTTP_500_INTERNAL_SERVER_ERROR
 from litestar.datastructures import UploadFile, State
 from litestar.params import Parameter, Body
 from litestar.response import Response as LitestarResponse, File as LitestarFile, Stream
 from litestar.middleware.base import AbstractMiddleware, DefineMiddleware
+from litestar.enums import ScopeType
 from litestar.middleware.compression import CompressionMiddleware
-from litestar.middleware.rate_limit import RateLimitConfig
 from litestar.config.cors import CORSConfig
 from litestar.openapi import OpenAPIConfig
 from litestar.connection import ASGIConnection
@@ -42,6 +42,7 @@ from datetime import datetime, timezone, timedelta, date
 from zoneinfo import ZoneInfo
 import asyncio
 import re
+import time
 
 # Import extracted enums and constants
 from enums import (
@@ -59,8 +60,9 @@ from constants import (
     DEFAULT_REMINDER_DAYS_ACCIDENT_ILLNESS, DEFAULT_REMINDER_DAYS_GRIEF_SUPPORT,
     JWT_TOKEN_EXPIRE_HOURS, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, MAX_PAGE_NUMBER,
     MAX_LIMIT, DEFAULT_ANALYTICS_DAYS, DEFAULT_UPCOMING_DAYS, MAX_IMAGE_SIZE,
-    MAX_CSV_SIZE, MAX_REQUEST_BODY_SIZE, IMAGE_MAGIC_BYTES,
-    API_MAX_RETRIES, API_RETRY_DELAYS, API_RETRY_TIMEOUT
+    MAX_CSV_SIZE, MAX_REQUEST_BODY_SIZE, IMAGE_MAGIC_BYTES, IMPORT_CHUNK_SIZE, EXPORT_BATCH_SIZE,
+    SYNC_WRITE_BATCH_SIZE, ACTIVITY_STREAM_HEARTBEAT_SECONDS,
+    API_MAX_RETRIES, API_RETRY_DELAYS
 )
 from models import (
     # UUID utilities
@@ -95,15 +97,36 @@ from utils import (
     # Validation
     EMAIL_PATTERN, PHONE_PATTERN,
     PASSWORD_MIN_LENGTH, PASSWORD_MAX_LENGTH,
-    escape_regex, validate_email, validate_phone, validate_password_strength,
+    validate_email, validate_phone, validate_password_strength,
     # Phone normalization
     normalize_phone_number,
-    # Engagement calculation
-    calculate_engagement_status,
-    # Cache
-    get_from_cache, set_in_cache, invalidate_cache,
+    # Stored engagement
+    contact_fields,
 )
-from dependencies import init_dependencies
+from dependencies import init_dependencies, load_user_principal, get_user_cache_stats, get_client_ip
+from services.cache import get_cache, get_rate_limiter, CacheService
+from services.rate_limit import select_policy, rate_limit_key
+from services.metrics import (
+    HTTP_REQUEST_DURATION, HTTP_RESPONSE_SIZE, HTTP_IN_FLIGHT, mongo_command_metrics,
+    get_metrics_publisher, render as render_metrics,
+)
+from services.query_profiler import QUERY_PROFILER_ENABLED, query_profiler, profile_queries, log_profile
+from services.member_import import MemberImportService, iter_csv_rows
+from services.csv_export import stream_csv, gzip_stream
+from services.pagination import RECENT_FIRST_SORT, keyset_query, split_page, cached_count
+from services.loaders import get_loaders, display_name
+from services.search_service import SearchService, ENTITY_CARE_EVENT
+from services.activity_writer import get_activity_writer
+from services.report_service import ReportService
+from services.rollup_service import RollupService, summarize_events, summarize_staff
+from services.analytics_service import AnalyticsService
+from services.engagement_service import EngagementService
+from services.image_service import HASHED_PHOTO_NAME, PHOTO_CACHE_CONTROL
+from services.http_client import (
+    shared_http_client, request_with_retry, UPSTREAM_WHATSAPP, UPSTREAM_CORE_API, UPSTREAM_DEFAULT
+)
+from pymongo import InsertOne, UpdateOne, UpdateMany
+from urllib.parse import quote
 from routes.campus import route_handlers as campus_route_handlers
 from routes.auth import route_handlers as auth_route_handlers
 from routes.members import route_handlers as member_route_handlers, init_member_routes
@@ -111,7 +134,10 @@ from routes.care_events import route_handlers as care_event_route_handlers, init
 from routes.grief_support import route_handlers as grief_support_route_handlers, init_grief_support_routes
 from routes.accident_followup import route_handlers as accident_followup_route_handlers, init_accident_followup_routes
 from routes.financial_aid import route_handlers as financial_aid_route_handlers, init_financial_aid_routes
-from routes.dashboard import route_handlers as dashboard_route_handlers, init_dashboard_routes
+from routes.dashboard import (
+    route_handlers as dashboard_route_handlers, init_dashboard_routes,
+    patch_dashboard_reminders, mark_dashboard_reminders_stale
+)
 
 
 # Custom msgspec response class for proper BSON/MongoDB type serialization
@@ -214,11 +240,6 @@ class CustomMsgspecResponse(Response):
 # Jakarta timezone (UTC+7)
 JAKARTA_TZ = ZoneInfo("Asia/Jakarta")
 
-# PDF report generation (lazy import to avoid startup issues)
-def get_pdf_generator():
-    from pdf_report import generate_monthly_report_pdf
-    return generate_monthly_report_pdf
-
 # Configure logging - structured JSON in production, human-readable in development
 import sys
 
@@ -307,34 +328,17 @@ async def http_request_with_retry(
     method: str,
     url: str,
     max_retries: int = API_MAX_RETRIES,
-    retry_delays: list = API_RETRY_DELAYS,
-    timeout: float = API_RETRY_TIMEOUT,
+    upstream: str = UPSTREAM_DEFAULT,
     **kwargs
 ) -> httpx.Response:
     """
-    Make an HTTP request with automatic retry on transient failures.
+    Make an HTTP request on the pooled client with automatic retry on transient failures.
     Uses exponential backoff for network errors and timeouts.
     """
-    last_error = None
-    for attempt in range(max_retries):
-        try:
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                response = await client.request(method, url, **kwargs)
-                return response
-        except (httpx.ConnectError, httpx.TimeoutException) as e:
-            last_error = e
-            if attempt < max_retries - 1:
-                delay = retry_delays[min(attempt, len(retry_delays) - 1)]
-                logger.warning(f"HTTP {method} {url} failed (attempt {attempt + 1}/{max_retries}): {e}. Retrying in {delay}s...")
-                await asyncio.sleep(delay)
-            else:
-                logger.error(f"HTTP {method} {url} failed after {max_retries} attempts: {e}")
-                raise
-    raise last_error
+    return await request_with_retry(method, url, upstream=upstream, max_retries=max_retries, **kwargs)
 
 from PIL import Image
-import io
-import csv
+import tempfile
 import json as json_lib
 import jwt
 from jwt.exceptions import InvalidTokenError as JWTError  # PyJWT (no ecdsa vulnerability)
@@ -358,6 +362,7 @@ client = AsyncIOMotorClient(
     serverSelectionTimeoutMS=5000,  # Timeout for server selection
     connectTimeoutMS=10000,  # Timeout for new connections
     socketTimeoutMS=45000,  # Timeout for socket operations
+    event_listeners=[mongo_command_metrics, query_profiler],  # /metrics timings; per-request profiling in development
 )
 db = client[os.environ.get('DB_NAME', 'pastoral_care_db')]
 
@@ -406,113 +411,100 @@ class SecurityHeadersMiddleware(AbstractMiddleware):
         else:
             await self.app(scope, receive, send)
 
-# ==================== LOGIN RATE LIMITING & ACCOUNT LOCKOUT ====================
-
-# In-memory storage for login attempts (per IP and per account)
-# Format: {"ip:email": {"attempts": int, "last_attempt": datetime, "locked_until": datetime | None}}
-_login_attempts: Dict[str, Dict[str, Any]] = {}
-
-# Security constants for brute force protection
-LOGIN_MAX_ATTEMPTS = 5  # Max failed attempts before lockout
-LOGIN_LOCKOUT_MINUTES = 15  # Account lockout duration
-LOGIN_ATTEMPT_WINDOW_MINUTES = 5  # Time window to count attempts
-
-def _get_client_ip(request: Request) -> str:
-    """Extract client IP from request, handling proxied requests"""
-    # Check X-Forwarded-For header (from Angie/reverse proxy)
-    forwarded_for = request.headers.get("x-forwarded-for", "")
-    if forwarded_for:
-        # Take the first IP (original client)
-        return forwarded_for.split(",")[0].strip()
-    # Check X-Real-IP header
-    real_ip = request.headers.get("x-real-ip", "")
-    if real_ip:
-        return real_ip.strip()
-    # Fallback to direct connection IP
-    client = request.scope.get("client")
-    return client[0] if client else "unknown"
-
-def _check_login_rate_limit(ip: str, email: str) -> tuple[bool, str | None]:
-    """
-    Check if login attempt is allowed.
-    Returns (is_allowed, error_message).
-    """
-    key = f"{ip}:{email.lower()}"
-    now = datetime.now(timezone.utc)
+# Request metrics - latency, status and response size per route template (exposed on /metrics)
+class MetricsMiddleware(AbstractMiddleware):
+    """Record per-route latency histograms, in-flight requests and response sizes"""
+    scopes = {ScopeType.HTTP}
+    # Long-lived SSE connections would only skew latencies; scrapes should not measure themselves
+    exclude = ["^/stream/", "^/metrics$"]
 
-    if key in _login_attempts:
-        record = _login_attempts[key]
+    async def __call__(self, scope, receive, send):
+        route = scope.get("path_template", "unmatched")
+        method = scope["method"]
+        status = 500
+        size = 0
+
+        async def send_with_metrics(message):
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - started, method, route, str(status))
+            HTTP_RESPONSE_SIZE.observe(size, method, route)
 
-        # Check if account is locked
-        if record.get("locked_until"):
-            if now < record["locked_until"]:
-                remaining = int((record["locked_until"] - now).total_seconds() // 60) + 1
-                return False, f"Account temporarily locked. Try again in {remaining} minutes."
-            else:
-                # Lockout expired, reset
-                del _login_attempts[key]
-                return True, None
-
-        # Check if within attempt window
-        window_start = now - timedelta(minutes=LOGIN_ATTEMPT_WINDOW_MINUTES)
-        if record["last_attempt"] > window_start:
-            if record["attempts"] >= LOGIN_MAX_ATTEMPTS:
-                # Lock the account
-                record["locked_until"] = now + timedelta(minutes=LOGIN_LOCKOUT_MINUTES)
-                logger.warning(f"Account locked due to too many failed attempts: {email} from {ip}")
-                return False, f"Too many failed attempts. Account locked for {LOGIN_LOCKOUT_MINUTES} minutes."
-
-    return True, None
-
-def _record_failed_login(ip: str, email: str) -> None:
-    """Record a failed login attempt"""
-    key = f"{ip}:{email.lower()}"
-    now = datetime.now(timezone.utc)
+# Query profiling (development only, QUERY_PROFILER=1) - flags N+1 patterns and slow queries per request
+class QueryProfilerMiddleware(AbstractMiddleware):
+    """Count Mongo commands per request and report them as X-Query-* response headers"""
+    scopes = {ScopeType.HTTP}
+    exclude = ["^/stream/", "^/metrics$"]
 
-    if key in _login_attempts:
-        record = _login_attempts[key]
-        window_start = now - timedelta(minutes=LOGIN_ATTEMPT_WINDOW_MINUTES)
+    async def __call__(self, scope, receive, send):
+        label = f"{scope['method']} {scope.get('path_template', scope['path'])}"
+        with profile_queries() as profile:
+            async def send_with_query_headers(message):
+                if message["type"] == "http.response.start":
+                    await profile.explain_slow(client)
+                    log_profile(label, profile)
+                    query_headers = [(k.lower().encode(), v.encode()) for k, v in profile.headers().items()]
+                    message = {**message, "headers": [*message.get("headers", []), *query_headers]}
+                await send(message)
+            await self.app(scope, receive, send_with_query_headers)
 
-        if record["last_attempt"] > window_start:
-            record["attempts"] += 1
-        else:
-            # Outside window, reset counter
-            record["attempts"] = 1
-        record["last_attempt"] = now
-    else:
-        _login_attempts[key] = {
-            "attempts": 1,
-            "last_attempt": now,
-            "locked_until": None
-        }
+# Request rate limiting - sliding windows shared by all workers (policies in services/rate_limit.py)
+class RateLimitMiddleware(AbstractMiddleware):
+    """Reject requests over their rate limit policy with 429 and Retry-After"""
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request = Request(scope)
+        user_id = _token_subject(request)
+        policy = select_policy(scope["method"], scope["path"], user_id is not None)
+        if policy is None:
+            await self.app(scope, receive, send)
+            return
 
-    # Log failed attempt
-    attempts = _login_attempts[key]["attempts"]
-    logger.warning(f"Failed login attempt {attempts}/{LOGIN_MAX_ATTEMPTS} for {email} from {ip}")
+        key = rate_limit_key(policy, user_id, get_client_ip(request))
+        result = await get_rate_limiter().hit_rate_limit(key, policy.limit, policy.window_seconds)
+        limit_headers = [
+            (b"ratelimit-limit", str(policy.limit).encode()),
+            (b"ratelimit-remaining", str(max(0, policy.limit - result.hits)).encode()),
+        ]
+        if not result.allowed:
+            response = LitestarResponse(
+                content={"detail": "Too many requests. Please slow down."},
+                status_code=HTTP_429_TOO_MANY_REQUESTS,
+                headers={"Retry-After": str(result.retry_after)},
+                media_type="application/json"
+            )
+            await response(scope, receive, send)
+            return
 
-def _clear_login_attempts(ip: str, email: str) -> None:
-    """Clear login attempts after successful login"""
-    key = f"{ip}:{email.lower()}"
-    if key in _login_attempts:
-        del _login_attempts[key]
+        async def send_with_limit_headers(message):
+            if message["type"] == "http.response.start":
+                message = {**message, "headers": [*message.get("headers", []), *limit_headers]}
+            await send(message)
+        await self.app(scope, receive, send_with_limit_headers)
 
-# Cleanup old entries periodically (called on each login attempt)
-def _cleanup_old_login_attempts() -> None:
-    """Remove expired login attempt records to prevent memory growth"""
-    now = datetime.now(timezone.utc)
-    expiry = now - timedelta(minutes=LOGIN_LOCKOUT_MINUTES + LOGIN_ATTEMPT_WINDOW_MINUTES)
 
-    keys_to_delete = []
-    for key, record in _login_attempts.items():
-        # Remove if last attempt was long ago and not locked
-        if record["last_attempt"] < expiry and not record.get("locked_until"):
-            keys_to_delete.append(key)
-        # Remove if lockout has expired
-        elif record.get("locked_until") and record["locked_until"] < now:
-            keys_to_delete.append(key)
-
-    for key in keys_to_delete:
-        del _login_attempts[key]
+def _token_subject(request: Request) -> Optional[str]:
+    """User id of a valid bearer token, None for anonymous (or forged) requests"""
+    auth = request.headers.get("authorization", "")
+    if not auth.startswith("Bearer "):
+        return None
+    try:
+        return jwt.decode(auth[7:], SECRET_KEY, algorithms=[ALGORITHM]).get("sub")
+    except jwt.PyJWTError:
+        return None
 
 # ==================== SAFE ERROR HANDLING ====================
 
@@ -693,7 +685,7 @@ async def get_current_user(request: Request) -> dict:
             detail="Could not validate credentials",
         )
 
-    user = await db.users.find_one({"id": user_id}, {"_id": 0})
+    user = await load_user_principal(user_id)
     if user is None:
         raise HTTPException(
             status_code=HTTP_401_UNAUTHORIZED,
@@ -737,12 +729,11 @@ def get_campus_filter(current_user: dict):
 # (All models now imported from models.py)
 
 # ==================== UTILITY FUNCTIONS ====================
-# (Cache functions now imported from utils.py)
 
 async def _get_engagement_settings_cached():
-    """Get engagement threshold settings from database (cached for 10 minutes) - internal helper"""
-    cache_key = "engagement_settings"
-    cached = get_from_cache(cache_key, ttl_seconds=600)
+    """Get engagement threshold settings from database (cached, invalidated on update) - internal helper"""
+    cache = get_cache()
+    cached = await cache.get(CacheService.KEY_ENGAGEMENT_SETTINGS)
     if cached is not None:
         return cached
 
@@ -753,16 +744,16 @@ async def _get_engagement_settings_cached():
         else:
             result = {"atRiskDays": ENGAGEMENT_AT_RISK_DAYS_DEFAULT, "disconnectedDays": ENGAGEMENT_DISCONNECTED_DAYS_DEFAULT}
 
-        set_in_cache(cache_key, result)
+        await cache.set(CacheService.KEY_ENGAGEMENT_SETTINGS, result, ttl=CacheService.SETTINGS_TTL)
         return result
     except Exception as e:
         logger.warning(f"Failed to get engagement settings: {str(e)}, using defaults")
         return {"atRiskDays": ENGAGEMENT_AT_RISK_DAYS_DEFAULT, "disconnectedDays": ENGAGEMENT_DISCONNECTED_DAYS_DEFAULT}
 
 async def get_writeoff_settings():
-    """Get overdue write-off threshold settings from database (cached for 10 minutes)"""
-    cache_key = "writeoff_settings"
-    cached = get_from_cache(cache_key, ttl_seconds=600)
+    """Get overdue write-off threshold settings from database (cached, invalidated on update)"""
+    cache = get_cache()
+    cached = await cache.get(CacheService.KEY_WRITEOFF_SETTINGS)
     if cached is not None:
         return cached
 
@@ -780,7 +771,7 @@ async def get_writeoff_settings():
         else:
             result = default_settings
 
-        set_in_cache(cache_key, result)
+        await cache.set(CacheService.KEY_WRITEOFF_SETTINGS, result, ttl=CacheService.SETTINGS_TTL)
         return result
     except Exception as e:
         logger.warning(f"Failed to get writeoff settings: {str(e)}, using defaults")
@@ -818,6 +809,47 @@ async def calculate_engagement_status_async(last_contact: Optional[datetime]) ->
 
 # calculate_engagement_status (sync) and normalize_phone_number now imported from utils.py
 
+def _build_activity(
+    campus_id: str,
+    user_id: str,
+    user_name: str,
+    action_type: ActivityActionType,
+    member_id: Optional[str] = None,
+    member_name: Optional[str] = None,
+    care_event_id: Optional[str] = None,
+    event_type: Optional[EventType] = None,
+    notes: Optional[str] = None,
+    user_photo_url: Optional[str] = None
+) -> tuple[dict, dict]:
+    """Build the activity_logs document and the SSE payload broadcast once it is stored"""
+    activity = ActivityLog(
+        campus_id=campus_id,
+        user_id=user_id,
+        user_name=user_name,
+        user_photo_url=user_photo_url,
+        action_type=action_type,
+        member_id=member_id,
+        member_name=member_name,
+        care_event_id=care_event_id,
+        event_type=event_type,
+        notes=notes
+    )
+    activity_data = {
+        "id": activity.id,
+        "campus_id": campus_id,
+        "user_id": user_id,
+        "user_name": user_name,
+        "user_photo_url": user_photo_url,
+        "action_type": action_type.value if hasattr(action_type, 'value') else action_type,
+        "member_id": member_id,
+        "member_name": member_name,
+        "care_event_id": care_event_id,
+        "event_type": event_type.value if event_type and hasattr(event_type, 'value') else event_type,
+        "notes": notes,
+        "timestamp": activity.created_at.isoformat() if activity.created_at else datetime.now(JAKARTA_TZ).isoformat()
+    }
+    return to_mongo_doc(activity), activity_data
+
 async def log_activity(
     campus_id: str,
     user_id: str,
@@ -832,49 +864,53 @@ async def log_activity(
 ):
     """Log user activity for accountability tracking and broadcast to SSE subscribers"""
     try:
-        activity = ActivityLog(
-            campus_id=campus_id,
-            user_id=user_id,
-            user_name=user_name,
-            user_photo_url=user_photo_url,
-            action_type=action_type,
-            member_id=member_id,
-            member_name=member_name,
-            care_event_id=care_event_id,
-            event_type=event_type,
-            notes=notes
+        doc, activity_data = _build_activity(
+            campus_id, user_id, user_name, action_type, member_id, member_name,
+            care_event_id, event_type, notes, user_photo_url
         )
-        await db.activity_logs.insert_one(to_mongo_doc(activity))
-        logger.info(f"Activity logged: {user_name} - {action_type} - {member_name}")
 
-        # Broadcast to SSE subscribers for real-time updates
-        # Import here to avoid circular import at module level
-        try:
-            activity_data = {
-                "id": activity.id,
-                "campus_id": campus_id,
-                "user_id": user_id,
-                "user_name": user_name,
-                "user_photo_url": user_photo_url,
-                "action_type": action_type.value if hasattr(action_type, 'value') else action_type,
-                "member_id": member_id,
-                "member_name": member_name,
-                "care_event_id": care_event_id,
-                "event_type": event_type.value if event_type and hasattr(event_type, 'value') else event_type,
-                "notes": notes,
-                "timestamp": activity.created_at.isoformat() if activity.created_at else datetime.now(JAKARTA_TZ).isoformat()
-            }
-            # Schedule broadcast without blocking (fire and forget)
-            import asyncio
-            asyncio.create_task(_broadcast_activity_safe(campus_id, activity_data))
-        except Exception as broadcast_err:
-            logger.debug(f"SSE broadcast skipped: {str(broadcast_err)}")
+        # Write-behind: the entry is batched with others instead of awaiting its own insert
+        writer = get_activity_writer()
+        if writer:
+            await writer.write(doc, activity_data)
+        else:
+            await db.activity_logs.insert_one(doc)
+            await RollupService(db).apply_activities([doc])
+            await _broadcast_activity_safe(campus_id, activity_data)
+        logger.debug(f"Activity logged: {user_name} - {action_type} - {member_name}")
 
     except Exception as e:
         logger.error(f"Error logging activity: {str(e)}")
         # Don't fail the main operation if logging fails
         pass
 
+async def log_activities(entries: List[Dict[str, Any]]):
+    """Log a batch of activities (log_activity keyword arguments each) with one insert"""
+    if not entries:
+        return
+    try:
+        built = [_build_activity(**entry) for entry in entries]
+        docs = [doc for doc, _ in built]
+        broadcasts = [activity_data for _, activity_data in built]
+
+        writer = get_activity_writer()
+        if writer:
+            await writer.write_many(docs, broadcasts)
+        else:
+            await db.activity_logs.insert_many(docs, ordered=False)
+            await RollupService(db).apply_activities(docs)
+            by_campus: Dict[str, List[dict]] = {}
+            for activity_data in broadcasts:
+                by_campus.setdefault(activity_data["campus_id"], []).append(activity_data)
+            for campus_id, activities in by_campus.items():
+                await _broadcast_activities_safe(campus_id, activities)
+        logger.debug(f"Activity logged: {len(docs)} entries")
+
+    except Exception as e:
+        logger.error(f"Error logging {len(entries)} activities: {str(e)}")
+        # Don't fail the main operation if logging fails
+        pass
+
 async def _broadcast_activity_safe(campus_id: str, activity_data: dict):
     """Safe wrapper for broadcasting that won't fail if broadcast_activity isn't defined yet"""
     try:
@@ -884,6 +920,15 @@ async def _broadcast_activity_safe(campus_id: str, activity_data: dict):
     except Exception as e:
         logger.debug(f"SSE broadcast error: {str(e)}")
 
+async def _broadcast_activities_safe(campus_id: str, activities: List[dict]):
+    """Batch form of _broadcast_activity_safe (one pipelined publish per campus)"""
+    try:
+        await broadcast_activities(campus_id, activities)
+    except NameError:
+        pass  # broadcast_activities not yet defined during module load
+    except Exception as e:
+        logger.debug(f"SSE broadcast error: {str(e)}")
+
 # ==================== HELPER FUNCTIONS ====================
 
 async def get_member_or_404(member_id: str, projection: Optional[dict] = None) -> dict:
@@ -1028,7 +1073,7 @@ async def send_whatsapp_message(phone: str, message: str, care_event_id: Optiona
             "message": message
         }
         
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with shared_http_client(UPSTREAM_WHATSAPP) as client:
             response = await client.post(f"{whatsapp_url}/send/message", json=payload)
             response_data = response.json()
             
@@ -1083,26 +1128,28 @@ async def send_whatsapp_message(phone: str, message: str, care_event_id: Optiona
 # ==================== MEMBER ENDPOINTS ====================
 # (Moved to routes/members.py)
 
-async def invalidate_dashboard_cache(campus_id: str):
-    """Invalidate dashboard cache for a specific campus - call after any data change"""
+async def invalidate_dashboard_cache(campus_id: str, member_ids: Optional[List[str]] = None):
+    """Refresh dashboard reminders for a campus - call after any data change.
+
+    When the change only touches known members, their rows are patched in the
+    materialized reminder store; otherwise the store is marked stale and
+    rebuilt in the background while it keeps being served.
+    """
     try:
-        # Get campus timezone to determine today's date
-        campus_tz = await get_campus_timezone(campus_id)
-        today_date = get_date_in_timezone(campus_tz)
-        
-        # Delete today's cache
-        cache_key = f"dashboard_reminders_{campus_id}_{today_date}"
-        await db.dashboard_cache.delete_one({"cache_key": cache_key})
-        
+        if member_ids:
+            try:
+                await patch_dashboard_reminders(campus_id, member_ids)
+                logger.info(f"Dashboard reminders patched for campus {campus_id} ({len(member_ids)} members)")
+                return
+            except Exception as e:
+                logger.warning(f"Patching dashboard reminders failed, marking stale: {str(e)}")
+
+        await mark_dashboard_reminders_stale(campus_id)
         logger.info(f"Dashboard cache invalidated for campus {campus_id}")
     except Exception as e:
         logger.error(f"Error invalidating dashboard cache: {str(e)}")
 
 
-# Timezone cache to avoid repeated DB lookups
-_timezone_cache: dict[str, tuple[str, float]] = {}
-TIMEZONE_CACHE_TTL = 600  # 10 minutes
-
 # Valid timezones set for validation
 try:
     from zoneinfo import available_timezones
@@ -1115,14 +1162,12 @@ def is_valid_timezone(tz_str: str) -> bool:
     return tz_str in VALID_TIMEZONES
 
 async def get_campus_timezone(campus_id: str) -> str:
-    """Get campus timezone setting (cached for 10 minutes)"""
-    import time
-
+    """Get campus timezone setting (cached, invalidated when the campus changes)"""
     # Check cache first
-    if campus_id in _timezone_cache:
-        cached_tz, cached_time = _timezone_cache[campus_id]
-        if time.time() - cached_time < TIMEZONE_CACHE_TTL:
-            return cached_tz
+    cache = get_cache()
+    cached_tz = await cache.get(CacheService.KEY_CAMPUS_TIMEZONE, church_id=campus_id)
+    if cached_tz:
+        return cached_tz
 
     try:
         campus = await db.campuses.find_one({"id": campus_id}, {"_id": 0, "timezone": 1})
@@ -1131,7 +1176,7 @@ async def get_campus_timezone(campus_id: str) -> str:
         if not is_valid_timezone(tz):
             logger.warning(f"Invalid timezone '{tz}' for campus {campus_id}, using default")
             tz = "Asia/Jakarta"
-        _timezone_cache[campus_id] = (tz, time.time())
+        await cache.set(CacheService.KEY_CAMPUS_TIMEZONE, tz, ttl=CacheService.SETTINGS_TTL, church_id=campus_id)
         return tz
     except Exception as e:
         logger.warning(f"Failed to get campus timezone: {str(e)}, using default")
@@ -1180,6 +1225,7 @@ async def ignore_care_event(event_id: str, request: Request) -> dict:
                 "updated_at": datetime.now(timezone.utc)
             }}
         )
+        await RollupService(db).mark_care_events([event])
 
         # Log activity
         await log_activity(
@@ -1196,7 +1242,7 @@ async def ignore_care_event(event_id: str, request: Request) -> dict:
         )
         
         # Invalidate dashboard cache
-        await invalidate_dashboard_cache(event["campus_id"])
+        await invalidate_dashboard_cache(event["campus_id"], [event["member_id"]])
         
         return {"success": True, "message": "Care event ignored"}
         
@@ -1224,6 +1270,7 @@ async def delete_care_event(event_id: str, request: Request) -> dict:
         
         member_id = event["member_id"]
         event_type = event.get("event_type")
+        rollups = RollupService(db)
         
         # If deleting a timeline event created from followup completion, reset the stage
         if event_type in ["grief_loss", "accident_illness"]:
@@ -1263,15 +1310,20 @@ async def delete_care_event(event_id: str, request: Request) -> dict:
                     {"id": birthday_event["id"]},
                     {"$set": {"completed": False, "updated_at": datetime.now(timezone.utc)}}
                 )
+                await rollups.mark_care_events([birthday_event])
                 # Also delete the activity log associated with the original birthday event completion
+                await rollups.mark_activity_query({"care_event_id": birthday_event["id"]})
                 await db.activity_logs.delete_many({"care_event_id": birthday_event["id"]})
         
         # Delete the care event
         result = await db.care_events.delete_one({"id": event_id})
         if result.deleted_count == 0:
             raise HTTPException(status_code=404, detail="Care event not found")
+        await SearchService(db).remove(ENTITY_CARE_EVENT, [event_id])
+        await rollups.mark_care_events([event])
 
         # Delete activity logs related to this care event
+        await rollups.mark_activity_query({"care_event_id": event_id})
         activity_delete_result = await db.activity_logs.delete_many({"care_event_id": event_id})
         logger.info(f"[DELETE EVENT] Deleted {activity_delete_result.deleted_count} activity logs for care_event_id={event_id}")
 
@@ -1298,10 +1350,12 @@ async def delete_care_event(event_id: str, request: Request) -> dict:
 
                 # Delete activity logs and notification logs for these timeline entries
                 if timeline_entry_ids:
+                    await rollups.mark_activity_query({"care_event_id": {"$in": timeline_entry_ids}})
                     await db.activity_logs.delete_many({"care_event_id": {"$in": timeline_entry_ids}})
                     await db.notification_logs.delete_many({"care_event_id": {"$in": timeline_entry_ids}})
 
                 # Delete the timeline entries
+                await rollups.mark_care_event_query({"grief_stage_id": {"$in": stage_ids}})
                 await db.care_events.delete_many({"grief_stage_id": {"$in": stage_ids}})
 
             # Delete grief support stages
@@ -1326,10 +1380,12 @@ async def delete_care_event(event_id: str, request: Request) -> dict:
 
                 # Delete activity logs and notification logs for these timeline entries
                 if timeline_entry_ids:
+                    await rollups.mark_activity_query({"care_event_id": {"$in": timeline_entry_ids}})
                     await db.activity_logs.delete_many({"care_event_id": {"$in": timeline_entry_ids}})
                     await db.notification_logs.delete_many({"care_event_id": {"$in": timeline_entry_ids}})
 
                 # Delete the timeline entries
+                await rollups.mark_care_event_query({"accident_stage_id": {"$in": stage_ids}})
                 await db.care_events.delete_many({"accident_stage_id": {"$in": stage_ids}})
 
             # Delete accident followup stages
@@ -1348,56 +1404,27 @@ async def delete_care_event(event_id: str, request: Request) -> dict:
             {"_id": 0, "created_at": 1}
         ).sort("created_at", -1).limit(1).to_list(1)
         
-        if remaining_events:
-            # Update to most recent remaining event
-            last_event = remaining_events[0]
-            new_last_contact = last_event["created_at"]
-            
-            # Calculate new engagement status
-            if isinstance(new_last_contact, str):
-                last_contact_dt = datetime.fromisoformat(new_last_contact)
-            else:
-                last_contact_dt = new_last_contact
-                
-            if last_contact_dt.tzinfo is None:
-                last_contact_dt = last_contact_dt.replace(tzinfo=timezone.utc)
-            
-            days_since = (datetime.now(timezone.utc) - last_contact_dt).days
-            
-            if days_since < 60:
-                engagement_status = "active"
-            elif days_since < 90:
-                engagement_status = "at_risk"
-            else:
-                engagement_status = "disconnected"
-                
-            await db.members.update_one(
-                {"id": member_id},
-                {"$set": {
-                    "last_contact_date": new_last_contact,
-                    "days_since_last_contact": days_since,
-                    "engagement_status": engagement_status,
-                    "updated_at": datetime.now(timezone.utc)
-                }}
-            )
-        else:
-            # No remaining events - reset to never contacted
-            await db.members.update_one(
-                {"id": member_id},
-                {"$set": {
-                    "last_contact_date": None,
-                    "days_since_last_contact": 999,
-                    "engagement_status": "disconnected",
-                    "updated_at": datetime.now(timezone.utc)
-                }}
-            )
+        # Most recent remaining event; no remaining events resets to never contacted
+        new_last_contact = remaining_events[0]["created_at"] if remaining_events else None
+        settings = await _get_engagement_settings_cached()
+        await db.members.update_one(
+            {"id": member_id},
+            {"$set": {
+                **contact_fields(
+                    new_last_contact,
+                    settings.get("atRiskDays", ENGAGEMENT_AT_RISK_DAYS_DEFAULT),
+                    settings.get("disconnectedDays", ENGAGEMENT_DISCONNECTED_DAYS_DEFAULT)
+                ),
+                "updated_at": datetime.now(timezone.utc)
+            }}
+        )
         
         # Also delete related grief support stages and accident followup stages
         await db.grief_support.delete_many({"care_event_id": event_id})
         await db.accident_followup.delete_many({"care_event_id": event_id})
         
         # Invalidate dashboard cache
-        await invalidate_dashboard_cache(event["campus_id"])
+        await invalidate_dashboard_cache(event["campus_id"], [event["member_id"]])
         
         return {"success": True, "message": "Care event deleted successfully"}
     except HTTPException:
@@ -1422,8 +1449,8 @@ async def sync_members_from_external_api(
     try:
         headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.get(api_url, headers=headers)
+        async with shared_http_client(UPSTREAM_DEFAULT) as client:
+            response = await client.get(api_url, headers=headers, timeout=60.0)
             external_members = response.json()
 
         sync_campus_id = campus_id or current_admin.get('campus_id')
@@ -1523,6 +1550,8 @@ async def sync_members_from_external_api(
                 archived_count += 1
                 logger.info(f"Archived member {member['name']} - no longer in external source")
         
+        await invalidate_dashboard_cache(sync_campus_id)
+
         return {
             "success": True,
             "synced_count": synced_count,
@@ -1546,61 +1575,62 @@ async def member_sync_webhook(request: Request) -> dict:
 
 # ==================== IMPORT/EXPORT ENDPOINTS ====================
 
-@post("/import/members/csv")
-async def import_members_csv(request: Request, data: UploadFile) -> Response:
-    """Import members from CSV file"""
+def _import_completion_hook(current_user: dict, source: str):
+    """Log the finished import and refresh the campus dashboard"""
+    async def on_complete(job: dict) -> None:
+        if not job["imported"]:
+            return
+        await log_activity(
+            campus_id=job["campus_id"],
+            user_id=current_user["id"],
+            user_name=current_user["name"],
+            action_type=ActivityActionType.CREATE_MEMBER,
+            notes=f"Imported {job['imported']} members from {source}",
+            user_photo_url=current_user.get("photo_url")
+        )
+        await invalidate_dashboard_cache(job["campus_id"])
+    return on_complete
+
+
+@post("/import/members/csv", status_code=HTTP_202_ACCEPTED)
+async def import_members_csv(request: Request, data: UploadFile) -> dict:
+    """Import members from CSV file as a background job"""
     current_user = await get_current_user(request)
     file = data  # Alias for compatibility
+    tmp_path = None
     try:
         # Get campus_id from current user for multi-tenancy
         campus_id = current_user.get("campus_id")
         if not campus_id:
             raise HTTPException(status_code=400, detail="No campus assigned to your account")
 
-        # Read and validate file size
-        contents = await file.read()
-        if len(contents) > MAX_CSV_SIZE:
-            raise HTTPException(status_code=400, detail=f"File too large. Maximum size is {MAX_CSV_SIZE // (1024*1024)} MB.")
-
-        decoded = contents.decode('utf-8')
-        reader = csv.DictReader(io.StringIO(decoded))
-
-        imported_count = 0
-        errors = []
-
-        for row in reader:
-            try:
-                # Create member from CSV row with campus_id for multi-tenancy
-                member = Member(
-                    name=row.get('name', ''),
-                    phone=row.get('phone', ''),
-                    external_member_id=row.get('external_member_id'),
-                    notes=row.get('notes'),
-                    campus_id=campus_id
-                )
-
-                await db.members.insert_one(to_mongo_doc(member))
-                imported_count += 1
-            except Exception as e:
-                errors.append(f"Row error: {str(e)}")
-
-        # Log the import activity
-        await log_activity(current_user["id"], "import", None, f"Imported {imported_count} members from CSV")
-
-        return {
-            "success": True,
-            "imported_count": imported_count,
-            "errors": errors
-        }
+        # Spool the upload to disk in chunks so large files never sit in memory
+        fd, tmp_path = tempfile.mkstemp(prefix="member-import-", suffix=".csv")
+        size = 0
+        with os.fdopen(fd, "wb") as out:
+            while chunk := await file.read(IMPORT_CHUNK_SIZE):
+                size += len(chunk)
+                if size > MAX_CSV_SIZE:
+                    raise HTTPException(status_code=400, detail=f"File too large. Maximum size is {MAX_CSV_SIZE // (1024*1024)} MB.")
+                out.write(chunk)
+
+        importer = MemberImportService(db)
+        job = await importer.create_job(campus_id, "csv", current_user["id"])
+        importer.start(job, iter_csv_rows(tmp_path), _import_completion_hook(current_user, "CSV"), cleanup_path=tmp_path)
+        tmp_path = None  # Owned by the import job now
+        return {"success": True, "job_id": job["id"], "status": job["status"]}
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error importing CSV: {str(e)}")
         raise HTTPException(status_code=500, detail=safe_error_detail(e))
+    finally:
+        if tmp_path:
+            os.unlink(tmp_path)
 
-@post("/import/members/json")
+@post("/import/members/json", status_code=HTTP_202_ACCEPTED)
 async def import_members_json(data: List[Dict[str, Any]] = Body(), request: Request = None) -> dict:
-    """Import members from JSON array"""
+    """Import members from JSON array as a background job"""
     current_user = await get_current_user(request)
     try:
         # Get campus_id from current user for multi-tenancy
@@ -1608,121 +1638,128 @@ async def import_members_json(data: List[Dict[str, Any]] = Body(), request: Requ
         if not campus_id:
             raise HTTPException(status_code=400, detail="No campus assigned to your account")
 
-        imported_count = 0
-        errors = []
-
-        for member_data in data:
-            try:
-                member = Member(
-                    name=member_data.get('name', ''),
-                    phone=member_data.get('phone', ''),
-                    external_member_id=member_data.get('external_member_id'),
-                    notes=member_data.get('notes'),
-                    campus_id=campus_id
-                )
-
-                await db.members.insert_one(to_mongo_doc(member))
-                imported_count += 1
-            except Exception as e:
-                errors.append(f"Member error: {str(e)}")
-
-        # Log the import activity
-        await log_activity(current_user["id"], "import", None, f"Imported {imported_count} members from JSON")
-
-        return {
-            "success": True,
-            "imported_count": imported_count,
-            "errors": errors
-        }
+        importer = MemberImportService(db)
+        job = await importer.create_job(campus_id, "json", current_user["id"])
+        importer.start(job, data, _import_completion_hook(current_user, "JSON"))
+        return {"success": True, "job_id": job["id"], "status": job["status"]}
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error importing JSON: {str(e)}")
         raise HTTPException(status_code=500, detail=safe_error_detail(e))
 
-@get("/export/members/csv")
-async def export_members_csv(request: Request) -> Response:
-    """Export members to CSV file - optimized with field projection (70% less data transfer)"""
+@get("/import/jobs/{job_id:str}")
+async def get_import_job(job_id: str, request: Request) -> dict:
+    """Get progress of a member import job"""
     current_user = await get_current_user(request)
     try:
-        # Build campus filter for multi-tenancy
-        campus_filter = get_campus_filter(current_user)
-        query = campus_filter if campus_filter else {}
+        campus_id = None if current_user.get("role") == UserRole.FULL_ADMIN.value else current_user.get("campus_id")
+        job = await MemberImportService(db).get_job(job_id, campus_id)
+        if not job:
+            raise HTTPException(status_code=404, detail="Import job not found")
+        return job
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting import job: {str(e)}")
+        raise HTTPException(status_code=500, detail=safe_error_detail(e))
 
-        # Only fetch fields needed for export (reduces data transfer by ~70%)
-        projection = {
-            "_id": 0, "id": 1, "name": 1, "phone": 1, "external_member_id": 1,
-            "last_contact_date": 1, "engagement_status": 1, "days_since_last_contact": 1, "notes": 1
-        }
-        members = await db.members.find(query, projection).to_list(10000)
-        
-        output = io.StringIO()
-        if members:
-            fieldnames = ['id', 'name', 'phone', 'external_member_id',
-                         'last_contact_date', 'engagement_status', 'days_since_last_contact', 'notes']
-            writer = csv.DictWriter(output, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for member in members:
-                # Update engagement status
-                if member.get('last_contact_date'):
-                    if isinstance(member['last_contact_date'], str):
-                        member['last_contact_date'] = datetime.fromisoformat(member['last_contact_date'])
-                
-                status, days = calculate_engagement_status(member.get('last_contact_date'))
-                member['engagement_status'] = status
-                member['days_since_last_contact'] = days
-                
-                # Convert dates to strings
-                if member.get('last_contact_date'):
-                    member['last_contact_date'] = member['last_contact_date'].isoformat()
-                
-                writer.writerow({k: member.get(k, '') for k in fieldnames})
-        
-        output.seek(0)
-        csv_content = output.getvalue()
-        return Response(
-            content=csv_content,
-            media_type="text/csv",
-            headers={"Content-Disposition": "attachment; filename=members.csv"}
+MEMBER_EXPORT_FIELDS = ['id', 'name', 'phone', 'external_member_id',
+                        'last_contact_date', 'engagement_status', 'days_since_last_contact', 'notes']
+CARE_EVENT_EXPORT_FIELDS = ['id', 'member_id', 'event_type', 'event_date', 'title', 'description',
+                            'completed', 'aid_type', 'aid_amount', 'hospital_name']
+
+
+def _export_fieldnames(fields: Optional[str], default: List[str]) -> List[str]:
+    """Resolve a comma-separated column list against the allowed export columns"""
+    if not fields:
+        return default
+    allowed = set(default) | {"campus_id"}
+    requested = [f.strip() for f in fields.split(",") if f.strip() in allowed]
+    return requested or default
+
+
+def _csv_stream_response(chunks, filename: str, gzip: bool) -> Stream:
+    if gzip:
+        return Stream(
+            gzip_stream(chunks),
+            media_type="application/gzip",
+            headers={"Content-Disposition": f"attachment; filename={filename}.gz"}
         )
+    return Stream(
+        chunks,
+        media_type="text/csv",
+        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    )
+
+
+def _export_member_row(member: dict) -> dict:
+    """Serialize dates for the CSV row (engagement is exported as stored)"""
+    if isinstance(member.get('last_contact_date'), datetime):
+        member['last_contact_date'] = member['last_contact_date'].isoformat()
+    return member
+
+
+@get("/export/members/csv")
+async def export_members_csv(
+    request: Request,
+    gzip: bool = False,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    fields: Optional[str] = None,
+) -> Stream:
+    """Stream members as CSV, optionally gzipped and filtered by creation date"""
+    current_user = await get_current_user(request)
+    try:
+        # Build campus filter for multi-tenancy
+        query = get_campus_filter(current_user)
+        created_range = {}
+        if start_date:
+            created_range["$gte"] = datetime.combine(start_date, datetime.min.time(), tzinfo=timezone.utc)
+        if end_date:
+            created_range["$lt"] = datetime.combine(end_date + timedelta(days=1), datetime.min.time(), tzinfo=timezone.utc)
+        if created_range:
+            query["created_at"] = created_range
+
+        fieldnames = _export_fieldnames(fields, MEMBER_EXPORT_FIELDS)
+        projection = {"_id": 0, **{f: 1 for f in fieldnames}}
+        cursor = db.members.find(query, projection).sort("name", 1).batch_size(EXPORT_BATCH_SIZE)
+
+        return _csv_stream_response(stream_csv(cursor, fieldnames, _export_member_row), "members.csv", gzip)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error exporting members CSV: {str(e)}")
         raise HTTPException(status_code=500, detail=safe_error_detail(e))
 
 @get("/export/care-events/csv")
-async def export_care_events_csv() -> Response:
-    """Export care events to CSV file - optimized with field projection (75% less data transfer)"""
+async def export_care_events_csv(
+    request: Request,
+    gzip: bool = False,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    fields: Optional[str] = None,
+) -> Stream:
+    """Stream care events as CSV, optionally gzipped and filtered by event date"""
+    current_user = await get_current_user(request)
     try:
-        # Only fetch fields needed for export (reduces data transfer by ~75%)
-        projection = {
-            "_id": 0, "id": 1, "member_id": 1, "event_type": 1, "event_date": 1,
-            "title": 1, "description": 1, "completed": 1, "aid_type": 1,
-            "aid_amount": 1, "hospital_name": 1
-        }
-        events = await db.care_events.find({}, projection).to_list(10000)
-        
-        output = io.StringIO()
-        if events:
-            fieldnames = ['id', 'member_id', 'event_type', 'event_date', 'title', 'description', 
-                         'completed', 'aid_type', 'aid_amount', 'hospital_name']
-            writer = csv.DictWriter(output, fieldnames=fieldnames)
-            writer.writeheader()
-            
-            for event in events:
-                # Convert dates
-                if event.get('event_date'):
-                    event['event_date'] = str(event['event_date'])
-                
-                writer.writerow({k: event.get(k, '') for k in fieldnames})
-        
-        output.seek(0)
-        csv_content = output.getvalue()
-        return Response(
-            content=csv_content,
-            media_type="text/csv",
-            headers={"Content-Disposition": "attachment; filename=care_events.csv"}
-        )
+        query = get_campus_filter(current_user)
+        # event_date is stored as an ISO date string, so string comparison is date order
+        event_range = {}
+        if start_date:
+            event_range["$gte"] = start_date.isoformat()
+        if end_date:
+            event_range["$lte"] = end_date.isoformat()
+        if event_range:
+            query["event_date"] = event_range
+
+        fieldnames = _export_fieldnames(fields, CARE_EVENT_EXPORT_FIELDS)
+        projection = {"_id": 0, **{f: 1 for f in fieldnames}}
+        cursor = db.care_events.find(query, projection).sort("event_date", -1).batch_size(EXPORT_BATCH_SIZE)
+
+        return _csv_stream_response(stream_csv(cursor, fieldnames), "care_events.csv", gzip)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error exporting care events CSV: {str(e)}")
         raise HTTPException(status_code=500, detail=safe_error_detail(e))
@@ -1775,118 +1812,43 @@ async def test_email_integration() -> dict:
 
 # ==================== AUTO-SUGGESTIONS ENDPOINTS ====================
 
+# (priority, suggestion, reason, recommended action) per AnalyticsService.follow_up_candidates rule
+_FOLLOW_UP_SUGGESTIONS = {
+    "reconnect": ("high", "Urgent reconnection needed",
+                  "No contact for {days} days - risk of disconnection", "Personal visit or phone call"),
+    "senior": ("medium", "Senior care check-in",
+               "Senior member, {days} days since contact", "Health and wellness check"),
+    "visitor": ("medium", "Visitor follow-up",
+                "New visitor needs welcoming contact", "Welcome visit or invitation to activities"),
+    "financial_aid": ("medium", "Financial aid follow-up",
+                      "Previous aid recipient, check on progress", "Follow-up on aid effectiveness"),
+    "single_adult": ("low", "Single adult engagement",
+                     "Single adult may need community connection", "Invite to small groups or social activities"),
+}
+
+
 @get("/suggestions/follow-up")
 async def get_intelligent_suggestions(request: Request) -> dict:
     """Generate intelligent follow-up recommendations"""
     current_user = await get_current_user(request)
     try:
-        campus_filter = get_campus_filter(current_user)
-        today = date.today()
-
-        # Get members and their recent activities
-        members = await db.members.find(campus_filter, {"_id": 0}).to_list(1000)
-        recent_events = await db.care_events.find({**campus_filter}, {"_id": 0}).to_list(2000)
-
-        # Build event lookup maps ONCE (O(n) instead of O(n*m) nested loops)
-        events_by_member = {}  # member_id -> list of events
-        financial_aid_members = set()  # members with financial aid events
-        for event in recent_events:
-            mid = event.get('member_id')
-            if mid:
-                if mid not in events_by_member:
-                    events_by_member[mid] = []
-                events_by_member[mid].append(event)
-                if event.get('event_type') == 'financial_aid':
-                    financial_aid_members.add(mid)
-
+        # Rules, ranking and the top-20 cut all run in MongoDB over the whole campus
+        candidates = await AnalyticsService(db).follow_up_candidates(get_campus_filter(current_user), limit=20)
         suggestions = []
-        now_utc = datetime.now(timezone.utc)
-
-        for member in members:
-            last_contact = member.get('last_contact_date')
-            days_since = member.get('days_since_last_contact', 999)
-
-            # Skip members contacted in last 48 hours (recently contacted)
-            if last_contact:
-                if isinstance(last_contact, str):
-                    last_contact_date = datetime.fromisoformat(last_contact)
-                else:
-                    last_contact_date = last_contact
-
-                # Ensure both dates are timezone-aware for comparison
-                if last_contact_date.tzinfo is None:
-                    last_contact_date = last_contact_date.replace(tzinfo=timezone.utc)
-
-                # If contacted in last 2 days, don't suggest
-                if (now_utc - last_contact_date).days <= 2:
-                    continue
-
-            # AI-powered suggestions based on patterns
-            if days_since > 90:
-                suggestions.append({
-                    "member_id": member['id'],
-                    "member_name": member['name'],
-                    "member_phone": member['phone'],
-                    "member_photo_url": member.get('photo_url'),
-                    "priority": "high",
-                    "suggestion": "Urgent reconnection needed",
-                    "reason": f"No contact for {days_since} days - risk of disconnection",
-                    "recommended_action": "Personal visit or phone call",
-                    "urgency_score": min(100, days_since)
-                })
-            elif member.get('age', 0) > 65 and days_since > 30:
-                suggestions.append({
-                    "member_id": member['id'],
-                    "member_name": member['name'],
-                    "member_phone": member['phone'],
-                    "member_photo_url": member.get('photo_url'),
-                    "priority": "medium",
-                    "suggestion": "Senior care check-in",
-                    "reason": f"Senior member, {days_since} days since contact",
-                    "recommended_action": "Health and wellness check",
-                    "urgency_score": days_since + 20  # Boost for seniors
-                })
-            elif member.get('membership_status') == 'Visitor' and days_since > 14:
-                suggestions.append({
-                    "member_id": member['id'],
-                    "member_name": member['name'],
-                    "member_phone": member['phone'],
-                    "member_photo_url": member.get('photo_url'),
-                    "priority": "medium",
-                    "suggestion": "Visitor follow-up",
-                    "reason": "New visitor needs welcoming contact",
-                    "recommended_action": "Welcome visit or invitation to activities",
-                    "urgency_score": days_since + 10
-                })
-            elif member['id'] in financial_aid_members and days_since > 60:
-                # O(1) lookup instead of O(n) array scan
-                suggestions.append({
-                    "member_id": member['id'],
-                    "member_name": member['name'],
-                    "member_phone": member['phone'],
-                    "member_photo_url": member.get('photo_url'),
-                    "priority": "medium",
-                    "suggestion": "Financial aid follow-up",
-                    "reason": "Previous aid recipient, check on progress",
-                    "recommended_action": "Follow-up on aid effectiveness",
-                    "urgency_score": days_since + 15
-                })
-            elif member.get('marital_status') == 'Single' and member.get('age', 0) > 25 and days_since > 45:
-                suggestions.append({
-                    "member_id": member['id'],
-                    "member_name": member['name'],
-                    "member_phone": member['phone'],
-                    "member_photo_url": member.get('photo_url'),
-                    "priority": "low",
-                    "suggestion": "Single adult engagement",
-                    "reason": "Single adult may need community connection",
-                    "recommended_action": "Invite to small groups or social activities",
-                    "urgency_score": days_since
-                })
-
-        # Sort by urgency score and return top suggestions
-        suggestions.sort(key=lambda x: x['urgency_score'], reverse=True)
-        return suggestions[:20]  # Top 20 suggestions
+        for member in candidates:
+            priority, suggestion, reason, action = _FOLLOW_UP_SUGGESTIONS[member["rule"]]
+            suggestions.append({
+                "member_id": member["id"],
+                "member_name": member.get("name"),
+                "member_phone": member.get("phone"),
+                "member_photo_url": member.get("photo_url"),
+                "priority": priority,
+                "suggestion": suggestion,
+                "reason": reason.format(days=member["days_since"]),
+                "recommended_action": action,
+                "urgency_score": member["urgency_score"]
+            })
+        return suggestions
         
     except Exception as e:
         logger.error(f"Error generating suggestions: {str(e)}")
@@ -2037,40 +1999,25 @@ async def _compute_monthly_report_data(current_user: dict, year: int = None, mon
              "last_contact_date": 1, "gender": 1, "age": 1, "category": 1, "membership_status": 1}
         ).to_list(2000)
 
-        # Care events this month
-        events_this_month = await db.care_events.find({
-            **campus_filter,
-            "event_date": {
-                "$gte": start_date.strftime("%Y-%m-%d"),
-                "$lt": end_date.strftime("%Y-%m-%d")
-            }
-        }, {"_id": 0}).to_list(5000)
-
-        # Care events previous month for comparison
-        events_prev_month = await db.care_events.find({
-            **campus_filter,
-            "event_date": {
-                "$gte": prev_start.strftime("%Y-%m-%d"),
-                "$lt": prev_end.strftime("%Y-%m-%d")
-            }
-        }, {"_id": 0}).to_list(5000)
-
-        # Activity logs this month (staff actions)
-        # Use datetime objects for comparison since created_at is stored as ISODate
-        activities_this_month = await db.activity_logs.find({
-            **campus_filter,
-            "created_at": {"$gte": start_date, "$lt": end_date}
-        }, {"_id": 0}).to_list(10000)
-
-        activities_prev_month = await db.activity_logs.find({
-            **campus_filter,
-            "created_at": {"$gte": prev_start, "$lt": prev_end}
-        }, {"_id": 0}).to_list(10000)
+        # Events and staff activity come from the daily rollups: O(days) reads, not O(events)
+        month_start, month_end = start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")
+        rollups = RollupService(db)
+        events_this_month = summarize_events(await rollups.event_rollups(campus_filter, month_start, month_end))
+        events_prev_month = summarize_events(
+            await rollups.event_rollups(campus_filter, prev_start.strftime("%Y-%m-%d"), prev_end.strftime("%Y-%m-%d"))
+        )
+        activity_this_month = await rollups.activity_rollups(campus_filter, month_start, month_end)
+        activities_this_month = sum(r.get("total", 0) for r in activity_this_month)
+        activities_prev_month = sum(
+            r.get("total", 0)
+            for r in await rollups.activity_rollups(campus_filter, prev_start.strftime("%Y-%m-%d"), prev_end.strftime("%Y-%m-%d"))
+        )
 
         # Financial aid this month
-        financial_events = [e for e in events_this_month if e.get("event_type") == "financial_aid"]
-        financial_total = sum(e.get("aid_amount", 0) or 0 for e in financial_events)
-        financial_prev = sum(e.get("aid_amount", 0) or 0 for e in events_prev_month if e.get("event_type") == "financial_aid")
+        financial_this_month = events_this_month["by_type"].get("financial_aid", {})
+        financial_total = financial_this_month.get("aid_amount", 0)
+        financial_recipients = financial_this_month.get("total", 0)
+        financial_prev = events_prev_month["by_type"].get("financial_aid", {}).get("aid_amount", 0)
 
         # === EXECUTIVE SUMMARY ===
         total_members = len(members)
@@ -2082,104 +2029,80 @@ async def _compute_monthly_report_data(current_user: dict, year: int = None, mon
         inactive_members = disconnected_members
 
         # Care delivery metrics
-        total_events = len(events_this_month)
-        completed_events = len([e for e in events_this_month if e.get("completed")])
-        pending_events = len([e for e in events_this_month if not e.get("completed") and not e.get("ignored")])
-        ignored_events = len([e for e in events_this_month if e.get("ignored")])
+        total_events = events_this_month["total"]
+        completed_events = events_this_month["completed"]
+        pending_events = events_this_month["pending"]
+        ignored_events = events_this_month["ignored"]
 
         completion_rate = round(completed_events / total_events * 100, 1) if total_events > 0 else 0
-        prev_completion = len([e for e in events_prev_month if e.get("completed")])
-        prev_total = len(events_prev_month)
+        prev_completion = events_prev_month["completed"]
+        prev_total = events_prev_month["total"]
         prev_completion_rate = round(prev_completion / prev_total * 100, 1) if prev_total > 0 else 0
 
         # === CARE BREAKDOWN BY TYPE ===
-        care_by_type = {}
-        for e in events_this_month:
-            etype = e.get("event_type", "unknown")
-            if etype not in care_by_type:
-                care_by_type[etype] = {"total": 0, "completed": 0, "pending": 0, "ignored": 0}
-            care_by_type[etype]["total"] += 1
-            if e.get("completed"):
-                care_by_type[etype]["completed"] += 1
-            elif e.get("ignored"):
-                care_by_type[etype]["ignored"] += 1
-            else:
-                care_by_type[etype]["pending"] += 1
+        care_by_type = {
+            etype: {
+                "total": counts["total"],
+                "completed": counts["completed"],
+                "pending": counts["pending"],
+                "ignored": counts["ignored_open"],
+            }
+            for etype, counts in events_this_month["by_type"].items()
+        }
 
         # === ENGAGEMENT HEALTH ===
+        # Weekly engagement for the month (7-day windows from the 1st, by Jakarta day)
         engagement_trend = []
-        # Calculate weekly engagement for the month
+        weekly = {}
+        for r in activity_this_month:
+            week = weekly.setdefault((int(r["date"][8:10]) - 1) // 7, {"contacts_made": 0, "activities": 0})
+            week["contacts_made"] += (r.get("actions") or {}).get("complete_task", 0)
+            week["activities"] += r.get("total", 0)
         current_week_start = start_date
         week_num = 1
         while current_week_start < end_date:
             week_end = min(current_week_start + timedelta(days=7), end_date)
-            # Handle both datetime objects and ISO strings for created_at
-            def get_activity_datetime(a):
-                created_at = a.get("created_at")
-                if isinstance(created_at, datetime):
-                    # Ensure timezone-aware (MongoDB stores as UTC)
-                    if created_at.tzinfo is None:
-                        created_at = created_at.replace(tzinfo=timezone.utc)
-                    return created_at
-                if isinstance(created_at, str) and created_at:
-                    try:
-                        dt = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
-                        if dt.tzinfo is None:
-                            dt = dt.replace(tzinfo=timezone.utc)
-                        return dt
-                    except ValueError:
-                        return None
-                return None
-            week_activities = [a for a in activities_this_month
-                            if (dt := get_activity_datetime(a)) and current_week_start <= dt < week_end]
-            week_events_completed = len([a for a in week_activities if a.get("action_type", "").lower() == "complete_task"])
             engagement_trend.append({
                 "week": f"Week {week_num}",
                 "start": current_week_start.strftime("%b %d"),
-                "contacts_made": week_events_completed,
-                "activities": len(week_activities)
+                **weekly.get(week_num - 1, {"contacts_made": 0, "activities": 0}),
             })
             current_week_start = week_end
             week_num += 1
 
         # === STAFF PERFORMANCE SUMMARY ===
-        staff_summary = {}
-        for a in activities_this_month:
-            user_id = a.get("user_id")
-            if user_id not in staff_summary:
-                staff_summary[user_id] = {
+        staff_list = sorted(
+            (
+                {
                     "user_id": user_id,
-                    "user_name": a.get("user_name", "Unknown"),
-                    "tasks_completed": 0,
-                    "tasks_created": 0,
-                    "members_contacted": set(),
-                    "total_actions": 0
+                    "user_name": staff["user_name"],
+                    "tasks_completed": staff["actions"]["complete_task"],
+                    "tasks_created": staff["actions"]["create_care_event"] + staff["actions"]["create_member"],
+                    "members_contacted": len(staff["members_contacted"]),
+                    "total_actions": staff["total_actions"],
                 }
-            staff_summary[user_id]["total_actions"] += 1
-            action_type = a.get("action_type", "").lower()
-            if action_type == "complete_task":
-                staff_summary[user_id]["tasks_completed"] += 1
-                if a.get("member_id"):
-                    staff_summary[user_id]["members_contacted"].add(a.get("member_id"))
-            elif action_type in ["create_care_event", "create_member"]:
-                staff_summary[user_id]["tasks_created"] += 1
-
-        # Convert sets to counts
-        for user_id in staff_summary:
-            staff_summary[user_id]["members_contacted"] = len(staff_summary[user_id]["members_contacted"])
-
-        staff_list = sorted(staff_summary.values(), key=lambda x: x["tasks_completed"], reverse=True)
+                for user_id, staff in summarize_staff(activity_this_month).items()
+            ),
+            key=lambda x: x["tasks_completed"],
+            reverse=True,
+        )
 
         # === MEMBER REACH ANALYSIS ===
         members_with_contact = len([m for m in members if m.get("last_contact_date")])
-        members_contacted_this_month = len(set(a.get("member_id") for a in activities_this_month
-                                               if a.get("action_type", "").lower() == "complete_task" and a.get("member_id")))
+        members_contacted_this_month = len(set().union(*(r.get("members_contacted") or [] for r in activity_this_month)))
         member_reach_rate = round(members_contacted_this_month / total_members * 100, 1) if total_members > 0 else 0
 
+        # Grief and hospital events of the month (small projected read; their followups live elsewhere)
+        support_events = await db.care_events.find({
+            **campus_filter,
+            "event_type": {"$in": ["grief_loss", "accident_illness"]},
+            "event_date": {"$gte": month_start, "$lt": month_end},
+        }, {"_id": 0, "id": 1, "member_id": 1, "event_type": 1}).to_list(None)
+
         # === GRIEF SUPPORT ANALYSIS ===
         # When a grief/loss event is recorded, it means the initial visit has been done
         # The 6 followup stages are additional visits on top of the initial one
-        grief_events = [e for e in events_this_month if e.get("event_type") == "grief_loss"]
+        grief_events = [e for e in support_events if e.get("event_type") == "grief_loss"]
         grief_families_supported = len(set(e.get("member_id") for e in grief_events))
 
         # Count touchpoints: initial visits (1 per grief event) + completed followup stages
@@ -2199,7 +2122,7 @@ async def _compute_monthly_report_data(current_user: dict, year: int = None, mon
         # === HOSPITAL/ILLNESS SUPPORT ===
         # When an accident/illness event is recorded, it means the initial hospital visit has been done
         # The 3 followup stages are additional visits on top of the initial one
-        hospital_events = [e for e in events_this_month if e.get("event_type") == "accident_illness"]
+        hospital_events = [e for e in support_events if e.get("event_type") == "accident_illness"]
         hospital_patients = len(set(e.get("member_id") for e in hospital_events))
 
         # Count visits: initial visits (1 per hospital event) + completed followup stages
@@ -2404,7 +2327,7 @@ async def _compute_monthly_report_data(current_user: dict, year: int = None, mon
             insights.append({
                 "type": "info",
                 "category": "Financial Aid",
-                "message": f"Rp {financial_total:,.0f} distributed to {len(financial_events)} recipients this month"
+                "message": f"Rp {financial_total:,.0f} distributed to {financial_recipients} recipients this month"
             })
 
         # Grief support
@@ -2444,9 +2367,9 @@ async def _compute_monthly_report_data(current_user: dict, year: int = None, mon
                 "change": round(completion_rate - prev_completion_rate, 1)
             },
             "total_activities": {
-                "current": len(activities_this_month),
-                "previous": len(activities_prev_month),
-                "change": len(activities_this_month) - len(activities_prev_month)
+                "current": activities_this_month,
+                "previous": activities_prev_month,
+                "change": activities_this_month - activities_prev_month
             },
             "financial_aid": {
                 "current": financial_total,
@@ -2476,7 +2399,7 @@ async def _compute_monthly_report_data(current_user: dict, year: int = None, mon
                 "ignored_events": ignored_events,
                 "completion_rate": completion_rate,
                 "financial_aid_total": financial_total,
-                "financial_aid_recipients": len(financial_events)
+                "financial_aid_recipients": financial_recipients
             },
             "kpis": kpis,
             "care_breakdown": [
@@ -2510,7 +2433,7 @@ async def _compute_monthly_report_data(current_user: dict, year: int = None, mon
                 },
                 "financial_aid": {
                     "total_amount": financial_total,
-                    "recipients": len(financial_events)
+                    "recipients": financial_recipients
                 }
             },
             "comparison": comparison,
@@ -2537,6 +2460,20 @@ async def get_monthly_management_report(
     return await _compute_monthly_report_data(current_user, year, month)
 
 
+async def _report_campus(current_user: dict) -> tuple:
+    """(cache scope, campus name for the PDF header) for the user's report"""
+    campus_name = "GKBJ"  # Default
+    if current_user.get("campus_id"):
+        campus = await db.campuses.find_one(
+            {"id": current_user["campus_id"]},
+            {"_id": 0, "campus_name": 1}
+        )
+        if campus:
+            campus_name = campus.get("campus_name", "GKBJ")
+    campus_key = current_user.get("campus_id") if get_campus_filter(current_user) else "all"
+    return campus_key or "none", campus_name
+
+
 @get("/reports/monthly/pdf")
 async def export_monthly_report_pdf(
     request: Request,
@@ -2546,29 +2483,17 @@ async def export_monthly_report_pdf(
     """
     Export monthly management report as a professionally formatted PDF.
     Returns a downloadable PDF file.
+
+    Rendering runs in a process pool so it never blocks the event loop, and finished
+    PDFs are cached by campus, period and a fingerprint of the report data.
     """
     current_user = await get_current_user(request)
     try:
         # Get the report data using helper function (not the route handler)
         report_data = await _compute_monthly_report_data(current_user, year, month)
+        campus_key, campus_name = await _report_campus(current_user)
 
-        # Get campus name for the header
-        campus_name = "GKBJ"  # Default
-        if current_user.get("campus_id"):
-            campus = await db.campuses.find_one(
-                {"id": current_user["campus_id"]},
-                {"_id": 0, "campus_name": 1}
-            )
-            if campus:
-                campus_name = campus.get("campus_name", "GKBJ")
-
-        # Generate PDF
-        generate_pdf = get_pdf_generator()
-        pdf_bytes = generate_pdf(report_data, campus_name)
-
-        # Create filename
-        period = report_data.get("report_period", {})
-        filename = f"Pastoral_Care_Report_{period.get('month_name', 'Monthly')}_{period.get('year', datetime.now().year)}.pdf"
+        pdf_bytes, filename, cached = await ReportService(db).monthly_report_pdf(report_data, campus_key, campus_name)
 
         # Return PDF bytes directly using Litestar's Response
         return Response(
@@ -2576,7 +2501,8 @@ async def export_monthly_report_pdf(
             media_type="application/pdf",
             headers={
                 "Content-Disposition": f'attachment; filename="{filename}"',
-                "Content-Length": str(len(pdf_bytes))
+                "Content-Length": str(len(pdf_bytes)),
+                "X-Report-Cache": "hit" if cached else "miss",
             }
         )
 
@@ -2585,6 +2511,71 @@ async def export_monthly_report_pdf(
         raise HTTPException(status_code=500, detail=safe_error_detail(e))
 
 
+@post("/reports/monthly/pdf/jobs", status_code=HTTP_202_ACCEPTED)
+async def create_monthly_report_pdf_job(
+    request: Request,
+    year: Optional[int] = None,
+    month: Optional[int] = None,
+) -> dict:
+    """Render the monthly report PDF as a background job; poll the job, then download it"""
+    current_user = await get_current_user(request)
+    try:
+        campus_key, campus_name = await _report_campus(current_user)
+        reports = ReportService(db)
+        job = await reports.create_job(current_user.get("campus_id"), current_user["id"], year, month)
+        reports.start(job, lambda: _compute_monthly_report_data(current_user, year, month), campus_key, campus_name)
+        return {"success": True, "job_id": job["id"], "status": job["status"]}
+    except Exception as e:
+        logger.error(f"Error starting PDF report job: {str(e)}")
+        raise HTTPException(status_code=500, detail=safe_error_detail(e))
+
+
+@get("/reports/jobs/{job_id:str}")
+async def get_report_job(job_id: str, request: Request) -> dict:
+    """Get status of a report export job"""
+    current_user = await get_current_user(request)
+    try:
+        job = await ReportService(db).get_job(job_id, current_user["id"])
+        if not job:
+            raise HTTPException(status_code=404, detail="Report job not found")
+        job.pop("cache_key", None)
+        return job
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting report job: {str(e)}")
+        raise HTTPException(status_code=500, detail=safe_error_detail(e))
+
+
+@get("/reports/jobs/{job_id:str}/download")
+async def download_report_job(job_id: str, request: Request) -> Response:
+    """Download the PDF produced by a completed report export job"""
+    current_user = await get_current_user(request)
+    try:
+        reports = ReportService(db)
+        job = await reports.get_job(job_id, current_user["id"])
+        if not job:
+            raise HTTPException(status_code=404, detail="Report job not found")
+        if job["status"] != "completed":
+            raise HTTPException(status_code=409, detail=f"Report job is {job['status']}")
+        pdf_bytes = await reports.get_job_pdf(job)
+        if pdf_bytes is None:
+            raise HTTPException(status_code=410, detail="Report has expired, please export it again")
+        return Response(
+            content=pdf_bytes,
+            media_type="application/pdf",
+            headers={
+                "Content-Disposition": f'attachment; filename="{job["filename"]}"',
+                "Content-Length": str(len(pdf_bytes))
+            }
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error downloading report job: {str(e)}")
+        raise HTTPException(status_code=500, detail=safe_error_detail(e))
+
+
 @get("/reports/staff-performance")
 async def get_staff_performance_report(
     request: Request,
@@ -2616,27 +2607,21 @@ async def get_staff_performance_report(
             {"_id": 0, "id": 1, "name": 1, "email": 1, "role": 1, "photo_url": 1}
         ).to_list(100)
 
-        # Get all activity logs for the month
-        # Use datetime objects for comparison (not ISO strings) since created_at is stored as ISODate
-        activities = await db.activity_logs.find({
-            **campus_filter,
-            "created_at": {"$gte": start_date, "$lt": end_date}
-        }, {"_id": 0}).to_list(20000)
-
-        # Note: Staff performance is derived from activity_logs (which use ISODate),
-        # not care_events (which store completed_at as strings). This ensures accurate data.
+        # Per-day staff activity for the month from the daily rollups (days are Jakarta dates)
+        activity_rollups = await RollupService(db).activity_rollups(
+            campus_filter, start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")
+        )
 
         # Build staff performance data
         staff_data = {}
 
-        # Initialize all users
-        for user in users:
-            staff_data[user["id"]] = {
-                "user_id": user["id"],
-                "user_name": user["name"],
-                "email": user["email"],
-                "role": user["role"],
-                "photo_url": user.get("photo_url"),
+        def _empty_staff(user_id, user_name, email, role, photo_url):
+            return {
+                "user_id": user_id,
+                "user_name": user_name,
+                "email": email,
+                "role": role,
+                "photo_url": photo_url,
                 "tasks_completed": 0,
                 "tasks_created": 0,
                 "tasks_ignored": 0,
@@ -2650,63 +2635,31 @@ async def get_staff_performance_report(
                 "active_days": set()
             }
 
-        # Process activity logs
-        for activity in activities:
-            user_id = activity.get("user_id")
+        # Initialize all users
+        for user in users:
+            staff_data[user["id"]] = _empty_staff(
+                user["id"], user["name"], user["email"], user["role"], user.get("photo_url")
+            )
+
+        for user_id, summary in summarize_staff(activity_rollups).items():
             if user_id not in staff_data:
                 # User might be inactive but has activities
-                staff_data[user_id] = {
-                    "user_id": user_id,
-                    "user_name": activity.get("user_name", "Unknown"),
-                    "email": "",
-                    "role": "",
-                    "photo_url": activity.get("user_photo_url"),
-                    "tasks_completed": 0,
-                    "tasks_created": 0,
-                    "tasks_ignored": 0,
-                    "members_created": 0,
-                    "members_updated": 0,
-                    "members_contacted": set(),
-                    "events_by_type": {},
-                    "daily_activity": {},
-                    "total_actions": 0,
-                    "whatsapp_sent": 0,
-                    "active_days": set()
-                }
-
+                staff_data[user_id] = _empty_staff(user_id, summary["user_name"], "", "", summary["user_photo_url"])
             staff = staff_data[user_id]
-            staff["total_actions"] += 1
-
-            action = activity.get("action_type", "").lower()  # Normalize to lowercase
-            created_at = activity.get("created_at")
-            if created_at:
-                # Handle both datetime objects and ISO strings
-                if isinstance(created_at, datetime):
-                    day = created_at.strftime("%Y-%m-%d")
-                elif isinstance(created_at, str):
-                    day = created_at[:10]
-                else:
-                    day = None
-                if day:
-                    staff["active_days"].add(day)
-                    staff["daily_activity"][day] = staff["daily_activity"].get(day, 0) + 1
-
-            if action == "complete_task":
-                staff["tasks_completed"] += 1
-                if activity.get("member_id"):
-                    staff["members_contacted"].add(activity.get("member_id"))
-                event_type = activity.get("event_type", "other")
-                staff["events_by_type"][event_type] = staff["events_by_type"].get(event_type, 0) + 1
-            elif action == "ignore_task":
-                staff["tasks_ignored"] += 1
-            elif action == "create_care_event":
-                staff["tasks_created"] += 1
-            elif action == "create_member":
-                staff["members_created"] += 1
-            elif action == "update_member":
-                staff["members_updated"] += 1
-            elif action == "send_reminder":
-                staff["whatsapp_sent"] += 1
+            actions = summary["actions"]
+            staff["total_actions"] = summary["total_actions"]
+            staff["tasks_completed"] = actions["complete_task"]
+            staff["tasks_ignored"] = actions["ignore_task"]
+            staff["tasks_created"] = actions["create_care_event"]
+            staff["members_created"] = actions["create_member"]
+            staff["members_updated"] = actions["update_member"]
+            staff["whatsapp_sent"] = actions["send_reminder"]
+            staff["members_contacted"] = summary["members_contacted"]
+            staff["events_by_type"] = dict(summary["completed_by_type"])
+            staff["daily_activity"] = summary["daily_activity"]
+            staff["active_days"] = set(summary["daily_activity"])
+
+        all_members_contacted = set().union(*(s["members_contacted"] for s in staff_data.values()))
 
         # Convert sets to counts and calculate metrics
         staff_list = []
@@ -2753,7 +2706,7 @@ async def get_staff_performance_report(
             "total_staff": len(staff_list),
             "active_staff": len([s for s in staff_list if s["total_actions"] > 0]),
             "total_tasks_completed": total_tasks_completed,
-            "total_members_contacted": len(set().union(*[set() if isinstance(s["members_contacted"], int) else s["members_contacted"] for s in staff_data.values()])),
+            "total_members_contacted": len(all_members_contacted),
             "average_tasks_per_staff": round(total_tasks_completed / len(staff_list), 1) if staff_list else 0,
             "median_tasks": sorted(tasks_completed_list)[len(tasks_completed_list)//2] if tasks_completed_list else 0,
             "max_tasks": max(tasks_completed_list) if tasks_completed_list else 0,
@@ -2841,61 +2794,45 @@ async def get_yearly_summary_report(
 
         campus_filter = get_campus_filter(current_user)
 
-        # Get all members
-        members = await db.members.find(
-            {**campus_filter, "is_archived": {"$ne": True}},
-            {"_id": 0, "id": 1, "engagement_status": 1, "created_at": 1}
-        ).to_list(5000)
+        total_members = await db.members.count_documents({**campus_filter, "is_archived": {"$ne": True}})
 
-        # Get all care events for the year
-        events = await db.care_events.find({
-            **campus_filter,
-            "event_date": {
-                "$gte": start_date.strftime("%Y-%m-%d"),
-                "$lt": end_date.strftime("%Y-%m-%d")
-            }
-        }, {"_id": 0}).to_list(50000)
+        # Care events for the year from the daily rollups, folded per month
+        rollups = await RollupService(db).event_rollups(
+            campus_filter, start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")
+        )
+        by_month = {}
+        for r in rollups:
+            by_month.setdefault(int(r["month"][5:7]), []).append(r)
+        year_summary = summarize_events(rollups)
 
         # Monthly breakdown
         monthly_data = []
         for month in range(1, 13):
-            month_start = datetime(report_year, month, 1, tzinfo=JAKARTA_TZ)
-            if month == 12:
-                month_end = datetime(report_year + 1, 1, 1, tzinfo=JAKARTA_TZ)
-            else:
-                month_end = datetime(report_year, month + 1, 1, tzinfo=JAKARTA_TZ)
-
-            month_events = [e for e in events
-                          if month_start.strftime("%Y-%m-%d") <= e.get("event_date", "") < month_end.strftime("%Y-%m-%d")]
-
-            completed = len([e for e in month_events if e.get("completed")])
-            total = len(month_events)
+            month_summary = summarize_events(by_month.get(month, []))
+            completed = month_summary["completed"]
+            total = month_summary["total"]
 
             monthly_data.append({
                 "month": month,
-                "month_name": month_start.strftime("%B"),
+                "month_name": datetime(report_year, month, 1).strftime("%B"),
                 "total_events": total,
                 "completed_events": completed,
                 "completion_rate": round(completed / total * 100, 1) if total > 0 else 0
             })
 
         # Year totals
-        total_events = len(events)
-        completed_events = len([e for e in events if e.get("completed")])
+        total_events = year_summary["total"]
+        completed_events = year_summary["completed"]
 
         # Financial aid totals
-        financial_events = [e for e in events if e.get("event_type") == "financial_aid"]
-        total_financial_aid = sum(e.get("aid_amount", 0) or 0 for e in financial_events)
+        financial = year_summary["by_type"].get("financial_aid", {})
+        total_financial_aid = financial.get("aid_amount", 0)
 
         # Care by type totals
-        care_totals = {}
-        for e in events:
-            etype = e.get("event_type", "unknown")
-            if etype not in care_totals:
-                care_totals[etype] = {"total": 0, "completed": 0}
-            care_totals[etype]["total"] += 1
-            if e.get("completed"):
-                care_totals[etype]["completed"] += 1
+        care_totals = {
+            etype: {"total": counts["total"], "completed": counts["completed"]}
+            for etype, counts in year_summary["by_type"].items()
+        }
 
         return {
             "report_period": {
@@ -2903,12 +2840,12 @@ async def get_yearly_summary_report(
                 "generated_at": today.isoformat()
             },
             "yearly_totals": {
-                "total_members": len(members),
+                "total_members": total_members,
                 "total_care_events": total_events,
                 "completed_events": completed_events,
                 "completion_rate": round(completed_events / total_events * 100, 1) if total_events > 0 else 0,
                 "total_financial_aid": total_financial_aid,
-                "financial_aid_recipients": len(financial_events)
+                "financial_aid_recipients": financial.get("total", 0)
             },
             "monthly_breakdown": monthly_data,
             "care_by_type": [
@@ -3162,45 +3099,31 @@ async def get_all_config() -> dict:
 @post("/admin/recalculate-engagement")
 async def recalculate_all_engagement_status(request: Request) -> dict:
     """Recalculate engagement status for all members (admin only)"""
+    current_user = await get_current_user(request)
     try:
-        if user.get("role") not in [UserRole.FULL_ADMIN.value, UserRole.CAMPUS_ADMIN.value]:
+        if current_user.get("role") not in [UserRole.FULL_ADMIN.value, UserRole.CAMPUS_ADMIN.value]:
             raise HTTPException(status_code=403, detail="Only admins can recalculate engagement")
-        
+
         # Get engagement settings
         settings = await _get_engagement_settings_cached()
         at_risk_days = settings.get("atRiskDays", 60)
         disconnected_days = settings.get("disconnectedDays", 90)
-        
-        # Get all members
-        members = await db.members.find({}, {"_id": 0, "id": 1, "last_contact_date": 1}).to_list(None)
-        
-        updated_count = 0
-        stats = {"active": 0, "at_risk": 0, "disconnected": 0}
-        
-        for member in members:
-            status, days = calculate_engagement_status(
-                member.get("last_contact_date"),
-                at_risk_days,
-                disconnected_days
-            )
-            
-            await db.members.update_one(
-                {"id": member["id"]},
-                {"$set": {
-                    "engagement_status": status,
-                    "days_since_last_contact": days,
-                    "updated_at": datetime.now(timezone.utc)
-                }}
-            )
-            
-            stats[status] = stats.get(status, 0) + 1
-            updated_count += 1
-        
-        # Clear dashboard cache for all campuses
-        await db.dashboard_cache.delete_many({})
-        
-        logger.info(f"Recalculated engagement for {updated_count} members")
-        
+
+        # Campus admins recalculate their own campus only
+        campus_id = get_campus_filter(current_user).get("campus_id")
+
+        # One update_many per campus, touching only members whose stored values changed
+        engagement = EngagementService(db)
+        updated = await engagement.recompute(campus_id, at_risk_days, disconnected_days)
+        stats = await engagement.status_counts(campus_id)
+
+        # Refresh dashboard reminders of the campuses that changed
+        for changed_campus_id in updated:
+            await mark_dashboard_reminders_stale(changed_campus_id)
+
+        updated_count = sum(updated.values())
+        logger.info(f"Recalculated engagement: {updated_count} members updated in {len(updated)} campuses")
+
         return {
             "success": True,
             "updated_count": updated_count,
@@ -3250,7 +3173,9 @@ async def update_engagement_settings(data: EngagementSettingsUpdate, request: Re
         )
 
         # Invalidate engagement settings cache
-        invalidate_cache("engagement_settings")
+        cache = get_cache()
+        await cache.delete(CacheService.KEY_ENGAGEMENT_SETTINGS)
+        await mark_dashboard_reminders_stale()
 
         return {"success": True, "message": "Engagement settings updated"}
     except Exception as e:
@@ -3358,7 +3283,9 @@ async def update_overdue_writeoff_settings(data: OverdueWriteoffSettingsUpdate,
         )
 
         # Invalidate writeoff settings cache
-        invalidate_cache("writeoff_settings")
+        cache = get_cache()
+        await cache.delete(CacheService.KEY_WRITEOFF_SETTINGS)
+        await mark_dashboard_reminders_stale()
 
         return {"success": True, "message": "Write-off settings updated"}
     except HTTPException:
@@ -3551,13 +3478,13 @@ async def save_sync_config(data: SyncConfigCreate, request: Request) -> dict:
         # Get core church_id by logging in to core API
         core_church_id = None
         try:
-            import httpx
             base_url = data.api_base_url.rstrip('/')
-            async with httpx.AsyncClient(timeout=10.0) as client:
+            async with shared_http_client(UPSTREAM_CORE_API) as client:
                 if password_for_login:
                     login_response = await client.post(
                         f"{base_url}{api_path_prefix}/auth/login",
-                        json={"email": data.api_email, "password": password_for_login}
+                        json={"email": data.api_email, "password": password_for_login},
+                        timeout=10.0
                     )
                     if login_response.status_code == 200:
                         login_data = login_response.json()
@@ -3579,6 +3506,7 @@ async def save_sync_config(data: SyncConfigCreate, request: Request) -> dict:
             "filter_mode": data.filter_mode,
             "filter_rules": data.filter_rules or [],
             "is_enabled": data.is_enabled,
+            "member_sync_cursor": None,  # Settings may have changed, next sync re-pulls everything
             "updated_at": datetime.now(timezone.utc)
         }
         
@@ -3670,7 +3598,6 @@ async def discover_fields_from_core(data: SyncConfigCreate, request: Request) ->
         raise HTTPException(status_code=403, detail="Only administrators can discover fields")
 
     try:
-        import httpx
 
         # Normalize api_path_prefix
         api_path_prefix = data.api_path_prefix.strip()
@@ -3692,7 +3619,7 @@ async def discover_fields_from_core(data: SyncConfigCreate, request: Request) ->
             password_to_use = data.api_password
 
         # Login to core API
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with shared_http_client(UPSTREAM_CORE_API) as client:
             login_response = await client.post(
                 f"{base_url}{api_path_prefix}/auth/login",
                 json={"email": data.api_email, "password": password_to_use}
@@ -3815,7 +3742,6 @@ async def test_sync_connection(data: SyncConfigCreate, request: Request) -> dict
         raise HTTPException(status_code=403, detail="Only administrators can test sync")
 
     try:
-        import httpx
 
         # Normalize paths
         api_path_prefix = data.api_path_prefix.strip()
@@ -3850,7 +3776,7 @@ async def test_sync_connection(data: SyncConfigCreate, request: Request) -> dict
         else:
             # Password is plaintext from frontend
             password_to_use = data.api_password
-        async with httpx.AsyncClient(timeout=30.0) as client:
+        async with shared_http_client(UPSTREAM_CORE_API) as client:
             login_response = await client.post(
                 login_url,
                 json={"email": data.api_email, "password": password_to_use}
@@ -3944,28 +3870,116 @@ async def test_sync_connection(data: SyncConfigCreate, request: Request) -> dict
             "message": f"Connection error: {str(e)}"
         }
 
-async def perform_member_sync_for_campus(campus_id: str, sync_type: str = "manual") -> dict:
+def _parse_core_timestamp(value: Any) -> Optional[datetime]:
+    """Parse a core API updated_at value (ISO string or datetime) as an aware UTC datetime"""
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, str) and value:
+        try:
+            parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    else:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _core_member_updated_at(core_member: dict) -> Optional[datetime]:
+    return _parse_core_timestamp(core_member.get("updated_at") or core_member.get("updatedAt"))
+
+
+def _core_member_matches_filters(core_member: dict, filter_mode: str, filter_rules: list) -> bool:
+    """Apply the sync config's dynamic filter rules to one core member"""
+    if not filter_rules:
+        return True
+
+    matches_all_rules = True
+    for rule in filter_rules:
+        field_name = rule.get("field")
+        operator = rule.get("operator")
+        filter_value = rule.get("value")
+        member_value = core_member.get(field_name)
+        rule_matches = False
+
+        if operator == "equals":
+            rule_matches = str(member_value) == str(filter_value)
+        elif operator == "not_equals":
+            rule_matches = str(member_value) != str(filter_value)
+        elif operator == "contains":
+            if member_value and filter_value:
+                rule_matches = str(filter_value).lower() in str(member_value).lower()
+        elif operator == "in":
+            if isinstance(filter_value, list):
+                rule_matches = member_value in filter_value
+        elif operator == "not_in":
+            if isinstance(filter_value, list):
+                rule_matches = member_value not in filter_value
+        elif operator in ["greater_than", "less_than", "between"]:
+            try:
+                if "date_of_birth" in field_name or "birth" in field_name:
+                    if member_value:
+                        birth_date = date.fromisoformat(member_value) if isinstance(member_value, str) else member_value
+                        age = (date.today() - birth_date).days // 365
+                        member_value = age
+                if operator == "greater_than":
+                    rule_matches = float(member_value) > float(filter_value)
+                elif operator == "less_than":
+                    rule_matches = float(member_value) < float(filter_value)
+                elif operator == "between":
+                    if isinstance(filter_value, list) and len(filter_value) == 2:
+                        rule_matches = float(filter_value[0]) <= float(member_value) <= float(filter_value[1])
+            except (ValueError, TypeError):
+                rule_matches = False
+        elif operator == "is_true":
+            rule_matches = member_value == True or member_value == "true"
+        elif operator == "is_false":
+            rule_matches = member_value == False or member_value == "false"
+
+        if not rule_matches:
+            matches_all_rules = False
+            break
+
+    return matches_all_rules if filter_mode == "include" else not matches_all_rules
+
+
+async def _bulk_write_chunked(collection, ops: list):
+    """Run unordered bulk_write in chunks; yields (chunk offset, result) for each chunk"""
+    for offset in range(0, len(ops), SYNC_WRITE_BATCH_SIZE):
+        yield offset, await collection.bulk_write(ops[offset:offset + SYNC_WRITE_BATCH_SIZE], ordered=False)
+
+
+async def perform_member_sync_for_campus(campus_id: str, sync_type: str = "manual", full: Optional[bool] = None) -> dict:
     """
     Core member sync logic - can be called from API endpoint or scheduler.
 
     Args:
         campus_id: The campus to sync members for
         sync_type: Type of sync ("manual", "polling", "reconciliation")
+        full: Force a full re-pull (True) or an incremental sync (False). By default
+            reconciliation runs are full and other runs are incremental once a
+            high-water mark exists in the sync config.
 
     Returns:
         dict with success status, stats, and duration
     """
-    import httpx
 
     # Get sync config
     config = await db.sync_configs.find_one({"campus_id": campus_id}, {"_id": 0})
     if not config or not config.get("is_enabled"):
         return {"success": False, "error": "Sync is not configured or enabled for this campus"}
 
+    # Incremental mode only fetches members changed since the stored high-water mark
+    sync_cursor = _parse_core_timestamp(config.get("member_sync_cursor"))
+    if full is None:
+        full = sync_type == "reconciliation"
+    incremental = not full and sync_cursor is not None
+    sync_mode = "incremental" if incremental else "full"
+
     # Create sync log
     sync_log = SyncLog(
         campus_id=campus_id,
         sync_type=sync_type,
+        sync_mode=sync_mode,
         status="in_progress"
     )
     await db.sync_logs.insert_one(to_mongo_doc(sync_log))
@@ -3983,7 +3997,7 @@ async def perform_member_sync_for_campus(campus_id: str, sync_type: str = "manua
         if not decrypted_pwd:
             raise Exception("Failed to decrypt API password")
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
+        async with shared_http_client(UPSTREAM_CORE_API) as client:
             # Login with retry logic
             login_url = f"{base_url}{api_path_prefix}/auth/login"
             login_payload = {"email": config["api_email"], "password": decrypted_pwd}
@@ -4012,6 +4026,8 @@ async def perform_member_sync_for_campus(campus_id: str, sync_type: str = "manua
 
             while True:
                 members_url = f"{base_url}{api_path_prefix}/members/?limit={page_size}&skip={offset}"
+                if incremental:
+                    members_url += f"&updated_since={quote(sync_cursor.isoformat())}"
                 members_response = None
                 for attempt in range(API_MAX_RETRIES):
                     try:
@@ -4045,7 +4061,7 @@ async def perform_member_sync_for_campus(campus_id: str, sync_type: str = "manua
                     batch_members = batch['data']
                     all_members.extend(batch_members)
                     pagination = batch.get('pagination', {})
-                    if not pagination.get('has_more', False):
+                    if not batch_members or not pagination.get('has_more', False):
                         break
                 elif isinstance(batch, list):
                     all_members.extend(batch)
@@ -4055,12 +4071,22 @@ async def perform_member_sync_for_campus(campus_id: str, sync_type: str = "manua
                     break
 
                 offset += page_size
-                if offset > 10000:
-                    logger.warning(f"Reached safety limit of 10000 members")
-                    break
 
-            core_members = all_members
-            logger.info(f"Fetched {len(core_members)} total members from core API")
+            # Advance the high-water mark to the newest change seen (core API clock, not ours)
+            seen_timestamps = [ts for ts in map(_core_member_updated_at, all_members) if ts]
+            next_cursor = max(seen_timestamps) if seen_timestamps else None
+
+            if incremental:
+                # Also filter locally in case the core API ignores updated_since;
+                # members without a timestamp are applied anyway (upserts are idempotent)
+                core_members = [
+                    m for m in all_members
+                    if (_core_member_updated_at(m) or sync_cursor) >= sync_cursor
+                ]
+                next_cursor = max(next_cursor or sync_cursor, sync_cursor)
+            else:
+                core_members = all_members
+            logger.info(f"Fetched {len(all_members)} members from core API ({sync_mode}, {len(core_members)} changed)")
 
             # Stats
             stats = {
@@ -4074,10 +4100,22 @@ async def perform_member_sync_for_campus(campus_id: str, sync_type: str = "manua
                 "matched_by_name_only": 0
             }
 
-            # Get existing members
-            existing_members = await db.members.find({"campus_id": campus_id}, {"_id": 0}).to_list(None)
+            # Get existing members (only the fields used for matching)
+            match_projection = {"_id": 0, "id": 1, "name": 1, "phone": 1, "external_member_id": 1, "is_archived": 1}
+            if incremental:
+                core_ids = [m.get("id") for m in core_members if m.get("id")]
+                existing_members = await db.members.find(
+                    {"campus_id": campus_id, "external_member_id": {"$in": core_ids}}, match_projection
+                ).to_list(None) if core_ids else []
+            else:
+                existing_members = await db.members.find({"campus_id": campus_id}, match_projection).to_list(None)
             existing_map = {m.get("external_member_id"): m for m in existing_members if m.get("external_member_id")}
 
+            # Name-based matching needs the whole campus, load it only if some member is unmatched by id
+            name_candidates = existing_members
+            if incremental and any(m.get("id") not in existing_map for m in core_members):
+                name_candidates = await db.members.find({"campus_id": campus_id}, match_projection).to_list(None)
+
             # Build additional lookup maps for name-based matching
             def normalize_name(name: str) -> str:
                 if not name:
@@ -4087,7 +4125,7 @@ async def perform_member_sync_for_campus(campus_id: str, sync_type: str = "manua
             name_map = {}
             name_phone_map = {}
 
-            for m in existing_members:
+            for m in name_candidates:
                 norm_name = normalize_name(m.get("name", ""))
                 if norm_name:
                     if norm_name not in name_map or m.get("is_archived"):
@@ -4103,69 +4141,19 @@ async def perform_member_sync_for_campus(campus_id: str, sync_type: str = "manua
             filter_mode = config.get("filter_mode", "include")
             filter_rules = config.get("filter_rules", [])
             filtered_members = []
-
+            filtered_out = []
             for core_member in core_members:
-                if not filter_rules or len(filter_rules) == 0:
+                if _core_member_matches_filters(core_member, filter_mode, filter_rules):
                     filtered_members.append(core_member)
-                    continue
-
-                matches_all_rules = True
-                for rule in filter_rules:
-                    field_name = rule.get("field")
-                    operator = rule.get("operator")
-                    filter_value = rule.get("value")
-                    member_value = core_member.get(field_name)
-                    rule_matches = False
-
-                    if operator == "equals":
-                        rule_matches = str(member_value) == str(filter_value)
-                    elif operator == "not_equals":
-                        rule_matches = str(member_value) != str(filter_value)
-                    elif operator == "contains":
-                        if member_value and filter_value:
-                            rule_matches = str(filter_value).lower() in str(member_value).lower()
-                    elif operator == "in":
-                        if isinstance(filter_value, list):
-                            rule_matches = member_value in filter_value
-                    elif operator == "not_in":
-                        if isinstance(filter_value, list):
-                            rule_matches = member_value not in filter_value
-                    elif operator in ["greater_than", "less_than", "between"]:
-                        try:
-                            if "date_of_birth" in field_name or "birth" in field_name:
-                                if member_value:
-                                    birth_date = date.fromisoformat(member_value) if isinstance(member_value, str) else member_value
-                                    age = (date.today() - birth_date).days // 365
-                                    member_value = age
-                            if operator == "greater_than":
-                                rule_matches = float(member_value) > float(filter_value)
-                            elif operator == "less_than":
-                                rule_matches = float(member_value) < float(filter_value)
-                            elif operator == "between":
-                                if isinstance(filter_value, list) and len(filter_value) == 2:
-                                    rule_matches = float(filter_value[0]) <= float(member_value) <= float(filter_value[1])
-                        except (ValueError, TypeError):
-                            rule_matches = False
-                    elif operator == "is_true":
-                        rule_matches = member_value == True or member_value == "true"
-                    elif operator == "is_false":
-                        rule_matches = member_value == False or member_value == "false"
-
-                    if not rule_matches:
-                        matches_all_rules = False
-                        break
-
-                if filter_mode == "include":
-                    if matches_all_rules:
-                        filtered_members.append(core_member)
                 else:
-                    if not matches_all_rules:
-                        filtered_members.append(core_member)
+                    filtered_out.append(core_member)
 
             logger.info(f"Filter mode: {filter_mode}. Filtered {len(core_members)} to {len(filtered_members)}")
             stats["fetched"] = len(filtered_members)
 
-            # Process each filtered core member
+            # Build the writes for each filtered core member, applied below with bulk_write
+            member_ops = []
+            new_members_by_op = {}  # op index -> (member id, birth_date) for upserted members
             for core_member in filtered_members:
                 core_id = core_member.get("id")
                 match_method = None
@@ -4263,59 +4251,87 @@ async def perform_member_sync_for_campus(campus_id: str, sync_type: str = "manua
                     else:
                         stats["updated"] += 1
 
-                    await db.members.update_one(
-                        {"id": existing["id"]},
-                        {"$set": member_data}
-                    )
+                    member_ops.append(UpdateOne({"id": existing["id"]}, {"$set": member_data}))
                 else:
-                    new_member = {
-                        "id": generate_uuid(),
-                        "campus_id": campus_id,
+                    new_member_id = generate_uuid()
+                    on_insert = {
+                        "id": new_member_id,
                         "church_id": campus_id,  # Use campus_id as church_id for multi-tenancy
-                        **member_data,
                         "is_archived": not is_active,
                         "is_active": is_active,
-                        "engagement_status": "active",
-                        "days_since_last_contact": 999,
+                        **contact_fields(None),
                         "created_at": datetime.now(timezone.utc)
                     }
-                    await db.members.insert_one(new_member)
-                    stats["created"] += 1
+                    new_members_by_op[len(member_ops)] = (new_member_id, member_data.get("birth_date"))
+                    if core_id:
+                        # Upsert on the external id so a concurrent webhook cannot create a duplicate
+                        member_ops.append(UpdateOne(
+                            {"campus_id": campus_id, "external_member_id": core_id},
+                            {"$set": member_data, "$setOnInsert": on_insert},
+                            upsert=True
+                        ))
+                    else:
+                        member_ops.append(InsertOne({"campus_id": campus_id, **member_data, **on_insert}))
 
+            # Archive members that no longer match the filter rules. A full sync sees every
+            # core member; an incremental sync only knows about the changed ones it filtered out
+            if incremental:
+                archive_candidates = [existing_map[m.get("id")] for m in filtered_out if m.get("id") in existing_map]
+            else:
+                filtered_core_ids = set(m.get("id") for m in filtered_members)
+                archive_candidates = [
+                    m for m in existing_members
+                    if m.get("external_member_id") and m["external_member_id"] not in filtered_core_ids
+                ]
+            to_archive = [m for m in archive_candidates if not m.get("is_archived")]
+            if to_archive:
+                member_ops.append(UpdateMany(
+                    {"id": {"$in": [m["id"] for m in to_archive]}},
+                    {"$set": {
+                        "is_archived": True,
+                        "archived_at": datetime.now(timezone.utc),
+                        "archived_reason": "No longer matches sync filter rules",
+                        "updated_at": datetime.now(timezone.utc)
+                    }}
+                ))
+                stats["archived"] += len(to_archive)
+                logger.info(f"Archived {len(to_archive)} members (no longer match filter)")
+
+            # Apply all member writes, then create birthday events for members actually inserted
+            birthday_events = []
+            async for offset, result in _bulk_write_chunked(db.members, member_ops):
+                inserted_indexes = list(result.upserted_ids.keys())
+                inserted_indexes += [
+                    i for i, op in enumerate(member_ops[offset:offset + SYNC_WRITE_BATCH_SIZE])
+                    if isinstance(op, InsertOne)
+                ]
+                for index in inserted_indexes:
+                    new_member_id, birth_date = new_members_by_op[offset + index]
+                    stats["created"] += 1
                     # Create birthday event if member has birth_date
-                    if new_member.get("birth_date"):
-                        birthday_event = {
+                    if birth_date:
+                        birthday_events.append(InsertOne({
                             "id": generate_uuid(),
-                            "member_id": new_member["id"],
+                            "member_id": new_member_id,
                             "campus_id": campus_id,
                             "church_id": campus_id,
                             "event_type": EventType.BIRTHDAY.value,
-                            "event_date": new_member["birth_date"],
+                            "event_date": birth_date,
                             "title": "Birthday Celebration",
                             "description": "Annual birthday reminder",
                             "completed": False,
                             "ignored": False,
                             "created_at": datetime.now(timezone.utc),
                             "updated_at": datetime.now(timezone.utc)
-                        }
-                        await db.care_events.insert_one(birthday_event)
-
-            # Archive members not in filtered list
-            filtered_core_ids = set(m.get("id") for m in filtered_members)
-            for existing_member in existing_members:
-                external_id = existing_member.get("external_member_id")
-                if external_id and external_id not in filtered_core_ids and not existing_member.get("is_archived"):
-                    await db.members.update_one(
-                        {"id": existing_member["id"]},
-                        {"$set": {
-                            "is_archived": True,
-                            "archived_at": datetime.now(timezone.utc),
-                            "archived_reason": "No longer matches sync filter rules",
-                            "updated_at": datetime.now(timezone.utc)
-                        }}
-                    )
-                    stats["archived"] += 1
-                    logger.info(f"Archived member {existing_member['name']} (no longer matches filter)")
+                        }))
+                # An upsert that matched a member created meanwhile counts as an update
+                matched_new = sum(
+                    1 for i in new_members_by_op
+                    if offset <= i < offset + SYNC_WRITE_BATCH_SIZE and (i - offset) not in inserted_indexes
+                )
+                stats["updated"] += matched_new
+            async for _ in _bulk_write_chunked(db.care_events, birthday_events):
+                pass
 
             # Log matching summary
             logger.info(
@@ -4343,7 +4359,8 @@ async def perform_member_sync_for_campus(campus_id: str, sync_type: str = "manua
                 {"$set": {
                     "last_sync_at": end_time,
                     "last_sync_status": "success",
-                    "last_sync_message": sync_message
+                    "last_sync_message": sync_message,
+                    "member_sync_cursor": next_cursor.isoformat() if next_cursor else None
                 }}
             )
 
@@ -4365,9 +4382,15 @@ async def perform_member_sync_for_campus(campus_id: str, sync_type: str = "manua
                 }}
             )
 
+            if stats["created"] or stats["updated"] or stats["archived"] or stats["unarchived"]:
+                await invalidate_dashboard_cache(campus_id)
+                # Members and birthday events written by this sync carry updated_at >= start_time
+                await SearchService(db).index_changed_since(start_time, campus_id)
+
             return {
                 "success": True,
                 "message": "Sync completed successfully",
+                "sync_mode": sync_mode,
                 "stats": stats,
                 "duration_seconds": duration
             }
@@ -4400,8 +4423,8 @@ async def perform_member_sync_for_campus(campus_id: str, sync_type: str = "manua
 
 
 @post("/sync/members/pull")
-async def sync_members_from_core(request: Request) -> dict:
-    """Pull members from core API and sync"""
+async def sync_members_from_core(request: Request, full: bool = False) -> dict:
+    """Pull members from core API and sync (incremental unless full=true)"""
     current_user = await get_current_user(request)
     if current_user["role"] not in [UserRole.FULL_ADMIN.value, UserRole.CAMPUS_ADMIN.value]:
         raise HTTPException(status_code=403, detail="Only administrators can sync members")
@@ -4410,7 +4433,7 @@ async def sync_members_from_core(request: Request) -> dict:
     if not campus_id:
         raise HTTPException(status_code=400, detail="Please select a campus first")
 
-    result = await perform_member_sync_for_campus(campus_id, sync_type="manual")
+    result = await perform_member_sync_for_campus(campus_id, sync_type="manual", full=True if full else None)
 
     if not result.get("success"):
         raise HTTPException(status_code=500, detail=result.get("error", "Sync failed"))
@@ -4506,7 +4529,8 @@ async def setup_first_campus(request: SetupCampusRequest) -> dict:
         await db.campuses.insert_one(to_mongo_doc(campus))
 
         # Invalidate campuses cache so new campus appears immediately
-        invalidate_cache("campuses")
+        cache = get_cache()
+        await cache.invalidate_campuses()
 
         return {"success": True, "message": "Campus created", "campus_id": campus.id}
 
@@ -4545,7 +4569,6 @@ _core_api_token_cache: dict = {}
 
 async def get_cached_core_token(campus_id: str, config: dict) -> str:
     """Get or refresh cached token for core API authentication"""
-    import httpx
 
     # Check if we have a valid cached token
     cached = _core_api_token_cache.get(campus_id)
@@ -4562,7 +4585,7 @@ async def get_cached_core_token(campus_id: str, config: dict) -> str:
     if not decrypted_pwd:
         raise Exception("Failed to decrypt API password")
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with shared_http_client(UPSTREAM_CORE_API) as client:
         login_response = await client.post(
             f"{base_url}{api_path_prefix}/auth/login",
             json={"email": config["api_email"], "password": decrypted_pwd}
@@ -4668,7 +4691,6 @@ async def receive_sync_webhook(request: Request) -> dict:
             logger.info(f"Webhook {event_type} received for member {member_id}, syncing...")
 
             try:
-                import httpx
 
                 # Get api_path_prefix with fallback for existing configs
                 api_path_prefix = config.get('api_path_prefix', '/api')
@@ -4677,7 +4699,7 @@ async def receive_sync_webhook(request: Request) -> dict:
                 # Get cached token (avoids rate limiting)
                 token = await get_cached_core_token(campus_id, config)
 
-                async with httpx.AsyncClient(timeout=30.0) as client:
+                async with shared_http_client(UPSTREAM_CORE_API) as client:
                     if event_type == "member.deleted":
                         # Archive the member
                         await db.members.update_one(
@@ -4758,8 +4780,7 @@ async def receive_sync_webhook(request: Request) -> dict:
                                 "campus_id": config["campus_id"],
                                 **member_data,
                                 "is_archived": not core_member.get("is_active", True),
-                                "engagement_status": "active",
-                                "days_since_last_contact": 999,
+                                **contact_fields(None),
                                 "created_at": datetime.now(timezone.utc)
                             }
                             await db.members.insert_one(new_member)
@@ -4833,8 +4854,22 @@ async def get_reminder_stats() -> dict:
 
 # ==================== STATIC FILES ====================
 
+def _photo_response(filepath: Path, request: Request) -> LitestarFile:
+    """Serve a photo; content-hashed JPEGs are cached for good and upgraded to AVIF/WebP when accepted"""
+    headers = {}
+    if HASHED_PHOTO_NAME.search(filepath.name):
+        headers["Cache-Control"] = PHOTO_CACHE_CONTROL
+        if filepath.suffix == ".jpg":
+            headers["Vary"] = "Accept"
+            accept = request.headers.get("accept", "")
+            for fmt in ("avif", "webp"):
+                candidate = filepath.with_suffix(f".{fmt}")
+                if f"image/{fmt}" in accept and candidate.exists():
+                    return LitestarFile(path=candidate, headers=headers, media_type=f"image/{fmt}")
+    return LitestarFile(path=filepath, headers=headers)
+
 @get("/uploads/{filename:str}")
-async def get_uploaded_file(filename: str) -> dict:
+async def get_uploaded_file(filename: str, request: Request) -> dict:
     """Serve uploaded files with path traversal protection"""
     # Validate filename - reject any path traversal attempts
     if ".." in filename or "/" in filename or "\\" in filename:
@@ -4849,10 +4884,10 @@ async def get_uploaded_file(filename: str) -> dict:
 
     if not filepath.exists():
         raise HTTPException(status_code=404, detail="File not found")
-    return LitestarFile(path=filepath)
+    return _photo_response(filepath, request)
 
 @get("/user-photos/{filename:str}")
-async def get_user_photo(filename: str) -> dict:
+async def get_user_photo(filename: str, request: Request) -> dict:
     """Serve user profile photos with path traversal protection"""
     # Validate filename - reject any path traversal attempts
     if ".." in filename or "/" in filename or "\\" in filename:
@@ -4867,7 +4902,7 @@ async def get_user_photo(filename: str) -> dict:
 
     if not filepath.exists():
         raise HTTPException(status_code=404, detail="Photo not found")
-    return LitestarFile(path=filepath)
+    return _photo_response(filepath, request)
 
 # ==================== SEARCH ENDPOINT ====================
 
@@ -4875,16 +4910,14 @@ async def get_user_photo(filename: str) -> dict:
 async def global_search(q: str, request: Request) -> dict:
     """
     Global search across members and care events
-    Returns members matching name, phone, email and care events matching title, description
+    Returns members matching name or phone and care events matching title or description,
+    ranked by the search index (word prefixes, phone digits, spelling variants and typos)
     """
     try:
         current_user = await get_current_user(request)
         if not q or len(q) < 2:
             return {"members": [], "care_events": []}
 
-        # Security: Escape regex special characters to prevent NoSQL injection
-        safe_query = escape_regex(q)
-
         # Get user's campus
         campus_id = current_user.get("campus_id")
 
@@ -4893,33 +4926,31 @@ async def global_search(q: str, request: Request) -> dict:
         if current_user["role"] in [UserRole.CAMPUS_ADMIN.value, UserRole.PASTOR.value]:
             search_filter["campus_id"] = campus_id
 
-        # Search members
-        member_query = {
-            **search_filter,
-            "$or": [
-                {"name": {"$regex": safe_query, "$options": "i"}},
-                {"phone": {"$regex": safe_query, "$options": "i"}}
-            ]
-        }
-        
-        members = await db.members.find(member_query, {"_id": 0}).limit(10).to_list(10)
-        
-        # Search care events
-        care_event_query = {
-            **search_filter,
-            "$or": [
-                {"title": {"$regex": safe_query, "$options": "i"}},
-                {"description": {"$regex": safe_query, "$options": "i"}}
-            ]
-        }
-        
-        care_events = await db.care_events.find(care_event_query, {"_id": 0}).limit(10).to_list(10)
+        # Ranked ids from the search index (prefix, phone and fuzzy matching)
+        search = SearchService(db)
+        member_ids, care_event_ids = await asyncio.gather(
+            search.search_members(q, search_filter.get("campus_id"), limit=10),
+            search.search_care_events(q, search_filter.get("campus_id"), limit=10),
+        )
+        members, care_events = await asyncio.gather(
+            db.members.find({**search_filter, "id": {"$in": member_ids}}, {"_id": 0}).to_list(10),
+            db.care_events.find({**search_filter, "id": {"$in": care_event_ids}}, {"_id": 0}).to_list(10),
+        )
+
+        # Keep relevance order ($in returns documents in index order)
+        member_rank = {member_id: i for i, member_id in enumerate(member_ids)}
+        members.sort(key=lambda m: member_rank[m["id"]])
+        event_rank = {event_id: i for i, event_id in enumerate(care_event_ids)}
+        care_events.sort(key=lambda e: event_rank[e["id"]])
         
-        # Enrich care events with member names
+        # Enrich care events with member names (one batched lookup; matched members are reused)
+        loaders = get_loaders(request, db)
+        for member in members:
+            loaders.members.prime(member)
+        members_by_id = await loaders.members.load_many(e.get("member_id") for e in care_events)
         for event in care_events:
             if event.get("member_id"):
-                member = await db.members.find_one({"id": event["member_id"]}, {"_id": 0, "name": 1})
-                event["member_name"] = member["name"] if member else "Unknown"
+                event["member_name"] = display_name(members_by_id.get(event["member_id"]))
         
         return {
             "members": members,
@@ -4939,11 +4970,12 @@ async def get_activity_logs(
     action_type: Optional[str] = None,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    limit: int = 100
-) -> dict:
+    limit: int = 100,
+    cursor: Optional[str] = None
+) -> Response:
     """
     Get activity logs with optional filters
-    Default: last 30 days
+    Default: last 30 days, newest first; pass X-Next-Cursor as ?cursor= for older logs
     """
     try:
         current_user = await get_current_user(request)
@@ -4979,11 +5011,19 @@ async def get_activity_logs(
             "$lte": end_datetime
         }
         
-        # Get logs
-        logs = await db.activity_logs.find(query, {"_id": 0}).sort("created_at", -1).limit(limit).to_list(limit)
-        
-        return logs
+        try:
+            query = keyset_query(query, RECENT_FIRST_SORT, cursor)
+        except ValueError:
+            raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+        # Get logs (one extra row tells us whether older logs exist)
+        logs = await db.activity_logs.find(query, {"_id": 0}).sort(list(RECENT_FIRST_SORT)).limit(limit + 1).to_list(limit + 1)
+        logs, next_cursor = split_page(logs, RECENT_FIRST_SORT, limit)
+
+        return Response(content=logs, headers={"X-Next-Cursor": next_cursor} if next_cursor else {})
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching activity logs: {str(e)}")
         raise HTTPException(status_code=500, detail=safe_error_detail(e))
@@ -5039,68 +5079,55 @@ async def get_activity_summary(request: Request) -> dict:
 
 # ==================== SSE REAL-TIME ACTIVITY STREAM ====================
 
-# In-memory event subscribers (keyed by campus_id)
-# Each subscriber is an asyncio.Queue that receives activity events
-from asyncio import Queue
-from typing import Dict, Set
-import asyncio
-
-_activity_subscribers: Dict[str, Set[Queue]] = {}
-_subscriber_lock = asyncio.Lock()
+# Fan-out lives in services.activity_stream: each worker holds one DragonflyDB subscription
+# per campus with local connections, so events reach dashboards on every worker
+from services.activity_stream import get_activity_broker
 
 async def broadcast_activity(campus_id: str, activity: dict):
-    """Broadcast an activity event to all subscribers for a campus"""
-    async with _subscriber_lock:
-        if campus_id in _activity_subscribers:
-            for queue in _activity_subscribers[campus_id]:
-                try:
-                    queue.put_nowait(activity)
-                except asyncio.QueueFull:
-                    try:
-                        queue.get_nowait()
-                        queue.put_nowait(activity)
-                    except (asyncio.QueueEmpty, asyncio.QueueFull):
-                        pass
-
-async def subscribe_to_activities(campus_id: str) -> Queue:
-    """Subscribe to activity events for a campus"""
-    queue: Queue = Queue(maxsize=100)
-    async with _subscriber_lock:
-        if campus_id not in _activity_subscribers:
-            _activity_subscribers[campus_id] = set()
-        _activity_subscribers[campus_id].add(queue)
-    return queue
-
-async def unsubscribe_from_activities(campus_id: str, queue: Queue):
-    """Unsubscribe from activity events"""
-    async with _subscriber_lock:
-        if campus_id in _activity_subscribers:
-            _activity_subscribers[campus_id].discard(queue)
-            if not _activity_subscribers[campus_id]:
-                del _activity_subscribers[campus_id]
-
-def activity_event_generator(campus_id: str, user_id: str, queue: Queue):
+    """Broadcast an activity event to all subscribers for a campus (on every worker)"""
+    await get_activity_broker().publish(campus_id, activity)
+
+async def broadcast_activities(campus_id: str, activities: List[dict]):
+    """Broadcast a batch of one campus' activity events in one pipelined publish"""
+    await get_activity_broker().publish_many(campus_id, activities)
+
+def activity_event_generator(campus_id: str, user_id: str, queue, replay: Optional[list] = None):
     """Generate SSE events for activity stream - sync generator wrapper"""
     import json
+    from services.activity_stream import parse_event_id
+
+    def _format(event_id: str, activity: dict) -> str:
+        return f"id: {event_id}\nevent: activity\ndata: {json.dumps(activity, default=str)}\n\n"
 
     async def _inner():
         try:
             # Send initial connection event
             yield f"event: connected\ndata: {json.dumps({'status': 'connected', 'campus_id': campus_id})}\n\n"
 
+            # Events missed since the client's Last-Event-ID; live events already queued
+            # during the replay are skipped below so nothing is sent twice
+            last_seen = None
+            for event_id, activity in replay or []:
+                last_seen = parse_event_id(event_id)
+                if activity.get("user_id") != user_id:
+                    yield _format(event_id, activity)
+
             # Send heartbeat every 30 seconds to keep connection alive
-            heartbeat_interval = 30
+            heartbeat_interval = ACTIVITY_STREAM_HEARTBEAT_SECONDS
 
             while True:
                 try:
                     # Wait for event with timeout for heartbeat
                     try:
-                        activity = await asyncio.wait_for(queue.get(), timeout=heartbeat_interval)
+                        event_id, activity = await asyncio.wait_for(queue.get(), timeout=heartbeat_interval)
+
+                        position = parse_event_id(event_id)
+                        if last_seen and position and position <= last_seen:
+                            continue
 
                         # Don't send user's own activities back to them
                         if activity.get("user_id") != user_id:
-                            event_data = json.dumps(activity, default=str)
-                            yield f"event: activity\ndata: {event_data}\n\n"
+                            yield _format(event_id, activity)
 
                     except asyncio.TimeoutError:
                         # Send heartbeat
@@ -5110,12 +5137,12 @@ def activity_event_generator(campus_id: str, user_id: str, queue: Queue):
                     break
 
         finally:
-            await unsubscribe_from_activities(campus_id, queue)
+            await get_activity_broker().unsubscribe(campus_id, queue)
 
     return _inner()
 
 @get("/stream/activity")
-async def stream_activity(request: Request, token: Optional[str] = None) -> Stream:
+async def stream_activity(request: Request, token: Optional[str] = None, last_event_id: Optional[str] = None) -> Stream:
     """
     Server-Sent Events endpoint for real-time activity updates.
 
@@ -5126,6 +5153,10 @@ async def stream_activity(request: Request, token: Optional[str] = None) -> Stre
     - Authorization header (Bearer token)
     - Query parameter (?token=xxx) - for EventSource which doesn't support headers
 
+    Every activity event carries an SSE id. On reconnect EventSource sends it back as
+    the Last-Event-ID header (or pass ?last_event_id=...) and missed events are replayed
+    from a capped per-campus stream before live events resume.
+
     Usage (JavaScript):
     ```js
     const eventSource = new EventSource('/api/stream/activity?token=' + authToken);
@@ -5153,7 +5184,7 @@ async def stream_activity(request: Request, token: Optional[str] = None) -> Stre
             payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
             user_id = payload.get("sub")
             if user_id:
-                user_doc = await db.users.find_one({"id": user_id}, {"_id": 0})
+                user_doc = await load_user_principal(user_id)
                 if user_doc:
                     current_user = user_doc
         except JWTError as e:
@@ -5167,11 +5198,14 @@ async def stream_activity(request: Request, token: Optional[str] = None) -> Stre
     campus_id = current_user.get("campus_id") or "global"
     user_id = current_user.get("id", "")
 
-    # Subscribe BEFORE creating Stream to avoid async issues in generator
-    queue = await subscribe_to_activities(campus_id)
+    # Subscribe BEFORE creating Stream to avoid async issues in generator, and before
+    # replaying so no event falls between the replay and the live subscription
+    broker = get_activity_broker()
+    queue = await broker.subscribe(campus_id)
+    replay = await broker.replay(campus_id, request.headers.get("last-event-id") or last_event_id)
 
     return Stream(
-        activity_event_generator(campus_id, user_id, queue),
+        activity_event_generator(campus_id, user_id, queue, replay),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -5219,6 +5253,9 @@ async def health_check() -> dict:
             "status": "healthy",
             "service": "faithtracker-api",
             "database": "connected",
+            "user_cache": get_user_cache_stats(),
+            "activity_log_writer": writer.stats() if (writer := get_activity_writer()) else None,
+            "activity_stream": get_activity_broker().stats(),
             "timestamp": datetime.now(timezone.utc)
         }
     except Exception as e:
@@ -5251,6 +5288,17 @@ async def readiness_check() -> dict:
             detail={"status": "not_ready", "database": "disconnected", "error": str(e)}
         )
 
+@get("/metrics", media_type="text/plain; version=0.0.4")
+async def metrics(request: Request) -> str:
+    """
+    Prometheus metrics merged across all workers.
+    Scrapers send METRICS_TOKEN as a bearer token; full admins can use their session token.
+    """
+    metrics_token = os.environ.get("METRICS_TOKEN", "")
+    if not (metrics_token and hmac.compare_digest(request.headers.get("authorization", ""), f"Bearer {metrics_token}")):
+        await get_full_admin(request)
+    return render_metrics(await get_metrics_publisher().collect())
+
 # ==================== LITESTAR APP CONFIGURATION ====================
 
 # CORS Configuration for subdomain architecture
@@ -5279,27 +5327,43 @@ cors_config = CORSConfig(
     allow_origins=cors_origins_list,
     allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
     allow_headers=["Authorization", "Content-Type", "X-Requested-With", "Cache-Control", "Pragma"],
-    expose_headers=["X-Total-Count"],
+    expose_headers=["X-Total-Count", "X-Total-Truncated", "X-Next-Cursor", *(
+        ["X-Query-Count", "X-Query-Time-Ms", "X-Query-Repeated", "X-Query-Slow"] if QUERY_PROFILER_ENABLED else []
+    )],
 )
 
 
 # Lifecycle functions
 async def on_startup() -> None:
     """Initialize dependencies, cache, and create default admin if needed"""
-    from services.cache import init_cache
+    from services.cache import init_cache, get_redis_client, get_cache
+    from services.http_client import init_http_clients
+    from services.activity_writer import init_activity_writer
+    from services.activity_stream import init_activity_broker
+    from services.report_service import init_pdf_renderer
+    from services.image_service import init_image_pool
+    from services.metrics import init_metrics
+    from services.index_registry import start_index_reconcile
     
+    await init_http_clients()
     try:
-        await init_cache()
-        logger.info("DragonflyDB cache initialized")
+        if await init_cache():
+            logger.info("DragonflyDB cache initialized")
     except Exception as e:
         logger.warning(f"Cache initialization failed (continuing without cache): {e}")
     
     init_dependencies(db, SECRET_KEY)
+    start_index_reconcile(db, get_cache())
+    init_activity_broker(get_redis_client())
+    init_metrics(get_redis_client())
+    init_pdf_renderer()
+    init_image_pool()
+    init_activity_writer(db, _broadcast_activities_safe)
     init_member_routes(invalidate_dashboard_cache, log_activity, msgspec_enc_hook, ROOT_DIR)
     init_care_event_routes(
         invalidate_dashboard_cache, log_activity, send_whatsapp_message,
         generate_grief_timeline, generate_accident_followup_timeline,
-        get_campus_timezone, get_date_in_timezone
+        get_campus_timezone, get_date_in_timezone, log_activities
     )
     init_grief_support_routes(
         invalidate_dashboard_cache, log_activity, send_whatsapp_message,
@@ -5357,14 +5421,47 @@ async def on_startup() -> None:
 async def on_shutdown() -> None:
     """Cleanup on shutdown"""
     from services.cache import close_cache
+    from services.http_client import close_http_clients
+    from services.activity_writer import close_activity_writer
+    from services.activity_stream import close_activity_broker
+    from services.report_service import close_pdf_renderer
+    from services.image_service import close_image_pool
+    from services.metrics import close_metrics
+    from services.index_registry import stop_index_reconcile
     
     stop_scheduler()
+    await stop_index_reconcile()
+    
+    # Drain queued activity logs while the database client is still open
+    try:
+        await close_activity_writer()
+    except Exception as e:
+        logger.warning(f"Error draining activity log writer: {e}")
+    
+    # Release the broker's pub/sub connection before the shared client closes
+    try:
+        await close_activity_broker()
+    except Exception as e:
+        logger.warning(f"Error closing activity stream broker: {e}")
+    
+    try:
+        await close_metrics()
+    except Exception as e:
+        logger.warning(f"Error closing metrics publisher: {e}")
+    
+    close_pdf_renderer()
+    close_image_pool()
     
     try:
         await close_cache()
     except Exception as e:
         logger.warning(f"Error closing cache: {e}")
     
+    try:
+        await close_http_clients()
+    except Exception as e:
+        logger.warning(f"Error closing HTTP clients: {e}")
+    
     client.close()
 
 
@@ -5440,9 +5537,16 @@ async def list_pastoral_notes(
     include_private: bool = False,
     follow_up_due: bool = False,
     page: int = 1,
-    limit: int = 50
+    limit: int = 50,
+    cursor: str | None = None,
+    include_total: bool | None = None
 ) -> dict:
-    """List pastoral notes with filtering options"""
+    """
+    List pastoral notes with filtering options, newest first.
+
+    next_cursor can be passed back as ?cursor= instead of page; total is then
+    only computed when include_total=true.
+    """
     current_user = await get_current_user(request)
 
     # Build query
@@ -5481,29 +5585,37 @@ async def list_pastoral_notes(
         query["follow_up_date"] = {"$lte": today}
         query["follow_up_completed"] = False
 
-    # Pagination
-    skip = (page - 1) * limit
+    # Get total count (cached across pages, skipped for cursor requests unless asked for)
+    total = None
+    if include_total or (include_total is None and not cursor):
+        total = await cached_count(db.pastoral_notes, query)
 
-    # Get total count
-    total = await db.pastoral_notes.count_documents(query)
+    # Pagination: keyset when a cursor is given, offset for page-based clients
+    try:
+        query = keyset_query(query, RECENT_FIRST_SORT, cursor)
+    except ValueError:
+        raise HTTPException(status_code=HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    skip = 0 if cursor else (page - 1) * limit
 
     # Get notes
     notes = await db.pastoral_notes.find(
         query,
         {"_id": 0}
-    ).sort("created_at", -1).skip(skip).limit(limit).to_list(limit)
+    ).sort(list(RECENT_FIRST_SORT)).skip(skip).limit(limit + 1).to_list(limit + 1)
+    notes, next_cursor = split_page(notes, RECENT_FIRST_SORT, limit)
 
-    # Enrich with member names
+    # Enrich with member names (one batched lookup for the page)
+    members_by_id = await get_loaders(request, db).members.load_many(note["member_id"] for note in notes)
     for note in notes:
-        member = await db.members.find_one({"id": note["member_id"]}, {"_id": 0, "name": 1})
-        note["member_name"] = member["name"] if member else "Unknown"
+        note["member_name"] = display_name(members_by_id.get(note["member_id"]))
 
     return {
         "items": notes,
         "total": total,
         "page": page,
         "limit": limit,
-        "pages": (total + limit - 1) // limit
+        "pages": (total + limit - 1) // limit if total is not None else None,
+        "next_cursor": next_cursor
     }
 
 
@@ -5731,8 +5843,9 @@ async def get_notes_with_followup_due(request: Request) -> list:
     notes = await db.pastoral_notes.find(query, {"_id": 0}).sort("follow_up_date", 1).to_list(200)
 
     # Enrich with member names
+    members_by_id = await get_loaders(request, db).members.load_many(note["member_id"] for note in notes)
     for note in notes:
-        member = await db.members.find_one({"id": note["member_id"]}, {"_id": 0, "name": 1, "phone": 1})
+        member = members_by_id.get(note["member_id"])
         if member:
             note["member_name"] = member["name"]
             note["member_phone"] = member.get("phone")
@@ -5760,6 +5873,7 @@ route_handlers = [
     # Health checks
     health_check,
     readiness_check,
+    metrics,
     # Campus endpoints (from routes/campus.py)
     *campus_route_handlers,
     # Auth endpoints (from routes/auth.py)
@@ -5793,6 +5907,7 @@ route_handlers = [
     # Import/Export endpoints
     import_members_csv,
     import_members_json,
+    get_import_job,
     export_members_csv,
     export_care_events_csv,
     # Integration endpoints
@@ -5803,6 +5918,9 @@ route_handlers = [
     # Reports endpoints
     get_monthly_management_report,
     export_monthly_report_pdf,
+    create_monthly_report_pdf_job,
+    get_report_job,
+    download_report_job,
     get_staff_performance_report,
     get_yearly_summary_report,
     # Config endpoints
@@ -5863,12 +5981,6 @@ route_handlers = [
     stream_test,
 ]
 
-# Rate limiting configuration
-rate_limit_config = RateLimitConfig(
-    rate_limit=("minute", 100),  # 100 requests per minute for general endpoints
-    exclude=["/health", "/docs", "/schema"],  # Exclude health check and docs
-)
-
 # Create Litestar application
 app = Litestar(
     route_handlers=route_handlers,
@@ -5876,10 +5988,12 @@ app = Litestar(
     on_startup=[on_startup],
     on_shutdown=[on_shutdown],
     middleware=[
+        DefineMiddleware(MetricsMiddleware),  # Per-route latency/size metrics (outermost, so 413/429 count too)
         DefineMiddleware(SecurityHeadersMiddleware),  # Security headers (XSS, clickjacking protection)
         # Note: Compression handled by Angie at edge (Brotli/gzip)
         DefineMiddleware(RequestSizeLimitMiddleware),  # Limit request body size
-        rate_limit_config.middleware,  # Rate limiting
+        *([DefineMiddleware(QueryProfilerMiddleware)] if QUERY_PROFILER_ENABLED else []),  # X-Query-* debug headers
+        DefineMiddleware(RateLimitMiddleware),  # Rate limiting (shared across workers)
     ],
     openapi_config=OpenAPIConfig(
         title="FaithTracker API",
@@ -1,16 +1,71 @@
-from services.cache import CacheService, get_cache, init_cache, close_cache
+from services.cache import CacheService, get_cache, init_cache, close_cache, get_rate_limiter
 from services.member_service import MemberService
 from services.care_event_service import CareEventService
 from services.notification_service import NotificationService
 from services.image_service import ImageService
+from services.member_import import MemberImportService
+from services.csv_export import stream_csv, gzip_stream
+from services.http_client import get_http_client, init_http_clients, close_http_clients
+from services.pagination import encode_cursor, decode_cursor, keyset_query, split_page, cached_count
+from services.loaders import EntityLoader, RequestLoaders, get_loaders
+from services.search_service import SearchService
+from services.activity_writer import ActivityLogWriter, init_activity_writer, get_activity_writer, close_activity_writer
+from services.activity_stream import ActivityBroker, init_activity_broker, get_activity_broker, close_activity_broker
+from services.report_service import ReportService, init_pdf_renderer, close_pdf_renderer
+from services.rollup_service import RollupService
+from services.analytics_service import AnalyticsService
+from services.engagement_service import EngagementService
+from services.rate_limit import RateLimitPolicy, select_policy
+from services.metrics import MetricsPublisher, init_metrics, get_metrics_publisher, close_metrics
+from services.index_registry import IndexSpec, INDEXES, reconcile_indexes, index_usage_report
 
 __all__ = [
     "CacheService",
     "get_cache",
     "init_cache",
     "close_cache",
+    "get_rate_limiter",
     "MemberService",
     "CareEventService",
     "NotificationService",
     "ImageService",
+    "MemberImportService",
+    "stream_csv",
+    "gzip_stream",
+    "get_http_client",
+    "init_http_clients",
+    "close_http_clients",
+    "encode_cursor",
+    "decode_cursor",
+    "keyset_query",
+    "split_page",
+    "cached_count",
+    "EntityLoader",
+    "RequestLoaders",
+    "get_loaders",
+    "SearchService",
+    "ActivityLogWriter",
+    "init_activity_writer",
+    "get_activity_writer",
+    "close_activity_writer",
+    "ActivityBroker",
+    "init_activity_broker",
+    "get_activity_broker",
+    "close_activity_broker",
+    "ReportService",
+    "init_pdf_renderer",
+    "close_pdf_renderer",
+    "RollupService",
+    "AnalyticsService",
+    "EngagementService",
+    "RateLimitPolicy",
+    "select_policy",
+    "MetricsPublisher",
+    "init_metrics",
+    "get_metrics_publisher",
+    "close_metrics",
+    "IndexSpec",
+    "INDEXES",
+    "reconcile_indexes",
+    "index_usage_report",
 ]
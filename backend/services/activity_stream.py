@@ -0,0 +1,258 @@
+import asyncio
+import itertools
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import redis.asyncio as redis
+
+from constants import ACTIVITY_STREAM_MAXLEN, ACTIVITY_STREAM_REPLAY_LIMIT, ACTIVITY_SUBSCRIBER_QUEUE_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Live events are published on one channel per campus as "<stream id>|<json>";
+# the same payload is appended to a capped stream per campus for Last-Event-ID replay
+ACTIVITY_CHANNEL_PREFIX = "ft:activity:"
+ACTIVITY_STREAM_PREFIX = "ft:activity-log:"
+
+# (event id, activity payload) as delivered to subscriber queues
+ActivityEvent = Tuple[str, Dict[str, Any]]
+
+
+def parse_event_id(event_id: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Stream ids are "<ms>-<seq>"; returns None for anything else"""
+    if not event_id:
+        return None
+    ms, _, seq = event_id.partition("-")
+    try:
+        return int(ms), int(seq or 0)
+    except ValueError:
+        return None
+
+
+class ActivityBroker:
+    """
+    Fans activity events out to SSE connections across all workers.
+
+    Each worker holds one pub/sub connection and subscribes to a campus channel only
+    while it has local connections for that campus. Incoming events are copied into
+    the local connection queues with put_nowait, so no lock is held on the hot path.
+    Without DragonflyDB the broker falls back to fanning out within this process.
+    """
+
+    def __init__(self, client: Optional[redis.Redis] = None, queue_size: int = ACTIVITY_SUBSCRIBER_QUEUE_SIZE):
+        self._client = client
+        self._queue_size = queue_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._pubsub = client.pubsub() if client else None
+        self._channels: Set[str] = set()
+        self._subscribed = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._local_seq = itertools.count()
+        self._published = 0
+        self._delivered = 0
+        self._dropped = 0
+        self._publish_errors = 0
+
+    def start(self) -> None:
+        if self._pubsub and self._task is None:
+            self._task = asyncio.create_task(self._listen())
+
+    # ---------- Subscribers ----------
+
+    async def subscribe(self, campus_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self._queue_size)
+        self._subscribers.setdefault(campus_id, set()).add(queue)
+        channel = ACTIVITY_CHANNEL_PREFIX + campus_id
+        if self._pubsub and channel not in self._channels:
+            self._channels.add(channel)
+            try:
+                await self._pubsub.subscribe(channel)
+                self._subscribed.set()
+            except Exception as e:
+                # The listener resubscribes every tracked channel when it reconnects
+                logger.warning(f"Activity stream subscribe failed for {campus_id}: {e}")
+        return queue
+
+    async def unsubscribe(self, campus_id: str, queue: asyncio.Queue) -> None:
+        queues = self._subscribers.get(campus_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if queues:
+            return
+        del self._subscribers[campus_id]
+        channel = ACTIVITY_CHANNEL_PREFIX + campus_id
+        if self._pubsub and channel in self._channels:
+            self._channels.discard(channel)
+            try:
+                await self._pubsub.unsubscribe(channel)
+            except Exception as e:
+                logger.debug(f"Activity stream unsubscribe failed for {campus_id}: {e}")
+
+    def _deliver(self, campus_id: str, event: ActivityEvent) -> None:
+        # Snapshot: a connection may unsubscribe while we iterate
+        for queue in tuple(self._subscribers.get(campus_id, ())):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Slow client: drop its oldest event rather than block everyone else
+                try:
+                    queue.get_nowait()
+                    queue.put_nowait(event)
+                    self._dropped += 1
+                except (asyncio.QueueEmpty, asyncio.QueueFull):
+                    continue
+            self._delivered += 1
+
+    # ---------- Publishing ----------
+
+    async def publish(self, campus_id: Optional[str], activity: Dict[str, Any]) -> Optional[str]:
+        """Append the event to the campus stream and notify every worker; returns the event id"""
+        event_ids = await self.publish_many(campus_id, [activity])
+        return event_ids[0] if event_ids else None
+
+    async def publish_many(self, campus_id: Optional[str], activities: List[Dict[str, Any]]) -> List[str]:
+        """
+        publish() for a batch of one campus' events: the stream appends go out in one
+        pipeline and the channel messages in a second, instead of two round trips per event.
+        """
+        if not campus_id or not activities:
+            return []
+        payloads = [json.dumps(activity, default=str) for activity in activities]
+        if self._client:
+            try:
+                # The channel message carries the stream id, so ids are needed before publishing
+                pipe = self._client.pipeline(transaction=False)
+                for data in payloads:
+                    pipe.xadd(
+                        ACTIVITY_STREAM_PREFIX + campus_id, {"data": data},
+                        maxlen=ACTIVITY_STREAM_MAXLEN, approximate=True,
+                    )
+                event_ids = await pipe.execute()
+                pipe = self._client.pipeline(transaction=False)
+                for event_id, data in zip(event_ids, payloads):
+                    pipe.publish(ACTIVITY_CHANNEL_PREFIX + campus_id, f"{event_id}|{data}")
+                await pipe.execute()
+                self._published += len(payloads)
+                return event_ids
+            except Exception as e:
+                self._publish_errors += 1
+                logger.warning(f"Activity stream publish failed, delivering locally only: {e}")
+        event_ids = []
+        for data in payloads:
+            event_id = f"{int(time.time() * 1000)}-{next(self._local_seq)}"
+            self._deliver(campus_id, (event_id, json.loads(data)))
+            event_ids.append(event_id)
+        self._published += len(payloads)
+        return event_ids
+
+    async def replay(self, campus_id: str, last_event_id: Optional[str]) -> List[ActivityEvent]:
+        """Events newer than last_event_id from the capped stream (oldest first)"""
+        if not self._client or parse_event_id(last_event_id) is None:
+            return []
+        try:
+            entries = await self._client.xrange(
+                ACTIVITY_STREAM_PREFIX + campus_id, min=f"({last_event_id}", max="+",
+                count=ACTIVITY_STREAM_REPLAY_LIMIT,
+            )
+        except Exception as e:
+            logger.warning(f"Activity stream replay failed for {campus_id}: {e}")
+            return []
+        events = []
+        for event_id, fields in entries:
+            try:
+                events.append((event_id, json.loads(fields["data"])))
+            except (KeyError, ValueError):
+                continue
+        return events
+
+    # ---------- Listener ----------
+
+    async def _listen(self) -> None:
+        """Route channel messages to local queues; resubscribe if the connection drops"""
+        while True:
+            try:
+                if not self._channels:
+                    self._subscribed.clear()
+                    await self._subscribed.wait()
+                    continue
+                if self._pubsub.connection is None:
+                    await self._pubsub.subscribe(*self._channels)
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if not message or message.get("type") != "message":
+                    continue
+                campus_id = message["channel"][len(ACTIVITY_CHANNEL_PREFIX):]
+                event_id, _, data = message["data"].partition("|")
+                self._deliver(campus_id, (event_id, json.loads(data)))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Activity stream listener error: {e}. Reconnecting in 5s")
+                await asyncio.sleep(5)
+                await self._reconnect()
+
+    async def _reconnect(self) -> None:
+        try:
+            await self._pubsub.aclose()
+        except Exception:
+            pass
+        self._pubsub = self._client.pubsub()
+        if self._channels:
+            try:
+                await self._pubsub.subscribe(*self._channels)
+            except Exception as e:
+                logger.warning(f"Activity stream resubscribe failed: {e}")
+
+    async def close(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+        if self._pubsub:
+            try:
+                await self._pubsub.aclose()
+            except Exception:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "mode": "pubsub" if self._client else "local",
+            "connections": sum(len(queues) for queues in self._subscribers.values()),
+            "campuses": len(self._subscribers),
+            "channels": len(self._channels),
+            "published": self._published,
+            "delivered": self._delivered,
+            "dropped": self._dropped,
+            "publish_errors": self._publish_errors,
+        }
+
+
+_broker: Optional[ActivityBroker] = None
+
+
+def init_activity_broker(client: Optional[redis.Redis] = None) -> ActivityBroker:
+    global _broker
+    _broker = ActivityBroker(client)
+    _broker.start()
+    logger.info(f"Activity stream broker started ({_broker.stats()['mode']} fan-out)")
+    return _broker
+
+
+def get_activity_broker() -> ActivityBroker:
+    """The worker's broker; a local-only one is created on first use (scripts, tests)"""
+    global _broker
+    if _broker is None:
+        _broker = ActivityBroker()
+    return _broker
+
+
+async def close_activity_broker() -> None:
+    global _broker
+    if _broker:
+        await _broker.close()
+        _broker = None
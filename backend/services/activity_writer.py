@@ -0,0 +1,216 @@
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from pymongo.errors import BulkWriteError
+
+from services.rollup_service import RollupService
+
+from constants import (
+    ACTIVITY_LOG_BATCH_SIZE, ACTIVITY_LOG_FLUSH_INTERVAL, ACTIVITY_LOG_MAX_QUEUE, ACTIVITY_LOG_SHUTDOWN_TIMEOUT,
+)
+
+logger = logging.getLogger(__name__)
+
+# Called once per campus and flush with the payloads of the entries that reached the database
+OnWritten = Callable[[Optional[str], List[Dict[str, Any]]], Awaitable[None]]
+
+
+class ActivityLogWriter:
+    """
+    Write-behind buffer for the activity_logs collection.
+
+    Entries are queued and written with one unordered insert_many per batch, flushed when
+    batch_size entries are waiting or flush_interval seconds after the first one arrived.
+    When max_queue entries are pending, writers wait for room instead of growing the
+    buffer without bound. Stored entries are added to the daily activity rollups.
+    Bulk operations hand over whole batches, which are written by background tasks.
+    """
+
+    def __init__(
+        self,
+        db,
+        on_written: Optional[OnWritten] = None,
+        batch_size: int = ACTIVITY_LOG_BATCH_SIZE,
+        flush_interval: float = ACTIVITY_LOG_FLUSH_INTERVAL,
+        max_queue: int = ACTIVITY_LOG_MAX_QUEUE,
+    ):
+        self._collection = db.activity_logs
+        self._rollups = RollupService(db)
+        self._on_written = on_written
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._queue: asyncio.Queue[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]] = asyncio.Queue(maxsize=max_queue)
+        self._task: Optional[asyncio.Task] = None
+        # Batches handed over by write_many, written outside the request that produced them
+        self._bulk_tasks: set[asyncio.Task] = set()
+        self._written = 0
+        self._failed = 0
+        self._batches = 0
+        self._backpressure_waits = 0
+        self._last_flush_ms: Optional[float] = None
+        self._max_flush_ms = 0.0
+        self._total_flush_ms = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+            self._task.add_done_callback(self._on_task_done)
+
+    def _on_task_done(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception():
+            logger.error(f"Activity log writer stopped unexpectedly: {task.exception()}")
+
+    async def write(self, doc: Dict[str, Any], broadcast: Optional[Dict[str, Any]] = None) -> None:
+        """Queue one activity log document; broadcast is handed to on_written once it is stored"""
+        if not self.running:
+            # Not started (scripts) or already closed: fall back to a direct write
+            await self._flush([(doc, broadcast)])
+            return
+        if self._queue.full():
+            self._backpressure_waits += 1
+        await self._queue.put((doc, broadcast))
+
+    async def write_many(
+        self, docs: List[Dict[str, Any]], broadcasts: Optional[List[Optional[Dict[str, Any]]]] = None
+    ) -> None:
+        """
+        Hand an already batched set of documents to a background insert_many, bypassing the queue.
+
+        Used by bulk operations, which produce all their entries at once: queueing them one
+        by one would only split them back into batch_size inserts and wait on backpressure.
+        Returns without waiting for the write; close() drains pending batches.
+        """
+        if not docs:
+            return
+        batch = list(zip(docs, broadcasts or [None] * len(docs)))
+        if not self.running:
+            await self._flush(batch)
+            return
+        task = asyncio.create_task(self._flush(batch))
+        self._bulk_tasks.add(task)
+        task.add_done_callback(self._bulk_tasks.discard)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._flush_interval
+            while len(batch) < self._batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                    continue
+                except asyncio.QueueEmpty:
+                    pass
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                await self._flush(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _flush(self, batch: List[Tuple[Dict[str, Any], Optional[Dict[str, Any]]]]) -> None:
+        started = time.perf_counter()
+        failed_indexes: set = set()
+        try:
+            await self._collection.insert_many([doc for doc, _ in batch], ordered=False)
+        except BulkWriteError as bwe:
+            failed_indexes = {err["index"] for err in bwe.details.get("writeErrors", [])}
+            logger.error(f"Activity log batch partially failed: {len(failed_indexes)} of {len(batch)} entries not written")
+        except Exception as e:
+            failed_indexes = set(range(len(batch)))
+            logger.error(f"Error writing {len(batch)} activity log entries: {str(e)}")
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self._batches += 1
+        self._written += len(batch) - len(failed_indexes)
+        self._failed += len(failed_indexes)
+        self._last_flush_ms = elapsed_ms
+        self._max_flush_ms = max(self._max_flush_ms, elapsed_ms)
+        self._total_flush_ms += elapsed_ms
+
+        await self._rollups.apply_activities(doc for i, (doc, _) in enumerate(batch) if i not in failed_indexes)
+
+        if self._on_written:
+            # One call per campus, so the broadcaster can pipeline each campus' events
+            by_campus: Dict[Optional[str], List[Dict[str, Any]]] = {}
+            for i, (doc, broadcast) in enumerate(batch):
+                if broadcast is not None and i not in failed_indexes:
+                    by_campus.setdefault(doc.get("campus_id"), []).append(broadcast)
+            for campus_id, broadcasts in by_campus.items():
+                try:
+                    await self._on_written(campus_id, broadcasts)
+                except Exception as e:
+                    logger.debug(f"Activity broadcast failed: {str(e)}")
+
+    async def close(self, timeout: float = ACTIVITY_LOG_SHUTDOWN_TIMEOUT) -> None:
+        """Drain queued entries and pending bulk batches (up to timeout seconds), then stop the flush loop"""
+        if self._task is None:
+            return
+        if self.running:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Activity log writer closed with {self._queue.qsize()} entries not written")
+        if self._bulk_tasks:
+            _, pending = await asyncio.wait(set(self._bulk_tasks), timeout=timeout)
+            if pending:
+                logger.warning(f"Activity log writer closed with {len(pending)} bulk batches not written")
+                for task in pending:
+                    task.cancel()
+        self._task.cancel()
+        try:
+            await self._task
+        except (asyncio.CancelledError, Exception):
+            pass
+        self._task = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and flush latency for health checks"""
+        return {
+            "running": self.running,
+            "queue_depth": self._queue.qsize(),
+            "queue_max": self._queue.maxsize,
+            "bulk_pending": len(self._bulk_tasks),
+            "written": self._written,
+            "failed": self._failed,
+            "batches": self._batches,
+            "backpressure_waits": self._backpressure_waits,
+            "last_flush_ms": round(self._last_flush_ms, 2) if self._last_flush_ms is not None else None,
+            "avg_flush_ms": round(self._total_flush_ms / self._batches, 2) if self._batches else None,
+            "max_flush_ms": round(self._max_flush_ms, 2),
+        }
+
+
+_writer: Optional[ActivityLogWriter] = None
+
+
+def init_activity_writer(db, on_written: Optional[OnWritten] = None) -> ActivityLogWriter:
+    global _writer
+    _writer = ActivityLogWriter(db, on_written)
+    _writer.start()
+    logger.info("Activity log writer started")
+    return _writer
+
+
+def get_activity_writer() -> Optional[ActivityLogWriter]:
+    return _writer
+
+
+async def close_activity_writer() -> None:
+    global _writer
+    if _writer:
+        await _writer.close()
+        logger.info(f"Activity log writer closed ({_writer.stats()['written']} entries written)")
+        _writer = None
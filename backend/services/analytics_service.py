@@ -0,0 +1,172 @@
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+AGE_GROUPS = [
+    ("Children (0-12)", 12),
+    ("Teenagers (13-17)", 17),
+    ("Young Adults (18-30)", 30),
+    ("Adults (31-60)", 60),
+]
+OLDEST_AGE_GROUP = "Seniors (60+)"
+
+# Members contacted this recently are never suggested for follow-up
+FOLLOW_UP_QUIET_DAYS = 3
+
+# Missing days_since_last_contact counts as never contacted
+_DAYS_SINCE = {"$ifNull": ["$days_since_last_contact", 999]}
+_AGE = {"$ifNull": ["$age", 0]}
+
+_AGE_GROUP = {"$switch": {
+    "branches": [{"case": {"$lte": [_AGE, limit]}, "then": name} for name, limit in AGE_GROUPS],
+    "default": OLDEST_AGE_GROUP,
+}}
+
+# membership_status, else category (external sync), else "Unknown"
+_MEMBERSHIP = {"$let": {
+    "vars": {"status": {"$ifNull": ["$membership_status", ""]}, "category": {"$ifNull": ["$category", ""]}},
+    "in": {"$cond": [
+        {"$ne": ["$$status", ""]}, "$$status",
+        {"$cond": [{"$ne": ["$$category", ""]}, "$$category", "Unknown"]},
+    ]},
+}}
+
+# Engagement score: 100 minus days since contact (0 days is treated as unknown, i.e. 999)
+_ENGAGEMENT_SCORE = {"$let": {
+    "vars": {"days": {"$ifNull": ["$days_since_last_contact", 0]}},
+    "in": {"$max": [0, {"$subtract": [100, {"$cond": [{"$eq": ["$$days", 0]}, 999, "$$days"]}]}]},
+}}
+
+
+class AnalyticsService:
+    """
+    Campus analytics computed by aggregation pipelines.
+
+    Results are folded server-side ($group/$facet), so they cover every member and
+    event of the campus and only the aggregated rows cross the wire.
+    """
+
+    def __init__(self, db):
+        self._db = db
+
+    async def events_by_type(self, campus_filter: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Care event count per event_type (covered by the campus_id, event_type index)"""
+        groups = await self._db.care_events.aggregate([
+            {"$match": campus_filter},
+            {"$group": {"_id": "$event_type", "count": {"$sum": 1}}},
+            {"$sort": {"count": -1, "_id": 1}},
+        ]).to_list(None)
+        return [{"type": g["_id"], "count": g["count"]} for g in groups]
+
+    async def events_per_day(self, campus_filter: Dict[str, Any], since: date) -> List[Dict[str, Any]]:
+        """Care event count per event_date from since onwards, oldest first"""
+        groups = await self._db.care_events.aggregate([
+            {"$match": {**campus_filter, "event_date": {"$gte": since.isoformat()}}},
+            {"$group": {"_id": {"$substrBytes": ["$event_date", 0, 10]}, "count": {"$sum": 1}}},
+            {"$sort": {"_id": 1}},
+        ]).to_list(None)
+        return [{"date": g["_id"], "count": g["count"]} for g in groups]
+
+    async def demographics(self, campus_filter: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Member counts and care events per age group, and engagement per membership status.
+
+        Returns {"age_groups": {name: {"count", "care_events"}}, "membership":
+        {status: {"count", "engagement_score"}}, "total_members": n}.
+        """
+        event_match = [{"$match": campus_filter}] if campus_filter else []
+        (result,) = await self._db.members.aggregate([
+            {"$match": campus_filter},
+            {"$project": {
+                "_id": 0,
+                "age_group": _AGE_GROUP,
+                "membership": _MEMBERSHIP,
+                "engagement_score": _ENGAGEMENT_SCORE,
+                "id": 1,
+            }},
+            {"$facet": {
+                "age_groups": [
+                    # Events per member through the care_events member_id index
+                    {"$lookup": {
+                        "from": "care_events",
+                        "localField": "id",
+                        "foreignField": "member_id",
+                        "pipeline": [*event_match, {"$count": "n"}],
+                        "as": "events",
+                    }},
+                    {"$group": {
+                        "_id": "$age_group",
+                        "count": {"$sum": 1},
+                        "care_events": {"$sum": {"$ifNull": [{"$first": "$events.n"}, 0]}},
+                    }},
+                ],
+                "membership": [
+                    {"$group": {
+                        "_id": "$membership",
+                        "count": {"$sum": 1},
+                        "engagement_score": {"$sum": "$engagement_score"},
+                    }},
+                    {"$sort": {"count": -1, "_id": 1}},
+                ],
+                "total": [{"$count": "n"}],
+            }},
+        ]).to_list(1)
+
+        age_groups = {name: {"count": 0, "care_events": 0} for name, _ in AGE_GROUPS}
+        age_groups[OLDEST_AGE_GROUP] = {"count": 0, "care_events": 0}
+        for g in result["age_groups"]:
+            age_groups[g["_id"]] = {"count": g["count"], "care_events": g["care_events"]}
+        membership = {
+            g["_id"]: {"count": g["count"], "engagement_score": g["engagement_score"]} for g in result["membership"]
+        }
+        total = result["total"][0]["n"] if result["total"] else 0
+        return {"age_groups": age_groups, "membership": membership, "total_members": total}
+
+    async def follow_up_candidates(self, campus_filter: Dict[str, Any], limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        Members most in need of a follow-up, highest urgency first.
+
+        Rules are checked in order and the first match wins: long silence (90+ days),
+        seniors (30+), visitors (14+), previous financial aid recipients (60+) and
+        single adults (45+). Members contacted in the last FOLLOW_UP_QUIET_DAYS are skipped.
+        """
+        aid_member_ids = await self._db.care_events.distinct(
+            "member_id", {**campus_filter, "event_type": "financial_aid"}
+        )
+        quiet_since = datetime.now(timezone.utc) - timedelta(days=FOLLOW_UP_QUIET_DAYS)
+        rule = {"$switch": {"branches": [
+            {"case": {"$gt": [_DAYS_SINCE, 90]}, "then": "reconnect"},
+            {"case": {"$and": [{"$gt": [_AGE, 65]}, {"$gt": [_DAYS_SINCE, 30]}]}, "then": "senior"},
+            {"case": {"$and": [{"$eq": ["$membership_status", "Visitor"]}, {"$gt": [_DAYS_SINCE, 14]}]}, "then": "visitor"},
+            {"case": {"$and": [{"$in": ["$id", aid_member_ids]}, {"$gt": [_DAYS_SINCE, 60]}]}, "then": "financial_aid"},
+            {"case": {"$and": [
+                {"$eq": ["$marital_status", "Single"]}, {"$gt": [_AGE, 25]}, {"$gt": [_DAYS_SINCE, 45]},
+            ]}, "then": "single_adult"},
+        ], "default": None}}
+        last_contact = {"$convert": {"input": "$last_contact_date", "to": "date", "onError": None, "onNull": None}}
+
+        return await self._db.members.aggregate([
+            # Every rule needs more than 14 days without contact (index: campus_id, days_since_last_contact)
+            {"$match": {**campus_filter, "$or": [
+                {"days_since_last_contact": {"$gt": 14}}, {"days_since_last_contact": None},
+            ]}},
+            {"$addFields": {"_rule": rule, "_last_contact": last_contact, "_days": _DAYS_SINCE}},
+            {"$match": {
+                "_rule": {"$ne": None},
+                "$or": [{"_last_contact": None}, {"_last_contact": {"$lte": quiet_since}}],
+            }},
+            {"$addFields": {"urgency_score": {"$switch": {"branches": [
+                {"case": {"$eq": ["$_rule", "reconnect"]}, "then": {"$min": [100, "$_days"]}},
+                {"case": {"$eq": ["$_rule", "senior"]}, "then": {"$add": ["$_days", 20]}},
+                {"case": {"$eq": ["$_rule", "visitor"]}, "then": {"$add": ["$_days", 10]}},
+                {"case": {"$eq": ["$_rule", "financial_aid"]}, "then": {"$add": ["$_days", 15]}},
+            ], "default": "$_days"}}}},
+            {"$sort": {"urgency_score": -1, "_id": 1}},
+            {"$limit": limit},
+            {"$project": {
+                "_id": 0, "id": 1, "name": 1, "phone": 1, "photo_url": 1,
+                "rule": "$_rule", "days_since": "$_days", "urgency_score": 1,
+            }},
+        ]).to_list(limit)
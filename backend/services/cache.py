@@ -1,23 +1,206 @@
 import os
 import logging
-import json
-from typing import Optional, Any, Union
+import asyncio
+import fnmatch
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Optional, Any, Union, Callable, Awaitable
 from datetime import timedelta
 
+import msgspec
 import redis.asyncio as redis
 
+from constants import MAX_CACHE_SIZE, RATE_LIMIT_REDIS_TIMEOUT, RATE_LIMIT_BREAKER_SECONDS
+from services.metrics import CACHE_REQUESTS
+
 logger = logging.getLogger(__name__)
 
 DRAGONFLY_URL = os.environ.get("DRAGONFLY_URL", "redis://localhost:6379/0")
 
+# Invalidation messages are "<worker id>|<key or glob pattern>"
+INVALIDATION_CHANNEL = "ft:cache:invalidate"
+
 _redis_client: Optional[redis.Redis] = None
+_invalidation_task: Optional[asyncio.Task] = None
+_worker_id = uuid.uuid4().hex
+
+
+# Deletes a lock only if it still holds our token (never release someone else's lock)
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+# Sliding-window log: one sorted-set member per admitted hit, scored by its time in ms.
+# Expired hits are trimmed and the decision is taken atomically, so every worker shares one budget.
+# Returns {allowed, hits in window, ms until the oldest hit leaves the window when denied}.
+_SLIDING_WINDOW_SCRIPT = """
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+redis.call('zremrangebyscore', KEYS[1], '-inf', now - window)
+local count = redis.call('zcard', KEYS[1])
+if count < limit then
+    redis.call('zadd', KEYS[1], now, ARGV[4])
+    redis.call('pexpire', KEYS[1], window)
+    return {1, count + 1, 0}
+end
+local oldest = redis.call('zrange', KEYS[1], 0, 0, 'WITHSCORES')
+return {0, count, math.max(0, tonumber(oldest[2]) + window - now)}
+"""
+
+
+class RateLimitResult(msgspec.Struct, frozen=True):
+    allowed: bool
+    hits: int            # Hits in the current window, including this one when allowed
+    retry_after: int     # Seconds until a denied caller may retry (0 when allowed)
+
+
+def _enc_hook(obj: Any) -> Any:
+    # Types msgspec cannot encode natively (e.g. ObjectId) are cached in their string form
+    return str(obj)
+
+
+_encoder = msgspec.json.Encoder(enc_hook=_enc_hook)
+_decoder = msgspec.json.Decoder()
+
+
+class LocalLRU:
+    """Bounded in-process LRU holding encoded values; get/set/delete are O(1)"""
+
+    def __init__(self, max_size: int = MAX_CACHE_SIZE):
+        self._max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, data = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return data
+
+    def set(self, key: str, data: bytes, ttl: int) -> None:
+        self._entries[key] = (time.monotonic() + ttl, data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def keys(self, pattern: str) -> list[str]:
+        """Unexpired keys matching a glob pattern"""
+        now = time.monotonic()
+        return [k for k, (expires_at, _) in self._entries.items() if expires_at > now and fnmatch.fnmatchcase(k, pattern)]
+
+    def delete_pattern(self, pattern: str) -> int:
+        if not any(c in pattern for c in "*?["):
+            return 1 if self._entries.pop(pattern, None) is not None else 0
+        keys = [k for k in self._entries if fnmatch.fnmatchcase(k, pattern)]
+        for k in keys:
+            del self._entries[k]
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class LocalRateLimiter:
+    """
+    In-process stand-in for the shared limiter, used while DragonflyDB is unreachable.
+
+    Same sliding-window semantics, but per worker; the number of tracked keys is bounded
+    (least recently used keys are dropped) so a burst of distinct callers cannot grow it.
+    """
+
+    def __init__(self, max_keys: int = MAX_CACHE_SIZE):
+        self._max_keys = max_keys
+        self._windows: OrderedDict[str, deque] = OrderedDict()
+        self._lockouts: OrderedDict[str, float] = OrderedDict()
+
+    def _bounded(self, entries: OrderedDict, key: str) -> None:
+        entries.move_to_end(key)
+        while len(entries) > self._max_keys:
+            entries.popitem(last=False)
+
+    async def hit_rate_limit(self, key: str, limit: int, window_seconds: int) -> RateLimitResult:
+        now = time.monotonic()
+        hits = self._windows.get(key)
+        if hits is None:
+            hits = self._windows[key] = deque()
+        self._bounded(self._windows, key)
+        while hits and hits[0] <= now - window_seconds:
+            hits.popleft()
+        if len(hits) < limit:
+            hits.append(now)
+            return RateLimitResult(True, len(hits), 0)
+        return RateLimitResult(False, len(hits), max(1, int(hits[0] + window_seconds - now) + 1))
+
+    async def reset_rate_limit(self, key: str) -> None:
+        self._windows.pop(key, None)
+        self._lockouts.pop(key, None)
+
+    async def lock_out(self, key: str, seconds: int) -> None:
+        self._lockouts[key] = time.monotonic() + seconds
+        self._bounded(self._lockouts, key)
+
+    async def lockout_remaining(self, key: str) -> int:
+        until = self._lockouts.get(key)
+        if until is None:
+            return 0
+        remaining = until - time.monotonic()
+        if remaining <= 0:
+            del self._lockouts[key]
+            return 0
+        return int(remaining) + 1
+
+
+# Shared by every CacheService in this worker
+_local_cache = LocalLRU()
+_local_rate_limiter = LocalRateLimiter()
+# Rate limiting runs before every request, so after a DragonflyDB error it stays on the
+# per-worker limiter until this monotonic time instead of waiting on a dead server each time
+_rate_limit_breaker_until = 0.0
+
+
+def _open_rate_limit_breaker(error: Exception, what: str) -> None:
+    global _rate_limit_breaker_until
+    if time.monotonic() >= _rate_limit_breaker_until:
+        logger.warning(f"{what} failed ({error!r}); rate limiting per worker for {RATE_LIMIT_BREAKER_SECONDS}s")
+    _rate_limit_breaker_until = time.monotonic() + RATE_LIMIT_BREAKER_SECONDS
+
+
+async def _bounded(awaitable: Awaitable[Any]) -> Any:
+    """Await a rate limit command, giving up after RATE_LIMIT_REDIS_TIMEOUT"""
+    return await asyncio.wait_for(awaitable, RATE_LIMIT_REDIS_TIMEOUT)
 
 
 class CacheService:
+    """
+    Two-tier cache: a bounded in-process LRU in front of DragonflyDB.
+
+    Without a client (DragonflyDB not configured or unreachable at startup) only the
+    in-process tier is used: values live at most LOCAL_MAX_TTL, locks are always granted
+    and invalidations stay within this worker.
+    """
+
     DEFAULT_TTL = 300
     DASHBOARD_TTL = 600
     SETTINGS_TTL = 3600
     STATIC_TTL = 86400
+    # Materialized dashboard reminders live for the whole (date-scoped) day and are patched in place
+    REMINDERS_TTL = 90000
     
     KEY_PREFIX = "ft:"
     
@@ -26,9 +209,18 @@ class CacheService:
     KEY_ENGAGEMENT_SETTINGS = "settings:engagement"
     KEY_WRITEOFF_SETTINGS = "settings:writeoff"
     KEY_AUTOMATION_SETTINGS = "settings:automation"
+    KEY_CAMPUS_TIMEZONE = "campus:timezone"
+
+    # The in-process tier never outlives this, even if an invalidation message is missed
+    LOCAL_MAX_TTL = 300
     
-    def __init__(self, client: redis.Redis):
+    def __init__(self, client: Optional[redis.Redis] = None):
         self._client = client
+
+    @property
+    def shared(self) -> bool:
+        """Whether values are shared with the other workers through DragonflyDB"""
+        return self._client is not None
     
     def _make_key(self, key: str, church_id: Optional[str] = None) -> str:
         if church_id:
@@ -41,12 +233,28 @@ class CacheService:
         church_id: Optional[str] = None
     ) -> Optional[Any]:
         full_key = self._make_key(key, church_id)
+        data = _local_cache.get(full_key)
+        if data is not None:
+            CACHE_REQUESTS.inc("local", "hit")
+            return _decoder.decode(data)
+        if not self._client:
+            CACHE_REQUESTS.inc("local", "miss")
+            return None
         try:
-            data = await self._client.get(full_key)
+            pipe = self._client.pipeline(transaction=False)
+            pipe.get(full_key)
+            pipe.ttl(full_key)
+            data, ttl = await pipe.execute()
             if data:
-                return json.loads(data)
+                CACHE_REQUESTS.inc("remote", "hit")
+                data = data.encode() if isinstance(data, str) else data
+                if ttl > 0:
+                    _local_cache.set(full_key, data, min(ttl, self.LOCAL_MAX_TTL))
+                return _decoder.decode(data)
+            CACHE_REQUESTS.inc("remote", "miss")
             return None
         except redis.RedisError as e:
+            CACHE_REQUESTS.inc("remote", "error")
             logger.warning(f"Cache get error for {full_key}: {e}")
             return None
     
@@ -58,22 +266,78 @@ class CacheService:
         church_id: Optional[str] = None
     ) -> bool:
         full_key = self._make_key(key, church_id)
+        serialized = _encoder.encode(value)
+        _local_cache.set(full_key, serialized, min(ttl, self.LOCAL_MAX_TTL))
+        if not self._client:
+            return True
         try:
-            serialized = json.dumps(value, default=str)
             await self._client.setex(full_key, ttl, serialized)
+            await self._publish_invalidation(full_key)
             return True
         except redis.RedisError as e:
             logger.warning(f"Cache set error for {full_key}: {e}")
             return False
     
+    async def update(
+        self,
+        key: str,
+        updater: Callable[[Any], Awaitable[Any]],
+        ttl: int = DEFAULT_TTL,
+        church_id: Optional[str] = None,
+        max_retries: int = 5
+    ) -> bool:
+        """
+        Read-modify-write an existing value with optimistic locking (WATCH/MULTI).
+
+        Returns False without writing when the key is absent. If another writer
+        keeps winning the race the key is deleted, so readers rebuild it rather
+        than see a lost update.
+        """
+        full_key = self._make_key(key, church_id)
+        if not self._client:
+            # One event loop per worker: nothing else can write between this read and set
+            data = _local_cache.get(full_key)
+            if data is None:
+                return False
+            value = await updater(_decoder.decode(data))
+            _local_cache.set(full_key, _encoder.encode(value), min(ttl, self.LOCAL_MAX_TTL))
+            return True
+        try:
+            async with self._client.pipeline(transaction=True) as pipe:
+                for _ in range(max_retries):
+                    try:
+                        await pipe.watch(full_key)
+                        data = await pipe.get(full_key)
+                        if not data:
+                            return False
+                        serialized = _encoder.encode(await updater(_decoder.decode(data)))
+                        pipe.multi()
+                        pipe.setex(full_key, ttl, serialized)
+                        await pipe.execute()
+                        _local_cache.set(full_key, serialized, min(ttl, self.LOCAL_MAX_TTL))
+                        await self._publish_invalidation(full_key)
+                        return True
+                    except redis.WatchError:
+                        continue
+            logger.warning(f"Cache update for {full_key} kept conflicting, dropping key")
+            await self.delete(key, church_id)
+            return False
+        except redis.RedisError as e:
+            logger.warning(f"Cache update error for {full_key}: {e}")
+            return False
+    
     async def delete(
         self,
         key: str,
         church_id: Optional[str] = None
     ) -> bool:
         full_key = self._make_key(key, church_id)
+        _local_cache.delete(full_key)
+        if not self._client:
+            return True
         try:
             await self._client.delete(full_key)
+            await self._publish_invalidation(full_key)
             return True
         except redis.RedisError as e:
             logger.warning(f"Cache delete error for {full_key}: {e}")
@@ -85,6 +349,9 @@ class CacheService:
         church_id: Optional[str] = None
     ) -> int:
         full_pattern = self._make_key(pattern, church_id)
+        deleted_locally = _local_cache.delete_pattern(full_pattern)
+        if not self._client:
+            return deleted_locally
         try:
             cursor = 0
             deleted = 0
@@ -98,11 +365,71 @@ class CacheService:
                     deleted += await self._client.delete(*keys)
                 if cursor == 0:
                     break
+            await self._publish_invalidation(full_pattern)
             return deleted
         except redis.RedisError as e:
             logger.warning(f"Cache invalidate_pattern error for {full_pattern}: {e}")
             return 0
     
+    async def scan_keys(
+        self,
+        pattern: str,
+        church_id: Optional[str] = None
+    ) -> list[str]:
+        """Keys matching a pattern, without KEY_PREFIX (so they can be passed back to get/set/update)"""
+        full_pattern = self._make_key(pattern, church_id)
+        if not self._client:
+            return [k[len(self.KEY_PREFIX):] for k in _local_cache.keys(full_pattern)]
+        keys: list[str] = []
+        try:
+            async for full_key in self._client.scan_iter(match=full_pattern, count=100):
+                keys.append(full_key[len(self.KEY_PREFIX):])
+        except redis.RedisError as e:
+            logger.warning(f"Cache scan error for {full_pattern}: {e}")
+        return keys
+    
+    async def acquire_lock(
+        self,
+        name: str,
+        ttl: int = 60,
+        church_id: Optional[str] = None
+    ) -> Optional[str]:
+        """
+        Try to take a short-lived lock shared by all workers.
+
+        Returns a token for release_lock, or None if another holder has it.
+        If DragonflyDB is unreachable the lock degrades to always granted.
+        """
+        full_key = self._make_key(f"lock:{name}", church_id)
+        token = uuid.uuid4().hex
+        if not self._client:
+            return token
+        try:
+            if await self._client.set(full_key, token, nx=True, ex=ttl):
+                return token
+            return None
+        except redis.RedisError as e:
+            logger.warning(f"Cache lock error for {full_key}: {e}")
+            return token
+    
+    async def release_lock(
+        self,
+        name: str,
+        token: str,
+        church_id: Optional[str] = None
+    ) -> None:
+        if not self._client:
+            return
+        full_key = self._make_key(f"lock:{name}", church_id)
+        try:
+            await self._client.eval(_RELEASE_LOCK_SCRIPT, 1, full_key, token)
+        except redis.RedisError as e:
+            logger.warning(f"Cache unlock error for {full_key}: {e}")
+    
+    async def _publish_invalidation(self, key_or_pattern: str) -> None:
+        """Tell the other workers to drop their in-process copy"""
+        await self._client.publish(INVALIDATION_CHANNEL, f"{_worker_id}|{key_or_pattern}")
+    
     async def get_dashboard_stats(self, church_id: str) -> Optional[dict]:
         return await self.get(self.KEY_DASHBOARD_STATS, church_id)
     
@@ -151,7 +478,53 @@ class CacheService:
             logger.warning(f"Rate limit incr error for {full_key}: {e}")
             return 0
     
+    async def hit_rate_limit(self, key: str, limit: int, window_seconds: int) -> RateLimitResult:
+        """
+        Count a hit against a sliding window shared by all workers.
+
+        The hit is only recorded when allowed, so callers that keep retrying while denied
+        do not extend their own penalty. Falls back to a per-worker window when DragonflyDB
+        is unreachable.
+        """
+        full_key = self._make_key(f"ratewindow:{key}")
+        now_ms = int(time.time() * 1000)
+        try:
+            allowed, hits, retry_ms = await _bounded(self._client.eval(
+                _SLIDING_WINDOW_SCRIPT, 1, full_key, now_ms, window_seconds * 1000, limit, f"{now_ms}:{uuid.uuid4().hex[:8]}"
+            ))
+            return RateLimitResult(bool(allowed), int(hits), -(-int(retry_ms) // 1000) if not allowed else 0)
+        except (redis.RedisError, asyncio.TimeoutError) as e:
+            _open_rate_limit_breaker(e, f"Rate limit check for {full_key}")
+            return await _local_rate_limiter.hit_rate_limit(key, limit, window_seconds)
+
+    async def reset_rate_limit(self, key: str) -> None:
+        """Forget the hits and any lockout recorded under key"""
+        await _local_rate_limiter.reset_rate_limit(key)
+        try:
+            await _bounded(self._client.delete(self._make_key(f"ratewindow:{key}"), self._make_key(f"lockout:{key}")))
+        except (redis.RedisError, asyncio.TimeoutError) as e:
+            _open_rate_limit_breaker(e, f"Rate limit reset for {key}")
+
+    async def lock_out(self, key: str, seconds: int) -> None:
+        """Block key for the given number of seconds (checked with lockout_remaining)"""
+        try:
+            await _bounded(self._client.set(self._make_key(f"lockout:{key}"), 1, ex=seconds))
+        except (redis.RedisError, asyncio.TimeoutError) as e:
+            _open_rate_limit_breaker(e, f"Lockout of {key}")
+            await _local_rate_limiter.lock_out(key, seconds)
+
+    async def lockout_remaining(self, key: str) -> int:
+        """Seconds left on the lockout of key, 0 when it is not locked out"""
+        try:
+            remaining = await _bounded(self._client.ttl(self._make_key(f"lockout:{key}")))
+            return max(0, remaining)
+        except (redis.RedisError, asyncio.TimeoutError) as e:
+            _open_rate_limit_breaker(e, f"Lockout check for {key}")
+            return await _local_rate_limiter.lockout_remaining(key)
+
     async def health_check(self) -> bool:
+        if not self._client:
+            return False
         try:
             await self._client.ping()
             return True
@@ -159,8 +532,35 @@ class CacheService:
             return False
 
 
-async def init_cache() -> CacheService:
-    global _redis_client
+async def _listen_for_invalidations() -> None:
+    """Drop local entries invalidated by other workers; resubscribe if the connection drops"""
+    while _redis_client:
+        pubsub = _redis_client.pubsub()
+        try:
+            await pubsub.subscribe(INVALIDATION_CHANNEL)
+            # Anything published while we were not subscribed is lost, so start clean
+            _local_cache.clear()
+            while True:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if not message:
+                    continue
+                sender, _, pattern = message["data"].partition("|")
+                if sender != _worker_id:
+                    _local_cache.delete_pattern(pattern)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Cache invalidation listener error: {e}. Reconnecting in 5s")
+            await asyncio.sleep(5)
+        finally:
+            try:
+                await pubsub.aclose()
+            except Exception:
+                pass
+
+
+async def init_cache() -> Optional[CacheService]:
+    global _redis_client, _invalidation_task
     
     _redis_client = redis.from_url(
         DRAGONFLY_URL,
@@ -176,19 +576,43 @@ async def init_cache() -> CacheService:
         logger.info(f"Connected to DragonflyDB at {DRAGONFLY_URL}")
     except redis.RedisError as e:
         logger.warning(f"DragonflyDB connection failed: {e}. Cache will be disabled.")
+        # Without a client every caller (cache, rate limits, pub/sub) takes its local path
+        await _redis_client.aclose()
+        _redis_client = None
+        return None
     
+    _invalidation_task = asyncio.create_task(_listen_for_invalidations())
     return CacheService(_redis_client)
 
 
 async def close_cache() -> None:
-    global _redis_client
+    global _redis_client, _invalidation_task
+    if _invalidation_task:
+        _invalidation_task.cancel()
+        try:
+            await _invalidation_task
+        except asyncio.CancelledError:
+            pass
+        _invalidation_task = None
     if _redis_client:
         await _redis_client.aclose()
         _redis_client = None
         logger.info("DragonflyDB connection closed")
+    _local_cache.clear()
 
 
-def get_cache() -> Optional[CacheService]:
-    if _redis_client:
+def get_redis_client() -> Optional[redis.Redis]:
+    """Shared DragonflyDB client for other pub/sub users; None when running without cache"""
+    return _redis_client
+
+
+def get_cache() -> CacheService:
+    """Two-tier cache, or the in-process tier alone when running without DragonflyDB"""
+    return CacheService(_redis_client)
+
+
+def get_rate_limiter() -> Union[CacheService, LocalRateLimiter]:
+    """Shared rate limiter, or the per-worker one without cache or while the breaker is open"""
+    if _redis_client and time.monotonic() >= _rate_limit_breaker_until:
         return CacheService(_redis_client)
-    return None
+    return _local_rate_limiter
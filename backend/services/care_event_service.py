@@ -12,6 +12,8 @@ from constants import (
     ACCIDENT_FIRST_FOLLOWUP_DAYS, ACCIDENT_SECOND_FOLLOWUP_DAYS, ACCIDENT_FINAL_FOLLOWUP_DAYS
 )
 from models import CareEventCreate, CareEventUpdate, generate_uuid
+from utils import contact_fields
+from services.activity_writer import get_activity_writer
 
 logger = logging.getLogger(__name__)
 
@@ -210,7 +212,7 @@ class CareEventService:
         
         await self._db.members.update_one(
             {"id": event["member_id"], "church_id": church_id},
-            {"$set": {"last_contact_date": now}}
+            {"$set": {**contact_fields(now), "updated_at": now}}
         )
         
         member = await self._db.members.find_one(
@@ -417,4 +419,8 @@ class CareEventService:
             "details": details,
             "timestamp": datetime.now(timezone.utc),
         }
-        await self._db.activity_logs.insert_one(log_doc)
+        writer = get_activity_writer()
+        if writer:
+            await writer.write(log_doc)
+        else:
+            await self._db.activity_logs.insert_one(log_doc)
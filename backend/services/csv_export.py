@@ -0,0 +1,44 @@
+import csv
+import io
+import logging
+import zlib
+from typing import Any, AsyncIterable, AsyncIterator, Callable, Dict, List, Optional
+
+from constants import EXPORT_BATCH_SIZE
+
+logger = logging.getLogger(__name__)
+
+
+async def stream_csv(
+    cursor: AsyncIterable[Dict[str, Any]],
+    fieldnames: List[str],
+    transform: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+) -> AsyncIterator[bytes]:
+    """Encode documents from an async cursor as CSV, yielding one chunk per batch of rows."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction="ignore")
+    writer.writeheader()
+    rows = 0
+    try:
+        async for doc in cursor:
+            writer.writerow(transform(doc) if transform else doc)
+            rows += 1
+            if rows % EXPORT_BATCH_SIZE == 0:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+    except Exception as e:
+        # Headers are already sent, so the client only sees a truncated file
+        logger.error(f"CSV export aborted after {rows} rows: {str(e)}")
+        raise
+    yield buffer.getvalue().encode("utf-8")
+
+
+async def gzip_stream(chunks: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+    """Gzip-compress a byte stream incrementally."""
+    compressor = zlib.compressobj(wbits=31)  # 31 = gzip container
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
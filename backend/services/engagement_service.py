@@ -0,0 +1,110 @@
+import logging
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple
+
+from constants import ENGAGEMENT_AT_RISK_DAYS_DEFAULT, ENGAGEMENT_DISCONNECTED_DAYS_DEFAULT, ENGAGEMENT_NO_CONTACT_DAYS
+from enums import EngagementStatus
+
+logger = logging.getLogger(__name__)
+
+_DAY_MS = 24 * 60 * 60 * 1000
+
+# last_contact_date as a date (legacy rows store ISO strings); unparsable counts as never contacted
+_LAST_CONTACT = {"$convert": {"input": "$last_contact_date", "to": "date", "onError": None, "onNull": None}}
+
+
+def days_since_expr(now: datetime) -> Dict[str, Any]:
+    """Whole days since last contact, as utils.calculate_engagement_status computes them"""
+    return {"$let": {
+        "vars": {"last": _LAST_CONTACT},
+        "in": {"$cond": [
+            {"$eq": ["$$last", None]},
+            ENGAGEMENT_NO_CONTACT_DAYS,
+            {"$toInt": {"$floor": {"$divide": [{"$subtract": [now, "$$last"]}, _DAY_MS]}}},
+        ]},
+    }}
+
+
+def status_expr(days: Any, at_risk_days: int, disconnected_days: int) -> Dict[str, Any]:
+    """Engagement bucket for a days-since-contact expression"""
+    return {"$switch": {
+        "branches": [
+            {"case": {"$lt": [days, at_risk_days]}, "then": EngagementStatus.ACTIVE.value},
+            {"case": {"$lt": [days, disconnected_days]}, "then": EngagementStatus.AT_RISK.value},
+        ],
+        "default": EngagementStatus.DISCONNECTED.value,
+    }}
+
+
+class EngagementService:
+    """
+    Stored member engagement (engagement_status, days_since_last_contact).
+
+    Read paths trust the stored values; this keeps them current by recomputing them in
+    MongoDB with one pipeline update_many per campus. Only members whose stored bucket or
+    day count differs from the recomputed one are matched, so already current rows are
+    not rewritten.
+    """
+
+    def __init__(self, db):
+        self._db = db
+
+    async def get_thresholds(self) -> Tuple[int, int]:
+        """(at_risk_days, disconnected_days) from the engagement settings, defaults when unset"""
+        settings = await self._db.settings.find_one({"key": "engagement_thresholds"}, {"_id": 0, "data": 1})
+        data = (settings or {}).get("data") or {}
+        return (
+            data.get("atRiskDays", ENGAGEMENT_AT_RISK_DAYS_DEFAULT),
+            data.get("disconnectedDays", ENGAGEMENT_DISCONNECTED_DAYS_DEFAULT),
+        )
+
+    async def recompute(
+        self,
+        campus_id: Optional[str] = None,
+        at_risk_days: Optional[int] = None,
+        disconnected_days: Optional[int] = None,
+    ) -> Dict[str, int]:
+        """
+        Recompute stored engagement for one campus (every campus when none given).
+
+        Returns {campus_id: members updated} for the campuses where something changed.
+        """
+        if at_risk_days is None or disconnected_days is None:
+            stored_at_risk, stored_disconnected = await self.get_thresholds()
+            at_risk_days = stored_at_risk if at_risk_days is None else at_risk_days
+            disconnected_days = stored_disconnected if disconnected_days is None else disconnected_days
+
+        now = datetime.now(timezone.utc)
+        days = days_since_expr(now)
+        stale = {"$expr": {"$let": {
+            "vars": {"days": days},
+            "in": {"$or": [
+                {"$ne": ["$days_since_last_contact", "$$days"]},
+                {"$ne": ["$engagement_status", status_expr("$$days", at_risk_days, disconnected_days)]},
+            ]},
+        }}}
+        update = [
+            {"$set": {"days_since_last_contact": days}},
+            {"$set": {"engagement_status": status_expr("$days_since_last_contact", at_risk_days, disconnected_days)}},
+        ]
+
+        campus_ids = [campus_id] if campus_id else await self._db.members.distinct("campus_id")
+        updated: Dict[str, int] = {}
+        for cid in campus_ids:
+            result = await self._db.members.update_many({"campus_id": cid, **stale}, update)
+            if result.modified_count:
+                updated[cid] = result.modified_count
+        return updated
+
+    async def status_counts(self, campus_id: Optional[str] = None) -> Dict[str, int]:
+        """Members per stored engagement status"""
+        match = {"campus_id": campus_id} if campus_id else {}
+        groups = await self._db.members.aggregate([
+            {"$match": match},
+            {"$group": {"_id": "$engagement_status", "count": {"$sum": 1}}},
+        ]).to_list(None)
+        counts = {status.value: 0 for status in EngagementStatus}
+        for g in groups:
+            if g["_id"] in counts:
+                counts[g["_id"]] = g["count"]
+        return counts
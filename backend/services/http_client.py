@@ -0,0 +1,137 @@
+import asyncio
+import logging
+from http.cookiejar import CookieJar, CookiePolicy
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+
+import httpx
+import msgspec
+
+from constants import API_MAX_RETRIES, API_RETRY_DELAYS, API_RETRY_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+UPSTREAM_WHATSAPP = "whatsapp"
+UPSTREAM_CORE_API = "core_api"
+UPSTREAM_DEFAULT = "default"
+
+
+class UpstreamPolicy(msgspec.Struct, frozen=True):
+    timeout: float
+    connect_timeout: float
+    max_connections: int
+    max_keepalive: int
+    max_retries: int = API_MAX_RETRIES
+    keepalive_expiry: float = 30.0
+
+
+# One pooled client per upstream so a burst to one service cannot starve the others
+UPSTREAM_POLICIES: Dict[str, UpstreamPolicy] = {
+    # Digest bursts send hundreds of messages to the same gateway host
+    UPSTREAM_WHATSAPP: UpstreamPolicy(timeout=API_RETRY_TIMEOUT, connect_timeout=5.0, max_connections=20, max_keepalive=20),
+    # Member sync pages can be slow on large churches
+    UPSTREAM_CORE_API: UpstreamPolicy(timeout=60.0, connect_timeout=10.0, max_connections=10, max_keepalive=5),
+    UPSTREAM_DEFAULT: UpstreamPolicy(timeout=API_RETRY_TIMEOUT, connect_timeout=10.0, max_connections=20, max_keepalive=10),
+}
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+
+
+class _RejectAllCookies(CookiePolicy):
+    """
+    Cookie policy that neither stores nor sends cookies.
+
+    The pooled clients are shared by every campus, so a Set-Cookie from one campus's
+    upstream must not be sent on another campus's requests. Explicit Cookie headers still pass.
+    """
+
+    netscape = True
+    rfc2965 = False
+    hide_cookie2 = False
+
+    def set_ok(self, cookie, request) -> bool:
+        return False
+
+    def return_ok(self, cookie, request) -> bool:
+        return False
+
+    def domain_return_ok(self, domain, request) -> bool:
+        return False
+
+    def path_return_ok(self, path, request) -> bool:
+        return False
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401 - optional dependency that enables HTTP/2 in httpx
+        return True
+    except ImportError:
+        return False
+
+
+def _create_client(upstream: str) -> httpx.AsyncClient:
+    policy = UPSTREAM_POLICIES[upstream]
+    limits = httpx.Limits(
+        max_connections=policy.max_connections,
+        max_keepalive_connections=policy.max_keepalive,
+        keepalive_expiry=policy.keepalive_expiry,
+    )
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(policy.timeout, connect=policy.connect_timeout),
+        cookies=CookieJar(policy=_RejectAllCookies()),
+        # Transport-level retry only covers failed connection attempts
+        transport=httpx.AsyncHTTPTransport(limits=limits, http2=_http2_available(), retries=1),
+    )
+
+
+def get_http_client(upstream: str = UPSTREAM_DEFAULT) -> httpx.AsyncClient:
+    """Shared client for an upstream (created on first use outside the app lifecycle, e.g. scripts)"""
+    client = _clients.get(upstream)
+    if client is None or client.is_closed:
+        client = _clients[upstream] = _create_client(upstream)
+    return client
+
+
+@asynccontextmanager
+async def shared_http_client(upstream: str = UPSTREAM_DEFAULT) -> AsyncIterator[httpx.AsyncClient]:
+    """Drop-in for `async with httpx.AsyncClient() as client` that borrows the pooled client instead"""
+    yield get_http_client(upstream)
+
+
+async def request_with_retry(
+    method: str,
+    url: str,
+    upstream: str = UPSTREAM_DEFAULT,
+    max_retries: Optional[int] = None,
+    **kwargs,
+) -> httpx.Response:
+    """Send a request on the pooled client, retrying connection errors and timeouts with backoff."""
+    client = get_http_client(upstream)
+    attempts = max_retries or UPSTREAM_POLICIES[upstream].max_retries
+    for attempt in range(attempts - 1):
+        try:
+            return await client.request(method, url, **kwargs)
+        except (httpx.ConnectError, httpx.TimeoutException) as e:
+            delay = API_RETRY_DELAYS[min(attempt, len(API_RETRY_DELAYS) - 1)]
+            logger.warning(f"HTTP {method} {url} failed (attempt {attempt + 1}/{attempts}): {e}. Retrying in {delay}s...")
+            await asyncio.sleep(delay)
+    try:
+        return await client.request(method, url, **kwargs)
+    except (httpx.ConnectError, httpx.TimeoutException) as e:
+        logger.error(f"HTTP {method} {url} failed after {attempts} attempts: {e}")
+        raise
+
+
+async def init_http_clients() -> None:
+    for upstream in UPSTREAM_POLICIES:
+        get_http_client(upstream)
+    logger.info(f"HTTP clients initialized ({'HTTP/2' if _http2_available() else 'HTTP/1.1'})")
+
+
+async def close_http_clients() -> None:
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
+    logger.info("HTTP clients closed")
@@ -1,199 +1,221 @@
-import logging
 import asyncio
-from pathlib import Path
-from typing import Optional, Tuple, Dict, Any
-from concurrent.futures import ThreadPoolExecutor
+import hashlib
 import io
+import logging
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from PIL import Image
+from PIL import Image, ImageOps, features
 
 logger = logging.getLogger(__name__)
 
 UPLOAD_DIR = Path(__file__).parent.parent / "uploads"
 UPLOAD_DIR.mkdir(exist_ok=True)
 
-_thread_pool = ThreadPoolExecutor(max_workers=4)
+USER_PHOTO_DIR = Path(__file__).parent.parent / "user_photos"
+
+IMAGE_WORKERS = max(1, int(os.environ.get("IMAGE_WORKERS", "2")))
 
 MEMBER_PHOTO_SIZES = {
-    "thumbnail": (100, 100),
-    "medium": (300, 300),
-    "large": (600, 600),
+    "thumbnail": (100, 100),  # For lists and small avatars
+    "medium": (300, 300),     # For profile views
+    "large": (600, 600),      # For detailed views
 }
 
 USER_PHOTO_SIZE = (400, 400)
 
 JPEG_QUALITY = 85
+WEBP_QUALITY = 80
+AVIF_QUALITY = 60
+AVIF_SPEED = 8  # 0 (smallest, slowest) - 10 (fastest); avatars don't need the slow presets
 
+# Every upload gets new content-hashed names, so served files never change and can be cached for a year
+PHOTO_CACHE_CONTROL = "public, max-age=31536000, immutable"
+HASHED_PHOTO_NAME = re.compile(r"-[0-9a-f]{12}(_[a-z]+)?\.(jpg|webp|avif)$")
 
-class ImageService:
-    @staticmethod
-    def _process_image_sync(
-        image_bytes: bytes,
-        sizes: Dict[str, Tuple[int, int]],
-        output_path_base: Path,
-        quality: int = JPEG_QUALITY
-    ) -> Dict[str, str]:
-        results = {}
-        
+# Photos processed at once by batch imports (the pool bounds actual CPU use)
+IMAGE_IMPORT_CONCURRENCY = 8
+
+_pool: Optional[ProcessPoolExecutor] = None
+# Held while a broken pool is replaced, so jobs that failed together restart it once
+_pool_restart_lock = asyncio.Lock()
+
+
+def photo_formats() -> Tuple[str, ...]:
+    """JPEG always (every client), plus the modern formats this Pillow build can encode"""
+    formats = ["jpeg"]
+    if features.check("webp"):
+        formats.append("webp")
+    if features.check("avif"):
+        formats.append("avif")
+    return tuple(formats)
+
+
+def render_variants(
+    image_bytes: bytes,
+    sizes: Dict[str, Tuple[int, int]],
+    output_dir: str,
+    stem: str,
+    formats: Tuple[str, ...],
+) -> Dict[str, Dict[str, str]]:
+    """
+    Decode once and write every size in every format; returns {size: {format: filename}}.
+
+    Runs in the image process pool. Filenames carry a hash of the uploaded bytes.
+    """
+    digest = hashlib.sha256(image_bytes).hexdigest()[:12]
+    try:
         img = Image.open(io.BytesIO(image_bytes))
-        
-        if img.mode in ('RGBA', 'P'):
-            img = img.convert('RGB')
-        
-        for size_name, (width, height) in sizes.items():
-            resized = img.copy()
-            resized.thumbnail((width, height), Image.Resampling.LANCZOS)
-            
-            output_path = output_path_base.parent / f"{output_path_base.stem}_{size_name}.jpg"
-            
-            resized.save(
-                output_path,
-                "JPEG",
-                quality=quality,
-                optimize=True,
-                progressive=True
-            )
-            
-            results[size_name] = str(output_path.relative_to(UPLOAD_DIR))
-        
-        return results
-    
+        largest = max(max(size) for size in sizes.values())
+        if img.format == "JPEG":
+            # Draft mode lets libjpeg decode at 1/2, 1/4 or 1/8 scale (never below the largest size)
+            img.draft("RGB", (largest, largest))
+        img = ImageOps.exif_transpose(img)
+    except Exception as e:
+        raise ValueError("Invalid or corrupted image file") from e
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+
+    results: Dict[str, Dict[str, str]] = {}
+    # Largest first, each size reduced from the previous one instead of the full original
+    current = img
+    for size_name, (width, height) in sorted(sizes.items(), key=lambda item: -max(item[1])):
+        current = current.copy()
+        current.thumbnail((width, height), Image.Resampling.LANCZOS, reducing_gap=3.0)
+        suffix = f"_{size_name}" if len(sizes) > 1 else ""
+        results[size_name] = {}
+        for fmt in formats:
+            ext = "jpg" if fmt == "jpeg" else fmt
+            filename = f"{stem}-{digest}{suffix}.{ext}"
+            path = Path(output_dir) / filename
+            if fmt == "jpeg":
+                current.save(path, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True)
+            elif fmt == "webp":
+                current.save(path, "WEBP", quality=WEBP_QUALITY, method=4)
+            else:
+                current.save(path, "AVIF", quality=AVIF_QUALITY, speed=AVIF_SPEED)
+            results[size_name][fmt] = filename
+    return results
+
+
+def init_image_pool(workers: int = IMAGE_WORKERS) -> None:
+    """Start the image pool; decoding and encoding run there instead of on the event loop"""
+    global _pool
+    if _pool is None:
+        # spawn: children must not inherit the event loop, Motor client or open sockets
+        _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        logger.info(f"Image pool started ({workers} processes)")
+
+
+def close_image_pool() -> None:
+    global _pool
+    if _pool:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+async def _restart_broken_pool(broken: ProcessPoolExecutor) -> ProcessPoolExecutor:
+    """Replace the pool a job failed on, unless another job already did; returns the pool to retry on"""
+    global _pool
+    async with _pool_restart_lock:
+        if _pool is broken:
+            logger.warning("Image pool broken, restarting")
+            broken.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+        if _pool is None:
+            init_image_pool()
+        return _pool
+
+
+async def _run_in_pool(*args) -> Dict[str, Dict[str, str]]:
+    if _pool is None:
+        init_image_pool()
+    loop = asyncio.get_running_loop()
+    pool = _pool
+    try:
+        return await loop.run_in_executor(pool, render_variants, *args)
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM on a huge image); retry once on a fresh pool
+        pool = await _restart_broken_pool(pool)
+        return await loop.run_in_executor(pool, render_variants, *args)
+
+
+def _urls(variants: Dict[str, Dict[str, str]], url_prefix: str) -> Dict[str, Dict[str, str]]:
+    return {size: {fmt: f"{url_prefix}/{name}" for fmt, name in names.items()} for size, names in variants.items()}
+
+
+class ImageService:
     @staticmethod
-    def _process_single_image_sync(
-        image_bytes: bytes,
-        size: Tuple[int, int],
-        output_path: Path,
-        quality: int = JPEG_QUALITY
-    ) -> str:
-        img = Image.open(io.BytesIO(image_bytes))
-        
-        if img.mode in ('RGBA', 'P'):
-            img = img.convert('RGB')
-        
-        img.thumbnail(size, Image.Resampling.LANCZOS)
-        
-        img.save(
-            output_path,
-            "JPEG",
-            quality=quality,
-            optimize=True,
-            progressive=True
-        )
-        
-        return str(output_path.relative_to(UPLOAD_DIR))
-    
-    @classmethod
-    async def process_member_photo(
-        cls,
-        image_bytes: bytes,
-        member_id: str,
-        church_id: str
-    ) -> Dict[str, str]:
-        output_dir = UPLOAD_DIR / "members" / church_id
-        output_dir.mkdir(parents=True, exist_ok=True)
-        output_path_base = output_dir / member_id
-        
-        loop = asyncio.get_event_loop()
-        results = await loop.run_in_executor(
-            _thread_pool,
-            cls._process_image_sync,
-            image_bytes,
-            MEMBER_PHOTO_SIZES,
-            output_path_base,
-            JPEG_QUALITY
+    async def process_member_photo(image_bytes: bytes, member_id: str) -> Dict[str, Any]:
+        """
+        Resize a member photo to every MEMBER_PHOTO_SIZES size in JPEG plus WebP/AVIF.
+
+        Returns the member fields to store: photo_url (medium JPEG), photo_urls (JPEG per
+        size, as before) and photo_variants ({size: {format: url}}).
+        Raises ValueError if the bytes are not a decodable image.
+        """
+        variants = _urls(
+            await _run_in_pool(image_bytes, MEMBER_PHOTO_SIZES, str(UPLOAD_DIR), member_id, photo_formats()),
+            "/uploads",
         )
-        
-        logger.info(f"Processed member photo {member_id}: {list(results.keys())}")
-        return results
-    
-    @classmethod
-    async def process_user_photo(
-        cls,
-        image_bytes: bytes,
-        user_id: str
-    ) -> str:
-        output_dir = UPLOAD_DIR / "users"
-        output_dir.mkdir(parents=True, exist_ok=True)
-        output_path = output_dir / f"{user_id}.jpg"
-        
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            _thread_pool,
-            cls._process_single_image_sync,
-            image_bytes,
-            USER_PHOTO_SIZE,
-            output_path,
-            JPEG_QUALITY
+        photo_urls = {size: formats["jpeg"] for size, formats in variants.items()}
+        return {"photo_url": photo_urls["medium"], "photo_urls": photo_urls, "photo_variants": variants}
+
+    @staticmethod
+    async def process_user_photo(image_bytes: bytes, user_id: str) -> Dict[str, Any]:
+        """Resize a user photo to USER_PHOTO_SIZE; returns photo_url (JPEG) and photo_variants"""
+        USER_PHOTO_DIR.mkdir(exist_ok=True)
+        variants = _urls(
+            await _run_in_pool(
+                image_bytes, {"profile": USER_PHOTO_SIZE}, str(USER_PHOTO_DIR), f"USER-{user_id[:8]}", photo_formats()
+            ),
+            "/api/user-photos",
         )
-        
-        logger.info(f"Processed user photo {user_id}")
-        return result
-    
-    @classmethod
-    async def process_member_photo_background(
-        cls,
-        image_bytes: bytes,
-        member_id: str,
-        church_id: str,
-        db
-    ) -> None:
-        try:
-            results = await cls.process_member_photo(image_bytes, member_id, church_id)
-            
-            photo_url = f"/uploads/members/{church_id}/{member_id}_medium.jpg"
-            
-            await db.members.update_one(
-                {"id": member_id, "church_id": church_id},
-                {"$set": {
-                    "photo_url": photo_url,
-                    "photo_sizes": results
-                }}
-            )
-            
-            logger.info(f"Updated member {member_id} photo URL")
-            
-        except Exception as e:
-            logger.error(f"Background photo processing failed for member {member_id}: {e}")
-    
+        return {"photo_url": variants["profile"]["jpeg"], "photo_variants": variants}
+
     @classmethod
-    async def process_user_photo_background(
-        cls,
-        image_bytes: bytes,
-        user_id: str,
-        db
-    ) -> None:
-        try:
-            result = await cls.process_user_photo(image_bytes, user_id)
-            
-            photo_url = f"/uploads/users/{user_id}.jpg"
-            
-            await db.users.update_one(
-                {"id": user_id},
-                {"$set": {"photo_url": photo_url}}
-            )
-            
-            logger.info(f"Updated user {user_id} photo URL")
-            
-        except Exception as e:
-            logger.error(f"Background photo processing failed for user {user_id}: {e}")
-    
+    async def process_member_photos(
+        cls, photos: Iterable[Tuple[str, bytes]], concurrency: int = IMAGE_IMPORT_CONCURRENCY
+    ) -> List[Tuple[str, Optional[Dict[str, Any]], Optional[str]]]:
+        """Batch variant of process_member_photo; returns (member_id, fields, error) per photo"""
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _one(member_id: str, image_bytes: bytes):
+            async with semaphore:
+                try:
+                    return member_id, await cls.process_member_photo(image_bytes, member_id), None
+                except Exception as e:
+                    return member_id, None, str(e)
+
+        return await asyncio.gather(*(_one(member_id, data) for member_id, data in photos))
+
     @staticmethod
-    def delete_member_photos(member_id: str, church_id: str) -> bool:
-        output_dir = UPLOAD_DIR / "members" / church_id
-        deleted = False
-        
-        for size_name in MEMBER_PHOTO_SIZES.keys():
-            photo_path = output_dir / f"{member_id}_{size_name}.jpg"
-            if photo_path.exists():
-                photo_path.unlink()
-                deleted = True
-        
+    def delete_photo_files(doc: Optional[Dict[str, Any]], keep: Optional[Dict[str, Any]] = None) -> int:
+        """Remove the files behind a member/user's previous photo_variants (or legacy photo_urls)"""
+        if not doc:
+            return 0
+        keep_urls = set()
+        for size in ((keep or {}).get("photo_variants") or {}).values():
+            keep_urls.update(size.values())
+        urls = set()
+        for size in (doc.get("photo_variants") or {}).values():
+            urls.update(size.values())
+        urls.update((doc.get("photo_urls") or {}).values())
+        # Legacy user photos only had photo_url; other bare photo_urls may be imported originals
+        if str(doc.get("photo_url")).startswith("/api/user-photos/USER-"):
+            urls.add(doc["photo_url"])
+        deleted = 0
+        for url in urls - keep_urls:
+            if not isinstance(url, str):
+                continue
+            name = url.rsplit("/", 1)[-1]
+            base = USER_PHOTO_DIR if url.startswith("/api/user-photos/") else UPLOAD_DIR
+            if url.startswith(("/uploads/", "/api/user-photos/")) and (base / name).is_file():
+                (base / name).unlink()
+                deleted += 1
         return deleted
-    
-    @staticmethod
-    def delete_user_photo(user_id: str) -> bool:
-        photo_path = UPLOAD_DIR / "users" / f"{user_id}.jpg"
-        if photo_path.exists():
-            photo_path.unlink()
-            return True
-        return False
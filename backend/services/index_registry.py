@@ -0,0 +1,377 @@
+import asyncio
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import msgspec
+from pymongo.errors import OperationFailure
+
+from constants import SYNC_LOG_RETENTION_DAYS, WEBHOOK_LOG_RETENTION_DAYS, INDEX_RECONCILE_LOCK_TTL
+
+logger = logging.getLogger(__name__)
+
+# Workers reconcile the registry at startup unless INDEX_RECONCILE_ON_STARTUP=false
+INDEX_RECONCILE_ON_STARTUP = os.environ.get("INDEX_RECONCILE_ON_STARTUP", "true").lower() not in ("0", "false", "no")
+
+IndexKeys = Tuple[Tuple[str, Union[int, str]], ...]
+
+_DAY = 24 * 3600
+
+
+class IndexSpec(msgspec.Struct, frozen=True):
+    """One index the application relies on; options mirror create_index"""
+    keys: IndexKeys
+    unique: bool = False
+    sparse: bool = False
+    partial: Optional[Dict[str, Any]] = None
+    expire_after_seconds: Optional[int] = None
+    name: Optional[str] = None
+
+    @property
+    def index_name(self) -> str:
+        """Explicit name, else the name MongoDB generates (campus_id_1_created_at_-1)"""
+        return self.name or "_".join(f"{field}_{direction}" for field, direction in self.keys)
+
+    def options(self) -> Dict[str, Any]:
+        return {
+            "unique": self.unique,
+            "sparse": self.sparse,
+            "partialFilterExpression": self.partial,
+            "expireAfterSeconds": self.expire_after_seconds,
+        }
+
+    def create_kwargs(self) -> Dict[str, Any]:
+        kwargs = {k: v for k, v in self.options().items() if v is not None and v is not False}
+        kwargs["name"] = self.index_name
+        return kwargs
+
+
+def _ix(*keys: Union[str, Tuple[str, Union[int, str]]], **options: Any) -> IndexSpec:
+    """IndexSpec from "field" (ascending) or ("field", direction) keys"""
+    return IndexSpec(keys=tuple((k, 1) if isinstance(k, str) else k for k in keys), **options)
+
+
+_OPEN = {"completed": False}
+
+# Every index the application needs, with the queries it serves. Reconciled at startup
+# (see start_index_reconcile) and by migrate.py; indexes found in the database but not
+# listed here are reported, never dropped automatically.
+INDEXES: Dict[str, Tuple[IndexSpec, ...]] = {
+    "members": (
+        _ix("id"),  # find_one by id, $lookup from care events / tasks
+        _ix("campus_id", "name", "id"),  # Member list keyset (MEMBER_SORT); is_archived filtered on fetch
+        _ix("campus_id", "days_since_last_contact"),  # Follow-up candidates
+        _ix("campus_id", "engagement_status", ("days_since_last_contact", -1)),  # At-risk / inactive lists
+        _ix("external_member_id"),  # Webhook member lookups
+        # Synced members are unique per campus; members without an external id are not indexed
+        # (the legacy sparse index rejected a second member with external_member_id: null)
+        _ix("campus_id", "external_member_id", unique=True,
+            partial={"external_member_id": {"$type": "string"}}),
+    ),
+    "care_events": (
+        _ix("id"),
+        _ix("campus_id", ("event_date", -1), ("created_at", -1), ("id", -1)),  # Event list keyset
+        _ix("campus_id", ("created_at", -1)),  # Dashboard recent activity
+        _ix("campus_id", "event_type", "member_id"),  # Analytics, birthday events per member
+        _ix("member_id", ("event_date", -1)),  # Member timeline, last contact recompute
+        _ix("event_type", "event_date", partial=_OPEN),  # Upcoming birthdays and open events by date
+        _ix("grief_stage_id", sparse=True),  # Timeline entries removed with their stage
+        _ix("accident_stage_id", sparse=True),
+    ),
+    "grief_support": (
+        _ix("id"),
+        _ix("care_event_id"),  # Stages of an event (cascade, touchpoint counts)
+        _ix("member_id", "scheduled_date"),  # Member grief timeline
+        _ix("campus_id", "completed", "scheduled_date"),  # Stage lists, due today / overdue tasks
+        _ix("scheduled_date", partial=_OPEN),  # Open stages across campuses
+    ),
+    "accident_followup": (
+        _ix("id"),
+        _ix("care_event_id"),
+        _ix("member_id", "scheduled_date"),
+        _ix("campus_id", "completed", "scheduled_date"),
+        _ix("scheduled_date", partial=_OPEN),
+    ),
+    "financial_aid_schedules": (
+        _ix("id"),
+        _ix("member_id"),
+        _ix("campus_id", "is_active", "next_occurrence"),  # Aid due today / overdue
+    ),
+    "activity_logs": (
+        _ix("campus_id", ("created_at", -1), ("id", -1)),  # Activity feed keyset and date ranges
+        _ix("care_event_id"),  # Logs removed with their event
+        _ix("member_id"),  # Logs removed with their member
+        _ix("user_id"),  # Staff activity
+    ),
+    "notification_logs": (
+        _ix("campus_id", ("created_at", -1)),  # Notification log list
+        _ix("created_at"),  # Notifications sent today
+        _ix("care_event_id"),
+        _ix("member_id"),
+    ),
+    "pastoral_notes": (
+        _ix("id"),
+        _ix("campus_id", ("created_at", -1), ("id", -1)),  # Note list keyset
+        _ix("member_id", ("created_at", -1)),  # Notes of a member
+        _ix("campus_id", "follow_up_date", partial={"follow_up_completed": False}),  # Follow-ups due
+    ),
+    "settings": (
+        _ix("key", sparse=True),
+        _ix("type", sparse=True),
+    ),
+    "users": (
+        _ix("email", unique=True),
+        _ix("id"),
+        _ix("campus_id"),
+        _ix("role"),
+    ),
+    "campuses": (
+        _ix("id", unique=True),
+    ),
+    "user_preferences": (
+        _ix("user_id"),
+    ),
+    "sync_configs": (
+        _ix("campus_id"),
+        _ix("core_church_id", sparse=True),  # Webhooks match core_church_id or campus_id
+    ),
+    "sync_logs": (
+        _ix("campus_id", ("started_at", -1)),  # Sync history
+        _ix("started_at", expire_after_seconds=SYNC_LOG_RETENTION_DAYS * _DAY),
+    ),
+    "webhook_logs": (
+        _ix("received_at", expire_after_seconds=WEBHOOK_LOG_RETENTION_DAYS * _DAY),
+    ),
+    "job_locks": (
+        _ix("lock_id", unique=True),
+        # Lock ids carry the date, so expired locks are removed rather than left to accumulate
+        _ix("expires_at", expire_after_seconds=0),
+    ),
+    "import_jobs": (
+        _ix("id", unique=True),
+        _ix("campus_id"),
+        _ix("created_at", expire_after_seconds=7 * _DAY),
+    ),
+    "report_jobs": (
+        _ix("id", unique=True),
+        _ix("created_by_user_id"),
+        _ix("created_at", expire_after_seconds=7 * _DAY),
+    ),
+    "rendered_reports": (
+        _ix("expires_at", expire_after_seconds=0),
+    ),
+    "search_index": (
+        _ix("entity", "keys", "campus_id"),
+        _ix("entity", "member_id"),
+        _ix("campus_id", "updated_at"),
+    ),
+    "daily_rollups": (
+        _ix("kind", "campus_id", "date"),
+        _ix("kind", "date", "computed_at"),
+    ),
+    "rollup_dirty": (
+        _ix("campus_id", "date"),
+    ),
+}
+
+
+def _key(info: Dict[str, Any]) -> IndexKeys:
+    return tuple(
+        (field, int(direction) if isinstance(direction, (int, float)) else direction)
+        for field, direction in info["key"]
+    )
+
+
+def _options(info: Dict[str, Any]) -> Dict[str, Any]:
+    ttl = info.get("expireAfterSeconds")
+    return {
+        "unique": bool(info.get("unique", False)),
+        "sparse": bool(info.get("sparse", False)),
+        "partialFilterExpression": info.get("partialFilterExpression"),
+        "expireAfterSeconds": int(ttl) if ttl is not None else None,
+    }
+
+
+def _match(spec: IndexSpec, present: Dict[str, Dict[str, Any]]) -> Optional[str]:
+    """Name of the existing index for spec: same name, else same key pattern"""
+    if spec.index_name in present:
+        return spec.index_name
+    for name, info in present.items():
+        if _key(info) == spec.keys:
+            return name
+    return None
+
+
+def _reason(error: OperationFailure) -> str:
+    return (error.details or {}).get("errmsg") or str(error)
+
+
+class ReconcileReport(msgspec.Struct):
+    """Outcome of reconcile_indexes; entries are "collection.index" (with a reason for problems)"""
+    created: List[str] = msgspec.field(default_factory=list)
+    updated: List[str] = msgspec.field(default_factory=list)
+    conflicts: List[str] = msgspec.field(default_factory=list)
+    failed: List[str] = msgspec.field(default_factory=list)
+    unlisted: List[str] = msgspec.field(default_factory=list)
+    dropped: List[str] = msgspec.field(default_factory=list)
+
+    def summary(self) -> str:
+        return ", ".join(f"{len(getattr(self, f))} {f}" for f in self.__struct_fields__)
+
+
+async def reconcile_indexes(
+    db,
+    registry: Optional[Dict[str, Tuple[IndexSpec, ...]]] = None,
+    drop_unlisted: bool = False,
+) -> ReconcileReport:
+    """
+    Create registered indexes that are missing; idempotent.
+
+    A TTL that differs is changed in place (collMod). Other option differences are
+    reported as conflicts and left alone, since rebuilding means dropping first.
+    Indexes not in the registry are reported, and dropped only if drop_unlisted.
+    """
+    registry = INDEXES if registry is None else registry
+    report = ReconcileReport()
+    for collection_name, specs in registry.items():
+        collection = db[collection_name]
+        present = await collection.index_information()
+        matched = {"_id_"}
+        for spec in specs:
+            label = f"{collection_name}.{spec.index_name}"
+            name = _match(spec, present)
+            if name is None:
+                try:
+                    await collection.create_index(list(spec.keys), **spec.create_kwargs())
+                    report.created.append(label)
+                except OperationFailure as e:
+                    # e.g. duplicate values under a unique index, or a name taken by other keys
+                    report.failed.append(f"{label} ({_reason(e)})")
+                continue
+            matched.add(name)
+            existing = _options(present[name])
+            differs = [k for k, v in spec.options().items() if existing[k] != v]
+            if not differs:
+                continue
+            if differs == ["expireAfterSeconds"] and spec.expire_after_seconds is not None:
+                try:
+                    await db.command({"collMod": collection_name, "index": {
+                        "name": name, "expireAfterSeconds": spec.expire_after_seconds,
+                    }})
+                    report.updated.append(f"{collection_name}.{name}")
+                except OperationFailure as e:
+                    report.failed.append(f"{collection_name}.{name} ({_reason(e)})")
+                continue
+            report.conflicts.append(f"{collection_name}.{name} ({', '.join(differs)} differs from the registry)")
+        for name in present:
+            if name in matched:
+                continue
+            if drop_unlisted:
+                await collection.drop_index(name)
+                report.dropped.append(f"{collection_name}.{name}")
+            else:
+                report.unlisted.append(f"{collection_name}.{name}")
+    return report
+
+
+class IndexUsage(msgspec.Struct):
+    collection: str
+    name: str
+    ops: int
+    since: Optional[datetime] = None
+
+
+class IndexUsageReport(msgspec.Struct):
+    """$indexStats view of the registry. Counters reset when mongod restarts (see since)"""
+    unused: List[IndexUsage] = msgspec.field(default_factory=list)
+    unlisted: List[IndexUsage] = msgspec.field(default_factory=list)
+    missing: List[str] = msgspec.field(default_factory=list)
+
+
+async def index_usage_report(db, registry: Optional[Dict[str, Tuple[IndexSpec, ...]]] = None) -> IndexUsageReport:
+    """
+    Registered indexes no query has used, indexes outside the registry, and registered
+    indexes that do not exist. Unique and TTL indexes work without being queried and
+    are never reported as unused.
+    """
+    registry = INDEXES if registry is None else registry
+    report = IndexUsageReport()
+    for collection_name, specs in registry.items():
+        collection = db[collection_name]
+        stats: Dict[str, Dict[str, Any]] = {}
+        async for row in collection.aggregate([{"$indexStats": {}}]):
+            # One row per index per host; sum the accesses
+            entry = stats.setdefault(row["name"], {"ops": 0, "since": None, "spec": row.get("spec") or {}})
+            accesses = row.get("accesses") or {}
+            entry["ops"] += int(accesses.get("ops", 0))
+            since = accesses.get("since")
+            if since is not None and (entry["since"] is None or since < entry["since"]):
+                entry["since"] = since
+        present = {name: {"key": entry["spec"].get("key", {}).items()} for name, entry in stats.items()}
+        registered = {"_id_"}
+        for spec in specs:
+            name = _match(spec, present)
+            if name is None:
+                report.missing.append(f"{collection_name}.{spec.index_name}")
+                continue
+            registered.add(name)
+            entry = stats[name]
+            if entry["ops"] == 0 and not entry["spec"].get("unique") and "expireAfterSeconds" not in entry["spec"]:
+                report.unused.append(IndexUsage(collection_name, name, 0, entry["since"]))
+        for name, entry in stats.items():
+            if name not in registered:
+                report.unlisted.append(IndexUsage(collection_name, name, entry["ops"], entry["since"]))
+    return report
+
+
+def log_reconcile_report(report: ReconcileReport) -> None:
+    logger.info(f"Index registry reconciled: {report.summary()}")
+    for label in report.created:
+        logger.info(f"Created index {label}")
+    for label in report.updated:
+        logger.info(f"Updated TTL of index {label}")
+    for label in report.conflicts + report.failed:
+        logger.warning(f"Index not reconciled: {label}")
+    if report.unlisted:
+        logger.info(
+            f"Indexes not in the registry (kept; review with migrate.py --index-report): {', '.join(report.unlisted)}"
+        )
+
+
+async def reconcile_on_startup(db, cache=None) -> None:
+    """Reconcile once per deployment: the worker holding the lock builds, the others skip"""
+    token = None
+    if cache:
+        token = await cache.acquire_lock("index-reconcile", ttl=INDEX_RECONCILE_LOCK_TTL)
+        if token is None:
+            logger.info("Index reconcile running in another worker")
+            return
+    try:
+        log_reconcile_report(await reconcile_indexes(db))
+    except Exception as e:
+        logger.error(f"Index reconcile failed: {e}")
+    finally:
+        if token:
+            await cache.release_lock("index-reconcile", token)
+
+
+_reconcile_task: Optional[asyncio.Task] = None
+
+
+def start_index_reconcile(db, cache=None) -> None:
+    """Reconcile in the background so index builds do not hold up startup"""
+    global _reconcile_task
+    if INDEX_RECONCILE_ON_STARTUP and _reconcile_task is None:
+        _reconcile_task = asyncio.create_task(reconcile_on_startup(db, cache))
+
+
+async def stop_index_reconcile() -> None:
+    global _reconcile_task
+    if _reconcile_task:
+        _reconcile_task.cancel()
+        try:
+            await _reconcile_task
+        except (asyncio.CancelledError, Exception):
+            pass
+        _reconcile_task = None
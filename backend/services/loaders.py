@@ -0,0 +1,99 @@
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Fields handlers enrich results with; loaders never return secrets such as hashed_password
+MEMBER_LOADER_PROJECTION = {"_id": 0, "id": 1, "name": 1, "phone": 1, "photo_url": 1, "campus_id": 1}
+USER_LOADER_PROJECTION = {"_id": 0, "id": 1, "name": 1, "email": 1, "role": 1, "campus_id": 1, "photo_url": 1}
+CAMPUS_LOADER_PROJECTION = {"_id": 0, "id": 1, "campus_name": 1, "timezone": 1}
+
+
+class EntityLoader:
+    """
+    DataLoader-style batching for lookups by id.
+
+    Every load() issued before the event loop next runs its callbacks is coalesced
+    into a single {"id": {"$in": [...]}} query, and results (including misses) are
+    memoized for the lifetime of the loader.
+    """
+
+    def __init__(self, collection, projection: Optional[Dict[str, Any]] = None, key: str = "id"):
+        self._collection = collection
+        self._projection = projection or {"_id": 0}
+        self._key = key
+        self._results: Dict[Any, asyncio.Future] = {}
+        self._queue: List[Any] = []
+        self._batches: set[asyncio.Task] = set()
+        self.query_count = 0
+
+    async def load(self, key: Any) -> Optional[Dict[str, Any]]:
+        if key is None:
+            return None
+        future = self._results.get(key)
+        if future is None:
+            future = self._results[key] = asyncio.get_running_loop().create_future()
+            self._queue.append(key)
+            if len(self._queue) == 1:
+                asyncio.get_running_loop().call_soon(self._dispatch)
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: Iterable[Any]) -> Dict[Any, Optional[Dict[str, Any]]]:
+        """Load several ids in one round trip; returns {id: document or None}"""
+        keys = list(dict.fromkeys(k for k in keys if k is not None))
+        docs = await asyncio.gather(*(self.load(k) for k in keys))
+        return dict(zip(keys, docs))
+
+    def prime(self, doc: Dict[str, Any]) -> None:
+        """Seed the cache with a document the handler already has"""
+        key = doc.get(self._key)
+        if key is not None and key not in self._results:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(doc)
+            self._results[key] = future
+
+    def _dispatch(self) -> None:
+        keys, self._queue = self._queue, []
+        task = asyncio.ensure_future(self._fetch(keys))
+        self._batches.add(task)
+        task.add_done_callback(self._batches.discard)
+
+    async def _fetch(self, keys: List[Any]) -> None:
+        try:
+            self.query_count += 1
+            docs = await self._collection.find({self._key: {"$in": keys}}, self._projection).to_list(None)
+        except Exception as e:
+            for k in keys:
+                # Failed lookups are not memoized so a later load can retry
+                future = self._results.pop(k)
+                if not future.done():
+                    future.set_exception(e)
+            return
+        by_key = {doc.get(self._key): doc for doc in docs}
+        for k in keys:
+            future = self._results[k]
+            if not future.done():
+                future.set_result(by_key.get(k))
+
+
+class RequestLoaders:
+    """Loaders for the entities handlers most often enrich results with"""
+
+    def __init__(self, db):
+        self.members = EntityLoader(db.members, MEMBER_LOADER_PROJECTION)
+        self.users = EntityLoader(db.users, USER_LOADER_PROJECTION)
+        self.campuses = EntityLoader(db.campuses, CAMPUS_LOADER_PROJECTION)
+
+
+def get_loaders(request, db) -> RequestLoaders:
+    """Loaders scoped to one request (memoized results never leak across requests)"""
+    loaders = getattr(request.state, "loaders", None)
+    if loaders is None:
+        loaders = RequestLoaders(db)
+        request.state.loaders = loaders
+    return loaders
+
+
+def display_name(member: Optional[Dict[str, Any]], default: str = "Unknown") -> str:
+    return member.get("name", default) if member else default
@@ -0,0 +1,209 @@
+import asyncio
+import csv
+import logging
+import os
+from datetime import datetime, timezone, timedelta
+from typing import Optional, Dict, Any, List, Iterable, Callable, Awaitable, Tuple
+
+import msgspec
+from pymongo.errors import BulkWriteError
+
+from constants import IMPORT_BATCH_SIZE, MAX_IMPORT_ERRORS, IMPORT_JOB_STALE_MINUTES
+from models import Member, generate_uuid, to_mongo_doc
+from services.search_service import SearchService
+from utils import normalize_phone_number
+
+logger = logging.getLogger(__name__)
+
+# Keep references so running imports are not garbage collected mid-flight
+_running_jobs: set[asyncio.Task] = set()
+
+
+def _clean(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _is_orphaned(job: Dict[str, Any]) -> bool:
+    """Queued or running without progress for IMPORT_JOB_STALE_MINUTES"""
+    if job.get("status") not in ("queued", "running"):
+        return False
+    heartbeat = job.get("updated_at") or job.get("started_at") or job.get("created_at")
+    if not isinstance(heartbeat, datetime):
+        return False
+    if heartbeat.tzinfo is None:
+        heartbeat = heartbeat.replace(tzinfo=timezone.utc)
+    return datetime.now(timezone.utc) - heartbeat > timedelta(minutes=IMPORT_JOB_STALE_MINUTES)
+
+
+def row_to_member(row: Dict[str, Any], campus_id: str) -> Member:
+    """Validate one import row into a Member (raises ValueError / msgspec.ValidationError)."""
+    name = _clean(row.get("name"))
+    if not name:
+        raise ValueError("name is required")
+    phone = _clean(row.get("phone"))
+    return msgspec.convert({
+        "name": name,
+        "campus_id": campus_id,
+        "phone": normalize_phone_number(phone) if phone else None,
+        "external_member_id": _clean(row.get("external_member_id")),
+        "notes": _clean(row.get("notes")),
+    }, Member)
+
+
+def iter_csv_rows(path: str) -> Iterable[Dict[str, Any]]:
+    """Yield CSV rows one at a time from a file on disk (handles an Excel BOM)."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        yield from csv.DictReader(f)
+
+
+class MemberImportService:
+    def __init__(self, db):
+        self._db = db
+
+    async def create_job(self, campus_id: str, source: str, user_id: str) -> Dict[str, Any]:
+        job = {
+            "id": generate_uuid(),
+            "campus_id": campus_id,
+            "source": source,
+            "status": "queued",
+            "created_by_user_id": user_id,
+            "processed": 0,
+            "imported": 0,
+            "failed": 0,
+            "errors": [],
+            "error": None,
+            "created_at": datetime.now(timezone.utc),
+            "updated_at": datetime.now(timezone.utc),
+            "started_at": None,
+            "completed_at": None,
+        }
+        await self._db.import_jobs.insert_one(dict(job))
+        return job
+
+    async def get_job(self, job_id: str, campus_id: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        query = {"id": job_id}
+        if campus_id:
+            query["campus_id"] = campus_id
+        job = await self._db.import_jobs.find_one(query, {"_id": 0})
+        if job and _is_orphaned(job):
+            job = await self._fail_orphaned(job)
+        return job
+
+    async def _fail_orphaned(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Mark a job whose worker stopped (restart, crash) as failed so pollers stop waiting"""
+        error = "Import was interrupted (server restarted); please import again"
+        now = datetime.now(timezone.utc)
+        # Only if it made no progress since it was read, in case its worker is merely slow
+        result = await self._db.import_jobs.update_one(
+            {"id": job["id"], "status": job["status"], "updated_at": job.get("updated_at")},
+            {"$set": {"status": "failed", "error": error, "completed_at": now, "updated_at": now}}
+        )
+        if result.modified_count:
+            logger.warning(f"Member import {job['id']} orphaned while {job['status']}; marked failed")
+            return {**job, "status": "failed", "error": error, "completed_at": now, "updated_at": now}
+        return await self._db.import_jobs.find_one({"id": job["id"]}, {"_id": 0}) or job
+
+    def start(
+        self,
+        job: Dict[str, Any],
+        rows: Iterable[Dict[str, Any]],
+        on_complete: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+        cleanup_path: Optional[str] = None,
+    ) -> None:
+        """Run an import in the background; progress is persisted on the job document."""
+        task = asyncio.create_task(self.run(job, rows, on_complete, cleanup_path))
+        _running_jobs.add(task)
+        task.add_done_callback(_running_jobs.discard)
+
+    async def run(
+        self,
+        job: Dict[str, Any],
+        rows: Iterable[Dict[str, Any]],
+        on_complete: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+        cleanup_path: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        job_id = job["id"]
+        now = datetime.now(timezone.utc)
+        await self._db.import_jobs.update_one(
+            {"id": job_id},
+            {"$set": {"status": "running", "started_at": now, "updated_at": now}}
+        )
+        stats = {"processed": 0, "imported": 0, "failed": 0}
+        try:
+            batch: List[Tuple[int, Dict[str, Any]]] = []
+            errors: List[Dict[str, Any]] = []
+
+            # Rows are reported 1-based: first data row of the CSV / first element of the JSON array
+            for row_number, row in enumerate(rows, start=1):
+                stats["processed"] += 1
+                try:
+                    batch.append((row_number, to_mongo_doc(row_to_member(row, job["campus_id"]))))
+                except (ValueError, TypeError, AttributeError, msgspec.ValidationError) as e:
+                    stats["failed"] += 1
+                    errors.append({"row": row_number, "error": str(e)})
+
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    await self._flush(job_id, batch, errors, stats)
+                    batch, errors = [], []
+                    # Parsing is synchronous; let other requests run between batches
+                    await asyncio.sleep(0)
+
+            await self._flush(job_id, batch, errors, stats)
+            status, error = "completed", None
+        except Exception as e:
+            logger.error(f"Member import {job_id} failed: {str(e)}")
+            status, error = "failed", str(e)
+        finally:
+            if cleanup_path:
+                try:
+                    os.unlink(cleanup_path)
+                except OSError:
+                    pass
+
+        await self._db.import_jobs.update_one(
+            {"id": job_id},
+            {"$set": {**stats, "status": status, "error": error,
+                      "completed_at": datetime.now(timezone.utc), "updated_at": datetime.now(timezone.utc)}}
+        )
+        final = {**job, **stats, "status": status, "error": error}
+        logger.info(f"Member import {job_id} {status}: {stats['imported']} imported, {stats['failed']} failed")
+        if on_complete:
+            try:
+                await on_complete(final)
+            except Exception as e:
+                logger.warning(f"Member import {job_id} completion hook failed: {str(e)}")
+        return final
+
+    async def _flush(
+        self,
+        job_id: str,
+        batch: List[Tuple[int, Dict[str, Any]]],
+        errors: List[Dict[str, Any]],
+        stats: Dict[str, int],
+    ) -> None:
+        """Insert one chunk unordered, map per-document failures back to row numbers, save progress."""
+        if batch:
+            failed_indexes = set()
+            try:
+                result = await self._db.members.insert_many([doc for _, doc in batch], ordered=False)
+                stats["imported"] += len(result.inserted_ids)
+            except BulkWriteError as bwe:
+                write_errors = bwe.details.get("writeErrors", [])
+                stats["imported"] += bwe.details.get("nInserted", 0)
+                stats["failed"] += len(write_errors)
+                for err in write_errors:
+                    failed_indexes.add(err["index"])
+                    errors.append({"row": batch[err["index"]][0], "error": err.get("errmsg", "write failed")})
+            await SearchService(self._db).index_members(
+                doc for i, (_, doc) in enumerate(batch) if i not in failed_indexes
+            )
+
+        # updated_at is the heartbeat get_job uses to detect orphaned jobs
+        update: Dict[str, Any] = {"$set": {**stats, "updated_at": datetime.now(timezone.utc)}}
+        if errors:
+            # Only the first MAX_IMPORT_ERRORS errors are kept; counts stay exact
+            update["$push"] = {"errors": {"$each": errors, "$slice": MAX_IMPORT_ERRORS}}
+        await self._db.import_jobs.update_one({"id": job_id}, update)
@@ -5,8 +5,9 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from enums import EngagementStatus, ActivityActionType
 from constants import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
-from utils import calculate_engagement_status, normalize_phone_number, escape_regex
+from utils import calculate_engagement_status, contact_fields, normalize_phone_number, escape_regex
 from models import MemberCreate, MemberUpdate, generate_uuid
+from services.activity_writer import get_activity_writer
 
 logger = logging.getLogger(__name__)
 
@@ -106,9 +107,7 @@ class MemberService:
             "family_group_id": data.family_group_id,
             "notes": data.notes,
             "categories": data.categories or [],
-            "engagement_status": EngagementStatus.ACTIVE.value,
-            "days_since_last_contact": 0,
-            "last_contact_date": now,
+            **contact_fields(now),
             "photo_url": None,
             "created_at": now,
             "updated_at": now,
@@ -245,12 +244,7 @@ class MemberService:
         
         await self._db.members.update_one(
             {"id": member_id, "church_id": church_id},
-            {"$set": {
-                "last_contact_date": contact_date,
-                "engagement_status": EngagementStatus.ACTIVE.value,
-                "days_since_last_contact": 0,
-                "updated_at": datetime.now(timezone.utc)
-            }}
+            {"$set": {**contact_fields(contact_date), "updated_at": datetime.now(timezone.utc)}}
         )
     
     async def get_at_risk_members(
@@ -308,4 +302,8 @@ class MemberService:
             "details": details,
             "timestamp": datetime.now(timezone.utc),
         }
-        await self._db.activity_logs.insert_one(log_doc)
+        writer = get_activity_writer()
+        if writer:
+            await writer.write(log_doc)
+        else:
+            await self._db.activity_logs.insert_one(log_doc)
@@ -0,0 +1,325 @@
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional, Tuple
+
+import msgspec
+import redis.asyncio as redis
+from apscheduler.events import EVENT_JOB_SUBMITTED, EVENT_JOB_MISSED, EVENT_JOB_ERROR
+from pymongo import monitoring
+
+from constants import METRICS_PUBLISH_INTERVAL, METRICS_WORKER_STALE_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Each worker keeps its own metrics and publishes a snapshot to one field of this hash;
+# /metrics merges the snapshots of all live workers so a scrape sees the whole process group
+METRICS_HASH = "ft:metrics:workers"
+
+_worker_id = uuid.uuid4().hex
+# Mongo command events arrive on driver threads; every update takes this lock
+_lock = threading.Lock()
+
+LabelValues = Tuple[str, ...]
+
+
+class _Family:
+    kind = ""
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.values: Dict[LabelValues, Any] = {}
+        REGISTRY[name] = self
+
+
+class Counter(_Family):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with _lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+
+class Gauge(_Family):
+    kind = "gauge"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with _lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Family):
+    """Per label set: one count per bucket (the last is +Inf), then the sum of observations"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...], buckets: Tuple[float, ...]):
+        super().__init__(name, help, labelnames)
+        self.buckets = buckets
+
+    def observe(self, value: float, *labels: str) -> None:
+        i = bisect_left(self.buckets, value)
+        with _lock:
+            counts = self.values.get(labels)
+            if counts is None:
+                counts = self.values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            counts[i] += 1
+            counts[-1] += value
+
+
+REGISTRY: Dict[str, _Family] = {}
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+_JOB_BUCKETS = (0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0, 3600.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Request latency by route template",
+    ("method", "route", "status"), _LATENCY_BUCKETS,
+)
+HTTP_RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes", "Response body size by route template", ("method", "route"), _SIZE_BUCKETS,
+)
+HTTP_IN_FLIGHT = Gauge("http_requests_in_flight", "Requests currently being handled")
+MONGO_COMMAND_DURATION = Histogram(
+    "mongo_command_duration_seconds", "MongoDB command latency", ("collection", "command"), _LATENCY_BUCKETS,
+)
+MONGO_COMMAND_FAILURES = Counter("mongo_command_failures_total", "Failed MongoDB commands", ("collection", "command"))
+MONGO_DOCUMENTS_RETURNED = Counter(
+    "mongo_documents_returned_total", "Documents returned in cursor batches", ("collection", "command"),
+)
+CACHE_REQUESTS = Counter("cache_requests_total", "Cache lookups by tier and result", ("tier", "result"))
+SCHEDULER_JOB_DURATION = Histogram(
+    "scheduler_job_duration_seconds", "Scheduled job run time", ("job", "status"), _JOB_BUCKETS,
+)
+SCHEDULER_JOBS_MISSED = Counter("scheduler_jobs_missed_total", "Scheduled runs missed past their grace time", ("job",))
+
+
+def snapshot() -> Dict[str, List[Any]]:
+    """This worker's values as {metric name: [[label values, value], ...]}"""
+    with _lock:
+        return {
+            name: [[list(labels), list(value) if isinstance(value, list) else value]
+                   for labels, value in family.values.items()]
+            for name, family in REGISTRY.items()
+        }
+
+
+def merge_snapshots(snapshots: List[Dict[str, List[Any]]]) -> Dict[str, Dict[LabelValues, Any]]:
+    """Sum the snapshots of several workers (histograms bucket by bucket)"""
+    merged: Dict[str, Dict[LabelValues, Any]] = {name: {} for name in REGISTRY}
+    for snap in snapshots:
+        for name, series in snap.items():
+            if name not in merged:
+                continue
+            values = merged[name]
+            for labels, value in series:
+                key = tuple(labels)
+                current = values.get(key)
+                if current is None:
+                    values[key] = list(value) if isinstance(value, list) else value
+                elif isinstance(current, list):
+                    values[key] = [a + b for a, b in zip(current, value)]
+                else:
+                    values[key] = current + value
+    return merged
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render(snapshots: List[Dict[str, List[Any]]]) -> str:
+    """Prometheus text exposition (format 0.0.4) of the merged snapshots"""
+    merged = merge_snapshots(snapshots)
+    lines: List[str] = []
+    for name, family in REGISTRY.items():
+        lines.append(f"# HELP {name} {family.help}")
+        lines.append(f"# TYPE {name} {family.kind}")
+        for labels, value in sorted(merged[name].items()):
+            if family.kind != "histogram":
+                lines.append(f"{name}{_labels(family.labelnames, labels)} {_number(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip((*family.buckets, "+Inf"), value[:-1]):
+                cumulative += count
+                le = 'le="' + (bound if bound == "+Inf" else _number(bound)) + '"'
+                lines.append(f"{name}_bucket{_labels(family.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{name}_sum{_labels(family.labelnames, labels)} {_number(value[-1])}")
+            lines.append(f"{name}_count{_labels(family.labelnames, labels)} {cumulative}")
+    lines.append("# HELP metrics_workers Workers whose metrics are included")
+    lines.append("# TYPE metrics_workers gauge")
+    lines.append(f"metrics_workers {len(snapshots)}")
+    return "\n".join(lines) + "\n"
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Per collection/command latency, failures and documents returned (register via event_listeners)"""
+
+    _IGNORED = frozenset({
+        "hello", "ismaster", "isMaster", "ping", "buildInfo", "saslStart", "saslContinue",
+        "endSessions", "killCursors", "authenticate",
+    })
+
+    def __init__(self):
+        self._pending: Dict[Tuple[Any, int], str] = {}
+
+    def started(self, event) -> None:
+        if event.command_name in self._IGNORED:
+            return
+        target = event.command.get("collection" if event.command_name == "getMore" else event.command_name)
+        self._pending[(event.connection_id, event.request_id)] = target if isinstance(target, str) else "-"
+
+    def succeeded(self, event) -> None:
+        collection = self._pending.pop((event.connection_id, event.request_id), None)
+        if collection is None:
+            return
+        MONGO_COMMAND_DURATION.observe(event.duration_micros / 1e6, collection, event.command_name)
+        cursor = event.reply.get("cursor") if isinstance(event.reply, dict) else None
+        if cursor:
+            returned = len(cursor.get("firstBatch") or cursor.get("nextBatch") or ())
+            if returned:
+                MONGO_DOCUMENTS_RETURNED.inc(collection, event.command_name, amount=returned)
+
+    def failed(self, event) -> None:
+        collection = self._pending.pop((event.connection_id, event.request_id), None)
+        if collection is None:
+            return
+        MONGO_COMMAND_DURATION.observe(event.duration_micros / 1e6, collection, event.command_name)
+        MONGO_COMMAND_FAILURES.inc(collection, event.command_name)
+
+
+mongo_command_metrics = MongoCommandMetrics()
+
+
+class SchedulerJobMetrics:
+    """APScheduler listener timing each run from submission to completion"""
+
+    def __init__(self):
+        self._started: Dict[str, float] = {}
+
+    def __call__(self, event) -> None:
+        if event.code == EVENT_JOB_SUBMITTED:
+            self._started[event.job_id] = time.perf_counter()
+        elif event.code == EVENT_JOB_MISSED:
+            SCHEDULER_JOBS_MISSED.inc(event.job_id)
+        else:
+            started = self._started.pop(event.job_id, None)
+            if started is not None:
+                status = "error" if event.code == EVENT_JOB_ERROR else "ok"
+                SCHEDULER_JOB_DURATION.observe(time.perf_counter() - started, event.job_id, status)
+
+
+class MetricsPublisher:
+    """Publishes this worker's snapshot to DragonflyDB and collects everyone's for /metrics"""
+
+    def __init__(self, client: Optional[redis.Redis] = None, interval: float = METRICS_PUBLISH_INTERVAL):
+        self._client = client
+        self._interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._client and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            await self.publish()
+            await asyncio.sleep(self._interval)
+
+    async def publish(self) -> None:
+        if not self._client:
+            return
+        try:
+            payload = msgspec.json.encode({"at": time.time(), "metrics": snapshot()})
+            await self._client.hset(METRICS_HASH, _worker_id, payload)
+        except redis.RedisError as e:
+            logger.warning(f"Metrics publish failed: {e}")
+
+    async def collect(self) -> List[Dict[str, List[Any]]]:
+        """Live snapshot of this worker plus the last published snapshot of every other live worker"""
+        snapshots = [snapshot()]
+        if not self._client:
+            return snapshots
+        try:
+            published = await self._client.hgetall(METRICS_HASH)
+        except redis.RedisError as e:
+            logger.warning(f"Metrics collect failed: {e}")
+            return snapshots
+        stale = []
+        cutoff = time.time() - METRICS_WORKER_STALE_SECONDS
+        for worker, payload in published.items():
+            worker = worker.decode() if isinstance(worker, bytes) else worker
+            if worker == _worker_id:
+                continue
+            data = msgspec.json.decode(payload)
+            if data["at"] < cutoff:
+                stale.append(worker)
+            else:
+                snapshots.append(data["metrics"])
+        if stale:
+            # Workers that exited (or restarted under a new id) stop being counted
+            try:
+                await self._client.hdel(METRICS_HASH, *stale)
+            except redis.RedisError:
+                pass
+        return snapshots
+
+    async def close(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._task = None
+        if self._client:
+            try:
+                await self._client.hdel(METRICS_HASH, _worker_id)
+            except redis.RedisError:
+                pass
+
+
+_publisher: Optional[MetricsPublisher] = None
+
+
+def init_metrics(client: Optional[redis.Redis] = None) -> MetricsPublisher:
+    global _publisher
+    _publisher = MetricsPublisher(client)
+    _publisher.start()
+    logger.info(f"Metrics publisher started ({'shared' if client else 'this worker only'})")
+    return _publisher
+
+
+def get_metrics_publisher() -> MetricsPublisher:
+    """The worker's publisher; a local-only one is created on first use (scripts, tests)"""
+    global _publisher
+    if _publisher is None:
+        _publisher = MetricsPublisher()
+    return _publisher
+
+
+async def close_metrics() -> None:
+    global _publisher
+    if _publisher:
+        await _publisher.close()
+        _publisher = None
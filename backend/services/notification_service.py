@@ -7,7 +7,8 @@ import httpx
 
 from enums import NotificationChannel, NotificationStatus
 from models import generate_uuid
-from constants import API_MAX_RETRIES, API_RETRY_DELAYS, API_RETRY_TIMEOUT
+from constants import API_MAX_RETRIES, API_RETRY_DELAYS
+from services.http_client import shared_http_client, UPSTREAM_WHATSAPP
 
 logger = logging.getLogger(__name__)
 
@@ -74,7 +75,7 @@ class NotificationService:
                     {"$inc": {"attempts": 1}}
                 )
                 
-                async with httpx.AsyncClient(timeout=API_RETRY_TIMEOUT) as client:
+                async with shared_http_client(UPSTREAM_WHATSAPP) as client:
                     response = await client.post(
                         f"{self._whatsapp_url}/send/message",
                         json={"phone": phone, "message": message}
@@ -0,0 +1,127 @@
+import base64
+import hashlib
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import msgspec
+
+from constants import COUNT_CACHE_TTL
+from services.cache import get_cache
+
+logger = logging.getLogger(__name__)
+
+# (field, direction) pairs; the last field must be unique (e.g. "id") so every row has one position
+SortSpec = Sequence[Tuple[str, int]]
+
+MEMBER_SORT: SortSpec = (("name", 1), ("id", 1))
+CARE_EVENT_SORT: SortSpec = (("event_date", -1), ("created_at", -1), ("id", -1))
+RECENT_FIRST_SORT: SortSpec = (("created_at", -1), ("id", -1))
+
+
+def _enc_value(value: Any) -> Any:
+    # Datetimes are tagged so the cursor compares against the same BSON type it was read from
+    if isinstance(value, datetime):
+        return {"$date": value.isoformat()}
+    return value
+
+
+def _dec_value(value: Any) -> Any:
+    if isinstance(value, dict) and "$date" in value:
+        return datetime.fromisoformat(value["$date"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Opaque, URL-safe token holding the sort key of the last row on a page"""
+    raw = msgspec.json.encode([_enc_value(v) for v in values])
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: SortSpec) -> List[Any]:
+    """Inverse of encode_cursor; raises ValueError for tampered or mismatched tokens"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = msgspec.json.decode(raw)
+    except (ValueError, msgspec.DecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(values, list) or len(values) != len(sort):
+        raise ValueError("Invalid cursor")
+    return [_dec_value(v) for v in values]
+
+
+def _past(field: str, direction: int, value: Any) -> Optional[Dict[str, Any]]:
+    """
+    Filter for values of field strictly after value in sort order, or None if nothing is.
+
+    MongoDB sorts null and missing values before everything else, but $gt/$lt never match
+    them, so they need explicit branches: after a null every non-null value follows in an
+    ascending sort, and in a descending sort nulls follow every non-null value.
+    """
+    if value is None:
+        return {field: {"$ne": None}} if direction > 0 else None
+    if direction > 0:
+        return {field: {"$gt": value}}
+    return {"$or": [{field: {"$lt": value}}, {field: None}]}
+
+
+def keyset_query(query: Dict[str, Any], sort: SortSpec, cursor: Optional[str]) -> Dict[str, Any]:
+    """
+    Restrict query to rows strictly after the cursor in sort order.
+
+    (a, b, id) > (x, y, z) expands to a > x OR (a = x AND b > y) OR (a = x AND b = y AND id > z),
+    with > flipped to < for descending fields, so the index range scan starts at the cursor.
+    Rows with a null or missing sort value keep their place (see _past).
+    """
+    if not cursor:
+        return query
+    values = decode_cursor(cursor, sort)
+    branches = []
+    for i, (field, direction) in enumerate(sort):
+        past = _past(field, direction, values[i])
+        if past is None:
+            continue
+        # Equality on None also matches a missing field, which sorts the same as null
+        branch = {prev_field: values[j] for j, (prev_field, _) in enumerate(sort[:i])}
+        branch.update(past)
+        branches.append(branch)
+    after = {"$or": branches}
+    return {"$and": [query, after]} if query else after
+
+
+def split_page(items: List[Dict[str, Any]], sort: SortSpec, limit: int) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Trim a fetch of limit + 1 rows to one page plus the cursor for the next page.
+
+    The extra row only signals that another page exists, so the last page never
+    hands out a cursor that leads to an empty response.
+    """
+    if len(items) <= limit:
+        return items, None
+    items = items[:limit]
+    last = items[-1]
+    return items, encode_cursor([last.get(field) for field, _ in sort])
+
+
+def sort_projection(projection: Dict[str, Any], sort: SortSpec) -> Dict[str, Any]:
+    """Ensure an inclusion projection returns the sort keys needed to build the next cursor"""
+    if any(v == 1 for k, v in projection.items() if k != "_id"):
+        projection = {**projection, **{field: 1 for field, _ in sort}}
+    return projection
+
+
+async def cached_count(collection, query: Dict[str, Any], ttl: int = COUNT_CACHE_TTL) -> int:
+    """
+    count_documents reused across pages of the same listing for a short TTL.
+
+    The total is therefore an estimate that may lag writes by up to ttl seconds.
+    """
+    digest = hashlib.sha1(msgspec.json.encode(query, enc_hook=str)).hexdigest()
+    key = f"count:{collection.name}:{digest}"
+    cache = get_cache()
+    cached = await cache.get(key)
+    if cached is not None:
+        return cached
+    total = await collection.count_documents(query)
+    await cache.set(key, total, ttl=ttl)
+    return total
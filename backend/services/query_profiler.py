@@ -0,0 +1,215 @@
+import contextvars
+import logging
+import os
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import msgspec
+from pymongo import monitoring
+
+from constants import (
+    QUERY_PROFILER_SLOW_MS, QUERY_PROFILER_REPEAT_THRESHOLD, QUERY_PROFILER_MAX_EXPLAINS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Development aid: never enabled in production, opt in with QUERY_PROFILER=1
+QUERY_PROFILER_ENABLED = (
+    os.environ.get("QUERY_PROFILER", "").lower() in ("1", "true", "yes")
+    and os.environ.get("ENVIRONMENT", "development") != "production"
+)
+
+# Commands that are not queries issued by application code
+_IGNORED_COMMANDS = frozenset({
+    "hello", "ismaster", "isMaster", "ping", "buildInfo", "saslStart", "saslContinue",
+    "endSessions", "killCursors", "authenticate", "explain",
+})
+# Commands explain() accepts; others are reported as slow without a plan
+_EXPLAINABLE = frozenset({"find", "aggregate", "count", "distinct", "findAndModify"})
+# Cursor continuations repeat by design and are not N+1 candidates
+_NOT_REPEATS = frozenset({"getMore"})
+# Parts of a command that describe its shape (values are masked)
+_SHAPE_FIELDS = ("filter", "query", "pipeline", "q", "key", "updates", "deletes", "sort", "projection")
+
+
+def query_shape(command_name: str, command: Dict[str, Any]) -> str:
+    """Command with every literal value replaced by "?" (same shape = same query with different arguments)"""
+    parts = {field: _mask(command[field]) for field in _SHAPE_FIELDS if field in command}
+    return f"{command_name} {msgspec.json.encode(parts, order='sorted').decode()}" if parts else command_name
+
+
+def _mask(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {k: _mask(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        # $in lists and bulk write batches: their length is an argument, not part of the shape
+        masked = [_mask(v) for v in value]
+        return list({repr(v): v for v in masked}.values())
+    if isinstance(value, str) and value.startswith("$"):
+        return value  # Field paths in pipelines are structure
+    return "?"
+
+
+class QueryRecord(msgspec.Struct):
+    database: str
+    collection: str
+    command_name: str
+    shape: str
+    duration_ms: float
+    command: Optional[Dict[str, Any]] = None  # Kept for slow explainable commands only
+    plan: Optional[str] = None
+
+
+class QueryProfile:
+    """Mongo commands issued while this profile is active (see profile_queries)"""
+
+    def __init__(self, slow_ms: float = QUERY_PROFILER_SLOW_MS):
+        self.slow_ms = slow_ms
+        self.records: List[QueryRecord] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.records)
+
+    @property
+    def total_ms(self) -> float:
+        return sum(r.duration_ms for r in self.records)
+
+    @property
+    def slow(self) -> List[QueryRecord]:
+        return [r for r in self.records if r.duration_ms >= self.slow_ms]
+
+    def repeated(self, threshold: int = QUERY_PROFILER_REPEAT_THRESHOLD) -> List[Tuple[str, int]]:
+        """(collection + shape, times issued) for shapes issued at least threshold times, most frequent first"""
+        counts = Counter(
+            f"{r.collection}.{r.shape}" for r in self.records if r.command_name not in _NOT_REPEATS
+        )
+        return [(shape, n) for shape, n in counts.most_common() if n >= threshold]
+
+    async def explain_slow(self, client, limit: int = QUERY_PROFILER_MAX_EXPLAINS) -> None:
+        """Attach a plan summary (e.g. "COLLSCAN", "IXSCAN campus_id_1") to the slowest explainable commands"""
+        candidates = sorted((r for r in self.slow if r.command), key=lambda r: r.duration_ms, reverse=True)
+        for record in candidates[:limit]:
+            try:
+                explained = await client[record.database].command(
+                    {"explain": record.command, "verbosity": "queryPlanner"}
+                )
+                record.plan = plan_summary(explained)
+            except Exception as e:
+                record.plan = f"explain failed: {e}"
+
+    def headers(self) -> Dict[str, str]:
+        """Debug response headers (ASCII, one line each)"""
+        headers = {"X-Query-Count": str(self.count), "X-Query-Time-Ms": f"{self.total_ms:.1f}"}
+        repeated = self.repeated()
+        if repeated:
+            headers["X-Query-Repeated"] = "; ".join(f"{shape.split(' ', 1)[0]} x{n}" for shape, n in repeated[:5])
+        slow = self.slow
+        if slow:
+            headers["X-Query-Slow"] = "; ".join(
+                f"{r.collection}.{r.command_name} {r.duration_ms:.0f}ms" + (f" {r.plan}" if r.plan else "")
+                for r in sorted(slow, key=lambda r: r.duration_ms, reverse=True)[:5]
+            )
+        return headers
+
+    def check_budget(self, max_queries: int, max_repeats: int = QUERY_PROFILER_REPEAT_THRESHOLD) -> None:
+        """Raise QueryBudgetExceeded when more than max_queries commands ran or a shape repeated max_repeats times"""
+        problems = []
+        if self.count > max_queries:
+            problems.append(f"{self.count} queries issued, budget is {max_queries}")
+        for shape, n in self.repeated(max_repeats):
+            problems.append(f"possible N+1: {shape} issued {n} times")
+        if problems:
+            raise QueryBudgetExceeded("\n".join(problems))
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def plan_summary(explained: Dict[str, Any]) -> str:
+    """Access path of an explain() result: collection scans and the indexes used"""
+    stages: List[str] = []
+
+    def walk(node: Any) -> None:
+        if isinstance(node, dict):
+            stage = node.get("stage")
+            if stage == "COLLSCAN":
+                stages.append("COLLSCAN")
+            elif stage in ("IXSCAN", "COUNT_SCAN", "DISTINCT_SCAN", "IDHACK", "EXPRESS_IXSCAN"):
+                stages.append(f"{stage} {node.get('indexName', '_id_')}".strip())
+            for key, value in node.items():
+                if key != "rejectedPlans":
+                    walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+
+    walk(explained.get("queryPlanner", explained))
+    return ", ".join(dict.fromkeys(stages)) or "unknown plan"
+
+
+_current_profile: contextvars.ContextVar[Optional[QueryProfile]] = contextvars.ContextVar("query_profile", default=None)
+
+
+@contextmanager
+def profile_queries(slow_ms: float = QUERY_PROFILER_SLOW_MS) -> Iterator[QueryProfile]:
+    """Record the Mongo commands issued in this context (Motor carries it into its driver threads)"""
+    profile = QueryProfile(slow_ms)
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+
+
+class QueryProfilerListener(monitoring.CommandListener):
+    """Feeds the active QueryProfile; a no-op outside profile_queries (register via event_listeners)"""
+
+    def __init__(self):
+        self._pending: Dict[Tuple[Any, int], Tuple[QueryProfile, str, Dict[str, Any]]] = {}
+
+    def started(self, event) -> None:
+        profile = _current_profile.get()
+        if profile is None or event.command_name in _IGNORED_COMMANDS:
+            return
+        self._pending[(event.connection_id, event.request_id)] = (profile, event.database_name, event.command)
+
+    def succeeded(self, event) -> None:
+        self._finish(event)
+
+    def failed(self, event) -> None:
+        self._finish(event)
+
+    def _finish(self, event) -> None:
+        pending = self._pending.pop((event.connection_id, event.request_id), None)
+        if pending is None:
+            return
+        profile, database, command = pending
+        name = event.command_name
+        target = command.get("collection" if name == "getMore" else name)
+        duration_ms = event.duration_micros / 1000
+        slow = duration_ms >= profile.slow_ms and name in _EXPLAINABLE
+        profile.records.append(QueryRecord(
+            database=database,
+            collection=target if isinstance(target, str) else "-",
+            command_name=name,
+            shape=query_shape(name, command),
+            duration_ms=duration_ms,
+            command={k: v for k, v in command.items() if not k.startswith("$") and k != "lsid"} if slow else None,
+        ))
+
+
+query_profiler = QueryProfilerListener()
+
+
+def log_profile(label: str, profile: QueryProfile) -> None:
+    """Warn about N+1 patterns and slow commands seen while handling label"""
+    for shape, n in profile.repeated():
+        logger.warning(f"Possible N+1 in {label}: {shape} issued {n} times")
+    for record in profile.slow:
+        logger.warning(
+            f"Slow query in {label}: {record.collection}.{record.command_name} {record.duration_ms:.0f}ms"
+            f" ({record.plan or 'no plan'}) {record.shape}"
+        )
@@ -0,0 +1,52 @@
+from typing import Optional
+
+import msgspec
+
+from constants import RATE_LIMIT_WINDOW_SECONDS, RATE_LIMIT_ANONYMOUS, RATE_LIMIT_AUTHENTICATED
+
+# Requests are counted in sliding windows shared by every worker (CacheService.hit_rate_limit).
+# Signed-in users get their own budget, anonymous callers are limited per client IP, and a few
+# expensive or sensitive routes have tighter budgets of their own.
+
+
+class RateLimitPolicy(msgspec.Struct, frozen=True):
+    name: str
+    limit: int                                       # Requests per window
+    window_seconds: int = RATE_LIMIT_WINDOW_SECONDS
+    per_user: bool = True                            # Keyed by the signed-in user when there is one, else by IP
+
+
+AUTHENTICATED_POLICY = RateLimitPolicy("user", RATE_LIMIT_AUTHENTICATED)
+ANONYMOUS_POLICY = RateLimitPolicy("ip", RATE_LIMIT_ANONYMOUS, per_user=False)
+
+# (method or None for any, path prefix, policy); the longest matching prefix wins
+ROUTE_POLICIES: tuple[tuple[Optional[str], str, RateLimitPolicy], ...] = (
+    ("POST", "/auth/login", RateLimitPolicy("login", 20, per_user=False)),
+    ("POST", "/import/", RateLimitPolicy("import", 10)),
+    ("GET", "/export/", RateLimitPolicy("export", 10)),
+    (None, "/reports/monthly/pdf", RateLimitPolicy("report-pdf", 20)),
+    ("POST", "/sync/members/", RateLimitPolicy("sync-pull", 6)),
+    ("POST", "/sync/webhook", RateLimitPolicy("sync-webhook", 60, per_user=False)),
+)
+
+# Health probes, docs, long-lived SSE connections and images (a member list loads dozens)
+EXEMPT_PREFIXES = ("/health", "/ready", "/docs", "/schema", "/stream/", "/uploads/", "/user-photos/")
+
+_ROUTE_POLICIES_BY_PREFIX = sorted(ROUTE_POLICIES, key=lambda entry: len(entry[1]), reverse=True)
+
+
+def select_policy(method: str, path: str, authenticated: bool) -> Optional[RateLimitPolicy]:
+    """Policy limiting this request, None when the path is exempt"""
+    if path.startswith(EXEMPT_PREFIXES):
+        return None
+    for route_method, prefix, policy in _ROUTE_POLICIES_BY_PREFIX:
+        if path.startswith(prefix) and route_method in (None, method):
+            return policy
+    return AUTHENTICATED_POLICY if authenticated else ANONYMOUS_POLICY
+
+
+def rate_limit_key(policy: RateLimitPolicy, user_id: Optional[str], client_ip: str) -> str:
+    """Limiter key for one caller under one policy"""
+    if policy.per_user and user_id:
+        return f"req:{policy.name}:u:{user_id}"
+    return f"req:{policy.name}:ip:{client_ip}"
@@ -0,0 +1,251 @@
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import msgspec
+
+from constants import (
+    PDF_RENDER_TASKS_PER_CHILD, PDF_RENDER_QUEUE_PER_WORKER,
+    REPORT_CACHE_TTL_HOURS, REPORT_CACHE_TTL_DAYS, REPORT_RENDERER_VERSION,
+)
+from models import generate_uuid
+
+logger = logging.getLogger(__name__)
+
+JAKARTA_TZ = ZoneInfo("Asia/Jakarta")
+
+PDF_RENDER_WORKERS = max(1, int(os.environ.get("PDF_RENDER_WORKERS", "2")))
+
+_pool: Optional[ProcessPoolExecutor] = None
+_render_slots: Optional[asyncio.Semaphore] = None
+# Held while a broken pool is replaced, so renders that failed together restart it once
+_pool_restart_lock = asyncio.Lock()
+
+# Renders in progress in this worker, so simultaneous downloads of one report share a render
+_inflight: Dict[str, asyncio.Future] = {}
+
+# Keep references so running report jobs are not garbage collected mid-flight
+_running_jobs: set[asyncio.Task] = set()
+
+_fingerprint_encoder = msgspec.json.Encoder(enc_hook=str, order="deterministic")
+
+
+# ---------- Process pool ----------
+
+def init_pdf_renderer(workers: int = PDF_RENDER_WORKERS) -> None:
+    """Start the render pool; WeasyPrint layout runs there instead of on the event loop"""
+    global _pool, _render_slots
+    if _pool is not None:
+        return
+    # spawn: children must not inherit the event loop, Motor client or open sockets
+    _pool = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        max_tasks_per_child=PDF_RENDER_TASKS_PER_CHILD,
+    )
+    # Kept across pool restarts: renders still holding a slot release it into the same semaphore
+    if _render_slots is None:
+        _render_slots = asyncio.Semaphore(workers * PDF_RENDER_QUEUE_PER_WORKER)
+    logger.info(f"PDF render pool started ({workers} processes)")
+
+
+def close_pdf_renderer() -> None:
+    global _pool, _render_slots
+    if _pool:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+        _render_slots = None
+
+
+async def _restart_broken_pool(broken: ProcessPoolExecutor) -> ProcessPoolExecutor:
+    """Replace the pool a render failed on, unless another render already did; returns the pool to retry on"""
+    global _pool
+    async with _pool_restart_lock:
+        if _pool is broken:
+            logger.warning("PDF render pool broken, restarting")
+            broken.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+        if _pool is None:
+            init_pdf_renderer()
+        return _pool
+
+
+async def render_monthly_report_pdf(report_data: Dict[str, Any], campus_name: str) -> bytes:
+    """Render the monthly report PDF in the process pool (bounded by the render slots)"""
+    # Lazy import: WeasyPrint is only loaded once a report is actually rendered
+    from pdf_report import generate_monthly_report_pdf
+
+    if _pool is None:
+        init_pdf_renderer()
+    async with _render_slots:
+        loop = asyncio.get_running_loop()
+        pool = _pool
+        try:
+            return await loop.run_in_executor(pool, generate_monthly_report_pdf, report_data, campus_name)
+        except BrokenProcessPool:
+            # A render process died (e.g. OOM-killed); retry once on a fresh pool
+            pool = await _restart_broken_pool(pool)
+            return await loop.run_in_executor(pool, generate_monthly_report_pdf, report_data, campus_name)
+
+
+# ---------- Rendered report cache ----------
+
+def report_fingerprint(report_data: Dict[str, Any], campus_name: str) -> str:
+    """Hash of everything that ends up in the PDF except the generation timestamp"""
+    period = {k: v for k, v in report_data.get("report_period", {}).items() if k != "generated_at"}
+    data = {**report_data, "report_period": period, "campus_name": campus_name, "renderer": REPORT_RENDERER_VERSION}
+    return hashlib.sha256(_fingerprint_encoder.encode(data)).hexdigest()[:32]
+
+
+def monthly_report_key(report_data: Dict[str, Any], campus_key: str, campus_name: str) -> str:
+    period = report_data.get("report_period", {})
+    return (
+        f"monthly:{campus_key}:{period.get('year')}-{period.get('month'):02d}:"
+        f"{report_fingerprint(report_data, campus_name)}"
+    )
+
+
+def report_filename(report_data: Dict[str, Any]) -> str:
+    period = report_data.get("report_period", {})
+    return f"Pastoral_Care_Report_{period.get('month_name', 'Monthly')}_{period.get('year', datetime.now().year)}.pdf"
+
+
+def _is_closed_period(report_data: Dict[str, Any]) -> bool:
+    period = report_data.get("report_period", {})
+    today = datetime.now(JAKARTA_TZ)
+    return (period.get("year", today.year), period.get("month", today.month)) < (today.year, today.month)
+
+
+class ReportService:
+    """Renders report PDFs through the process pool, caching finished files in rendered_reports"""
+
+    def __init__(self, db):
+        self._db = db
+
+    async def monthly_report_pdf(
+        self, report_data: Dict[str, Any], campus_key: str, campus_name: str
+    ) -> Tuple[bytes, str, bool]:
+        """Returns (pdf bytes, filename, served from cache)"""
+        cache_key = monthly_report_key(report_data, campus_key, campus_name)
+        filename = report_filename(report_data)
+
+        cached = await self._load(cache_key)
+        if cached is not None:
+            return cached, filename, True
+
+        future = _inflight.get(cache_key)
+        if future is not None:
+            return await asyncio.shield(future), filename, True
+
+        future = _inflight[cache_key] = asyncio.get_running_loop().create_future()
+        try:
+            pdf_bytes = await render_monthly_report_pdf(report_data, campus_name)
+            await self._store(cache_key, pdf_bytes, filename, _is_closed_period(report_data))
+            future.set_result(pdf_bytes)
+            return pdf_bytes, filename, False
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters (if any) see the error; don't warn about it going unretrieved
+            future.exception()
+            raise
+        finally:
+            if not future.done():
+                future.cancel()
+            _inflight.pop(cache_key, None)
+
+    async def _load(self, cache_key: str) -> Optional[bytes]:
+        try:
+            doc = await self._db.rendered_reports.find_one(
+                {"_id": cache_key, "expires_at": {"$gt": datetime.now(timezone.utc)}}, {"pdf": 1}
+            )
+            return bytes(doc["pdf"]) if doc else None
+        except Exception as e:
+            logger.warning(f"Rendered report cache read failed: {e}")
+            return None
+
+    async def _store(self, cache_key: str, pdf_bytes: bytes, filename: str, closed: bool) -> None:
+        now = datetime.now(timezone.utc)
+        ttl = timedelta(days=REPORT_CACHE_TTL_DAYS) if closed else timedelta(hours=REPORT_CACHE_TTL_HOURS)
+        try:
+            await self._db.rendered_reports.replace_one(
+                {"_id": cache_key},
+                {"pdf": pdf_bytes, "filename": filename, "size": len(pdf_bytes), "created_at": now, "expires_at": now + ttl},
+                upsert=True,
+            )
+        except Exception as e:
+            logger.warning(f"Rendered report cache write failed: {e}")
+
+    # ---------- Export jobs ----------
+
+    async def create_job(self, campus_id: Optional[str], user_id: str, year: Optional[int], month: Optional[int]) -> Dict[str, Any]:
+        job = {
+            "id": generate_uuid(),
+            "kind": "monthly_pdf",
+            "campus_id": campus_id,
+            "created_by_user_id": user_id,
+            "year": year,
+            "month": month,
+            "status": "queued",
+            "filename": None,
+            "size": None,
+            "cached": None,
+            "error": None,
+            "created_at": datetime.now(timezone.utc),
+            "started_at": None,
+            "completed_at": None,
+        }
+        await self._db.report_jobs.insert_one(dict(job))
+        return job
+
+    async def get_job(self, job_id: str, user_id: str) -> Optional[Dict[str, Any]]:
+        return await self._db.report_jobs.find_one({"id": job_id, "created_by_user_id": user_id}, {"_id": 0})
+
+    async def get_job_pdf(self, job: Dict[str, Any]) -> Optional[bytes]:
+        return await self._load(job["cache_key"]) if job.get("cache_key") else None
+
+    def start(
+        self,
+        job: Dict[str, Any],
+        compute: Callable[[], Awaitable[Dict[str, Any]]],
+        campus_key: str,
+        campus_name: str,
+    ) -> None:
+        """Compute and render in the background; status is persisted on the job document"""
+        task = asyncio.create_task(self.run(job, compute, campus_key, campus_name))
+        _running_jobs.add(task)
+        task.add_done_callback(_running_jobs.discard)
+
+    async def run(
+        self,
+        job: Dict[str, Any],
+        compute: Callable[[], Awaitable[Dict[str, Any]]],
+        campus_key: str,
+        campus_name: str,
+    ) -> None:
+        job_id = job["id"]
+        await self._db.report_jobs.update_one(
+            {"id": job_id}, {"$set": {"status": "running", "started_at": datetime.now(timezone.utc)}}
+        )
+        update: Dict[str, Any] = {}
+        try:
+            report_data = await compute()
+            pdf_bytes, filename, cached = await self.monthly_report_pdf(report_data, campus_key, campus_name)
+            update.update({
+                "status": "completed",
+                "filename": filename,
+                "size": len(pdf_bytes),
+                "cached": cached,
+                "cache_key": monthly_report_key(report_data, campus_key, campus_name),
+            })
+        except Exception as e:
+            logger.error(f"Report job {job_id} failed: {str(e)}")
+            update.update({"status": "failed", "error": str(e)})
+        update["completed_at"] = datetime.now(timezone.utc)
+        await self._db.report_jobs.update_one({"id": job_id}, {"$set": update})
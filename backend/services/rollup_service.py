@@ -0,0 +1,424 @@
+import logging
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from zoneinfo import ZoneInfo
+
+from pymongo import DeleteMany, ReplaceOne, UpdateOne
+
+from constants import ROLLUP_RECONCILE_DAYS, ROLLUP_WRITE_BATCH_SIZE
+
+logger = logging.getLogger(__name__)
+
+JAKARTA_TZ = ZoneInfo("Asia/Jakarta")
+
+KIND_EVENTS = "events"
+KIND_ACTIVITY = "activity"
+
+# Activity actions the reports break out per staff member
+ACTION_COMPLETE = "complete_task"
+
+# Per (campus, event_date, event_type): care event counts by status and aid total
+_EVENT_GROUP = {
+    "total": {"$sum": 1},
+    "completed": {"$sum": {"$cond": [{"$eq": ["$completed", True]}, 1, 0]}},
+    "ignored": {"$sum": {"$cond": [{"$eq": ["$ignored", True]}, 1, 0]}},
+    # Ignored and not completed (the by-type breakdown counts completed first)
+    "ignored_open": {"$sum": {"$cond": [
+        {"$and": [{"$ne": [{"$ifNull": ["$completed", False]}, True]}, {"$eq": ["$ignored", True]}]}, 1, 0
+    ]}},
+    "aid_amount": {"$sum": {"$ifNull": ["$aid_amount", 0]}},
+}
+
+
+def _date_str(value: Any) -> Optional[str]:
+    if isinstance(value, (date, datetime)):
+        return value.strftime("%Y-%m-%d")
+    if isinstance(value, str) and len(value) >= 10:
+        return value[:10]
+    return None
+
+
+def _day_start(day: date) -> datetime:
+    return datetime(day.year, day.month, day.day, tzinfo=JAKARTA_TZ)
+
+
+# Jakarta calendar day of an activity log's created_at, inside an aggregation
+_JAKARTA_DAY = {"$dateToString": {"format": "%Y-%m-%d", "date": {"$toDate": "$created_at"}, "timezone": "Asia/Jakarta"}}
+
+
+def activity_day(created_at: Any) -> Optional[str]:
+    """Jakarta calendar day of an activity timestamp (naive datetimes are UTC, as Mongo returns them)"""
+    if isinstance(created_at, str):
+        try:
+            created_at = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if not isinstance(created_at, datetime):
+        return None
+    if created_at.tzinfo is None:
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return created_at.astimezone(JAKARTA_TZ).strftime("%Y-%m-%d")
+
+
+def _key_part(value: Any) -> str:
+    # Rollup field names: Mongo keys must not contain "." or start with "$"
+    return str(value or "other").replace(".", "_").lstrip("$")
+
+
+def _event_doc(campus_id: str, day: str, event_type: str, counts: Dict[str, Any], now: datetime) -> Dict[str, Any]:
+    return {
+        "kind": KIND_EVENTS,
+        "campus_id": campus_id,
+        "date": day,
+        "month": day[:7],
+        "event_type": event_type,
+        "total": counts["total"],
+        "completed": counts["completed"],
+        "ignored": counts["ignored"],
+        "ignored_open": counts["ignored_open"],
+        "pending": counts["total"] - counts["completed"] - counts["ignored_open"],
+        "aid_amount": counts["aid_amount"],
+        "computed_at": now,
+    }
+
+
+def summarize_events(rollups: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Fold event rollups into totals plus a per-type breakdown"""
+    fields = ("total", "completed", "ignored", "ignored_open", "pending", "aid_amount")
+    summary: Dict[str, Any] = {f: 0 for f in fields}
+    by_type: Dict[str, Dict[str, Any]] = {}
+    for doc in rollups:
+        type_summary = by_type.setdefault(doc["event_type"], {f: 0 for f in fields})
+        for f in fields:
+            summary[f] += doc.get(f, 0) or 0
+            type_summary[f] += doc.get(f, 0) or 0
+    summary["by_type"] = by_type
+    return summary
+
+
+def summarize_staff(rollups: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Fold activity rollups into one entry per user (counts, per-day totals, distinct members contacted)"""
+    staff: Dict[str, Dict[str, Any]] = {}
+    for doc in sorted(rollups, key=lambda d: d["date"]):
+        entry = staff.setdefault(doc["user_id"], {
+            "user_id": doc["user_id"],
+            "user_name": doc.get("user_name") or "Unknown",
+            "user_photo_url": doc.get("user_photo_url"),
+            "total_actions": 0,
+            "actions": defaultdict(int),
+            "completed_by_type": defaultdict(int),
+            "members_contacted": set(),
+            "daily_activity": {},
+        })
+        # Latest name wins, as the reports previously took it from the activity entries
+        entry["user_name"] = doc.get("user_name") or entry["user_name"]
+        entry["user_photo_url"] = doc.get("user_photo_url") or entry["user_photo_url"]
+        entry["total_actions"] += doc.get("total", 0)
+        for action, n in (doc.get("actions") or {}).items():
+            entry["actions"][action] += n
+        for event_type, n in (doc.get("completed_by_type") or {}).items():
+            entry["completed_by_type"][event_type] += n
+        entry["members_contacted"].update(doc.get("members_contacted") or [])
+        entry["daily_activity"][doc["date"]] = entry["daily_activity"].get(doc["date"], 0) + doc.get("total", 0)
+    return staff
+
+
+class RollupService:
+    """
+    Daily pre-aggregates behind the monthly, yearly and staff reports (daily_rollups).
+
+    Event rollups (per campus, event_date, event_type) are recomputed for days that
+    writes mark dirty: report reads refresh dirty days in their range first, and a
+    scheduler job drains the rest. Activity rollups (per campus, Jakarta day, staff member)
+    are incremented as activity log batches are written; deleting logs marks their days
+    dirty the same way.
+    """
+
+    def __init__(self, db):
+        self._db = db
+
+    # ---------- Care event rollups ----------
+
+    async def mark_care_events(self, events: Iterable[Optional[Dict[str, Any]]]) -> None:
+        """Mark the (campus, event_date) days of these care events for recomputation"""
+        days: Set[Tuple[str, str]] = set()
+        for event in events:
+            if event and event.get("campus_id") and (day := _date_str(event.get("event_date"))):
+                days.add((event["campus_id"], day))
+        await self._mark_days(KIND_EVENTS, days)
+
+    async def mark_care_event_query(self, query: Dict[str, Any]) -> None:
+        """Mark the days of every care event matching query (call before deleting them)"""
+        try:
+            groups = await self._db.care_events.aggregate([
+                {"$match": query},
+                {"$group": {"_id": {"campus_id": "$campus_id", "date": "$event_date"}}},
+            ]).to_list(None)
+        except Exception as e:
+            logger.warning(f"Could not mark rollup days for care event query: {e}")
+            return
+        await self.mark_care_events({"campus_id": g["_id"].get("campus_id"), "event_date": g["_id"].get("date")} for g in groups)
+
+    async def mark_activity_query(self, query: Dict[str, Any]) -> None:
+        """Mark the (campus, day) of every activity log matching query (call before deleting them)"""
+        try:
+            groups = await self._db.activity_logs.aggregate([
+                {"$match": query},
+                {"$group": {"_id": {"campus_id": "$campus_id", "date": _JAKARTA_DAY}}},
+            ]).to_list(None)
+        except Exception as e:
+            logger.warning(f"Could not mark rollup days for activity query: {e}")
+            return
+        await self._mark_days(KIND_ACTIVITY, {(g["_id"].get("campus_id"), g["_id"]["date"]) for g in groups if g["_id"].get("date")})
+
+    async def _mark_days(self, kind: str, days: Set[Tuple[Optional[str], str]]) -> None:
+        if not days:
+            return
+        now = datetime.now(timezone.utc)
+        try:
+            await self._db.rollup_dirty.bulk_write([
+                UpdateOne(
+                    {"_id": f"{kind}:{campus_id}:{day}"},
+                    {"$set": {"kind": kind, "campus_id": campus_id, "date": day, "marked_at": now}},
+                    upsert=True,
+                )
+                for campus_id, day in days
+            ], ordered=False)
+        except Exception as e:
+            # Best effort: the nightly reconciliation recomputes recent days anyway
+            logger.warning(f"Could not mark {len(days)} rollup days dirty: {e}")
+
+    async def refresh_dirty(
+        self,
+        campus_filter: Optional[Dict[str, Any]] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        kind: Optional[str] = None,
+    ) -> int:
+        """Recompute rollups for dirty days (optionally one kind, in [start, end)); returns days refreshed"""
+        query: Dict[str, Any] = dict(campus_filter or {})
+        if kind:
+            query["kind"] = kind
+        if start or end:
+            query["date"] = {k: v for k, v in (("$gte", start), ("$lt", end)) if v}
+        started = datetime.now(timezone.utc)
+        marks = await self._db.rollup_dirty.find(query, {"_id": 1, "kind": 1, "campus_id": 1, "date": 1}).to_list(None)
+        if not marks:
+            return 0
+
+        by_campus: Dict[Tuple[str, Optional[str]], List[str]] = defaultdict(list)
+        for mark in marks:
+            by_campus[(mark.get("kind", KIND_EVENTS), mark["campus_id"])].append(mark["date"])
+        for (mark_kind, campus_id), days in by_campus.items():
+            if mark_kind == KIND_ACTIVITY:
+                await self._recompute_activity(campus_id, days)
+            else:
+                await self._recompute_events({"campus_id": campus_id, "event_date": {"$in": days}}, campus_id, days)
+
+        # Marks set while we were recomputing stay for the next refresh
+        await self._db.rollup_dirty.delete_many({
+            "_id": {"$in": [mark["_id"] for mark in marks]}, "marked_at": {"$lte": started}
+        })
+        return len(marks)
+
+    async def reconcile_recent(self, days: int = ROLLUP_RECONCILE_DAYS) -> Dict[str, int]:
+        """Recompute the trailing days for every campus (catches writes no hook marked)"""
+        today = datetime.now(JAKARTA_TZ).date()
+        start, end = today - timedelta(days=days), today + timedelta(days=1)
+        date_range = (start.isoformat(), end.isoformat())
+        events = await self._recompute_events({"event_date": {"$gte": date_range[0], "$lt": date_range[1]}}, date_range=date_range)
+        activity = await self.rebuild_activity(
+            {"created_at": {"$gte": _day_start(start), "$lt": _day_start(end)}}, date_range=date_range
+        )
+        return {"events": events, "activity": activity}
+
+    async def _recompute_events(
+        self,
+        match: Dict[str, Any],
+        campus_id: Optional[str] = None,
+        days: Optional[List[str]] = None,
+        date_range: Optional[Tuple[str, str]] = None,
+    ) -> int:
+        now = datetime.now(timezone.utc)
+        groups = await self._db.care_events.aggregate([
+            {"$match": {**match, "campus_id": match.get("campus_id", {"$ne": None})}},
+            {"$group": {
+                "_id": {
+                    "campus_id": "$campus_id",
+                    "date": "$event_date",
+                    "event_type": {"$ifNull": ["$event_type", "unknown"]},
+                },
+                **_EVENT_GROUP,
+            }},
+        ]).to_list(None)
+
+        ops: List[Any] = []
+        for g in groups:
+            key = g["_id"]
+            day = _date_str(key.get("date"))
+            if not day:
+                continue
+            doc = _event_doc(key["campus_id"], day, key["event_type"], g, now)
+            ops.append(ReplaceOne({"_id": f"{KIND_EVENTS}:{key['campus_id']}:{day}:{key['event_type']}"}, doc, upsert=True))
+
+        # Types (or whole days) that no longer have events: drop their stale rollups
+        stale: Dict[str, Any] = {"kind": KIND_EVENTS, "computed_at": {"$lt": now}}
+        if campus_id:
+            stale["campus_id"] = campus_id
+        if days is not None:
+            stale["date"] = {"$in": days}
+        elif date_range:
+            stale["date"] = {"$gte": date_range[0], "$lt": date_range[1]}
+        ops.append(DeleteMany(stale))
+
+        for i in range(0, len(ops), ROLLUP_WRITE_BATCH_SIZE):
+            await self._db.daily_rollups.bulk_write(ops[i:i + ROLLUP_WRITE_BATCH_SIZE], ordered=True)
+        return len(groups)
+
+    async def _read(self, kind: str, campus_filter: Dict[str, Any], start: str, end: str) -> List[Dict[str, Any]]:
+        try:
+            await self.refresh_dirty(campus_filter, start, end, kind)
+        except Exception as e:
+            logger.warning(f"Rollup refresh failed, reading possibly stale rollups: {e}")
+        return await self._db.daily_rollups.find(
+            {"kind": kind, **campus_filter, "date": {"$gte": start, "$lt": end}}, {"_id": 0}
+        ).to_list(None)
+
+    async def event_rollups(self, campus_filter: Dict[str, Any], start: str, end: str) -> List[Dict[str, Any]]:
+        """Event rollups for days in [start, end), refreshing dirty days in that range first"""
+        return await self._read(KIND_EVENTS, campus_filter, start, end)
+
+    # ---------- Activity rollups ----------
+
+    async def apply_activities(self, docs: Iterable[Dict[str, Any]]) -> None:
+        """Add newly written activity log entries to their (campus, day, user) rollups"""
+        updates: Dict[str, Dict[str, Any]] = {}
+        for doc in docs:
+            day = activity_day(doc.get("created_at"))
+            if not day:
+                continue
+            campus_id = doc.get("campus_id")
+            user_id = doc.get("user_id")
+            key = f"{KIND_ACTIVITY}:{campus_id}:{day}:{user_id}"
+            entry = updates.setdefault(key, {
+                "inc": defaultdict(int), "members": set(),
+                "set": {}, "insert": {
+                    "kind": KIND_ACTIVITY, "campus_id": campus_id, "date": day, "month": day[:7], "user_id": user_id,
+                    "computed_at": datetime.now(timezone.utc),
+                },
+            })
+            action = _key_part((doc.get("action_type") or "").lower())
+            entry["inc"]["total"] += 1
+            entry["inc"][f"actions.{action}"] += 1
+            if action == ACTION_COMPLETE:
+                entry["inc"][f"completed_by_type.{_key_part(doc.get('event_type'))}"] += 1
+                if doc.get("member_id"):
+                    entry["members"].add(doc["member_id"])
+            if doc.get("user_name"):
+                entry["set"]["user_name"] = doc["user_name"]
+            if doc.get("user_photo_url"):
+                entry["set"]["user_photo_url"] = doc["user_photo_url"]
+        if not updates:
+            return
+
+        ops = []
+        for key, entry in updates.items():
+            update: Dict[str, Any] = {"$inc": dict(entry["inc"]), "$setOnInsert": entry["insert"]}
+            if entry["set"]:
+                update["$set"] = entry["set"]
+            if entry["members"]:
+                update["$addToSet"] = {"members_contacted": {"$each": sorted(entry["members"])}}
+            ops.append(UpdateOne({"_id": key}, update, upsert=True))
+        try:
+            await self._db.daily_rollups.bulk_write(ops, ordered=False)
+        except Exception as e:
+            logger.warning(f"Activity rollup update failed for {len(ops)} entries: {e}")
+
+    async def _recompute_activity(self, campus_id: Optional[str], days: List[str]) -> int:
+        ordered = sorted(days)
+        first, last = date.fromisoformat(ordered[0]), date.fromisoformat(ordered[-1])
+        return await self.rebuild_activity(
+            {"campus_id": campus_id, "created_at": {"$gte": _day_start(first), "$lt": _day_start(last + timedelta(days=1))}},
+            campus_id=campus_id,
+            days=ordered,
+        )
+
+    async def rebuild_activity(
+        self,
+        match: Optional[Dict[str, Any]] = None,
+        campus_id: Optional[str] = None,
+        days: Optional[List[str]] = None,
+        date_range: Optional[Tuple[str, str]] = None,
+    ) -> int:
+        """
+        Recompute activity rollups from the activity_logs matching match; returns documents written.
+
+        With days or date_range (or no match at all), rollups in that span that no log
+        produced any more are removed.
+        """
+        now = datetime.now(timezone.utc)
+        groups = await self._db.activity_logs.aggregate([
+            {"$match": {**(match or {}), "created_at": (match or {}).get("created_at", {"$ne": None})}},
+            {"$group": {
+                "_id": {
+                    "campus_id": "$campus_id",
+                    "date": _JAKARTA_DAY,
+                    "user_id": "$user_id",
+                    "action": {"$toLower": {"$ifNull": ["$action_type", ""]}},
+                    "event_type": "$event_type",
+                },
+                "n": {"$sum": 1},
+                "members": {"$addToSet": "$member_id"},
+                "user_name": {"$last": "$user_name"},
+                "user_photo_url": {"$last": "$user_photo_url"},
+            }},
+        ]).to_list(None)
+
+        docs: Dict[str, Dict[str, Any]] = {}
+        for g in groups:
+            key = g["_id"]
+            if not key.get("date") or (days is not None and key["date"] not in days):
+                continue
+            _id = f"{KIND_ACTIVITY}:{key.get('campus_id')}:{key['date']}:{key.get('user_id')}"
+            doc = docs.setdefault(_id, {
+                "kind": KIND_ACTIVITY, "campus_id": key.get("campus_id"), "date": key["date"],
+                "month": key["date"][:7], "user_id": key.get("user_id"), "total": 0,
+                "actions": {}, "completed_by_type": {}, "members_contacted": set(), "computed_at": now,
+            })
+            action = _key_part(key["action"])
+            doc["total"] += g["n"]
+            doc["actions"][action] = doc["actions"].get(action, 0) + g["n"]
+            if action == ACTION_COMPLETE:
+                event_type = _key_part(key.get("event_type"))
+                doc["completed_by_type"][event_type] = doc["completed_by_type"].get(event_type, 0) + g["n"]
+                doc["members_contacted"].update(m for m in g["members"] if m)
+            for field in ("user_name", "user_photo_url"):
+                if g.get(field):
+                    doc[field] = g[field]
+
+        ops: List[Any] = [
+            ReplaceOne({"_id": _id}, {**doc, "members_contacted": sorted(doc["members_contacted"])}, upsert=True)
+            for _id, doc in docs.items()
+        ]
+        if days is not None or date_range or not match:
+            # Full rebuilds (no match) replace every activity rollup
+            stale: Dict[str, Any] = {"kind": KIND_ACTIVITY, "computed_at": {"$lt": now}}
+            if days is not None:
+                stale.update({"campus_id": campus_id, "date": {"$in": days}})
+            elif date_range:
+                stale["date"] = {"$gte": date_range[0], "$lt": date_range[1]}
+            ops.append(DeleteMany(stale))
+        for i in range(0, len(ops), ROLLUP_WRITE_BATCH_SIZE):
+            await self._db.daily_rollups.bulk_write(ops[i:i + ROLLUP_WRITE_BATCH_SIZE], ordered=True)
+        return len(docs)
+
+    async def activity_rollups(self, campus_filter: Dict[str, Any], start: str, end: str) -> List[Dict[str, Any]]:
+        """Activity rollups for days in [start, end), refreshing days whose logs were deleted first"""
+        return await self._read(KIND_ACTIVITY, campus_filter, start, end)
+
+    async def rebuild(self) -> Dict[str, int]:
+        """Backfill every rollup from care_events and activity_logs"""
+        events = await self._recompute_events({})
+        activity = await self.rebuild_activity()
+        return {"events": events, "activity": activity}
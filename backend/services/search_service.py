@@ -0,0 +1,356 @@
+import logging
+import math
+import re
+import unicodedata
+from difflib import SequenceMatcher
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pymongo import DeleteMany, ReplaceOne
+
+from constants import (
+    SEARCH_MAX_PREFIX, SEARCH_DESCRIPTION_TOKENS, SEARCH_CANDIDATE_LIMIT, SEARCH_FUZZY_CANDIDATES,
+    SEARCH_FUZZY_MIN_OVERLAP, SEARCH_MIN_SCORE, SEARCH_INDEX_BATCH_SIZE,
+)
+
+logger = logging.getLogger(__name__)
+
+ENTITY_MEMBER = "member"
+ENTITY_CARE_EVENT = "care_event"
+
+_WATERMARK_ID = "meta:watermark"
+
+# Old (pre-1972 EYD) and Arabic-derived spellings that name the same person: Soekarno/Sukarno,
+# Djoko/Joko, Tjahjo/Cahyo, Chairul/Khairul, Ramadhan/Ramadan, Fathur/Fatur.
+# Doubled letters are collapsed afterwards (Mohammad/Mohamad).
+_SPELLING_VARIANTS = (
+    ("oe", "u"), ("dj", "j"), ("tj", "c"), ("sj", "sy"), ("nj", "ny"),
+    ("ch", "kh"), ("ph", "f"), ("dh", "d"), ("th", "t"),
+)
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_REPEATED = re.compile(r"(.)\1+")
+
+
+def _fold(text: str) -> str:
+    """Lowercase and strip accents so "José" and "jose" index identically"""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def canonical_token(token: str) -> str:
+    for old, new in _SPELLING_VARIANTS:
+        token = token.replace(old, new)
+    return _REPEATED.sub(r"\1", token)
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Canonical word tokens of free text, in order (digits-only tokens are kept as-is)"""
+    tokens = []
+    for raw in _NON_ALNUM.split(_fold(text or "")):
+        if raw:
+            tokens.append(raw if raw.isdigit() else canonical_token(raw))
+    return tokens
+
+
+def phone_digits(phone: Optional[str]) -> str:
+    """National significant number: +62 812-3456, 0812 3456 and 628123456 all become 8123456"""
+    digits = re.sub(r"\D", "", phone or "")
+    if digits.startswith("62"):
+        return digits[2:]
+    if digits.startswith("0"):
+        return digits[1:]
+    return digits
+
+
+def trigrams(token: str) -> List[str]:
+    padded = f"^{token}$"
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def similarity(a: str, b: str) -> float:
+    """
+    Edit similarity of two canonical tokens (0..1).
+
+    Trigrams only select candidates; they under-rate short names that differ by one
+    vowel (muhamad/mohamad share 4 of 10 trigrams but are 86% similar).
+    """
+    return SequenceMatcher(None, a, b).ratio()
+
+
+def _phone_keys(digits: str) -> set:
+    if len(digits) < 3:
+        return set()
+    keys = {f"n:{digits[:3]}"}
+    keys.update(f"d:{digits[i:i + 4]}" for i in range(len(digits) - 3))
+    return keys
+
+
+def _token_keys(tokens: Iterable[str]) -> set:
+    keys = set()
+    for token in tokens:
+        keys.add(f"w:{token}")
+        if token.isdigit():
+            # Numbers in titles ("Visit 2", "2024") match like phone numbers
+            keys.update(_phone_keys(token))
+            continue
+        keys.update(f"p:{token[:k]}" for k in range(1, min(len(token), SEARCH_MAX_PREFIX) + 1))
+        keys.update(f"t:{g}" for g in trigrams(token))
+    return keys
+
+
+def build_member_entry(member: Dict[str, Any]) -> Dict[str, Any]:
+    tokens = tokenize(member.get("name"))
+    digits = phone_digits(member.get("phone"))
+    return {
+        "_id": f"{ENTITY_MEMBER}:{member['id']}",
+        "entity": ENTITY_MEMBER,
+        "entity_id": member["id"],
+        "campus_id": member.get("campus_id"),
+        "tokens": tokens,
+        "phone": digits,
+        "keys": sorted(_token_keys(tokens) | _phone_keys(digits)),
+        "updated_at": datetime.now(timezone.utc),
+    }
+
+
+def build_care_event_entry(event: Dict[str, Any]) -> Dict[str, Any]:
+    tokens = tokenize(event.get("title")) + tokenize(event.get("description"))[:SEARCH_DESCRIPTION_TOKENS]
+    return {
+        "_id": f"{ENTITY_CARE_EVENT}:{event['id']}",
+        "entity": ENTITY_CARE_EVENT,
+        "entity_id": event["id"],
+        "campus_id": event.get("campus_id"),
+        "member_id": event.get("member_id"),
+        "tokens": tokens,
+        "phone": "",
+        "keys": sorted(_token_keys(tokens)),
+        "updated_at": datetime.now(timezone.utc),
+    }
+
+
+def _digit_query_keys(digits: str) -> List[str]:
+    if len(digits) >= 4:
+        return [f"d:{digits[i:i + 4]}" for i in range(len(digits) - 3)]
+    return [f"n:{digits}" if len(digits) == 3 else f"w:{digits}"]
+
+
+def score_entry(query_tokens: List[str], query_digits: List[str], entry: Dict[str, Any]) -> float:
+    """
+    Rank an index entry against a query: exact word 1.0, word prefix 0.8-1.0,
+    otherwise edit similarity (scaled to at most 0.7). Every query token must match something.
+    """
+    doc_tokens = entry.get("tokens") or []
+    phone = entry.get("phone") or ""
+    scores = []
+    for qt in query_tokens:
+        best = 0.0
+        for i, dt in enumerate(doc_tokens):
+            if dt == qt:
+                s = 1.0
+            elif dt.startswith(qt):
+                s = 0.8 + 0.2 * len(qt) / len(dt)
+            else:
+                s = 0.7 * similarity(qt, dt)
+            if i == 0:
+                s += 0.05  # Matching the first name ranks above a match deeper in the text
+            best = max(best, s)
+        if best < SEARCH_MIN_SCORE:
+            return 0.0
+        scores.append(best)
+    if query_digits:
+        # query_digits are alternative forms of one number (as typed / without the 0 or 62 prefix)
+        if any(phone.startswith(d) for d in query_digits):
+            scores.append(1.0)
+        elif any(d in phone or d in doc_tokens for d in query_digits):
+            scores.append(0.8)
+        else:
+            return 0.0
+    return sum(scores) / len(scores) if scores else 0.0
+
+
+class SearchService:
+    """
+    Token/trigram search index over members and care events.
+
+    Entries live in the search_index collection and are derived data: write paths keep them
+    current, refresh() catches up on anything changed since the last run, and rebuild()
+    recreates them from scratch. A failed index write is logged, never raised.
+    """
+
+    def __init__(self, db):
+        self._db = db
+        self._index = db.search_index
+
+    # ---------------------------------------------------------------- indexing
+
+    async def _write(self, ops: list) -> None:
+        for start in range(0, len(ops), SEARCH_INDEX_BATCH_SIZE):
+            await self._index.bulk_write(ops[start:start + SEARCH_INDEX_BATCH_SIZE], ordered=False)
+
+    async def index_members(self, members: Iterable[Dict[str, Any]]) -> int:
+        ops = [ReplaceOne({"_id": e["_id"]}, e, upsert=True) for e in map(build_member_entry, members)]
+        try:
+            await self._write(ops)
+        except Exception as e:
+            logger.warning(f"Search index update for {len(ops)} member(s) failed: {str(e)}")
+            return 0
+        return len(ops)
+
+    async def index_care_events(self, events: Iterable[Dict[str, Any]]) -> int:
+        ops = [ReplaceOne({"_id": e["_id"]}, e, upsert=True) for e in map(build_care_event_entry, events)]
+        try:
+            await self._write(ops)
+        except Exception as e:
+            logger.warning(f"Search index update for {len(ops)} care event(s) failed: {str(e)}")
+            return 0
+        return len(ops)
+
+    async def index_member_ids(self, member_ids: List[str]) -> int:
+        members = await self._db.members.find(
+            {"id": {"$in": member_ids}}, {"_id": 0, "id": 1, "name": 1, "phone": 1, "campus_id": 1}
+        ).to_list(None)
+        return await self.index_members(members)
+
+    async def index_care_event_ids(self, event_ids: List[str]) -> int:
+        events = await self._db.care_events.find(
+            {"id": {"$in": event_ids}}, {"_id": 0, "id": 1, "title": 1, "description": 1, "campus_id": 1, "member_id": 1}
+        ).to_list(None)
+        return await self.index_care_events(events)
+
+    async def remove(self, entity: str, entity_ids: List[str]) -> None:
+        try:
+            await self._index.delete_many({"_id": {"$in": [f"{entity}:{i}" for i in entity_ids]}})
+        except Exception as e:
+            logger.warning(f"Search index removal failed: {str(e)}")
+
+    async def remove_member(self, member_id: str) -> None:
+        """Drop a deleted member and its (cascade-deleted) care events"""
+        try:
+            await self._index.bulk_write([
+                DeleteMany({"_id": f"{ENTITY_MEMBER}:{member_id}"}),
+                DeleteMany({"entity": ENTITY_CARE_EVENT, "member_id": member_id}),
+            ], ordered=False)
+        except Exception as e:
+            logger.warning(f"Search index removal for member {member_id} failed: {str(e)}")
+
+    async def index_changed_since(self, since: Optional[datetime], campus_id: Optional[str] = None) -> Dict[str, int]:
+        """(Re)index members and care events with updated_at >= since (everything when since is None)"""
+        query: Dict[str, Any] = {}
+        if since is not None:
+            query["updated_at"] = {"$gte": since}
+        if campus_id:
+            query["campus_id"] = campus_id
+        counts = {}
+        for name, collection, projection, index in (
+            ("members", self._db.members, {"_id": 0, "id": 1, "name": 1, "phone": 1, "campus_id": 1}, self.index_members),
+            ("care_events", self._db.care_events,
+             {"_id": 0, "id": 1, "title": 1, "description": 1, "campus_id": 1, "member_id": 1}, self.index_care_events),
+        ):
+            counts[name] = 0
+            batch = []
+            async for doc in collection.find(query, projection).batch_size(SEARCH_INDEX_BATCH_SIZE):
+                batch.append(doc)
+                if len(batch) >= SEARCH_INDEX_BATCH_SIZE:
+                    counts[name] += await index(batch)
+                    batch = []
+            if batch:
+                counts[name] += await index(batch)
+        return counts
+
+    async def refresh(self) -> Dict[str, int]:
+        """Catch up on writes that bypassed the request hooks (automation, scripts, syncs)"""
+        started = datetime.now(timezone.utc)
+        meta = await self._index.find_one({"_id": _WATERMARK_ID})
+        counts = await self.index_changed_since(meta.get("since") if meta else None)
+        await self._index.update_one(
+            {"_id": _WATERMARK_ID}, {"$set": {"entity": "meta", "since": started}}, upsert=True
+        )
+        return counts
+
+    async def rebuild(self, campus_id: Optional[str] = None) -> Dict[str, int]:
+        """Reindex everything, then drop entries for documents that no longer exist"""
+        started = datetime.now(timezone.utc)
+        counts = await self.index_changed_since(None, campus_id)
+        stale = {"entity": {"$in": [ENTITY_MEMBER, ENTITY_CARE_EVENT]}, "updated_at": {"$lt": started}}
+        if campus_id:
+            stale["campus_id"] = campus_id
+        counts["removed"] = (await self._index.delete_many(stale)).deleted_count
+        return counts
+
+    # ---------------------------------------------------------------- querying
+
+    async def search(
+        self,
+        entity: str,
+        q: str,
+        campus_id: Optional[str] = None,
+        limit: int = 10,
+    ) -> List[Tuple[str, float]]:
+        """Ranked (entity_id, score) pairs, best first"""
+        ranked, _ = await self._rank(entity, q, campus_id, limit)
+        return ranked
+
+    async def _rank(
+        self, entity: str, q: str, campus_id: Optional[str], limit: int,
+    ) -> Tuple[List[Tuple[str, float]], bool]:
+        """Ranked (entity_id, score) pairs and whether matches were cut off by a cap"""
+        tokens = tokenize(q)
+        words = [t for t in tokens if not t.isdigit()]
+        # Digits typed in groups ("0812 3456") are one number; match it as typed and without the 0/62 prefix
+        number = "".join(t for t in tokens if t.isdigit())
+        digits = list(dict.fromkeys(d for d in (number, phone_digits(number)) if d))
+        if not words and not digits:
+            return [], False
+
+        base: Dict[str, Any] = {"entity": entity}
+        if campus_id:
+            base["campus_id"] = campus_id
+        projection = {"_id": 0, "entity_id": 1, "tokens": 1, "phone": 1}
+
+        # Prefix pass: each query word must prefix an indexed word; numbers hit phone/number n-grams
+        word_keys = [f"p:{w[:SEARCH_MAX_PREFIX]}" for w in words]
+        key_sets = [list(dict.fromkeys(word_keys + _digit_query_keys(d))) for d in digits] or [word_keys]
+        prefix_query = {**base, "$or": [{"keys": {"$all": keys}} for keys in key_sets]}
+        # Sorted so a capped pass always keeps the same candidates; one extra shows the cap was hit
+        candidates = await self._index.find(prefix_query, projection).sort("entity_id", 1).limit(
+            SEARCH_CANDIDATE_LIMIT + 1
+        ).to_list(SEARCH_CANDIDATE_LIMIT + 1)
+        truncated = len(candidates) > SEARCH_CANDIDATE_LIMIT
+        del candidates[SEARCH_CANDIDATE_LIMIT:]
+
+        # Fuzzy pass for typos and spelling variants the canonical form does not cover
+        fuzzy_grams = list(dict.fromkeys(f"t:{g}" for w in words if len(w) >= 3 for g in trigrams(w)))
+        if len(candidates) < limit and fuzzy_grams:
+            min_overlap = max(1, math.ceil(len(fuzzy_grams) * SEARCH_FUZZY_MIN_OVERLAP))
+            candidates += await self._index.aggregate([
+                {"$match": {**base, "keys": {"$in": fuzzy_grams}}},
+                {"$project": {**projection, "overlap": {"$size": {"$setIntersection": ["$keys", fuzzy_grams]}}}},
+                {"$match": {"overlap": {"$gte": min_overlap}}},
+                {"$sort": {"overlap": -1}},
+                {"$limit": SEARCH_FUZZY_CANDIDATES},
+            ]).to_list(SEARCH_FUZZY_CANDIDATES)
+
+        scored: Dict[str, float] = {}
+        for entry in candidates:
+            score = score_entry(words, digits, entry)
+            if score > 0:
+                scored[entry["entity_id"]] = max(score, scored.get(entry["entity_id"], 0.0))
+        ranked = sorted(scored.items(), key=lambda kv: (-kv[1], kv[0]))
+        return ranked[:limit], truncated or len(ranked) > limit
+
+    async def search_members(self, q: str, campus_id: Optional[str] = None, limit: int = 10) -> List[str]:
+        return [entity_id for entity_id, _ in await self.search(ENTITY_MEMBER, q, campus_id, limit)]
+
+    async def match_members(
+        self, q: str, campus_id: Optional[str] = None, limit: int = SEARCH_CANDIDATE_LIMIT,
+    ) -> Tuple[List[str], bool]:
+        """
+        Member IDs matching q for filtering a list, and whether more members matched than returned.
+
+        A truncated result still filters correctly, but a count of it is a lower bound.
+        """
+        ranked, truncated = await self._rank(ENTITY_MEMBER, q, campus_id, limit)
+        return [entity_id for entity_id, _ in ranked], truncated
+
+    async def search_care_events(self, q: str, campus_id: Optional[str] = None, limit: int = 10) -> List[str]:
+        return [entity_id for entity_id, _ in await self.search(ENTITY_CARE_EVENT, q, campus_id, limit)]
@@ -6,15 +6,26 @@ Provides:
 - Authentication fixtures (tokens, users)
 - Test data factories
 - Async test support
+- Query budgets (fail tests that issue too many Mongo commands or N+1 patterns)
+- In-memory collection fakes (FakeDB, FakeCollection) for unit tests
 """
 
 import pytest
 import asyncio
+import copy
 import os
+import sys
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from motor.motor_asyncio import AsyncIOMotorClient
 import uuid
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from constants import QUERY_PROFILER_REPEAT_THRESHOLD
+from services.query_profiler import profile_queries, query_profiler
+from services import cache as cache_module
 
 # Test database configuration
 TEST_DB_NAME = 'faithtracker_test'
@@ -32,7 +43,7 @@ def event_loop():
 @pytest.fixture(scope="session")
 async def test_db_client():
     """MongoDB client for tests"""
-    client = AsyncIOMotorClient(MONGO_URL)
+    client = AsyncIOMotorClient(MONGO_URL, event_listeners=[query_profiler])
     yield client
     client.close()
 
@@ -42,10 +53,11 @@ async def test_db(test_db_client):
     """Clean test database for each test"""
     db = test_db_client[TEST_DB_NAME]
 
-    # Clean all collections before test
+    # Clean all collections before test, and anything the in-process cache tier kept from them
     collections = await db.list_collection_names()
     for collection in collections:
         await db[collection].delete_many({})
+    cache_module._local_cache.clear()
 
     yield db
 
@@ -55,6 +67,16 @@ async def test_db(test_db_client):
         await db[collection].delete_many({})
 
 
+@pytest.fixture
+def server_module(test_db, monkeypatch):
+    """The server module with its db pointed at test_db, for calling handlers directly"""
+    os.environ.setdefault('MONGO_URL', MONGO_URL)
+    import server
+
+    monkeypatch.setattr(server, "db", test_db)
+    return server
+
+
 @pytest.fixture
 async def test_campus(test_db):
     """Create a test campus"""
@@ -197,6 +219,199 @@ async def test_care_event(test_db, test_campus, test_member):
     return event
 
 
+@pytest.fixture
+def query_budget():
+    """
+    Fail the test when the code under it exceeds a Mongo command budget or repeats a query shape (N+1)
+
+        with query_budget(3):
+            await list_pastoral_notes(request)
+    """
+    @contextmanager
+    def budget(max_queries: int, max_repeats: int = QUERY_PROFILER_REPEAT_THRESHOLD):
+        with profile_queries() as profile:
+            yield profile
+        profile.check_budget(max_queries, max_repeats)
+
+    return budget
+
+
+# In-memory stand-ins for unit tests that must not need MongoDB
+class FakeCursor:
+    """Motor cursor stand-in over a list of documents"""
+
+    def __init__(self, docs):
+        self._docs = list(docs)
+
+    def sort(self, key, direction=1):
+        self._docs.sort(key=lambda d: d.get(key), reverse=direction < 0)
+        return self
+
+    def limit(self, n):
+        del self._docs[n:]
+        return self
+
+    async def to_list(self, length=None):
+        return self._docs[:length] if length else list(self._docs)
+
+
+class FakeResult:
+    def __init__(self, count=0, upserted_id=None):
+        self.matched_count = self.modified_count = self.deleted_count = count
+        self.upserted_id = upserted_id
+
+
+def _matches_condition(value, op, arg):
+    if op == "$in":
+        return any(v in arg for v in value) if isinstance(value, list) else value in arg
+    if op == "$nin":
+        return not _matches_condition(value, "$in", arg)
+    if op == "$all":
+        return isinstance(value, list) and set(arg) <= set(value)
+    if op == "$ne":
+        return value != arg
+    if op == "$exists":
+        return (value is not None) == arg
+    if value is None:
+        return False
+    if op in ("$gt", "$gte", "$lt", "$lte"):
+        return {"$gt": value > arg, "$gte": value >= arg, "$lt": value < arg, "$lte": value <= arg}[op]
+    raise NotImplementedError(f"FakeCollection does not support {op}")
+
+
+def _matches(doc: dict, query: dict) -> bool:
+    for key, cond in query.items():
+        if key == "$or":
+            if not any(_matches(doc, q) for q in cond):
+                return False
+        elif key == "$and":
+            if not all(_matches(doc, q) for q in cond):
+                return False
+        elif key.startswith("$"):
+            raise NotImplementedError(f"FakeCollection does not support {key}")
+        elif isinstance(cond, dict) and cond and all(op.startswith("$") for op in cond):
+            if not all(_matches_condition(doc.get(key), op, arg) for op, arg in cond.items()):
+                return False
+        elif doc.get(key) != cond:
+            return False
+    return True
+
+
+def _project(doc: dict, projection: Optional[dict]) -> dict:
+    if not projection:
+        return copy.deepcopy(doc)
+    included = {k for k, v in projection.items() if v and k != "_id"}
+    if included:
+        keep = included | ({"_id"} if projection.get("_id", 1) else set())
+        return {k: copy.deepcopy(v) for k, v in doc.items() if k in keep}
+    return {k: copy.deepcopy(v) for k, v in doc.items() if projection.get(k, 1)}
+
+
+class FakeCollection:
+    """
+    Motor collection stand-in: equality and simple operator queries over in-memory documents.
+
+    Queries (find/find_one) and updates are recorded for assertions. aggregate() returns
+    the next list queued in aggregate_results, and bulk_write() only records its operations.
+    """
+
+    def __init__(self, docs=()):
+        self.docs = [dict(d) for d in docs]
+        self.queries = []
+        self.updates = []
+        self.pipelines = []
+        self.bulk_writes = []
+        self.aggregate_results = []
+
+    def _find(self, query):
+        return [d for d in self.docs if _matches(d, query or {})]
+
+    def find(self, query=None, projection=None):
+        self.queries.append(query)
+        return FakeCursor(_project(d, projection) for d in self._find(query))
+
+    async def find_one(self, query=None, projection=None):
+        self.queries.append(query)
+        found = self._find(query)
+        return _project(found[0], projection) if found else None
+
+    async def count_documents(self, query):
+        return len(self._find(query))
+
+    async def distinct(self, field, query=None):
+        return list(dict.fromkeys(d[field] for d in self._find(query) if d.get(field) is not None))
+
+    async def insert_one(self, doc):
+        self.docs.append(dict(doc))
+        return FakeResult(1)
+
+    async def insert_many(self, docs, ordered=True):
+        self.docs.extend(dict(d) for d in docs)
+        return FakeResult(len(docs))
+
+    def _apply(self, doc, update, inserting=False):
+        for key, value in update.get("$set", {}).items():
+            doc[key] = value
+        for key, value in update.get("$inc", {}).items():
+            doc[key] = doc.get(key, 0) + value
+        for key in update.get("$unset", {}):
+            doc.pop(key, None)
+        if inserting:
+            doc.update(update.get("$setOnInsert", {}))
+
+    async def _update(self, query, update, upsert, many):
+        self.updates.append((query, update))
+        found = self._find(query)[:None if many else 1]
+        for doc in found:
+            self._apply(doc, update)
+        if not found and upsert:
+            doc = {k: v for k, v in query.items() if not k.startswith("$") and not isinstance(v, dict)}
+            self._apply(doc, update, inserting=True)
+            self.docs.append(doc)
+            return FakeResult(0, upserted_id=doc.get("_id", doc.get("id")))
+        return FakeResult(len(found))
+
+    async def update_one(self, query, update, upsert=False):
+        return await self._update(query, update, upsert, many=False)
+
+    async def update_many(self, query, update, upsert=False):
+        return await self._update(query, update, upsert, many=True)
+
+    async def replace_one(self, query, doc, upsert=False):
+        found = self._find(query)
+        if found:
+            self.docs[self.docs.index(found[0])] = {**{k: v for k, v in found[0].items() if k == "_id"}, **doc}
+        elif upsert:
+            self.docs.append({**{k: v for k, v in query.items() if k == "_id"}, **doc})
+        return FakeResult(len(found[:1]))
+
+    async def delete_many(self, query):
+        found = self._find(query)
+        self.docs = [d for d in self.docs if d not in found]
+        return FakeResult(len(found))
+
+    def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+        return FakeCursor(self.aggregate_results.pop(0) if self.aggregate_results else [])
+
+    async def bulk_write(self, ops, ordered=True):
+        self.bulk_writes.append(ops)
+        return FakeResult(len(ops))
+
+
+class FakeDB:
+    """Database stand-in; collections not passed in are created empty on first use"""
+
+    def __init__(self, **collections):
+        self.__dict__.update(collections)
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        collection = self.__dict__[name] = FakeCollection()
+        return collection
+
+
 # Helper functions for tests
 def create_test_member_data(campus_id: str, **overrides):
     """Factory function to create test member data"""
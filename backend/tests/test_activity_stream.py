@@ -0,0 +1,193 @@
+"""
+Test the SSE activity fan-out broker
+
+Events must reach every connection for their campus only, a slow connection must
+not hold up the others, and reconnecting clients get what they missed from the stream.
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.activity_stream import ActivityBroker, parse_event_id
+
+
+class _StreamClient:
+    """Stand-in for the DragonflyDB client: only the stream commands replay uses"""
+
+    def __init__(self, entries):
+        self.entries = entries
+        self.ranges = []
+
+    def pubsub(self):
+        return None
+
+    async def xrange(self, key, min="-", max="+", count=None):
+        self.ranges.append((key, min, count))
+        after = parse_event_id(min.lstrip("("))
+        return [(event_id, fields) for event_id, fields in self.entries if parse_event_id(event_id) > after][:count]
+
+
+class _PubSubServer:
+    """Shared pub/sub and streams, standing in for the one DragonflyDB all workers use"""
+
+    def __init__(self):
+        self.channels = {}
+        self.streams = {}
+        self.round_trips = 0
+
+    def client(self):
+        return _ServerClient(self)
+
+
+class _ServerClient:
+    def __init__(self, server):
+        self.server = server
+
+    def pubsub(self):
+        return _PubSub(self.server)
+
+    def pipeline(self, transaction=True):
+        return _Pipeline(self)
+
+    async def xadd(self, key, fields, maxlen=None, approximate=True):
+        stream = self.server.streams.setdefault(key, [])
+        event_id = f"1700000000000-{len(stream)}"
+        stream.append((event_id, fields))
+        return event_id
+
+    async def publish(self, channel, data):
+        for pubsub in self.server.channels.get(channel, ()):
+            pubsub.messages.put_nowait({"type": "message", "channel": channel, "data": data})
+
+
+class _Pipeline:
+    """Queues commands and runs them on execute(), counting one round trip per execute"""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def xadd(self, *args, **kwargs):
+        self.commands.append(self.client.xadd(*args, **kwargs))
+
+    def publish(self, *args):
+        self.commands.append(self.client.publish(*args))
+
+    async def execute(self):
+        self.client.server.round_trips += 1
+        return [await command for command in self.commands]
+
+
+class _PubSub:
+    def __init__(self, server):
+        self.server = server
+        self.messages = asyncio.Queue()
+        self.connection = None
+
+    async def subscribe(self, *channels):
+        self.connection = object()
+        for channel in channels:
+            self.server.channels.setdefault(channel, set()).add(self)
+
+    async def unsubscribe(self, *channels):
+        for channel in channels:
+            self.server.channels.get(channel, set()).discard(self)
+
+    async def get_message(self, ignore_subscribe_messages=True, timeout=1.0):
+        try:
+            return await asyncio.wait_for(self.messages.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def aclose(self):
+        await self.unsubscribe(*self.server.channels)
+
+
+@pytest.mark.unit
+async def test_local_fan_out_is_scoped_to_campus():
+    broker = ActivityBroker()
+    first = await broker.subscribe("campus-a")
+    second = await broker.subscribe("campus-a")
+    other = await broker.subscribe("campus-b")
+
+    event_id = await broker.publish("campus-a", {"user_id": "u1", "action_type": "complete_task"})
+
+    assert first.get_nowait() == (event_id, {"user_id": "u1", "action_type": "complete_task"})
+    assert second.get_nowait()[0] == event_id
+    assert other.empty()
+
+    await broker.unsubscribe("campus-a", first)
+    await broker.unsubscribe("campus-a", second)
+    assert broker.stats()["campuses"] == 1
+
+
+@pytest.mark.unit
+async def test_slow_subscriber_drops_oldest_event():
+    broker = ActivityBroker(queue_size=2)
+    slow = await broker.subscribe("campus-a")
+    for i in range(3):
+        await broker.publish("campus-a", {"n": i})
+
+    assert [slow.get_nowait()[1]["n"] for _ in range(slow.qsize())] == [1, 2]
+    assert broker.stats()["dropped"] == 1
+
+
+@pytest.mark.unit
+async def test_replay_returns_events_after_last_event_id():
+    client = _StreamClient([
+        ("1700000000000-0", {"data": '{"n": 1}'}),
+        ("1700000000001-0", {"data": '{"n": 2}'}),
+        ("1700000000002-0", {"data": "not json"}),
+        ("1700000000003-0", {"data": '{"n": 3}'}),
+    ])
+    broker = ActivityBroker(client)
+
+    replay = await broker.replay("campus-a", "1700000000000-0")
+
+    assert [activity["n"] for _, activity in replay] == [2, 3]
+    assert client.ranges[0][:2] == ("ft:activity-log:campus-a", "(1700000000000-0")
+    assert await broker.replay("campus-a", "garbage") == []
+    assert await broker.replay("campus-a", None) == []
+
+
+@pytest.mark.unit
+async def test_publish_on_one_worker_reaches_subscribers_on_another():
+    server = _PubSubServer()
+    publisher, listener = ActivityBroker(server.client()), ActivityBroker(server.client())
+    publisher.start()
+    listener.start()
+    try:
+        remote = await listener.subscribe("campus-a")
+        other_campus = await listener.subscribe("campus-b")
+
+        event_id = await publisher.publish("campus-a", {"user_id": "u1", "action_type": "complete_task"})
+
+        assert await asyncio.wait_for(remote.get(), 1) == (event_id, {"user_id": "u1", "action_type": "complete_task"})
+        assert other_campus.empty()
+        assert publisher.stats()["mode"] == "pubsub" and publisher.stats()["connections"] == 0
+    finally:
+        await publisher.close()
+        await listener.close()
+
+
+@pytest.mark.unit
+async def test_batch_publish_is_pipelined_and_reaches_other_workers_in_order():
+    server = _PubSubServer()
+    publisher, listener = ActivityBroker(server.client()), ActivityBroker(server.client())
+    listener.start()
+    try:
+        remote = await listener.subscribe("campus-a")
+
+        event_ids = await publisher.publish_many("campus-a", [{"n": i} for i in range(500)])
+
+        assert server.round_trips == 2  # Stream appends, then channel messages; not 2 per event
+        received = [await asyncio.wait_for(remote.get(), 1) for _ in range(500)]
+        assert [event_id for event_id, _ in received] == event_ids
+        assert [activity["n"] for _, activity in received] == list(range(500))
+    finally:
+        await publisher.close()
+        await listener.close()
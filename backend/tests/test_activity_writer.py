@@ -0,0 +1,138 @@
+"""
+Test the write-behind activity log writer
+
+Entries queued together must reach MongoDB as one insert_many, and nothing queued
+may be lost on shutdown.
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymongo.errors import BulkWriteError
+
+from services.activity_writer import ActivityLogWriter
+from tests.conftest import FakeCollection, FakeDB
+
+
+class _ActivityLogs(FakeCollection):
+    """activity_logs with slow inserts and duplicate-key failures for chosen ids, recording each batch"""
+
+    def __init__(self, delay=0.0, fail_ids=()):
+        super().__init__()
+        self.batches = []
+        self._delay = delay
+        self._fail_ids = set(fail_ids)
+
+    async def insert_many(self, docs, ordered=True):
+        await asyncio.sleep(self._delay)
+        self.batches.append([d["id"] for d in docs])
+        errors = [{"index": i, "errmsg": "dup"} for i, d in enumerate(docs) if d["id"] in self._fail_ids]
+        if errors:
+            raise BulkWriteError({"writeErrors": errors, "nInserted": len(docs) - len(errors)})
+        return await super().insert_many(docs, ordered)
+
+
+def _doc(i):
+    return {"id": f"log-{i}", "campus_id": "c1"}
+
+
+@pytest.mark.unit
+async def test_entries_queued_together_are_written_in_one_batch():
+    logs = _ActivityLogs()
+    writer = ActivityLogWriter(FakeDB(activity_logs=logs), batch_size=200, flush_interval=0.05)
+    writer.start()
+
+    for i in range(100):
+        await writer.write(_doc(i))
+    assert logs.batches == []  # Callers never wait on the insert
+
+    await writer.close()
+    assert len(logs.batches) == 1 and len(logs.batches[0]) == 100
+    stats = writer.stats()
+    assert stats["written"] == 100 and stats["batches"] == 1 and stats["queue_depth"] == 0
+    assert stats["last_flush_ms"] is not None
+
+
+@pytest.mark.unit
+async def test_batches_are_capped_and_flushed_on_interval():
+    logs = _ActivityLogs()
+    writer = ActivityLogWriter(FakeDB(activity_logs=logs), batch_size=40, flush_interval=0.02)
+    writer.start()
+
+    for i in range(100):
+        await writer.write(_doc(i))
+    await asyncio.sleep(0.1)
+
+    assert [len(b) for b in logs.batches] == [40, 40, 20]
+    await writer.close()
+
+
+@pytest.mark.unit
+async def test_full_queue_applies_backpressure_and_close_drains_it():
+    logs = _ActivityLogs(delay=0.01)
+    writer = ActivityLogWriter(FakeDB(activity_logs=logs), batch_size=5, flush_interval=0.01, max_queue=5)
+    writer.start()
+
+    for i in range(30):
+        await writer.write(_doc(i))
+    assert writer.stats()["backpressure_waits"] > 0
+
+    await writer.close()
+    assert sum(len(b) for b in logs.batches) == 30
+    assert not writer.running
+
+
+@pytest.mark.unit
+async def test_only_stored_entries_are_broadcast():
+    broadcasts = []
+
+    async def on_written(campus_id, payloads):
+        broadcasts.extend((campus_id, payload["id"]) for payload in payloads)
+
+    logs = _ActivityLogs(fail_ids={"log-1"})
+    writer = ActivityLogWriter(FakeDB(activity_logs=logs), on_written=on_written, flush_interval=0.01)
+    writer.start()
+    for i in range(3):
+        await writer.write(_doc(i), {"id": f"log-{i}"})
+    await writer.close()
+
+    assert broadcasts == [("c1", "log-0"), ("c1", "log-2")]
+    assert writer.stats()["failed"] == 1
+
+
+@pytest.mark.unit
+async def test_writes_go_straight_to_the_database_when_not_started():
+    logs = _ActivityLogs()
+    writer = ActivityLogWriter(FakeDB(activity_logs=logs))
+
+    await writer.write(_doc(1))
+
+    assert logs.batches == [["log-1"]]
+
+
+@pytest.mark.unit
+async def test_bulk_entries_are_written_in_the_background_in_one_insert():
+    calls = []
+
+    async def on_written(campus_id, payloads):
+        calls.append((campus_id, [payload["id"] for payload in payloads]))
+
+    logs = _ActivityLogs(delay=0.05)
+    writer = ActivityLogWriter(FakeDB(activity_logs=logs), on_written=on_written, batch_size=40)
+    writer.start()
+    docs = [{"id": f"log-{i}", "campus_id": "c1" if i % 2 else "c2"} for i in range(100)]
+
+    await writer.write_many(docs, [{"id": d["id"]} for d in docs])
+
+    # The request does not wait on the insert or the broadcasts
+    assert logs.batches == [] and writer.stats()["bulk_pending"] == 1
+    await writer.close()
+
+    # Already batched by the caller: not split by batch_size; broadcast once per campus
+    assert [len(b) for b in logs.batches] == [100]
+    assert [(campus_id, len(ids)) for campus_id, ids in calls] == [("c2", 50), ("c1", 50)]
+    assert writer.stats()["written"] == 100 and writer.stats()["bulk_pending"] == 0
@@ -0,0 +1,155 @@
+"""
+Benchmark the analytics pipelines against the previous Python implementations
+
+The pipelines must return exactly what the Python folds compute over the whole
+campus, including campuses larger than the old fetch caps (where the capped
+Python versions silently undercounted).
+"""
+
+import pytest
+import time
+import uuid
+import sys
+import os
+from datetime import datetime, timezone, timedelta, date
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.analytics_service import AnalyticsService, FOLLOW_UP_QUIET_DAYS
+
+EVENT_TYPES = ["birthday", "grief_loss", "accident_illness", "financial_aid", "regular_contact"]
+STATUSES = ["Member", "Visitor", "", None]
+
+
+# ---------- Previous implementations (fetch, then fold in Python) ----------
+
+async def _python_events_by_type(db, campus_filter, cap=10000):
+    events = await db.care_events.find(campus_filter, {"_id": 0, "event_type": 1}).to_list(cap)
+    counts = {}
+    for event in events:
+        counts[event.get("event_type")] = counts.get(event.get("event_type"), 0) + 1
+    return counts
+
+
+async def _python_events_per_day(db, campus_filter, since, cap=1000):
+    events = await db.care_events.find(
+        {**campus_filter, "event_date": {"$gte": since.isoformat()}}, {"_id": 0, "event_date": 1}
+    ).to_list(cap)
+    counts = {}
+    for event in events:
+        counts[event["event_date"][:10]] = counts.get(event["event_date"][:10], 0) + 1
+    return counts
+
+
+async def _python_demographics(db, campus_filter, member_cap=1000, event_cap=2000):
+    members = await db.members.find(campus_filter, {"_id": 0}).to_list(member_cap)
+    events = await db.care_events.find(campus_filter, {"_id": 0}).to_list(event_cap)
+    events_per_member = {}
+    for e in events:
+        events_per_member[e["member_id"]] = events_per_member.get(e["member_id"], 0) + 1
+    age_groups, membership = {}, {}
+    for member in members:
+        age = member.get("age") or 0
+        group = ("Children (0-12)" if age <= 12 else "Teenagers (13-17)" if age <= 17 else
+                 "Young Adults (18-30)" if age <= 30 else "Adults (31-60)" if age <= 60 else "Seniors (60+)")
+        entry = age_groups.setdefault(group, {"count": 0, "care_events": 0})
+        entry["count"] += 1
+        entry["care_events"] += events_per_member.get(member["id"], 0)
+        status = member.get("membership_status") or member.get("category") or "Unknown"
+        trend = membership.setdefault(status, {"count": 0, "engagement_score": 0})
+        trend["count"] += 1
+        trend["engagement_score"] += max(0, 100 - (member.get("days_since_last_contact") or 999))
+    return age_groups, membership, len(members)
+
+
+async def _python_follow_up(db, campus_filter, member_cap=1000, event_cap=2000):
+    members = await db.members.find(campus_filter, {"_id": 0}).to_list(member_cap)
+    events = await db.care_events.find(campus_filter, {"_id": 0}).to_list(event_cap)
+    aid_members = {e["member_id"] for e in events if e.get("event_type") == "financial_aid"}
+    now = datetime.now(timezone.utc)
+    scored = []
+    for m in members:
+        last = m.get("last_contact_date")
+        if last and (now - last.replace(tzinfo=timezone.utc)).days < FOLLOW_UP_QUIET_DAYS:
+            continue
+        days, age = m.get("days_since_last_contact", 999), m.get("age", 0)
+        if days > 90:
+            scored.append((m["id"], min(100, days)))
+        elif age > 65 and days > 30:
+            scored.append((m["id"], days + 20))
+        elif m.get("membership_status") == "Visitor" and days > 14:
+            scored.append((m["id"], days + 10))
+        elif m["id"] in aid_members and days > 60:
+            scored.append((m["id"], days + 15))
+        elif m.get("marital_status") == "Single" and age > 25 and days > 45:
+            scored.append((m["id"], days))
+    return sorted(scored, key=lambda s: -s[1])
+
+
+# ---------- Seeding ----------
+
+async def _seed_campus(db, campus_id, member_count, events_per_member):
+    today = date.today()
+    members, events = [], []
+    for i in range(member_count):
+        member_id = str(uuid.uuid4())
+        members.append({
+            "id": member_id, "campus_id": campus_id, "name": f"Bench Member {i}", "phone": f"+62811{i:07d}",
+            "age": (i * 7) % 90, "membership_status": STATUSES[i % 4], "category": "Jemaat" if i % 8 == 3 else None,
+            "marital_status": "Single" if i % 5 == 0 else "Married",
+            "days_since_last_contact": i % 200,
+            "last_contact_date": datetime.now(timezone.utc) - timedelta(days=i % 200, hours=1),
+        })
+        for j in range(events_per_member):
+            events.append({
+                "id": str(uuid.uuid4()), "campus_id": campus_id, "member_id": member_id,
+                "event_type": EVENT_TYPES[(i + j) % len(EVENT_TYPES)],
+                "event_date": (today - timedelta(days=(i + j) % 60)).isoformat(),
+            })
+    await db.members.insert_many(members)
+    await db.care_events.insert_many(events)
+
+
+async def _timed(fn, *args, **kwargs):
+    started = time.perf_counter()
+    result = await fn(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+@pytest.mark.slow
+@pytest.mark.integration
+async def test_analytics_pipelines_match_python_folds_beyond_old_caps(test_db):
+    """Pipelines equal the uncapped Python folds; the capped versions undercount at this size"""
+    campus_id = f"bench-{uuid.uuid4()}"
+    campus_filter = {"campus_id": campus_id}
+    since = date.today() - timedelta(days=30)
+    analytics = AnalyticsService(test_db)
+    await _seed_campus(test_db, campus_id, member_count=3000, events_per_member=4)
+
+    by_type, pipeline_s = await _timed(analytics.events_by_type, campus_filter)
+    capped, python_s = await _timed(_python_events_by_type, test_db, campus_filter)
+    print(f"\nevents by type: pipeline {pipeline_s:.3f}s, python (capped) {python_s:.3f}s")
+    assert {t["type"]: t["count"] for t in by_type} == await _python_events_by_type(test_db, campus_filter, cap=None)
+    assert sum(capped.values()) == 10000 < sum(t["count"] for t in by_type)
+
+    per_day, pipeline_s = await _timed(analytics.events_per_day, campus_filter, since)
+    capped, python_s = await _timed(_python_events_per_day, test_db, campus_filter, since)
+    print(f"events per day: pipeline {pipeline_s:.3f}s, python (capped) {python_s:.3f}s")
+    assert {d["date"]: d["count"] for d in per_day} == await _python_events_per_day(test_db, campus_filter, since, cap=None)
+    assert [d["date"] for d in per_day] == sorted(d["date"] for d in per_day)
+    assert sum(capped.values()) < sum(d["count"] for d in per_day)
+
+    demographics, pipeline_s = await _timed(analytics.demographics, campus_filter)
+    _, python_s = await _timed(_python_demographics, test_db, campus_filter)
+    print(f"demographics: pipeline {pipeline_s:.3f}s, python (capped) {python_s:.3f}s")
+    age_groups, membership, total = await _python_demographics(test_db, campus_filter, member_cap=None, event_cap=None)
+    assert {k: v for k, v in demographics["age_groups"].items() if v["count"]} == age_groups
+    assert demographics["membership"] == membership
+    assert demographics["total_members"] == total == 3000
+
+    candidates, pipeline_s = await _timed(analytics.follow_up_candidates, campus_filter, limit=20)
+    _, python_s = await _timed(_python_follow_up, test_db, campus_filter)
+    print(f"follow-up suggestions: pipeline {pipeline_s:.3f}s, python (capped) {python_s:.3f}s")
+    expected = await _python_follow_up(test_db, campus_filter, member_cap=None, event_cap=None)
+    assert [c["urgency_score"] for c in candidates] == [score for _, score in expected[:20]]
+    assert {c["id"] for c in candidates} <= {member_id for member_id, _ in expected}
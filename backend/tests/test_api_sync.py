@@ -4,6 +4,7 @@ Test API Sync functionality
 Tests for FaithFlow API sync configuration, webhook handling, and member synchronization.
 """
 
+import httpx
 import pytest
 import sys
 import os
@@ -12,9 +13,13 @@ import hashlib
 import json
 from datetime import datetime, timezone
 import uuid
+from urllib.parse import parse_qs, urlparse
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from services import http_client
+from services.http_client import UPSTREAM_CORE_API
+
 
 @pytest.fixture
 async def sync_config(test_db, test_campus):
@@ -309,3 +314,114 @@ async def test_sync_updates_existing_member(test_db, test_campus):
     member = await test_db.members.find_one({"external_member_id": "ext-99999"})
     assert member["name"] == "Updated Name"
     assert member["phone"] == "+6281234567890"
+
+
+@pytest.mark.unit
+def test_core_timestamps_parse_for_incremental_sync():
+    """Core updated_at values compare as aware datetimes regardless of format"""
+    from server import _parse_core_timestamp, _core_member_updated_at
+
+    zulu = _parse_core_timestamp("2026-01-01T08:00:00Z")
+    offset = _parse_core_timestamp("2026-01-01T15:00:00+07:00")
+    naive = _parse_core_timestamp("2026-01-01T08:00:00")
+
+    assert zulu == offset == naive
+    assert _parse_core_timestamp("not a date") is None
+    assert _core_member_updated_at({"updatedAt": "2026-01-01T08:00:00Z"}) == zulu
+    assert _core_member_updated_at({"name": "No timestamp"}) is None
+
+
+@pytest.mark.unit
+def test_sync_filter_rules_include_and_exclude():
+    """Filter rules select members in include mode and drop them in exclude mode"""
+    from server import _core_member_matches_filters
+
+    rules = [{"field": "gender", "operator": "equals", "value": "Female"}]
+    female, male = {"gender": "Female"}, {"gender": "Male"}
+
+    assert _core_member_matches_filters(female, "include", rules)
+    assert not _core_member_matches_filters(male, "include", rules)
+    assert not _core_member_matches_filters(female, "exclude", rules)
+    assert _core_member_matches_filters(male, "exclude", [])
+
+
+def _core_member(core_id, name, updated_at, **fields):
+    return {"id": core_id, "full_name": name, "phone": fields.pop("phone", None), "updated_at": updated_at, **fields}
+
+
+@pytest.mark.slow
+@pytest.mark.integration
+async def test_incremental_member_sync_applies_two_pages_of_changes(test_db, test_campus, server_module, monkeypatch):
+    """An incremental sync pages through the core API from the stored cursor and applies every change"""
+    campus_id = test_campus["id"]
+    await test_db.sync_configs.insert_one({
+        "id": str(uuid.uuid4()), "campus_id": campus_id, "is_enabled": True,
+        "api_base_url": "https://core.example.com", "api_path_prefix": "/api",
+        "api_email": "sync@example.com", "api_password": server_module.encrypt_password("secret"),
+        "filter_mode": "include", "filter_rules": [{"field": "status", "operator": "not_equals", "value": "Moved"}],
+        "member_sync_cursor": "2026-10-01T00:00:00+00:00",
+    })
+
+    def local(name, external_id=None, phone=None):
+        return {"id": str(uuid.uuid4()), "campus_id": campus_id, "name": name, "phone": phone,
+                "external_member_id": external_id, "is_archived": False}
+
+    renamed, moved, deactivated = local("Old Name", "core-1"), local("Moving Away", "core-2"), local("Leaving", "core-3")
+    by_phone = local("Dewi Lestari", phone="+6281234500006")
+    await test_db.members.insert_many([renamed, moved, deactivated, by_phone])
+
+    pages = [
+        [
+            _core_member("core-1", "New Name", "2026-10-05T00:00:00Z"),
+            _core_member("core-2", "Moving Away", "2026-10-06T00:00:00Z", status="Moved"),
+            _core_member("core-3", "Leaving", "2026-10-07T00:00:00Z", is_active=False),
+            _core_member("core-4", "Budi Santoso", "2026-10-08T00:00:00Z", date_of_birth="1990-05-15"),
+        ],
+        [
+            _core_member("core-5", "No Birthday", "2026-10-09T00:00:00Z"),
+            _core_member("core-6", "Dewi Lestari", "2026-10-10T00:00:00Z", phone="081234500006"),
+            # Older than the cursor: a core API that ignores updated_since must not reapply it
+            _core_member("core-old", "Stale Change", "2026-09-01T00:00:00Z", date_of_birth="1970-01-01"),
+            _core_member("core-7", "Siti Aminah", "2026-10-12T06:30:00Z", date_of_birth="1985-12-01"),
+        ],
+    ]
+    member_requests = []
+
+    def core_api(request):
+        if request.url.path == "/api/auth/login":
+            return httpx.Response(200, json={"access_token": "token"})
+        query = parse_qs(urlparse(str(request.url)).query)
+        member_requests.append((query["skip"][0], query["updated_since"][0]))
+        page = int(query["skip"][0]) // int(query["limit"][0])
+        return httpx.Response(200, json={"data": pages[page], "pagination": {"has_more": page + 1 < len(pages)}})
+
+    async def invalidate(campus_id, member_ids=None):
+        return None
+
+    monkeypatch.setitem(http_client._clients, UPSTREAM_CORE_API, httpx.AsyncClient(transport=httpx.MockTransport(core_api)))
+    monkeypatch.setattr(server_module, "invalidate_dashboard_cache", invalidate)
+
+    result = await server_module.perform_member_sync_for_campus(campus_id, sync_type="polling")
+    await http_client.close_http_clients()
+
+    assert result["success"] and result["sync_mode"] == "incremental"
+    assert member_requests == [("0", "2026-10-01T00:00:00+00:00"), ("100", "2026-10-01T00:00:00+00:00")]
+    assert (result["stats"]["created"], result["stats"]["archived"], result["stats"]["matched_by_name_phone"]) == (3, 2, 1)
+
+    members = {m.get("external_member_id"): m for m in await test_db.members.find({"campus_id": campus_id}, {"_id": 0}).to_list(None)}
+    assert set(members) == {"core-1", "core-2", "core-3", "core-4", "core-5", "core-6", "core-7"}
+    assert members["core-1"]["name"] == "New Name" and members["core-1"]["id"] == renamed["id"]
+    assert members["core-6"]["id"] == by_phone["id"]
+    assert (members["core-2"]["is_archived"], members["core-2"]["archived_reason"]) == (True, "No longer matches sync filter rules")
+    assert (members["core-3"]["is_archived"], members["core-3"]["archived_reason"]) == (True, "Deactivated in core system")
+    assert not any(members[core_id]["is_archived"] for core_id in ("core-1", "core-4", "core-5", "core-6", "core-7"))
+
+    # Birthday events go to the members that were actually inserted, with their own birth dates
+    birthdays = await test_db.care_events.find({"event_type": "birthday"}, {"_id": 0}).to_list(None)
+    assert sorted((e["member_id"], e["event_date"]) for e in birthdays) == sorted([
+        (members["core-4"]["id"], "1990-05-15"), (members["core-7"]["id"], "1985-12-01"),
+    ])
+
+    config = await test_db.sync_configs.find_one({"campus_id": campus_id})
+    assert config["member_sync_cursor"] == "2026-10-12T06:30:00+00:00"
+    assert config["last_sync_status"] == "success"
@@ -0,0 +1,219 @@
+"""
+Test the bulk care event execution path
+
+Bulk requests accept thousands of IDs, so member updates must be one bulk_write
+and dashboards must be refreshed once per campus. Against a real database, the
+endpoints must touch every requested event of the caller's campus across chunks,
+and nothing of other campuses.
+"""
+
+import pytest
+import uuid
+import sys
+import os
+from datetime import datetime, timezone, timedelta
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from litestar.exceptions import HTTPException
+
+import routes.care_events as care_events
+from constants import BULK_EVENT_MAX_IDS, BULK_EVENT_CHUNK_SIZE, BULK_DASHBOARD_PATCH_MAX
+from tests.conftest import FakeDB
+
+
+@pytest.mark.unit
+def test_bulk_ids_are_deduplicated_and_capped():
+    assert care_events._bulk_event_ids(care_events.BulkEventIds(event_ids=["a", "b", "a"])) == ["a", "b"]
+
+    with pytest.raises(HTTPException) as exc:
+        care_events._bulk_event_ids(care_events.BulkEventIds(event_ids=[str(i) for i in range(BULK_EVENT_MAX_IDS + 1)]))
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.unit
+async def test_contact_for_thousands_of_members_is_one_bulk_write():
+    db = FakeDB()
+    now = datetime.now(timezone.utc)
+
+    await care_events._record_contact(db, [f"m{i}" for i in range(BULK_EVENT_CHUNK_SIZE * 3 + 1)], now)
+
+    # One round trip, one update per chunk of members
+    (ops,) = db.members.bulk_writes
+    assert len(ops) == 4
+
+
+@pytest.mark.unit
+async def test_deleted_events_recompute_last_contact_in_one_aggregate_and_one_bulk_write():
+    recent = datetime.now(timezone.utc) - timedelta(days=10)
+    db = FakeDB()
+    db.care_events.aggregate_results.append([{"_id": "m1", "last_contact": recent}])
+
+    await care_events._recalculate_last_contact(db, ["m1", "m2", "m3"])
+
+    assert len(db.care_events.pipelines) == 1
+    (ops,) = db.members.bulk_writes
+    assert len(ops) == 3
+
+
+@pytest.mark.unit
+async def test_dashboards_are_patched_once_per_campus_or_rebuilt_when_large(monkeypatch):
+    calls = []
+
+    async def invalidate(campus_id, member_ids=None):
+        calls.append((campus_id, sorted(member_ids) if member_ids else None))
+
+    monkeypatch.setattr(care_events, "_invalidate_dashboard_cache", invalidate)
+    events = [{"campus_id": "c1", "member_id": "m1"}, {"campus_id": "c1", "member_id": "m2"},
+              {"campus_id": "c1", "member_id": "m1"}]
+    events += [{"campus_id": "c2", "member_id": f"x{i}"} for i in range(BULK_DASHBOARD_PATCH_MAX + 1)]
+
+    await care_events._refresh_dashboards_for_events(events)
+
+    assert calls == [("c1", ["m1", "m2"]), ("c2", None)]
+
+
+# ---------- Endpoints against a real database ----------
+
+# More than two chunks of IDs per request
+BULK_COUNT = BULK_EVENT_CHUNK_SIZE * 2 + 10
+
+
+@pytest.fixture
+def bulk(test_db, test_campus, server_module, monkeypatch):
+    """Bulk endpoints on test_db as a campus admin of test_campus, logging through server.log_activities"""
+    invalidated = []
+
+    async def campus_admin(request):
+        return {"id": "admin-1", "name": "Admin", "role": "campus_admin", "campus_id": test_campus["id"]}
+
+    async def invalidate(campus_id, member_ids=None):
+        invalidated.append((campus_id, len(member_ids) if member_ids else None))
+
+    monkeypatch.setattr(care_events, "get_db", lambda: test_db)
+    monkeypatch.setattr(care_events, "get_current_user", campus_admin)
+    monkeypatch.setattr(care_events, "_log_activities", server_module.log_activities)
+    monkeypatch.setattr(care_events, "_invalidate_dashboard_cache", invalidate)
+    return invalidated
+
+
+def _request():
+    return SimpleNamespace(state=SimpleNamespace())
+
+
+async def _seed_events(db, campus_id, count, **fields):
+    """count open regular_contact events, each for its own member (who was last contacted 100 days ago)"""
+    long_ago = datetime.now(timezone.utc) - timedelta(days=100)
+    members = [
+        {"id": str(uuid.uuid4()), "campus_id": campus_id, "name": f"Member {i}", "last_contact_date": long_ago,
+         "engagement_status": "disconnected", "days_since_last_contact": 100}
+        for i in range(count)
+    ]
+    events = [
+        {"id": str(uuid.uuid4()), "campus_id": campus_id, "member_id": member["id"], "event_type": "regular_contact",
+         "event_date": "2026-10-01", "completed": False, "ignored": False, "created_at": long_ago, **fields}
+        for member in members
+    ]
+    await db.members.insert_many(members)
+    await db.care_events.insert_many(events)
+    return events
+
+
+@pytest.mark.slow
+@pytest.mark.integration
+async def test_bulk_complete_updates_every_chunk_of_the_callers_campus_only(test_db, test_campus, second_campus, bulk):
+    events = await _seed_events(test_db, test_campus["id"], BULK_COUNT)
+    already_done = await _seed_events(test_db, test_campus["id"], 3, completed=True)
+    foreign = await _seed_events(test_db, second_campus["id"], 5)
+    requested = [e["id"] for e in events + already_done + foreign]
+
+    result = await care_events.bulk_complete_care_events.fn(_request(), care_events.BulkEventIds(event_ids=requested))
+
+    assert result["completed_count"] == BULK_COUNT
+    done = await test_db.care_events.find({"id": {"$in": [e["id"] for e in events]}}, {"_id": 0}).to_list(None)
+    assert len(done) == BULK_COUNT
+    assert all(e["completed"] and e["completed_by_user_id"] == "admin-1" for e in done)
+    assert await test_db.care_events.count_documents({"campus_id": second_campus["id"], "completed": True}) == 0
+
+    # One activity entry per completed event, none for skipped or foreign events
+    logs = await test_db.activity_logs.find({}, {"_id": 0, "care_event_id": 1, "action_type": 1, "campus_id": 1}).to_list(None)
+    assert sorted(log["care_event_id"] for log in logs) == sorted(e["id"] for e in events)
+    assert {(log["action_type"], log["campus_id"]) for log in logs} == {("complete_task", test_campus["id"])}
+
+    # Completion counts as contact; other campuses' members are untouched
+    members = await test_db.members.find({"campus_id": test_campus["id"]}, {"_id": 0}).to_list(None)
+    contacted = [m for m in members if m["id"] in {e["member_id"] for e in events}]
+    assert {(m["engagement_status"], m["days_since_last_contact"]) for m in contacted} == {("active", 0)}
+    assert await test_db.members.count_documents({"campus_id": second_campus["id"], "days_since_last_contact": 100}) == 5
+
+    assert await test_db.rollup_dirty.count_documents({"campus_id": test_campus["id"], "date": "2026-10-01"}) == 1
+    # More members than BULK_DASHBOARD_PATCH_MAX: one rebuild of the campus dashboard
+    assert bulk == [(test_campus["id"], None)]
+
+
+@pytest.mark.slow
+@pytest.mark.integration
+async def test_bulk_ignore_updates_every_chunk_of_the_callers_campus_only(test_db, test_campus, second_campus, bulk):
+    events = await _seed_events(test_db, test_campus["id"], BULK_COUNT)
+    foreign = await _seed_events(test_db, second_campus["id"], 5)
+
+    result = await care_events.bulk_ignore_care_events.fn(
+        _request(), care_events.BulkEventIds(event_ids=[e["id"] for e in events + foreign])
+    )
+
+    assert result["ignored_count"] == BULK_COUNT
+    assert await test_db.care_events.count_documents(
+        {"campus_id": test_campus["id"], "ignored": True, "ignored_by_user_id": "admin-1"}
+    ) == BULK_COUNT
+    assert await test_db.care_events.count_documents({"campus_id": second_campus["id"], "ignored": True}) == 0
+    assert await test_db.activity_logs.count_documents({"action_type": "ignore_task", "campus_id": test_campus["id"]}) == BULK_COUNT
+    assert await test_db.activity_logs.count_documents({"campus_id": second_campus["id"]}) == 0
+    # Ignoring is not contact
+    assert await test_db.members.count_documents({"days_since_last_contact": 100}) == BULK_COUNT + 5
+
+
+@pytest.mark.slow
+@pytest.mark.integration
+async def test_bulk_delete_recomputes_last_contact_from_remaining_events(test_db, test_campus, second_campus, bulk):
+    events = await _seed_events(test_db, test_campus["id"], BULK_COUNT)
+    foreign = await _seed_events(test_db, second_campus["id"], 5)
+    # The first member keeps an older contact, the second a completed birthday; the rest have nothing left
+    kept_contact = datetime.now(timezone.utc) - timedelta(days=75, hours=1)
+    await test_db.care_events.insert_many([
+        {"id": str(uuid.uuid4()), "campus_id": test_campus["id"], "member_id": events[0]["member_id"],
+         "event_type": "regular_contact", "event_date": "2026-09-01", "created_at": kept_contact},
+        {"id": str(uuid.uuid4()), "campus_id": test_campus["id"], "member_id": events[1]["member_id"],
+         "event_type": "birthday", "event_date": "1980-09-01", "completed": True, "created_at": kept_contact},
+        # An open birthday is not contact
+        {"id": str(uuid.uuid4()), "campus_id": test_campus["id"], "member_id": events[2]["member_id"],
+         "event_type": "birthday", "event_date": "1980-09-01", "completed": False, "created_at": kept_contact},
+    ])
+    await test_db.activity_logs.insert_many([
+        {"id": str(uuid.uuid4()), "campus_id": e["campus_id"], "care_event_id": e["id"], "action_type": "create_care_event",
+         "created_at": datetime.now(timezone.utc)}
+        for e in (events[0], events[-1], foreign[0])
+    ])
+
+    result = await care_events.bulk_delete_care_events.fn(
+        _request(), care_events.BulkEventIds(event_ids=[e["id"] for e in events + foreign])
+    )
+
+    assert result["deleted_count"] == BULK_COUNT
+    assert await test_db.care_events.count_documents({"id": {"$in": [e["id"] for e in events]}}) == 0
+    assert await test_db.care_events.count_documents({"id": {"$in": [e["id"] for e in foreign]}}) == 5
+
+    # The deleted events' activity is gone (the foreign one stays), replaced by one delete entry each
+    remaining_logs = await test_db.activity_logs.find({}, {"_id": 0, "action_type": 1, "care_event_id": 1}).to_list(None)
+    assert [log["care_event_id"] for log in remaining_logs if log["action_type"] == "create_care_event"] == [foreign[0]["id"]]
+    assert sum(1 for log in remaining_logs if log["action_type"] == "delete_care_event") == BULK_COUNT
+
+    members = {m["id"]: m for m in await test_db.members.find({"campus_id": test_campus["id"]}, {"_id": 0}).to_list(None)}
+    for member_id in (events[0]["member_id"], events[1]["member_id"]):
+        assert (members[member_id]["engagement_status"], members[member_id]["days_since_last_contact"]) == ("at_risk", 75)
+    for event in events[2:]:
+        member = members[event["member_id"]]
+        assert (member["last_contact_date"], member["engagement_status"], member["days_since_last_contact"]) == (
+            None, "disconnected", 999
+        )
+    assert await test_db.members.count_documents({"campus_id": second_campus["id"], "days_since_last_contact": 100}) == 5
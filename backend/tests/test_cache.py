@@ -0,0 +1,131 @@
+"""
+Test the two-tier cache layer
+
+Covers LRU eviction order, expiry and pattern invalidation, the in-process tier on its
+own (no DragonflyDB), and invalidations reaching other workers' in-process tier.
+"""
+
+import asyncio
+import importlib.util
+import pytest
+import sys
+import os
+import time
+
+import fakeredis
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import cache as cache_module
+from services.cache import INVALIDATION_CHANNEL, LocalLRU, get_cache
+
+
+@pytest.mark.unit
+def test_evicts_least_recently_used():
+    lru = LocalLRU(max_size=2)
+    lru.set("a", b"1", ttl=60)
+    lru.set("b", b"2", ttl=60)
+    assert lru.get("a") == b"1"  # "b" is now the least recently used
+    lru.set("c", b"3", ttl=60)
+
+    assert lru.get("b") is None
+    assert lru.get("a") == b"1"
+    assert lru.get("c") == b"3"
+    assert len(lru) == 2
+
+
+@pytest.mark.unit
+def test_expired_entries_are_misses(monkeypatch):
+    lru = LocalLRU()
+    lru.set("k", b"v", ttl=10)
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+
+    assert lru.get("k") is None
+    assert len(lru) == 0
+
+
+@pytest.mark.unit
+def test_delete_pattern_matches_globs_and_exact_keys():
+    lru = LocalLRU()
+    for key in ("ft:c1:reminders:2025-01-01", "ft:c2:reminders:2025-01-01", "ft:c1:dashboard:stats"):
+        lru.set(key, b"{}", ttl=60)
+
+    assert lru.delete_pattern("ft:*:reminders:*") == 2
+    assert lru.delete_pattern("ft:c1:dashboard:stats") == 1
+    assert len(lru) == 0
+
+
+@pytest.mark.unit
+async def test_cache_without_dragonfly_serves_from_the_local_tier(monkeypatch):
+    monkeypatch.setattr(cache_module, "_redis_client", None)
+    monkeypatch.setattr(cache_module, "_local_cache", LocalLRU())
+    cache = get_cache()
+
+    assert not cache.shared
+    await cache.set("settings:writeoff", {"birthday": 7}, church_id="c1")
+    assert await cache.get("settings:writeoff", church_id="c1") == {"birthday": 7}
+
+    async def bump(current):
+        return {**current, "birthday": 8}
+
+    assert await cache.update("settings:writeoff", bump, church_id="c1")
+    assert not await cache.update("settings:missing", bump, church_id="c1")
+    assert await cache.get("settings:writeoff", church_id="c1") == {"birthday": 8}
+    assert await cache.scan_keys("settings:*", church_id="c1") == ["c1:settings:writeoff"]
+    assert await cache.acquire_lock("rebuild") is not None
+
+    await cache.delete("settings:writeoff", church_id="c1")
+    assert await cache.get("settings:writeoff", church_id="c1") is None
+
+
+def _worker(name, server):
+    """A separate copy of services.cache (own local tier and worker id), as in another process"""
+    spec = importlib.util.spec_from_file_location(name, cache_module.__file__)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    module._redis_client = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    return module
+
+
+async def _eventually(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.unit
+async def test_invalidation_drops_the_other_workers_local_entry():
+    server = fakeredis.FakeServer()
+    first, second = _worker("cache_worker_a", server), _worker("cache_worker_b", server)
+    listeners = [asyncio.create_task(w._listen_for_invalidations()) for w in (first, second)]
+    try:
+        async def subscribed():
+            return (await first._redis_client.pubsub_numsub(INVALIDATION_CHANNEL))[0][1]
+
+        deadline = time.monotonic() + 2
+        while await subscribed() < 2:
+            assert time.monotonic() < deadline
+            await asyncio.sleep(0.01)
+
+        writer, reader = first.CacheService(first._redis_client), second.CacheService(second._redis_client)
+        await writer.set("campuses:list", ["GKBJ"])
+        await writer.set("c1:reminders:2025-06-15", {"stale": False})
+        assert await reader.get("campuses:list") == ["GKBJ"]
+        assert await reader.get("c1:reminders:2025-06-15") == {"stale": False}
+        assert second._local_cache.get("ft:campuses:list") is not None
+
+        await writer.set("campuses:list", ["GKBJ", "Kelapa Gading"])
+        await _eventually(lambda: second._local_cache.get("ft:campuses:list") is None)
+        assert await reader.get("campuses:list") == ["GKBJ", "Kelapa Gading"]
+
+        await writer.invalidate_pattern("*:reminders:*")
+        await _eventually(lambda: second._local_cache.get("ft:c1:reminders:2025-06-15") is None)
+        assert first._local_cache.get("ft:campuses:list") is not None  # The writer keeps its own copy
+    finally:
+        for task in listeners:
+            task.cancel()
+        await asyncio.gather(*listeners, return_exceptions=True)
+        for worker in (first, second):
+            await worker._redis_client.aclose()
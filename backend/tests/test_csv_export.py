@@ -0,0 +1,56 @@
+"""
+Test streamed CSV export helpers
+
+Exports are written from an async cursor in fixed-size chunks, optionally gzipped.
+"""
+
+import csv
+import gzip
+import io
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from constants import EXPORT_BATCH_SIZE
+from services.csv_export import stream_csv, gzip_stream
+
+
+async def _cursor(docs):
+    for doc in docs:
+        yield doc
+
+
+async def _collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+@pytest.mark.unit
+async def test_stream_csv_has_no_row_cap_and_chunks_by_batch():
+    docs = [{"id": str(i), "name": f"Member {i}", "extra": "ignored"} for i in range(EXPORT_BATCH_SIZE * 2 + 1)]
+
+    chunks = await _collect(stream_csv(_cursor(docs), ["id", "name"]))
+    rows = list(csv.DictReader(io.StringIO(b"".join(chunks).decode("utf-8"))))
+
+    assert len(chunks) == 3
+    assert len(rows) == len(docs)
+    assert rows[-1] == {"id": str(len(docs) - 1), "name": f"Member {len(docs) - 1}"}
+
+
+@pytest.mark.unit
+async def test_stream_csv_writes_header_for_empty_export():
+    chunks = await _collect(stream_csv(_cursor([]), ["id", "name"]))
+
+    assert b"".join(chunks).decode("utf-8").strip() == "id,name"
+
+
+@pytest.mark.unit
+async def test_gzip_stream_round_trips():
+    docs = [{"id": str(i), "name": "x" * 50} for i in range(1000)]
+    plain = b"".join(await _collect(stream_csv(_cursor(docs), ["id", "name"])))
+
+    compressed = b"".join(await _collect(gzip_stream(stream_csv(_cursor(docs), ["id", "name"]))))
+
+    assert gzip.decompress(compressed) == plain
+    assert len(compressed) < len(plain)
@@ -0,0 +1,203 @@
+"""
+Test incremental maintenance of the materialized dashboard reminders
+
+A patch for a handful of members must produce the same lists as a full rebuild,
+and a stale or missing store must be recomputed by one request only.
+"""
+
+import asyncio
+import copy
+import fnmatch
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from routes import dashboard
+from routes.dashboard import _build_reminders, _merge_member_reminders, MEMBER_REMINDER_LISTS
+
+TODAY = "2025-06-15"
+WRITEOFF = {"birthday": 7, "grief_support": 30, "accident_illness": 14, "financial_aid": 30}
+
+
+def _member(member_id, **fields):
+    return {"id": member_id, "name": member_id.title(), "phone": "+62811", **fields}
+
+
+def _sources():
+    members = [
+        _member("alice", birth_date="1980-06-15", engagement_status="active"),
+        _member("bob", birth_date="1975-06-18", engagement_status="at_risk", days_since_last_contact=70),
+        _member("carol", engagement_status="disconnected", days_since_last_contact=120),
+    ]
+    grief = [
+        {"id": "g1", "member_id": "bob", "campus_id": "c1", "stage": "1_week", "scheduled_date": "2025-06-15"},
+        {"id": "g2", "member_id": "carol", "campus_id": "c1", "stage": "2_weeks", "scheduled_date": "2025-06-10"},
+    ]
+    accident = [
+        {"id": "a1", "member_id": "alice", "campus_id": "c1", "stage": "first_followup", "scheduled_date": "2025-06-17"},
+    ]
+    aid = [
+        {"id": "f1", "member_id": "carol", "campus_id": "c1", "aid_amount": 500000, "next_occurrence": "2025-06-01"},
+    ]
+    return members, grief, accident, aid, []
+
+
+def _only(rows, member_ids):
+    return [r for r in rows if r["member_id"] in member_ids]
+
+
+def _keyed(reminders):
+    return {key: sorted(repr(sorted(item.items(), key=str)) for item in reminders[key]) for key in MEMBER_REMINDER_LISTS}
+
+
+@pytest.mark.unit
+def test_full_build_groups_tasks():
+    members, grief, accident, aid, birthdays = _sources()
+    data = _build_reminders(TODAY, WRITEOFF, members, grief, accident, aid, birthdays)
+
+    assert [b["member_id"] for b in data["birthdays_today"]] == ["alice"]
+    assert [t["member_id"] for t in data["today_tasks"]] == ["bob"]
+    assert [g["member_id"] for g in data["grief_today"]] == ["carol"]
+    assert [f["member_id"] for f in data["financial_aid_due"]] == ["carol"]
+    assert [u["date"] for u in data["upcoming_tasks"]] == ["2025-06-17", "2025-06-18"]
+    assert data["total_members"] == 3
+
+
+@pytest.mark.unit
+def test_patch_matches_full_rebuild():
+    members, grief, accident, aid, birthdays = _sources()
+    current = _build_reminders(TODAY, WRITEOFF, members, grief, accident, aid, birthdays)
+
+    # Carol's grief stage is completed and she is contacted again
+    grief = [g for g in grief if g["id"] != "g2"]
+    members[2] = _member("carol", engagement_status="active", days_since_last_contact=0)
+
+    touched = ["carol"]
+    patch = _build_reminders(
+        TODAY, WRITEOFF, [m for m in members if m["id"] in touched],
+        _only(grief, touched), _only(accident, touched), _only(aid, touched), []
+    )
+    patched = _merge_member_reminders(current, patch, touched, total_members=3)
+    rebuilt = _build_reminders(TODAY, WRITEOFF, members, grief, accident, aid, birthdays)
+
+    assert _keyed(patched) == _keyed(rebuilt)
+    assert patched["total_tasks"] == rebuilt["total_tasks"]
+    assert patched["disconnected_members"] == []
+
+
+@pytest.mark.unit
+def test_patch_removes_deleted_member():
+    members, grief, accident, aid, birthdays = _sources()
+    current = _build_reminders(TODAY, WRITEOFF, members, grief, accident, aid, birthdays)
+
+    empty = _build_reminders(TODAY, WRITEOFF, [], [], [], [], [])
+    patched = _merge_member_reminders(current, empty, ["bob"], total_members=2)
+
+    for key in MEMBER_REMINDER_LISTS:
+        assert all(item["member_id"] != "bob" for item in patched[key])
+    assert patched["total_members"] == 2
+
+
+class _Cache:
+    """In-memory CacheService stand-in with the same key, update and lock semantics"""
+
+    def __init__(self):
+        self.values = {}
+        self.locks = set()
+
+    @staticmethod
+    def _key(key, church_id=None):
+        return f"{church_id}:{key}" if church_id else key
+
+    async def get(self, key, church_id=None):
+        return copy.deepcopy(self.values.get(self._key(key, church_id)))
+
+    async def set(self, key, value, ttl=None, church_id=None):
+        self.values[self._key(key, church_id)] = copy.deepcopy(value)
+        return True
+
+    async def update(self, key, updater, ttl=None, church_id=None):
+        full_key = self._key(key, church_id)
+        if full_key not in self.values:
+            return False
+        self.values[full_key] = copy.deepcopy(await updater(copy.deepcopy(self.values[full_key])))
+        return True
+
+    async def scan_keys(self, pattern, church_id=None):
+        return [k for k in self.values if fnmatch.fnmatchcase(k, self._key(pattern, church_id))]
+
+    async def acquire_lock(self, name, ttl=60, church_id=None):
+        full_key = self._key(name, church_id)
+        if full_key in self.locks:
+            return None
+        self.locks.add(full_key)
+        return full_key
+
+    async def release_lock(self, name, token, church_id=None):
+        self.locks.discard(token)
+
+
+@pytest.fixture
+def reminders_endpoint(monkeypatch):
+    """Dashboard reminders handler over a fake cache; calculations block until released"""
+    cache = _Cache()
+    release = asyncio.Event()
+    calculations = []
+
+    async def calculate(campus_id, campus_tz, today_date):
+        calculations.append(campus_id)
+        await release.wait()
+        return {"birthdays_today": [], "total_members": len(calculations)}
+
+    async def current_user(request):
+        return {"id": "u1", "campus_id": "c1"}
+
+    async def campus_timezone(campus_id):
+        return "Asia/Jakarta"
+
+    monkeypatch.setattr(dashboard, "get_cache", lambda: cache)
+    monkeypatch.setattr(dashboard, "get_db", lambda: None)
+    monkeypatch.setattr(dashboard, "get_current_user", current_user)
+    monkeypatch.setattr(dashboard, "calculate_dashboard_reminders", calculate)
+    monkeypatch.setattr(dashboard, "_get_campus_timezone", campus_timezone)
+    monkeypatch.setattr(dashboard, "_get_date_in_timezone", lambda tz: TODAY)
+
+    async def read():
+        return await dashboard.get_dashboard_reminders.fn(request=None)
+
+    return read, cache, release, calculations
+
+
+@pytest.mark.unit
+async def test_stale_store_is_served_while_one_background_rebuild_runs(reminders_endpoint):
+    read, cache, release, calculations = reminders_endpoint
+    await cache.set(dashboard.reminders_cache_key(TODAY), {"birthdays_today": [], "total_members": 0}, church_id="c1")
+    await dashboard.mark_dashboard_reminders_stale("c1")
+
+    served = await asyncio.gather(*(read() for _ in range(20)))
+
+    assert {(r["cache_source"], r["total_members"]) for r in served} == {("dragonfly_stale", 0)}
+    await asyncio.sleep(0)
+    assert calculations == ["c1"]
+
+    release.set()
+    await asyncio.gather(*dashboard._revalidation_tasks)
+    fresh = await read()
+    assert (fresh["cache_source"], fresh["total_members"]) == ("dragonfly", 1)
+    assert calculations == ["c1"] and not cache.locks
+
+
+@pytest.mark.unit
+async def test_concurrent_misses_compute_the_store_once(reminders_endpoint):
+    read, cache, release, calculations = reminders_endpoint
+
+    readers = asyncio.gather(*(read() for _ in range(5)))
+    await asyncio.sleep(0.05)
+    release.set()
+    results = await readers
+
+    assert calculations == ["c1"]
+    assert {r["total_members"] for r in results} == {1}
+    assert (await cache.get(dashboard.reminders_cache_key(TODAY), church_id="c1"))["total_members"] == 1
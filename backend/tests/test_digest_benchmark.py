@@ -0,0 +1,98 @@
+"""
+Benchmark the daily digest against a seeded campus
+
+The digest must issue a fixed number of queries regardless of how many members
+and open tasks the campus has (no per-member lookups).
+"""
+
+import pytest
+import time
+import uuid
+import sys
+import os
+from datetime import datetime, timezone, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import scheduler
+from scheduler import generate_daily_digest_for_campus, today_jakarta
+
+
+class CountingCollection:
+    def __init__(self, collection, counter):
+        self._collection = collection
+        self._counter = counter
+
+    def __getattr__(self, name):
+        if name in ("find", "find_one", "distinct", "aggregate", "count_documents"):
+            self._counter["queries"] += 1
+        return getattr(self._collection, name)
+
+
+class CountingDB:
+    def __init__(self, db):
+        self._db = db
+        self.counter = {"queries": 0}
+
+    def __getattr__(self, name):
+        return CountingCollection(getattr(self._db, name), self.counter)
+
+
+async def _seed_campus(db, campus_id: str, member_count: int):
+    today = today_jakarta()
+    members, events, grief = [], [], []
+    for i in range(member_count):
+        member_id = str(uuid.uuid4())
+        birthday = today + timedelta(days=i % 10)
+        members.append({
+            "id": member_id,
+            "campus_id": campus_id,
+            "name": f"Bench Member {i}",
+            "phone": f"+62811{i:07d}",
+            "birth_date": f"1980-{birthday.month:02d}-{birthday.day:02d}",
+            "last_contact_date": datetime.now(timezone.utc) - timedelta(days=i % 90),
+        })
+        events.append({
+            "id": str(uuid.uuid4()), "campus_id": campus_id, "member_id": member_id,
+            "event_type": "birthday", "completed": False, "ignored": False,
+        })
+        if i % 100 == 0:
+            grief.append({
+                "id": str(uuid.uuid4()), "campus_id": campus_id, "member_id": member_id,
+                "stage": "1_week", "scheduled_date": (today - timedelta(days=i % 3)).isoformat(),
+                "completed": False,
+            })
+    await db.members.insert_many(members)
+    await db.care_events.insert_many(events)
+    await db.grief_support.insert_many(grief)
+
+
+async def _run_digest(monkeypatch, db, campus_id: str):
+    counting = CountingDB(db)
+    monkeypatch.setattr(scheduler, "db", counting)
+    started = time.perf_counter()
+    digest = await generate_daily_digest_for_campus(campus_id, "Benchmark Campus")
+    elapsed = time.perf_counter() - started
+    return digest, counting.counter["queries"], elapsed
+
+
+@pytest.mark.slow
+@pytest.mark.integration
+async def test_digest_query_count_is_independent_of_campus_size(test_db, monkeypatch):
+    """Digest issues the same number of queries for a small and a large campus"""
+    # Seeded into the test database (cleaned by the fixture), never the scheduler's DB_NAME
+    small_campus, large_campus = f"bench-{uuid.uuid4()}", f"bench-{uuid.uuid4()}"
+    await _seed_campus(test_db, small_campus, 50)
+    await _seed_campus(test_db, large_campus, 5000)
+
+    small, small_queries, small_elapsed = await _run_digest(monkeypatch, test_db, small_campus)
+    large, large_queries, large_elapsed = await _run_digest(monkeypatch, test_db, large_campus)
+
+    print(f"\ndigest 50 members: {small_queries} queries in {small_elapsed:.3f}s")
+    print(f"digest 5000 members: {large_queries} queries in {large_elapsed:.3f}s")
+
+    assert small is not None and large is not None
+    assert small_queries == large_queries
+    assert large["stats"]["birthdays_today"] == 500
+    assert large["stats"]["birthdays_week"] == 3500
+    assert large["stats"]["grief_due"] + large["stats"]["overdue_grief"] == 50
@@ -0,0 +1,141 @@
+"""
+Test the set-based engagement recompute and the stored engagement writers
+
+Recomputing must cost one update_many per campus and only match members whose
+stored engagement differs from the recomputed one. Reads serve the stored values,
+so inserts and contact writers must store the engagement they imply.
+"""
+
+import pytest
+import uuid
+import sys
+import os
+from datetime import datetime, timezone, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import routes.grief_support as grief_support
+from models import to_mongo_doc
+from services.engagement_service import EngagementService
+from services.member_import import row_to_member
+from tests.conftest import FakeCollection, FakeDB, FakeResult
+from utils import calculate_engagement_status
+
+
+class _Members(FakeCollection):
+    """members whose pipeline updates ($expr) report a fixed modified count per campus"""
+
+    def __init__(self, campus_ids, modified):
+        super().__init__({"campus_id": campus_id} for campus_id in campus_ids)
+        self._modified = modified
+
+    async def update_many(self, query, update, upsert=False):
+        self.updates.append((query, update))
+        return FakeResult(self._modified.get(query["campus_id"], 0))
+
+
+@pytest.mark.unit
+async def test_recompute_is_one_pipeline_update_per_campus_matching_only_stale_members():
+    members = _Members(["c1", "c2", "c3"], {"c1": 12, "c3": 1})
+
+    updated = await EngagementService(FakeDB(members=members)).recompute(at_risk_days=30, disconnected_days=45)
+
+    assert updated == {"c1": 12, "c3": 1}
+    assert [query["campus_id"] for query, _ in members.updates] == ["c1", "c2", "c3"]
+    query, update = members.updates[0]
+    assert "$expr" in query
+    assert isinstance(update, list) and [list(stage["$set"]) for stage in update] == [
+        ["days_since_last_contact"], ["engagement_status"],
+    ]
+    branches = update[1]["$set"]["engagement_status"]["$switch"]["branches"]
+    assert [b["case"]["$lt"][1] for b in branches] == [30, 45]
+
+
+@pytest.mark.unit
+async def test_thresholds_come_from_engagement_settings_with_defaults():
+    configured = FakeDB(settings=FakeCollection([
+        {"key": "engagement_thresholds", "data": {"atRiskDays": 21, "disconnectedDays": 40}},
+    ]))
+    assert await EngagementService(configured).get_thresholds() == (21, 40)
+    assert await EngagementService(FakeDB()).get_thresholds() == (60, 90)
+
+    members = _Members(["c1"], {})
+    await EngagementService(FakeDB(members=members)).recompute(campus_id="c9")
+    assert [query["campus_id"] for query, _ in members.updates] == ["c9"]
+
+
+@pytest.mark.unit
+def test_imported_member_is_stored_as_never_contacted():
+    doc = to_mongo_doc(row_to_member({"name": "Budi", "phone": "08123456789"}, "c1"))
+
+    assert doc["engagement_status"] == "disconnected"
+    assert doc["days_since_last_contact"] == 999
+    assert doc.get("last_contact_date") is None
+
+
+@pytest.mark.unit
+async def test_completed_grief_stage_stores_the_member_as_active(monkeypatch):
+    db = FakeDB(
+        members=FakeCollection([{"id": "m1", "name": "Siti"}]),
+        grief_support=FakeCollection([{"id": "s1", "member_id": "m1", "campus_id": "c1", "stage": "1_week"}]),
+    )
+
+    async def noop(*args, **kwargs):
+        return None
+
+    async def timezone_of(campus_id):
+        return "Asia/Jakarta"
+
+    class _Rollups:
+        def __init__(self, db):
+            pass
+
+        mark_care_events = staticmethod(noop)
+
+    async def current_user(request):
+        return {"id": "u1", "name": "Pastor"}
+
+    monkeypatch.setattr(grief_support, "get_db", lambda: db)
+    monkeypatch.setattr(grief_support, "get_current_user", current_user)
+    monkeypatch.setattr(grief_support, "RollupService", _Rollups)
+    grief_support.init_grief_support_routes(noop, noop, noop, timezone_of, lambda tz: "2026-10-17")
+
+    await grief_support.complete_grief_stage.fn("s1", request=None)
+
+    ((query, update),) = db.members.updates
+    assert query == {"id": "m1"}
+    assert update["$set"]["engagement_status"] == "active"
+    assert update["$set"]["days_since_last_contact"] == 0
+    assert update["$set"]["last_contact_date"] is not None
+
+
+@pytest.mark.slow
+@pytest.mark.integration
+async def test_recompute_stores_what_calculate_engagement_status_computes(test_db, test_campus, second_campus):
+    await test_db.settings.insert_one({"key": "engagement_thresholds", "data": {"atRiskDays": 30, "disconnectedDays": 60}})
+    now = datetime.now(timezone.utc)
+    members = []
+    for days in (0, 29, 30, 31, 59, 60, 61, 89, 90, 91):
+        # An hour past the day boundary, so the pipeline and Python agree on the whole day count
+        last_contact = now - timedelta(days=days, hours=1)
+        members.append({"last_contact_date": last_contact})
+        members.append({"last_contact_date": last_contact.isoformat()})  # Legacy rows store ISO strings
+    members += [{"last_contact_date": None}, {}, {"last_contact_date": "not a date"}]
+    # Stored values that are all wrong, so every member needs an update
+    await test_db.members.insert_many([
+        {"id": str(uuid.uuid4()), "campus_id": campus["id"], "name": f"Member {i}",
+         "engagement_status": "active", "days_since_last_contact": -1, **member}
+        for campus in (test_campus, second_campus) for i, member in enumerate(members)
+    ])
+
+    updated = await EngagementService(test_db).recompute(campus_id=test_campus["id"])
+
+    assert updated == {test_campus["id"]: len(members)}
+    for member in await test_db.members.find({"campus_id": test_campus["id"]}, {"_id": 0}).to_list(None):
+        status, days = calculate_engagement_status(member.get("last_contact_date"), 30, 60)
+        assert (member["engagement_status"], member["days_since_last_contact"]) == (status.value, days), member
+    # Other campuses are left alone
+    assert await test_db.members.count_documents({"campus_id": second_campus["id"], "days_since_last_contact": -1}) == len(members)
+
+    # Already current rows are not rewritten
+    assert await EngagementService(test_db).recompute(campus_id=test_campus["id"]) == {}
@@ -0,0 +1,84 @@
+"""
+Test the shared HTTP client registry
+
+Outbound calls reuse one pooled client per upstream and retry transient failures.
+"""
+
+import httpx
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import http_client
+from services.http_client import (
+    get_http_client, shared_http_client, request_with_retry, init_http_clients, close_http_clients,
+    UPSTREAM_WHATSAPP, UPSTREAM_CORE_API,
+)
+
+
+@pytest.mark.unit
+async def test_clients_are_shared_per_upstream_and_closed_on_shutdown():
+    await init_http_clients()
+    whatsapp = get_http_client(UPSTREAM_WHATSAPP)
+
+    async with shared_http_client(UPSTREAM_WHATSAPP) as borrowed:
+        assert borrowed is whatsapp
+    assert not whatsapp.is_closed  # Borrowing never closes the pooled client
+    assert get_http_client(UPSTREAM_CORE_API) is not whatsapp
+
+    await close_http_clients()
+    assert whatsapp.is_closed
+    assert get_http_client(UPSTREAM_WHATSAPP) is not whatsapp
+    await close_http_clients()
+
+
+@pytest.mark.unit
+async def test_request_with_retry_recovers_from_connect_errors(monkeypatch):
+    calls = []
+
+    def handler(request):
+        calls.append(request.url)
+        if len(calls) < 3:
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(200, json={"code": "SUCCESS"})
+
+    monkeypatch.setattr(http_client, "API_RETRY_DELAYS", [0])
+    monkeypatch.setitem(http_client._clients, UPSTREAM_WHATSAPP, httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+    response = await request_with_retry("POST", "http://gateway/send/message", upstream=UPSTREAM_WHATSAPP, json={})
+
+    assert response.json() == {"code": "SUCCESS"}
+    assert len(calls) == 3
+    await close_http_clients()
+
+
+@pytest.mark.unit
+async def test_request_with_retry_gives_up_after_max_retries(monkeypatch):
+    def handler(request):
+        raise httpx.ConnectError("connection refused", request=request)
+
+    monkeypatch.setattr(http_client, "API_RETRY_DELAYS", [0])
+    monkeypatch.setitem(http_client._clients, UPSTREAM_CORE_API, httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+    with pytest.raises(httpx.ConnectError):
+        await request_with_retry("GET", "http://core/api/members/", upstream=UPSTREAM_CORE_API, max_retries=2)
+    await close_http_clients()
+
+
+@pytest.mark.unit
+async def test_shared_clients_do_not_carry_cookies_between_requests():
+    client = http_client._create_client(UPSTREAM_CORE_API)
+    first = httpx.Request("GET", "https://core.example.org/api/members?church_id=c1")
+    response = httpx.Response(200, headers={"set-cookie": "session=campus-1; Path=/"}, request=first)
+
+    client.cookies.extract_cookies(response)
+
+    assert len(client.cookies.jar) == 0
+    second = client.build_request("GET", "https://core.example.org/api/members?church_id=c2")
+    assert "cookie" not in second.headers
+    # Cookies a caller sets explicitly are still sent
+    explicit = client.build_request("GET", "https://core.example.org/", headers={"Cookie": "a=b"})
+    assert explicit.headers["cookie"] == "a=b"
+    await client.aclose()
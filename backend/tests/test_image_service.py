@@ -0,0 +1,113 @@
+"""
+Test the photo processing pipeline
+
+One upload must produce every size in every supported format under content-hashed
+names, and replacing a photo must clean up only the files it no longer references.
+"""
+
+import asyncio
+import io
+import pytest
+import sys
+import os
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+
+from services import image_service
+from services.image_service import (
+    HASHED_PHOTO_NAME, MEMBER_PHOTO_SIZES, ImageService, photo_formats, render_variants,
+)
+
+
+def _jpeg(width=1600, height=1200, color=(200, 120, 40)):
+    buf = io.BytesIO()
+    Image.new("RGB", (width, height), color).save(buf, "JPEG", quality=90)
+    return buf.getvalue()
+
+
+@pytest.mark.unit
+def test_render_variants_writes_hashed_sizes_in_each_format(tmp_path):
+    formats = photo_formats()
+    variants = render_variants(_jpeg(), MEMBER_PHOTO_SIZES, str(tmp_path), "member-1", formats)
+
+    assert set(variants) == set(MEMBER_PHOTO_SIZES)
+    for size_name, (width, height) in MEMBER_PHOTO_SIZES.items():
+        assert set(variants[size_name]) == set(formats)
+        for filename in variants[size_name].values():
+            assert HASHED_PHOTO_NAME.search(filename)
+            with Image.open(tmp_path / filename) as img:
+                # 4:3 landscape source: width fills the box, aspect ratio is kept
+                assert img.size == (width, height * 3 // 4)
+
+    # Same bytes, same names (re-uploads are idempotent); new bytes, new names
+    again = render_variants(_jpeg(), MEMBER_PHOTO_SIZES, str(tmp_path), "member-1", formats)
+    changed = render_variants(_jpeg(color=(10, 20, 30)), MEMBER_PHOTO_SIZES, str(tmp_path), "member-1", formats)
+    assert again == variants
+    assert changed["medium"]["jpeg"] != variants["medium"]["jpeg"]
+
+
+@pytest.mark.unit
+def test_render_variants_rejects_non_images(tmp_path):
+    with pytest.raises(ValueError):
+        render_variants(b"not an image", MEMBER_PHOTO_SIZES, str(tmp_path), "member-1", ("jpeg",))
+
+
+@pytest.mark.unit
+def test_delete_photo_files_keeps_current_upload(tmp_path, monkeypatch):
+    monkeypatch.setattr(image_service, "UPLOAD_DIR", tmp_path)
+    old = render_variants(_jpeg(), MEMBER_PHOTO_SIZES, str(tmp_path), "member-1", ("jpeg", "webp"))
+    new = render_variants(_jpeg(color=(1, 2, 3)), MEMBER_PHOTO_SIZES, str(tmp_path), "member-1", ("jpeg", "webp"))
+    (tmp_path / "original.jpg").write_bytes(b"imported original")
+
+    def as_doc(variants, photo_url=None):
+        urls = {s: {f: f"/uploads/{n}" for f, n in names.items()} for s, names in variants.items()}
+        return {"photo_url": photo_url or urls["medium"]["jpeg"], "photo_variants": urls}
+
+    deleted = ImageService.delete_photo_files(as_doc(old, "/uploads/original.jpg"), keep=as_doc(new))
+
+    assert deleted == 6
+    assert sorted(os.listdir(tmp_path)) == sorted(["original.jpg", *(n for v in new.values() for n in v.values())])
+
+
+class _Pool:
+    """Executor stand-in; the first pool created dies under every job submitted to it"""
+
+    created = []
+
+    def __init__(self, **kwargs):
+        self.broken = not _Pool.created
+        self.shut_down = False
+        _Pool.created.append(self)
+
+    def submit(self, fn, *args):
+        future = Future()
+        if self.broken or self.shut_down:
+            future.set_exception(BrokenProcessPool("A process in the process pool was terminated abruptly"))
+        else:
+            future.set_result(fn(*args))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+@pytest.mark.unit
+async def test_jobs_failing_on_one_broken_pool_restart_it_once(tmp_path, monkeypatch):
+    _Pool.created = []
+    monkeypatch.setattr(image_service, "ProcessPoolExecutor", _Pool)
+    monkeypatch.setattr(image_service, "_pool", None)
+    sizes = {"thumbnail": (100, 100)}
+
+    results = await asyncio.gather(*(
+        image_service._run_in_pool(_jpeg(), sizes, str(tmp_path), f"m{i}", ("jpeg",)) for i in range(3)
+    ))
+
+    assert all(set(variants["thumbnail"]) == {"jpeg"} for variants in results)
+    first, replacement = _Pool.created
+    assert first.shut_down and not replacement.shut_down
+    assert image_service._pool is replacement
+    image_service.close_image_pool()
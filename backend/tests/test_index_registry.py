@@ -0,0 +1,131 @@
+"""
+Test the index registry reconcile and $indexStats report
+
+Reconciling must be idempotent, change TTLs in place and never drop or rebuild
+an index on its own: option conflicts and indexes outside the registry are
+only reported.
+"""
+
+import pytest
+import sys
+import os
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pymongo.errors import OperationFailure
+
+from services.index_registry import INDEXES, reconcile_indexes, index_usage_report, _ix
+
+
+class FakeCollection:
+    """Index catalog of one collection, shaped like index_information()"""
+
+    def __init__(self, db, name):
+        self.db = db
+        self.name = name
+        self.indexes = {"_id_": {"key": [("_id", 1)]}}
+        self.ops = {}
+
+    async def index_information(self):
+        return {name: dict(info) for name, info in self.indexes.items()}
+
+    async def create_index(self, keys, name, **options):
+        if name in self.db.fail_names:
+            raise OperationFailure("E11000 duplicate key error", 11000, {"errmsg": "E11000 duplicate key error"})
+        self.indexes[name] = {"key": list(keys), **options}
+
+    async def drop_index(self, name):
+        del self.indexes[name]
+
+    async def aggregate(self, pipeline):
+        assert pipeline == [{"$indexStats": {}}]
+        since = datetime(2026, 10, 1, tzinfo=timezone.utc)
+        for name, info in self.indexes.items():
+            spec = {"key": dict(info["key"]), **{k: v for k, v in info.items() if k != "key"}}
+            yield {"name": name, "spec": spec, "accesses": {"ops": self.ops.get(name, 0), "since": since}}
+
+
+class FakeDb:
+    def __init__(self):
+        self.collections = {}
+        self.fail_names = set()
+
+    def __getitem__(self, name):
+        if name not in self.collections:
+            self.collections[name] = FakeCollection(self, name)
+        return self.collections[name]
+
+    async def command(self, command):
+        index = command["index"]
+        self.collections[command["collMod"]].indexes[index["name"]]["expireAfterSeconds"] = index["expireAfterSeconds"]
+
+
+REGISTRY = {
+    "members": (
+        _ix("campus_id", "name", "id"),
+        _ix("campus_id", "external_member_id", unique=True, partial={"external_member_id": {"$type": "string"}}),
+    ),
+    "job_locks": (
+        _ix("lock_id", unique=True),
+        _ix("expires_at", expire_after_seconds=0),
+    ),
+    "webhook_logs": (
+        _ix("received_at", expire_after_seconds=3600),
+    ),
+}
+
+
+@pytest.mark.unit
+async def test_reconcile_creates_missing_indexes_once_and_only_reports_the_rest():
+    db = FakeDb()
+    db["members"].indexes["campus_id_1_external_member_id_1"] = {
+        "key": [("campus_id", 1), ("external_member_id", 1)], "unique": True, "sparse": True,
+    }
+    db["members"].indexes["last_contact_date_1"] = {"key": [("last_contact_date", 1.0)]}
+    db["job_locks"].indexes["expires_at_1"] = {"key": [("expires_at", 1)]}
+    db.fail_names.add("lock_id_1")
+
+    report = await reconcile_indexes(db, REGISTRY)
+
+    assert report.created == ["members.campus_id_1_name_1_id_1", "webhook_logs.received_at_1"]
+    assert report.updated == ["job_locks.expires_at_1"]
+    assert db["job_locks"].indexes["expires_at_1"]["expireAfterSeconds"] == 0
+    (conflict,) = report.conflicts
+    assert conflict.startswith("members.campus_id_1_external_member_id_1") and "sparse" in conflict
+    assert report.failed == ["job_locks.lock_id_1 (E11000 duplicate key error)"]
+    assert report.unlisted == ["members.last_contact_date_1"]
+    assert "last_contact_date_1" in db["members"].indexes
+
+    db.fail_names.clear()
+    again = await reconcile_indexes(db, REGISTRY)
+    assert again.created == ["job_locks.lock_id_1"] and not again.updated
+
+    third = await reconcile_indexes(db, REGISTRY, drop_unlisted=True)
+    assert not third.created and not third.updated and not third.failed
+    assert third.dropped == ["members.last_contact_date_1"]
+    assert "last_contact_date_1" not in db["members"].indexes
+
+
+@pytest.mark.unit
+async def test_usage_report_skips_unique_and_ttl_indexes_when_unused():
+    db = FakeDb()
+    await reconcile_indexes(db, REGISTRY)
+    await db["webhook_logs"].drop_index("received_at_1")
+    db["members"].indexes["name_text_phone_text"] = {"key": [("_fts", "text"), ("_ftsx", 1)]}
+    db["members"].ops["name_text_phone_text"] = 4
+
+    report = await index_usage_report(db, REGISTRY)
+
+    assert [(u.collection, u.name) for u in report.unused] == [("members", "campus_id_1_name_1_id_1")]
+    assert report.missing == ["webhook_logs.received_at_1"]
+    (unlisted,) = report.unlisted
+    assert (unlisted.name, unlisted.ops) == ("name_text_phone_text", 4)
+
+
+@pytest.mark.unit
+def test_registry_has_no_duplicate_names_or_key_patterns():
+    for collection, specs in INDEXES.items():
+        names = [spec.index_name for spec in specs]
+        assert len(names) == len(set(names)), collection
+        assert len({spec.keys for spec in specs}) == len(specs), collection
@@ -0,0 +1,66 @@
+"""
+Test the request-scoped batching loaders
+
+Lookups issued together must collapse into one $in query and repeat lookups must hit the memo.
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.loaders import EntityLoader, display_name
+from tests.conftest import FakeCollection
+
+
+def _members():
+    return FakeCollection([{"id": f"m{i}", "name": f"Member {i}"} for i in range(5)])
+
+
+@pytest.mark.unit
+async def test_concurrent_loads_are_coalesced_into_one_query():
+    members = _members()
+    loader = EntityLoader(members)
+
+    found = await loader.load_many(["m1", "m2", "m1", "missing", None])
+
+    assert members.queries == [{"id": {"$in": ["m1", "m2", "missing"]}}]
+    assert display_name(found["m1"]) == "Member 1"
+    assert found["missing"] is None and display_name(found["missing"]) == "Unknown"
+
+    # Separate gather() callers in the same tick share the batch too
+    a, b = await asyncio.gather(loader.load("m3"), loader.load("m4"))
+    assert (a["name"], b["name"]) == ("Member 3", "Member 4")
+    assert len(members.queries) == 2
+
+
+@pytest.mark.unit
+async def test_results_and_misses_are_memoized_and_primed_docs_skip_the_query():
+    members = _members()
+    loader = EntityLoader(members)
+    loader.prime({"id": "m0", "name": "Already loaded"})
+
+    assert (await loader.load("m0"))["name"] == "Already loaded"
+    await loader.load_many(["m1", "missing"])
+    await loader.load_many(["m1", "missing", "m0"])
+
+    assert members.queries == [{"id": {"$in": ["m1", "missing"]}}]
+    assert loader.query_count == 1
+
+
+@pytest.mark.unit
+async def test_failed_batches_are_not_memoized():
+    members = _members()
+    loader = EntityLoader(members)
+    original_find = members.find
+
+    def failing_find(query, projection=None):
+        members.find = original_find
+        raise RuntimeError("connection reset")
+
+    members.find = failing_find
+    with pytest.raises(RuntimeError):
+        await loader.load("m1")
+    assert (await loader.load("m1"))["name"] == "Member 1"
@@ -0,0 +1,64 @@
+"""
+Test row validation for the streaming member import
+
+Rows are validated into Member structs before being batched for insert_many.
+"""
+
+import pytest
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.member_import import MemberImportService, row_to_member, iter_csv_rows
+from tests.conftest import FakeCollection, FakeDB
+
+
+@pytest.mark.unit
+def test_row_is_cleaned_into_member():
+    member = row_to_member(
+        {"name": "  Budi Santoso ", "phone": "08123456789", "external_member_id": "", "notes": " "},
+        campus_id="c1"
+    )
+
+    assert member.name == "Budi Santoso"
+    assert member.campus_id == "c1"
+    assert member.phone.startswith("+62")
+    assert member.external_member_id is None
+    assert member.notes is None
+
+
+@pytest.mark.unit
+def test_row_without_name_is_rejected():
+    with pytest.raises(ValueError):
+        row_to_member({"name": "   ", "phone": "08123456789"}, campus_id="c1")
+
+
+@pytest.mark.unit
+def test_csv_rows_stream_from_file_with_bom(tmp_path):
+    path = tmp_path / "members.csv"
+    path.write_text("\ufeffname,phone\nAlice,0811\nBob,\n", encoding="utf-8")
+
+    rows = list(iter_csv_rows(str(path)))
+
+    assert [r["name"] for r in rows] == ["Alice", "Bob"]
+
+
+@pytest.mark.unit
+async def test_job_orphaned_by_a_restart_is_reported_failed():
+    # Naive UTC datetimes, as Motor returns them
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    jobs = FakeCollection([
+        {"id": "old", "campus_id": "c1", "status": "running", "updated_at": now - timedelta(hours=1)},
+        {"id": "busy", "campus_id": "c1", "status": "running", "updated_at": now - timedelta(seconds=5)},
+        {"id": "done", "campus_id": "c1", "status": "completed", "updated_at": now - timedelta(days=1)},
+    ])
+    importer = MemberImportService(FakeDB(import_jobs=jobs))
+
+    orphaned = await importer.get_job("old", "c1")
+    assert orphaned["status"] == "failed" and "interrupted" in orphaned["error"]
+    assert (await jobs.find_one({"id": "old"}))["status"] == "failed"
+    assert (await importer.get_job("busy", "c1"))["status"] == "running"
+    assert (await importer.get_job("done", "c1"))["status"] == "completed"
+    assert await importer.get_job("old", "c2") is None
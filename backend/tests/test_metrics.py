@@ -0,0 +1,75 @@
+"""
+Test the metrics registry, Mongo command listener and Prometheus rendering
+
+Each worker keeps its own values; /metrics sums the published snapshots of
+all workers, so merging must add histograms bucket by bucket.
+"""
+
+import pytest
+import sys
+import os
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from apscheduler.events import EVENT_JOB_SUBMITTED, EVENT_JOB_EXECUTED, EVENT_JOB_ERROR
+
+import services.metrics as metrics
+
+
+@pytest.mark.unit
+def test_worker_snapshots_are_summed_and_rendered_as_cumulative_buckets():
+    buckets = len(metrics.HTTP_REQUEST_DURATION.buckets)
+    # Worker 1: one request under 5 ms; worker 2: one request above every bucket
+    fast = [1] + [0] * buckets + [0.004]
+    slow = [0] * buckets + [1, 12.0]
+    labels = ["GET", "/members", "200"]
+    snapshots = [
+        {"http_request_duration_seconds": [[labels, fast]], "cache_requests_total": [[["local", "hit"], 3]]},
+        {"http_request_duration_seconds": [[labels, slow]], "cache_requests_total": [[["local", "hit"], 4]]},
+    ]
+
+    text = metrics.render(snapshots)
+
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/members",status="200",le="0.005"} 1' in text
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/members",status="200",le="10"} 1' in text
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/members",status="200",le="+Inf"} 2' in text
+    assert 'http_request_duration_seconds_count{method="GET",route="/members",status="200"} 2' in text
+    assert 'cache_requests_total{tier="local",result="hit"} 7' in text
+    assert "# TYPE http_request_duration_seconds histogram" in text
+    assert "metrics_workers 2" in text
+
+
+@pytest.mark.unit
+def test_mongo_listener_times_commands_per_collection_and_counts_returned_documents():
+    listener = metrics.MongoCommandMetrics()
+    before = (metrics.MONGO_DOCUMENTS_RETURNED.values.get(("members", "getMore"), 0),
+              (metrics.MONGO_COMMAND_DURATION.values.get(("members", "find")) or [0])[-1])
+
+    def run(name, command, reply, request_id):
+        listener.started(SimpleNamespace(command_name=name, command=command, connection_id=("db", 27017), request_id=request_id))
+        listener.succeeded(SimpleNamespace(command_name=name, reply=reply, connection_id=("db", 27017),
+                                           request_id=request_id, duration_micros=2500))
+
+    run("find", {"find": "members"}, {"cursor": {"firstBatch": [{}, {}]}}, 1)
+    run("getMore", {"getMore": 12345, "collection": "members"}, {"cursor": {"nextBatch": [{}] * 3}}, 2)
+    run("hello", {"hello": 1}, {}, 3)
+
+    assert metrics.MONGO_DOCUMENTS_RETURNED.values[("members", "getMore")] - before[0] == 3
+    assert metrics.MONGO_COMMAND_DURATION.values[("members", "find")][-1] - before[1] == pytest.approx(0.0025)
+    assert not any(labels[1] == "hello" for labels in metrics.MONGO_COMMAND_DURATION.values)
+    assert listener._pending == {}
+
+
+@pytest.mark.unit
+def test_scheduler_listener_records_run_time_and_outcome():
+    listener = metrics.SchedulerJobMetrics()
+    before = sum((metrics.SCHEDULER_JOB_DURATION.values.get(("nightly", "error")) or [0, 0])[:-1])
+
+    listener(SimpleNamespace(code=EVENT_JOB_SUBMITTED, job_id="nightly"))
+    listener(SimpleNamespace(code=EVENT_JOB_ERROR, job_id="nightly"))
+    # A completion without a recorded submission is ignored
+    listener(SimpleNamespace(code=EVENT_JOB_EXECUTED, job_id="nightly"))
+
+    assert sum(metrics.SCHEDULER_JOB_DURATION.values[("nightly", "error")][:-1]) - before == 1
+    assert ("nightly", "ok") not in metrics.SCHEDULER_JOB_DURATION.values
@@ -0,0 +1,108 @@
+"""
+Test keyset (cursor) pagination helpers
+
+Cursors encode the sort key of the last row on a page and expand into a range
+filter, so deep pages seek instead of skipping.
+"""
+
+import pytest
+import sys
+import os
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.pagination import (
+    CARE_EVENT_SORT, MEMBER_SORT, RECENT_FIRST_SORT,
+    decode_cursor, encode_cursor, keyset_query, split_page,
+)
+
+
+@pytest.mark.unit
+def test_cursor_round_trips_datetimes_and_rejects_garbage():
+    created = datetime(2026, 3, 1, 8, 30, tzinfo=timezone.utc)
+    cursor = encode_cursor(["2026-03-01", created, "evt-1"])
+
+    assert decode_cursor(cursor, CARE_EVENT_SORT) == ["2026-03-01", created, "evt-1"]
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor!", CARE_EVENT_SORT)
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, MEMBER_SORT)  # Cursor from a different listing
+
+
+@pytest.mark.unit
+def test_keyset_query_expands_to_range_after_cursor():
+    base = {"campus_id": "c1"}
+    assert keyset_query(base, MEMBER_SORT, None) is base
+
+    query = keyset_query(base, MEMBER_SORT, encode_cursor(["Budi", "m-9"]))
+    assert query == {"$and": [base, {"$or": [
+        {"name": {"$gt": "Budi"}},
+        {"name": "Budi", "id": {"$gt": "m-9"}},
+    ]}]}
+
+    created = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    query = keyset_query({}, RECENT_FIRST_SORT, encode_cursor([created, "log-1"]))
+    assert query == {"$or": [
+        {"$or": [{"created_at": {"$lt": created}}, {"created_at": None}]},
+        {"created_at": created, "$or": [{"id": {"$lt": "log-1"}}, {"id": None}]},
+    ]}
+
+
+def _matches(doc, query):
+    """Evaluate the operators keyset_query emits the way MongoDB does (nulls match neither $gt nor $lt)"""
+    for key, cond in query.items():
+        if key == "$and":
+            ok = all(_matches(doc, q) for q in cond)
+        elif key == "$or":
+            ok = any(_matches(doc, q) for q in cond)
+        elif isinstance(cond, dict):
+            value = doc.get(key)
+            op, bound = next(iter(cond.items()))
+            if op == "$ne":
+                ok = value != bound
+            else:
+                ok = value is not None and (value > bound if op == "$gt" else value < bound)
+        else:
+            ok = doc.get(key) == cond
+        if not ok:
+            return False
+    return True
+
+
+def _mongo_order(docs, sort):
+    """Sort like MongoDB: null and missing values before every other value"""
+    for field, direction in reversed(sort):
+        docs = sorted(docs, key=lambda d: (d.get(field) is not None, d.get(field) or 0), reverse=direction < 0)
+    return docs
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("sort", [RECENT_FIRST_SORT, (("created_at", 1), ("id", 1))])
+def test_cursor_pages_keep_rows_with_a_null_sort_value(sort):
+    day = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    docs = [{"id": f"r-{i}", "created_at": day.replace(day=1 + i % 3)} for i in range(5)]
+    docs += [{"id": "r-null", "created_at": None}, {"id": "r-missing"}]
+    ordered = _mongo_order(docs, sort)
+
+    seen, cursor = [], None
+    while True:
+        rows = _mongo_order([d for d in docs if _matches(d, keyset_query({}, sort, cursor))], sort)
+        page, cursor = split_page(rows[:3], sort, 2)
+        seen += page
+        if not cursor:
+            break
+
+    assert [d["id"] for d in seen] == [d["id"] for d in ordered]
+
+
+@pytest.mark.unit
+def test_split_page_only_returns_cursor_when_more_rows_exist():
+    rows = [{"name": f"Member {i}", "id": f"m-{i}"} for i in range(4)]
+
+    page, cursor = split_page(rows, MEMBER_SORT, 3)
+    assert page == rows[:3]
+    assert decode_cursor(cursor, MEMBER_SORT) == ["Member 2", "m-2"]
+
+    page, cursor = split_page(rows[:3], MEMBER_SORT, 3)
+    assert page == rows[:3] and cursor is None
@@ -8,6 +8,7 @@ import pytest
 import sys
 import os
 from datetime import datetime, timezone, timedelta, date
+from types import SimpleNamespace
 import uuid
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -314,3 +315,37 @@ async def test_recent_notes_for_campus(test_db, test_campus, pastoral_note):
     }).sort("created_at", -1).limit(10).to_list(None)
 
     assert len(recent) >= 1
+
+
+@pytest.mark.slow
+@pytest.mark.integration
+async def test_note_listing_pages_stay_within_query_budget(test_db, test_campus, server_module, query_budget, monkeypatch):
+    """Member names for a page come from one batched lookup, not one find per note"""
+    async def pastor(request):
+        return {"id": "pastor-1", "name": "Pastor", "role": "pastor", "campus_id": test_campus["id"]}
+
+    monkeypatch.setattr(server_module, "get_current_user", pastor)
+    created = datetime(2026, 10, 1, tzinfo=timezone.utc)
+    members = [{"id": str(uuid.uuid4()), "campus_id": test_campus["id"], "name": f"Member {i}"} for i in range(30)]
+    await test_db.members.insert_many(members)
+    await test_db.pastoral_notes.insert_many([
+        {"id": str(uuid.uuid4()), "campus_id": test_campus["id"], "member_id": member["id"], "category": "visit",
+         "title": f"Visit {i}", "is_private": False, "created_at": created - timedelta(hours=i)}
+        for i, member in enumerate(members)
+    ])
+
+    # Count, page and member names
+    with query_budget(3, max_repeats=2):
+        first = await server_module.list_pastoral_notes.fn(SimpleNamespace(state=SimpleNamespace()), limit=20)
+
+    assert first["total"] == 30 and len(first["items"]) == 20
+    assert [note["member_name"] for note in first["items"]] == [f"Member {i}" for i in range(20)]
+
+    # Cursor pages skip the count
+    with query_budget(2, max_repeats=2):
+        rest = await server_module.list_pastoral_notes.fn(
+            SimpleNamespace(state=SimpleNamespace()), limit=20, cursor=first["next_cursor"]
+        )
+
+    assert [note["member_name"] for note in rest["items"]] == [f"Member {i}" for i in range(20, 30)]
+    assert rest["next_cursor"] is None
@@ -0,0 +1,92 @@
+"""
+Test the request-scoped query profiler
+
+Commands are attributed to the profile active in the caller's context; the same
+query shape issued repeatedly (find_one in a loop) is reported as a possible N+1.
+"""
+
+import pytest
+import re
+import sys
+import os
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.query_profiler import (
+    QueryProfilerListener, QueryBudgetExceeded, profile_queries, query_shape, plan_summary,
+)
+
+_listener = QueryProfilerListener()
+_request_ids = iter(range(1, 1_000_000))
+
+
+def _run(name, command, duration_ms=1.0):
+    """Feed one command through the listener as the driver would"""
+    request_id = next(_request_ids)
+    _listener.started(SimpleNamespace(
+        command_name=name, command={name: command.pop("collection"), **command},
+        database_name="pastoral_care_db", connection_id=("db", 27017), request_id=request_id,
+    ))
+    _listener.succeeded(SimpleNamespace(
+        command_name=name, connection_id=("db", 27017), request_id=request_id, duration_micros=int(duration_ms * 1000),
+    ))
+
+
+@pytest.mark.unit
+def test_same_shape_with_different_values_is_one_shape():
+    first = query_shape("find", {"find": "members", "filter": {"id": "a", "campus_id": "c1"}})
+    second = query_shape("find", {"find": "members", "filter": {"campus_id": "c2", "id": "b"}})
+    in_list = query_shape("find", {"find": "members", "filter": {"id": {"$in": ["a", "b", "c"]}}})
+
+    assert first == second
+    assert in_list == query_shape("find", {"find": "members", "filter": {"id": {"$in": ["d"]}}})
+    assert first != in_list
+
+
+@pytest.mark.unit
+def test_loop_of_find_one_is_flagged_and_only_profiled_commands_are_recorded():
+    _run("find", {"collection": "members", "filter": {"id": "outside"}})
+
+    with profile_queries(slow_ms=50) as profile:
+        _run("find", {"collection": "pastoral_notes", "filter": {"campus_id": "c1"}})
+        for i in range(6):
+            _run("find", {"collection": "members", "filter": {"id": f"m{i}"}, "limit": 1})
+        _run("aggregate", {"collection": "care_events", "pipeline": [{"$match": {"campus_id": "c1"}}]}, duration_ms=120)
+
+    assert profile.count == 8
+    (shape, n), = profile.repeated()
+    assert shape.startswith("members.find") and n == 6
+    (slow,) = profile.slow
+    assert slow.collection == "care_events" and slow.command["aggregate"] == "care_events"
+
+    headers = profile.headers()
+    assert headers["X-Query-Count"] == "8"
+    assert headers["X-Query-Repeated"] == "members.find x6"
+    assert headers["X-Query-Slow"].startswith("care_events.aggregate 120ms")
+
+
+@pytest.mark.unit
+def test_query_budget_fixture_fails_on_n_plus_one(query_budget):
+    with query_budget(10):
+        for i in range(3):
+            _run("find", {"collection": "members", "filter": {"id": f"m{i}"}})
+
+    with pytest.raises(QueryBudgetExceeded, match=re.escape("possible N+1: members.find")), \
+            query_budget(10, max_repeats=3):
+        for i in range(3):
+            _run("find", {"collection": "members", "filter": {"id": f"m{i}"}})
+
+    with pytest.raises(QueryBudgetExceeded, match=re.escape("4 queries issued, budget is 2")), query_budget(2):
+        for collection in ("members", "campuses", "care_events", "users"):
+            _run("find", {"collection": collection, "filter": {}})
+
+
+@pytest.mark.unit
+def test_plan_summary_names_collection_scans_and_indexes():
+    explained = {"queryPlanner": {
+        "winningPlan": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "campus_id_1_engagement_status_1"}},
+        "rejectedPlans": [{"stage": "COLLSCAN"}],
+    }}
+    assert plan_summary(explained) == "IXSCAN campus_id_1_engagement_status_1"
+    assert plan_summary({"queryPlanner": {"winningPlan": {"stage": "COLLSCAN"}}}) == "COLLSCAN"
@@ -0,0 +1,129 @@
+"""
+Test rate limiting and login lockout
+
+Limits are sliding windows; while DragonflyDB is unreachable the per-worker
+limiter must make the same decisions.
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import redis.asyncio as redis
+
+import dependencies
+import services.cache as cache
+from constants import LOGIN_MAX_ATTEMPTS, RATE_LIMIT_ANONYMOUS
+from services.cache import CacheService, LocalRateLimiter
+from services.rate_limit import select_policy, rate_limit_key, AUTHENTICATED_POLICY, ANONYMOUS_POLICY
+
+
+@pytest.mark.unit
+async def test_sliding_window_denies_over_limit_and_does_not_count_denied_hits():
+    limiter = LocalRateLimiter()
+
+    results = [await limiter.hit_rate_limit("k", 3, 60) for _ in range(5)]
+
+    assert [r.allowed for r in results] == [True, True, True, False, False]
+    assert results[-1].hits == 3 and 0 < results[-1].retry_after <= 60
+    await limiter.reset_rate_limit("k")
+    assert (await limiter.hit_rate_limit("k", 3, 60)).allowed
+
+
+@pytest.mark.unit
+async def test_local_limiter_tracks_a_bounded_number_of_keys():
+    limiter = LocalRateLimiter(max_keys=10)
+
+    for i in range(100):
+        await limiter.hit_rate_limit(f"ip:{i}", 1, 60)
+        await limiter.lock_out(f"ip:{i}", 60)
+
+    assert len(limiter._windows) == 10 and len(limiter._lockouts) == 10
+    assert await limiter.lockout_remaining("ip:99") > 0
+    assert await limiter.lockout_remaining("ip:0") == 0
+
+
+@pytest.mark.unit
+def test_route_policies_win_over_the_default_and_exempt_paths_are_not_limited():
+    assert select_policy("POST", "/auth/login", True).name == "login"
+    assert select_policy("GET", "/export/members/csv", True).name == "export"
+    assert select_policy("GET", "/import/jobs/abc", True) is AUTHENTICATED_POLICY
+    assert select_policy("GET", "/members", False) is ANONYMOUS_POLICY
+    assert ANONYMOUS_POLICY.limit == RATE_LIMIT_ANONYMOUS
+    assert select_policy("GET", "/health", False) is None
+    assert select_policy("GET", "/stream/activity", True) is None
+
+    assert rate_limit_key(AUTHENTICATED_POLICY, "u1", "1.2.3.4") == "req:user:u:u1"
+    # Per-IP policies ignore the user even when signed in
+    assert rate_limit_key(select_policy("POST", "/auth/login", True), "u1", "1.2.3.4") == "req:login:ip:1.2.3.4"
+
+
+@pytest.mark.unit
+async def test_login_locks_out_after_max_failed_attempts(monkeypatch):
+    limiter = LocalRateLimiter()
+    monkeypatch.setattr(dependencies, "get_rate_limiter", lambda: limiter)
+
+    for _ in range(LOGIN_MAX_ATTEMPTS - 1):
+        await dependencies.record_failed_login("1.2.3.4", "Pastor@Church.org")
+    assert (await dependencies.check_login_rate_limit("1.2.3.4", "pastor@church.org"))[0]
+
+    await dependencies.record_failed_login("1.2.3.4", "pastor@church.org")
+    allowed, message = await dependencies.check_login_rate_limit("1.2.3.4", "pastor@church.org")
+    assert not allowed and "locked" in message
+    # Other clients are unaffected
+    assert (await dependencies.check_login_rate_limit("5.6.7.8", "pastor@church.org"))[0]
+
+    await dependencies.clear_login_attempts("1.2.3.4", "pastor@church.org")
+    assert (await dependencies.check_login_rate_limit("1.2.3.4", "pastor@church.org"))[0]
+
+
+class _DeadDragonfly:
+    """Client whose commands fail (or hang) the way an unreachable DragonflyDB does"""
+
+    def __init__(self, hang=False):
+        self.calls = 0
+        self._hang = hang
+
+    async def eval(self, *args):
+        self.calls += 1
+        if self._hang:
+            await asyncio.sleep(10)
+        raise redis.ConnectionError("Error 111 connecting to dragonfly:6379. Connection refused.")
+
+
+@pytest.mark.unit
+async def test_unreachable_dragonfly_opens_the_breaker_and_requests_are_limited_locally(monkeypatch):
+    client = _DeadDragonfly()
+    monkeypatch.setattr(cache, "_redis_client", client)
+    monkeypatch.setattr(cache, "_rate_limit_breaker_until", 0.0)
+
+    limiter = cache.get_rate_limiter()
+    assert isinstance(limiter, CacheService)
+    assert (await limiter.hit_rate_limit("req:test:ip:1", 100, 60)).allowed
+
+    # While the breaker is open DragonflyDB is not tried again
+    for _ in range(5):
+        limiter = cache.get_rate_limiter()
+        assert limiter is cache._local_rate_limiter
+        assert (await limiter.hit_rate_limit("req:test:ip:1", 100, 60)).allowed
+    assert client.calls == 1
+
+    monkeypatch.setattr(cache, "_rate_limit_breaker_until", time.monotonic() - 1)
+    assert isinstance(cache.get_rate_limiter(), CacheService)
+
+
+@pytest.mark.unit
+async def test_hanging_dragonfly_does_not_hold_up_the_request(monkeypatch):
+    monkeypatch.setattr(cache, "_redis_client", _DeadDragonfly(hang=True))
+    monkeypatch.setattr(cache, "_rate_limit_breaker_until", 0.0)
+
+    started = time.perf_counter()
+    result = await cache.get_rate_limiter().hit_rate_limit("req:test:ip:2", 100, 60)
+
+    assert result.allowed
+    assert time.perf_counter() - started < 1
+    assert cache.get_rate_limiter() is cache._local_rate_limiter
@@ -0,0 +1,124 @@
+"""
+Test rendered report caching and export jobs
+
+PDFs are rendered once per distinct report data: repeat downloads come from the cache,
+simultaneous downloads share one render, and export jobs record where the PDF went.
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+import types
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services import report_service
+from services.report_service import ReportService, report_fingerprint
+from tests.conftest import FakeDB
+
+
+def _report(total_members=10, generated_at="2024-02-01T08:00:00+07:00"):
+    return {
+        "report_period": {"year": 2024, "month": 1, "month_name": "January", "generated_at": generated_at},
+        "executive_summary": {"total_members": total_members, "active_members": 7},
+    }
+
+
+@pytest.fixture
+def renders(monkeypatch):
+    calls = []
+
+    async def fake_render(report_data, campus_name):
+        calls.append(campus_name)
+        await asyncio.sleep(0.01)
+        return b"%PDF-" + str(report_data["executive_summary"]["total_members"]).encode()
+
+    monkeypatch.setattr(report_service, "render_monthly_report_pdf", fake_render)
+    return calls
+
+
+class _Pool:
+    """Executor stand-in; the first pool created dies under every render submitted to it"""
+
+    created = []
+
+    def __init__(self, **kwargs):
+        self.broken = not _Pool.created
+        self.shut_down = False
+        _Pool.created.append(self)
+
+    def submit(self, fn, *args):
+        future = Future()
+        if self.broken or self.shut_down:
+            future.set_exception(BrokenProcessPool("A process in the process pool was terminated abruptly"))
+        else:
+            future.set_result(fn(*args))
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut_down = True
+
+
+@pytest.fixture
+def dying_pool(monkeypatch):
+    _Pool.created = []
+    pdf_report = types.ModuleType("pdf_report")
+    pdf_report.generate_monthly_report_pdf = lambda report_data, campus_name: b"%PDF-" + campus_name.encode()
+    monkeypatch.setitem(sys.modules, "pdf_report", pdf_report)
+    monkeypatch.setattr(report_service, "ProcessPoolExecutor", _Pool)
+    monkeypatch.setattr(report_service, "_pool", None)
+    monkeypatch.setattr(report_service, "_render_slots", None)
+    yield _Pool.created
+    report_service.close_pdf_renderer()
+
+
+@pytest.mark.unit
+def test_fingerprint_ignores_generation_time_only():
+    base = report_fingerprint(_report(), "GKBJ")
+    assert report_fingerprint(_report(generated_at="2024-03-05T10:00:00+07:00"), "GKBJ") == base
+    assert report_fingerprint(_report(total_members=11), "GKBJ") != base
+    assert report_fingerprint(_report(), "Other Campus") != base
+
+
+@pytest.mark.unit
+async def test_pdf_rendered_once_per_report_data(renders):
+    reports = ReportService(FakeDB())
+
+    results = await asyncio.gather(*(reports.monthly_report_pdf(_report(), "campus-1", "GKBJ") for _ in range(3)))
+    again = await reports.monthly_report_pdf(_report(generated_at="later"), "campus-1", "GKBJ")
+    changed = await reports.monthly_report_pdf(_report(total_members=11), "campus-1", "GKBJ")
+
+    assert renders == ["GKBJ", "GKBJ"]
+    assert {pdf for pdf, _, _ in results} == {b"%PDF-10"}
+    assert again == (b"%PDF-10", "Pastoral_Care_Report_January_2024.pdf", True)
+    assert changed[0] == b"%PDF-11" and changed[2] is False
+
+
+@pytest.mark.unit
+async def test_export_job_completes_with_downloadable_pdf(renders):
+    reports = ReportService(FakeDB())
+    job = await reports.create_job("campus-1", "user-1", 2024, 1)
+
+    async def compute():
+        return _report()
+
+    await reports.run(job, compute, "campus-1", "GKBJ")
+
+    stored = await reports.get_job(job["id"], "user-1")
+    assert stored["status"] == "completed"
+    assert stored["filename"] == "Pastoral_Care_Report_January_2024.pdf"
+    assert await reports.get_job_pdf(stored) == b"%PDF-10"
+    assert await reports.get_job(job["id"], "someone-else") is None
+
+
+@pytest.mark.unit
+async def test_renders_failing_on_one_broken_pool_restart_it_once(dying_pool):
+    pdfs = await asyncio.gather(*(report_service.render_monthly_report_pdf(_report(), f"C{i}") for i in range(4)))
+
+    assert pdfs == [b"%PDF-C0", b"%PDF-C1", b"%PDF-C2", b"%PDF-C3"]
+    first, replacement = dying_pool
+    assert first.shut_down and not replacement.shut_down
+    assert report_service._pool is replacement
@@ -0,0 +1,270 @@
+"""
+Test the daily report rollups
+
+Reports fold per-day rollups instead of scanning events, so the folds must reproduce
+the old per-event counts, and activity batches must land on the right Jakarta day.
+"""
+
+import pytest
+import uuid
+import sys
+import os
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from services.rollup_service import JAKARTA_TZ, RollupService, activity_day, summarize_events, summarize_staff
+from tests.conftest import FakeDB
+
+
+def _event_rollup(day, event_type, total, completed=0, ignored=0, ignored_open=0, aid_amount=0):
+    return {
+        "kind": "events", "campus_id": "c1", "date": day, "month": day[:7], "event_type": event_type,
+        "total": total, "completed": completed, "ignored": ignored, "ignored_open": ignored_open,
+        "pending": total - completed - ignored_open, "aid_amount": aid_amount,
+    }
+
+
+@pytest.mark.unit
+def test_event_rollups_fold_into_totals_and_type_breakdown():
+    summary = summarize_events([
+        _event_rollup("2024-01-02", "birthday", total=5, completed=3, ignored=2, ignored_open=1),
+        _event_rollup("2024-01-09", "birthday", total=2, completed=1),
+        _event_rollup("2024-01-09", "financial_aid", total=2, completed=2, aid_amount=750000),
+    ])
+
+    assert (summary["total"], summary["completed"], summary["ignored"], summary["pending"]) == (9, 6, 2, 2)
+    assert summary["by_type"]["birthday"]["total"] == 7
+    # An event both completed and ignored counts as completed in the breakdown, as before
+    assert summary["by_type"]["birthday"]["ignored_open"] == 1
+    assert summary["by_type"]["financial_aid"]["aid_amount"] == 750000
+
+
+def _activity_batch():
+    return [
+        # 20:00 UTC is already the next day in Jakarta
+        {"campus_id": "c1", "user_id": "u1", "user_name": "Ana", "action_type": "complete_task",
+         "event_type": "birthday", "member_id": "m1", "created_at": datetime(2024, 1, 31, 20, 0, tzinfo=timezone.utc)},
+        {"campus_id": "c1", "user_id": "u1", "user_name": "Ana", "action_type": "COMPLETE_TASK",
+         "event_type": "birthday", "member_id": "m2", "created_at": datetime(2024, 2, 1, 3, 0)},
+        {"campus_id": "c1", "user_id": "u1", "user_name": "Ana", "action_type": "send_reminder",
+         "created_at": datetime(2024, 1, 31, 1, 0, tzinfo=timezone.utc)},
+        {"campus_id": "c1", "user_id": "u1", "action": "complete", "timestamp": datetime(2024, 1, 31)},
+    ]
+
+
+@pytest.mark.unit
+async def test_activity_batch_is_one_bulk_write_with_one_upsert_per_jakarta_day_and_user():
+    db = FakeDB()
+
+    await RollupService(db).apply_activities(_activity_batch())
+
+    (ops,) = db.daily_rollups.bulk_writes
+    assert len(ops) == 2
+
+
+@pytest.mark.slow
+@pytest.mark.integration
+async def test_activity_batches_accumulate_on_the_jakarta_day(test_db):
+    rollups = RollupService(test_db)
+
+    await rollups.apply_activities(_activity_batch())
+    await rollups.apply_activities(_activity_batch()[:1])
+
+    docs = {doc["_id"]: doc for doc in await test_db.daily_rollups.find({}).to_list(None)}
+    assert set(docs) == {"activity:c1:2024-02-01:u1", "activity:c1:2024-01-31:u1"}
+    feb = docs["activity:c1:2024-02-01:u1"]
+    assert (feb["total"], feb["actions"], feb["completed_by_type"]) == (3, {"complete_task": 3}, {"birthday": 3})
+    assert sorted(feb["members_contacted"]) == ["m1", "m2"] and feb["user_name"] == "Ana"
+    jan = docs["activity:c1:2024-01-31:u1"]
+    assert (jan["total"], jan["actions"], jan.get("members_contacted")) == (1, {"send_reminder": 1}, None)
+
+
+@pytest.mark.unit
+def test_staff_fold_counts_members_contacted_once_across_days():
+    staff = summarize_staff([
+        {"date": "2024-01-02", "user_id": "u1", "user_name": "Ana", "total": 3,
+         "actions": {"complete_task": 2, "create_member": 1}, "completed_by_type": {"birthday": 2},
+         "members_contacted": ["m1", "m2"]},
+        {"date": "2024-01-03", "user_id": "u1", "user_name": "Ana B.", "total": 1,
+         "actions": {"complete_task": 1}, "completed_by_type": {"grief_loss": 1}, "members_contacted": ["m2"]},
+    ])
+
+    ana = staff["u1"]
+    assert ana["total_actions"] == 4
+    assert ana["actions"]["complete_task"] == 3 and ana["actions"]["ignore_task"] == 0
+    assert ana["members_contacted"] == {"m1", "m2"}
+    assert ana["daily_activity"] == {"2024-01-02": 3, "2024-01-03": 1}
+    assert ana["user_name"] == "Ana B."
+
+
+# ---------- Against a real database ----------
+
+def _care_event(campus_id, day, event_type="regular_contact", completed=False, ignored=False, aid_amount=None):
+    event = {
+        "id": str(uuid.uuid4()), "campus_id": campus_id, "member_id": str(uuid.uuid4()),
+        "event_type": event_type, "event_date": day, "completed": completed, "ignored": ignored,
+    }
+    if aid_amount is not None:
+        event["aid_amount"] = aid_amount
+    return event
+
+
+def _activity_log(campus_id, user_id, action_type, created_at, member_id=None, event_type=None):
+    return {
+        "id": str(uuid.uuid4()), "campus_id": campus_id, "user_id": user_id, "user_name": user_id.title(),
+        "action_type": action_type, "member_id": member_id, "event_type": event_type, "created_at": created_at,
+    }
+
+
+async def _direct_event_counts(db, campus_id, start, end):
+    """What the reports must show, counted straight from care_events"""
+    events = await db.care_events.find(
+        {"campus_id": campus_id, "event_date": {"$gte": start, "$lt": end}}, {"_id": 0}
+    ).to_list(None)
+    completed = sum(1 for e in events if e.get("completed"))
+    ignored_open = sum(1 for e in events if e.get("ignored") and not e.get("completed"))
+    return {
+        "total": len(events),
+        "completed": completed,
+        "ignored": sum(1 for e in events if e.get("ignored")),
+        "pending": len(events) - completed - ignored_open,
+        "aid_amount": sum(e.get("aid_amount") or 0 for e in events if e["event_type"] == "financial_aid"),
+    }
+
+
+async def _direct_staff_counts(db, campus_id, start, end):
+    """Per-user totals, completions and distinct members contacted, counted straight from activity_logs"""
+    staff = {}
+    for log in await db.activity_logs.find({"campus_id": campus_id}, {"_id": 0}).to_list(None):
+        if not start <= activity_day(log["created_at"]) < end:
+            continue
+        entry = staff.setdefault(log["user_id"], {"total_actions": 0, "tasks_completed": 0, "members_contacted": set()})
+        entry["total_actions"] += 1
+        if log["action_type"] == "complete_task":
+            entry["tasks_completed"] += 1
+            entry["members_contacted"].add(log["member_id"])
+    return {user_id: {**s, "members_contacted": len(s["members_contacted"])} for user_id, s in staff.items()}
+
+
+@pytest.fixture
+def reports(server_module, test_campus, monkeypatch):
+    """Report handlers reading test_db as a campus admin of test_campus"""
+    async def campus_admin(request):
+        return {"id": "admin", "role": "campus_admin", "campus_id": test_campus["id"]}
+
+    monkeypatch.setattr(server_module, "get_current_user", campus_admin)
+    return server_module
+
+
+async def _assert_reports_match(db, server, campus_id, year, month):
+    start = f"{year}-{month:02d}-01"
+    end = f"{year + month // 12}-{month % 12 + 1:02d}-01"
+    expected = await _direct_event_counts(db, campus_id, start, end)
+
+    monthly = await server.get_monthly_management_report.fn(request=None, year=year, month=month)
+    summary = monthly["executive_summary"]
+    assert (summary["total_care_events"], summary["completed_events"], summary["pending_events"], summary["ignored_events"]) == (
+        expected["total"], expected["completed"], expected["pending"], expected["ignored"]
+    )
+    assert summary["financial_aid_total"] == expected["aid_amount"]
+
+    yearly = await server.get_yearly_summary_report.fn(request=None, year=year)
+    month_row = yearly["monthly_breakdown"][month - 1]
+    assert (month_row["total_events"], month_row["completed_events"]) == (expected["total"], expected["completed"])
+    year_expected = await _direct_event_counts(db, campus_id, f"{year}-01-01", f"{year + 1}-01-01")
+    assert (yearly["yearly_totals"]["total_care_events"], yearly["yearly_totals"]["completed_events"]) == (
+        year_expected["total"], year_expected["completed"]
+    )
+
+    expected_staff = await _direct_staff_counts(db, campus_id, start, end)
+    staff = await server.get_staff_performance_report.fn(request=None, year=year, month=month)
+    reported = {
+        s["user_id"]: {k: s[k] for k in ("total_actions", "tasks_completed", "members_contacted")}
+        for s in staff["staff_performance"] if s["total_actions"]
+    }
+    assert reported == expected_staff
+    assert monthly["comparison"]["total_activities"]["current"] == sum(s["total_actions"] for s in expected_staff.values())
+
+
+@pytest.mark.slow
+@pytest.mark.integration
+async def test_reports_match_direct_counts_through_rebuild_and_dirty_refresh(test_db, test_campus, second_campus, test_member, reports):
+    campus_id, other_id = test_campus["id"], second_campus["id"]
+    events = [
+        _care_event(campus_id, "2024-03-01", "birthday", completed=True),
+        _care_event(campus_id, "2024-03-01", "birthday", ignored=True),
+        # Completed and ignored counts as completed, not as ignored-open
+        _care_event(campus_id, "2024-03-15", "birthday", completed=True, ignored=True),
+        _care_event(campus_id, "2024-03-15", "financial_aid", completed=True, aid_amount=500000),
+        _care_event(campus_id, "2024-03-31", "grief_loss"),
+        _care_event(campus_id, "2024-02-29", "regular_contact", completed=True),
+        _care_event(other_id, "2024-03-15", "financial_aid", aid_amount=900000),
+    ]
+    logs = [
+        # 20:00 UTC on Feb 29 is already March 1 in Jakarta
+        _activity_log(campus_id, "ana", "complete_task", datetime(2024, 2, 29, 20, 0), "m1", "birthday"),
+        _activity_log(campus_id, "ana", "complete_task", datetime(2024, 3, 10, 3, 0), "m1", "birthday"),
+        _activity_log(campus_id, "ana", "create_member", datetime(2024, 3, 10, 4, 0)),
+        _activity_log(campus_id, "budi", "complete_task", datetime(2024, 3, 20, 5, 0), "m2", "grief_loss"),
+        _activity_log(campus_id, "budi", "ignore_task", datetime(2024, 2, 29, 10, 0), "m3", "birthday"),
+        _activity_log(other_id, "budi", "complete_task", datetime(2024, 3, 20, 5, 0), "m9", "birthday"),
+    ]
+    await test_db.care_events.insert_many(events)
+    await test_db.activity_logs.insert_many(logs)
+    rollups = RollupService(test_db)
+
+    await rollups.rebuild()
+    await _assert_reports_match(test_db, reports, campus_id, 2024, 3)
+
+    # Create, complete and delete events, and delete logs, the way the handlers mark them
+    created = _care_event(campus_id, "2024-03-20", "financial_aid", aid_amount=250000)
+    await test_db.care_events.insert_one(created)
+    await rollups.mark_care_events([created])
+
+    await test_db.care_events.update_one({"id": events[4]["id"]}, {"$set": {"completed": True}})
+    await rollups.mark_care_events([events[4]])
+
+    deleted = {"id": {"$in": [events[0]["id"], events[3]["id"]]}}
+    await rollups.mark_care_event_query(deleted)
+    await test_db.care_events.delete_many(deleted)
+
+    await rollups.mark_activity_query({"user_id": "ana", "action_type": "create_member"})
+    await test_db.activity_logs.delete_many({"user_id": "ana", "action_type": "create_member"})
+
+    new_log = _activity_log(campus_id, "citra", "complete_task", datetime(2024, 3, 21, 2, 0), "m4", "financial_aid")
+    await test_db.activity_logs.insert_one(new_log)
+    await rollups.apply_activities([new_log])
+
+    # Report reads refresh the dirty days in their range first
+    await _assert_reports_match(test_db, reports, campus_id, 2024, 3)
+    assert await test_db.rollup_dirty.count_documents({"date": {"$gte": "2024-03-01", "$lt": "2024-04-01"}}) == 0
+
+    # Refreshing again finds nothing left to do
+    assert await rollups.refresh_dirty({"campus_id": campus_id}, "2024-03-01", "2024-04-01") == 0
+
+
+@pytest.mark.slow
+@pytest.mark.integration
+async def test_reconcile_recent_catches_writes_no_hook_marked(test_db, test_campus, test_member, reports):
+    campus_id = test_campus["id"]
+    now = datetime.now(JAKARTA_TZ)
+    today = now.date().isoformat()
+    rollups = RollupService(test_db)
+    await test_db.care_events.insert_one(_care_event(campus_id, today, "birthday", completed=True))
+    await rollups.rebuild()
+
+    # Written behind the rollups' back: no mark, no apply_activities
+    await test_db.care_events.insert_many([
+        _care_event(campus_id, today, "birthday"), _care_event(campus_id, today, "grief_loss", ignored=True),
+    ])
+    await test_db.activity_logs.insert_one(
+        _activity_log(campus_id, "ana", "complete_task", datetime.now(timezone.utc), "m1", "birthday")
+    )
+    stale = await reports.get_monthly_management_report.fn(request=None, year=now.year, month=now.month)
+    assert stale["executive_summary"]["total_care_events"] == 1
+
+    result = await rollups.reconcile_recent()
+
+    assert result == {"events": 2, "activity": 1}
+    await _assert_reports_match(test_db, reports, campus_id, now.year, now.month)
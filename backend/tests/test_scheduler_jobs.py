@@ -329,3 +329,88 @@ async def test_reminder_settings_retrieval(test_db, test_campus):
     retrieved = await test_db.settings.find_one({"campus_id": test_campus["id"]})
     assert retrieved is not None
     assert retrieved["reminder_days"]["birthday"] == 7
+
+
+@pytest.mark.unit
+async def test_campus_executor_bounds_concurrency_and_keeps_order():
+    """Campus executor never runs more than the limit at once and returns results in order"""
+    from scheduler import run_for_each_campus
+
+    running = 0
+    peak = 0
+
+    async def worker(campus):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return campus["id"]
+
+    campuses = [{"id": f"c{i}", "campus_name": f"Campus {i}"} for i in range(10)]
+    results = await run_for_each_campus("test_job", campuses, worker, concurrency=3)
+
+    assert peak == 3
+    assert [r["result"] for r in results] == [c["id"] for c in campuses]
+    assert all(r["status"] == "ok" and r["elapsed"] >= 0 for r in results)
+
+
+@pytest.mark.unit
+async def test_campus_executor_isolates_failures_and_timeouts():
+    """A failing or hanging campus does not stop the others"""
+    from scheduler import run_for_each_campus
+
+    async def worker(campus):
+        if campus.get("id") == "broken":
+            raise RuntimeError("boom")
+        if campus.get("id") == "slow":
+            await asyncio.sleep(10)
+        return "done"
+
+    campuses = [{"id": "broken"}, {"id": "slow"}, {"campus_id": "healthy"}]
+    results = await run_for_each_campus("test_job", campuses, worker, timeout=0.05)
+
+    assert [(r["campus_id"], r["status"]) for r in results] == [
+        ("broken", "error"), ("slow", "timeout"), ("healthy", "ok")
+    ]
+    assert results[0]["error"] == "boom"
+    assert results[2]["result"] == "done"
+
+
+@pytest.mark.unit
+def test_campus_job_lock_outlives_every_batch_of_campuses(monkeypatch):
+    """The lock lasts as long as the campus sweeps can, never less than the job's floor"""
+    import scheduler
+
+    monkeypatch.setattr(scheduler, "SCHEDULER_CAMPUS_CONCURRENCY", 4)
+    monkeypatch.setattr(scheduler, "SCHEDULER_CAMPUS_TIMEOUT", 120)
+
+    assert scheduler.campus_job_lock_ttl(0) == 300
+    assert scheduler.campus_job_lock_ttl(8) == 300
+    assert scheduler.campus_job_lock_ttl(9) == 3 * 120 + 60
+    assert scheduler.campus_job_lock_ttl(40) == 10 * 120 + 60
+    assert scheduler.campus_job_lock_ttl(40, sweeps=2, minimum=600) == 2 * 10 * 120 + 60
+    assert scheduler.campus_job_lock_ttl(13, timeout=600, minimum=1800) == 4 * 600 + 60
+
+
+@pytest.mark.unit
+async def test_cache_refresh_lock_covers_all_active_campuses(monkeypatch):
+    """Refreshing 40 campuses four at a time must not let the lock expire after five minutes"""
+    import scheduler
+    from tests.conftest import FakeCollection, FakeDB
+
+    requested = []
+
+    async def held_elsewhere(job_name, ttl_seconds=300):
+        requested.append((job_name, ttl_seconds))
+        return False
+
+    campuses = [{"id": f"c{i}", "campus_name": f"Campus {i}", "is_active": i < 40} for i in range(45)]
+    monkeypatch.setattr(scheduler, "db", FakeDB(campuses=FakeCollection(campuses)))
+    monkeypatch.setattr(scheduler, "acquire_job_lock", held_elsewhere)
+    monkeypatch.setattr(scheduler, "SCHEDULER_CAMPUS_CONCURRENCY", 4)
+    monkeypatch.setattr(scheduler, "SCHEDULER_CAMPUS_TIMEOUT", 120)
+
+    await scheduler.refresh_all_dashboard_caches()
+
+    assert requested == [("cache_refresh", 10 * 120 + 60)]
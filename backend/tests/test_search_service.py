@@ -0,0 +1,122 @@
+"""
+Test search index normalization and ranking
+
+Spelling variants, phone formats and typos must land on the same tokens, and
+exact or prefix matches must outrank fuzzy ones.
+"""
+
+import pytest
+import uuid
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import services.search_service as search_service
+from services.search_service import (
+    SearchService, tokenize, phone_digits, build_member_entry, build_care_event_entry, score_entry,
+)
+from tests.conftest import FakeCollection, FakeDB
+
+
+def _score(q, entry):
+    tokens = tokenize(q)
+    words = [t for t in tokens if not t.isdigit()]
+    number = "".join(t for t in tokens if t.isdigit())
+    digits = [d for d in dict.fromkeys((number, phone_digits(number))) if d]
+    return score_entry(words, digits, entry)
+
+
+@pytest.mark.unit
+def test_indonesian_spelling_variants_share_tokens():
+    assert tokenize("Soekarno") == tokenize("Sukarno")
+    assert tokenize("Djoko Tjahjono") == ["joko", "cahjono"]
+    assert tokenize("Mohammad Chairul") == tokenize("Mohamad Khairul")
+    assert tokenize("Ramadhan") == tokenize("Ramadan")
+    assert tokenize("José-María") == ["jose", "maria"]
+
+
+@pytest.mark.unit
+def test_phone_formats_normalize_to_national_number():
+    assert phone_digits("+62 812-3456-7890") == phone_digits("081234567890") == "81234567890"
+    assert phone_digits("6281234567890") == "81234567890"
+    entry = build_member_entry({"id": "m1", "name": "Budi", "phone": "+6281234567890", "campus_id": "c1"})
+    assert {"n:812", "d:8123", "d:7890"} <= set(entry["keys"])
+
+
+@pytest.mark.unit
+def test_ranking_prefers_exact_then_prefix_then_fuzzy():
+    entry = build_member_entry({"id": "m1", "name": "Muhammad Fathurrahman", "phone": "+6281234567890"})
+
+    exact, prefix, fuzzy = _score("muhammad", entry), _score("fathur", entry), _score("muhamat", entry)
+    assert exact > prefix > fuzzy > 0
+    assert _score("0812 3456", entry) == pytest.approx(1.0)
+    assert _score("4567", entry) > 0
+    assert _score("siti", entry) == 0
+    assert _score("muhammad siti", entry) == 0  # Every query word must match
+
+
+@pytest.mark.unit
+def test_care_event_entry_indexes_title_and_description():
+    entry = build_care_event_entry({
+        "id": "e1", "campus_id": "c1", "member_id": "m1",
+        "title": "Birthday - Budi", "description": "Kunjungan rumah 2024",
+    })
+    assert entry["_id"] == "care_event:e1" and entry["member_id"] == "m1"
+    assert _score("kunjung", entry) > 0
+    assert _score("2024", entry) > 0
+
+
+@pytest.mark.unit
+async def test_member_matches_over_the_cap_are_stable_and_reported_truncated(monkeypatch):
+    monkeypatch.setattr(search_service, "SEARCH_CANDIDATE_LIMIT", 3)
+    # Unsorted, like a multikey index scan would return them
+    index = FakeCollection(build_member_entry({"id": f"m{i}", "name": f"Budi {i}", "campus_id": "c1"}) for i in (5, 2, 4, 1, 3))
+    search = SearchService(FakeDB(search_index=index))
+
+    ids, truncated = await search.match_members("budi", "c1")
+    assert truncated and ids == ["m1", "m2", "m3"]
+    index.docs.reverse()
+    assert await search.match_members("budi", "c1") == (ids, True)
+
+    assert await search.match_members("budi 4", "c1") == (["m4"], False)
+
+
+@pytest.mark.slow
+@pytest.mark.integration
+async def test_indexed_members_rank_typeahead_phone_and_typo_matches(test_db, test_campus, second_campus):
+    def member(name, phone=None, campus=test_campus):
+        return {"id": str(uuid.uuid4()), "campus_id": campus["id"], "name": name, "phone": phone}
+
+    budi = member("Budi Santoso", "+6281234567890")
+    budiman = member("Budiman Hartono", "081299990000")
+    sri_budi = member("Sri Budiarti")
+    muhammad = member("Muhammad Fathurrahman", "+6285711112222")
+    soekarno = member("Soekarno Putra")
+    other_campus = member("Budi Gunawan", "+6281234567890", campus=second_campus)
+    await test_db.members.insert_many([budi, budiman, sri_budi, muhammad, soekarno, other_campus])
+    await test_db.care_events.insert_one({
+        "id": str(uuid.uuid4()), "campus_id": test_campus["id"], "member_id": budi["id"],
+        "title": "Kunjungan rumah sakit", "description": "Operasi lutut",
+    })
+    search = SearchService(test_db)
+
+    counts = await search.rebuild()
+
+    assert counts == {"members": 6, "care_events": 1, "removed": 0}
+    campus_id = test_campus["id"]
+    # Typeahead: the exact word first, then prefixes of the first name, then deeper in the name
+    assert await search.search_members("budi", campus_id) == [budi["id"], budiman["id"], sri_budi["id"]]
+    assert await search.search_members("bud", campus_id) == [budi["id"], budiman["id"], sri_budi["id"]]
+    assert await search.search_members("budi san", campus_id) == [budi["id"]]
+    # Phone numbers in any format, and digit runs from the middle
+    assert await search.search_members("0812 3456 7890", campus_id) == [budi["id"]]
+    assert await search.search_members("+62 857-1111", campus_id) == [muhammad["id"]]
+    assert await search.search_members("9999", campus_id) == [budiman["id"]]
+    # Typos and old spellings come from the fuzzy trigram pass
+    assert await search.search_members("muhamat", campus_id) == [muhammad["id"]]
+    assert await search.search_members("sukarno", campus_id) == [soekarno["id"]]
+    # Campus scoping, and every campus for full admins
+    assert other_campus["id"] not in await search.search_members("budi", campus_id)
+    assert other_campus["id"] in await search.search_members("budi gunawan")
+    assert len(await search.search_care_events("kunjung", campus_id)) == 1
@@ -0,0 +1,101 @@
+"""
+Test the authenticated user principal cache
+
+Repeat lookups of a user must come from the cache, and any change to a user's
+role or campus must evict the cached principal so the next request sees it.
+"""
+
+import copy
+import pytest
+import sys
+import os
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dependencies
+from enums import UserRole
+from models import UserLogin, UserUpdate
+from routes import auth
+from tests.conftest import FakeCollection, FakeDB
+
+
+class _Cache:
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key, church_id=None):
+        return copy.deepcopy(self.values.get(key))
+
+    async def set(self, key, value, ttl=None, church_id=None):
+        self.values[key] = copy.deepcopy(value)
+        return True
+
+    async def delete(self, key, church_id=None):
+        self.values.pop(key, None)
+        return True
+
+
+def _user(user_id, role, campus_id):
+    return {
+        "id": user_id, "email": f"{user_id}@example.org", "name": user_id.title(), "phone": "+62811",
+        "role": role, "campus_id": campus_id, "hashed_password": "hash", "is_active": True,
+        "created_at": datetime(2026, 1, 1, tzinfo=timezone.utc),
+    }
+
+
+@pytest.fixture
+def principals(monkeypatch):
+    db = FakeDB(
+        users=FakeCollection([
+            _user("admin", UserRole.FULL_ADMIN.value, "c1"),
+            _user("pastor", UserRole.PASTOR.value, "c1"),
+        ]),
+        campuses=FakeCollection({"id": campus_id, "campus_name": f"Campus {campus_id}"} for campus_id in ("c1", "c2")),
+    )
+    cache = _Cache()
+    monkeypatch.setattr(dependencies, "get_db", lambda: db)
+    monkeypatch.setattr(dependencies, "get_cache", lambda: cache)
+    monkeypatch.setattr(dependencies, "_user_cache_stats", {"hits": 0, "misses": 0})
+    monkeypatch.setattr(auth, "get_db", lambda: db)
+    return db
+
+
+@pytest.mark.unit
+async def test_role_and_campus_change_evicts_the_cached_principal(principals, monkeypatch):
+    async def full_admin(request):
+        return {"id": "admin", "role": UserRole.FULL_ADMIN.value}
+
+    monkeypatch.setattr(auth, "get_current_user", full_admin)
+
+    first = await dependencies.load_user_principal("pastor")
+    again = await dependencies.load_user_principal("pastor")
+    assert first == again and "hashed_password" not in first
+    assert len(principals.users.queries) == 1
+
+    await auth.update_user.fn("pastor", UserUpdate(role=UserRole.CAMPUS_ADMIN, campus_id="c2"), request=None)
+
+    updated = await dependencies.load_user_principal("pastor")
+    assert (updated["role"], updated["campus_id"]) == (UserRole.CAMPUS_ADMIN.value, "c2")
+    assert dependencies.get_user_cache_stats() == {"hits": 1, "misses": 2, "hit_ratio": 0.3333}
+
+
+@pytest.mark.unit
+async def test_full_admin_campus_switch_at_login_evicts_the_cached_principal(principals, monkeypatch):
+    async def allowed(client_ip, email):
+        return True, ""
+
+    async def cleared(client_ip, email):
+        return None
+
+    monkeypatch.setattr(auth, "get_client_ip", lambda request: "10.0.0.1")
+    monkeypatch.setattr(auth, "check_login_rate_limit", allowed)
+    monkeypatch.setattr(auth, "clear_login_attempts", cleared)
+    monkeypatch.setattr(auth, "verify_password", lambda password, hashed: True)
+    monkeypatch.setattr(auth, "create_access_token", lambda data: "token")
+
+    assert (await dependencies.load_user_principal("admin"))["campus_id"] == "c1"
+
+    await auth.login.fn(UserLogin(email="admin@example.org", password="secret", campus_id="c2"), request=None)
+
+    assert (await dependencies.load_user_principal("admin"))["campus_id"] == "c2"
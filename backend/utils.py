@@ -1,12 +1,12 @@
 """
 FaithTracker Utils - Pure utility functions
 
-Validation, caching, and helper functions that don't depend on database.
+Validation and helper functions that don't depend on database.
 """
 
 import re
 from datetime import datetime, timezone
-from typing import Optional, Any
+from typing import Optional
 
 from enums import EngagementStatus
 from constants import (
@@ -14,7 +14,6 @@ from constants import (
     ENGAGEMENT_DISCONNECTED_DAYS_DEFAULT,
     ENGAGEMENT_NO_CONTACT_DAYS,
     IMAGE_MAGIC_BYTES,
-    MAX_CACHE_SIZE
 )
 
 # ==================== REGEX PATTERNS ====================
@@ -172,69 +171,23 @@ def calculate_engagement_status(
         return EngagementStatus.DISCONNECTED, days_since
 
 
-# ==================== CACHE ====================
-
-# Simple in-memory cache for static data
-_cache: dict = {}
-_cache_timestamps: dict = {}
-
-
-def get_from_cache(key: str, ttl_seconds: int = 300) -> Optional[Any]:
-    """
-    Get value from cache if not expired.
-
-    Args:
-        key: Cache key
-        ttl_seconds: Time to live in seconds (default 5 minutes)
-
-    Returns:
-        Cached value or None if expired/not found
-    """
-    if key in _cache:
-        age = (datetime.now(timezone.utc) - _cache_timestamps[key]).total_seconds()
-        if age < ttl_seconds:
-            return _cache[key]
-        else:
-            # Expired, remove from cache
-            del _cache[key]
-            del _cache_timestamps[key]
-    return None
-
-
-def set_in_cache(key: str, value: Any) -> None:
-    """
-    Store value in cache with current timestamp.
-    Enforces MAX_CACHE_SIZE limit using simple LRU eviction.
-
-    Args:
-        key: Cache key
-        value: Value to cache
-    """
-    if key not in _cache and len(_cache) >= MAX_CACHE_SIZE:
-        oldest_key = min(_cache_timestamps, key=_cache_timestamps.get)
-        del _cache[oldest_key]
-        del _cache_timestamps[oldest_key]
-    _cache[key] = value
-    _cache_timestamps[key] = datetime.now(timezone.utc)
-
-
-def invalidate_cache(pattern: Optional[str] = None) -> None:
+def contact_fields(
+    last_contact: Optional[datetime],
+    at_risk_days: int = ENGAGEMENT_AT_RISK_DAYS_DEFAULT,
+    disconnected_days: int = ENGAGEMENT_DISCONNECTED_DAYS_DEFAULT
+) -> dict:
     """
-    Invalidate cache entries.
+    Member fields to $set when last_contact_date changes.
 
-    Args:
-        pattern: If provided, only invalidate keys containing this pattern.
-                If None, clear entire cache.
+    Reads serve the stored engagement_status and days_since_last_contact, so every
+    writer of last_contact_date stores the engagement it implies alongside it.
     """
-    global _cache, _cache_timestamps
-    if pattern is None:
-        _cache.clear()
-        _cache_timestamps.clear()
-    else:
-        keys_to_delete = [k for k in _cache.keys() if pattern in k]
-        for key in keys_to_delete:
-            del _cache[key]
-            del _cache_timestamps[key]
+    status, days = calculate_engagement_status(last_contact, at_risk_days, disconnected_days)
+    return {
+        "last_contact_date": last_contact,
+        "engagement_status": status.value,
+        "days_since_last_contact": days,
+    }
 
 
 # ==================== IMAGE VALIDATION ====================
@@ -43,6 +43,7 @@ export function useActivityStream({ onActivity, enabled = true, maxActivities =
   const eventSourceRef = useRef(null);
   const reconnectTimeoutRef = useRef(null);
   const reconnectDelayRef = useRef(INITIAL_RECONNECT_DELAY);
+  const lastEventIdRef = useRef(null);
 
   /**
    * Connect to SSE endpoint
@@ -62,7 +63,11 @@ export function useActivityStream({ onActivity, enabled = true, maxActivities =
 
     try {
       // Note: EventSource doesn't support custom headers, so we use query param for auth
-      const url = `${BACKEND_URL}/stream/activity?token=${encodeURIComponent(token)}`;
+      // Reconnects open a fresh EventSource, so pass the last seen id to replay missed events
+      const resume = lastEventIdRef.current
+        ? `&last_event_id=${encodeURIComponent(lastEventIdRef.current)}`
+        : '';
+      const url = `${BACKEND_URL}/stream/activity?token=${encodeURIComponent(token)}${resume}`;
       const eventSource = new EventSource(url);
       eventSourceRef.current = eventSource;
 
@@ -90,6 +95,7 @@ export function useActivityStream({ onActivity, enabled = true, maxActivities =
       // Handle activity events
       eventSource.addEventListener('activity', (e) => {
         const activity = JSON.parse(e.data);
+        if (e.lastEventId) lastEventIdRef.current = e.lastEventId;
 
         // Skip own activities
         if (activity.user_id === user?.id) return;
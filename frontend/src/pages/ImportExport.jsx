@@ -15,6 +15,12 @@ import { Dialog, DialogContent, DialogHeader, DialogTitle } from '@/components/u
 import { ConfirmDialog } from '@/components/ConfirmDialog';
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from '@/components/ui/select';
 
+const IMPORT_POLL_INTERVAL_MS = 1000;
+// Give up waiting after this long (the server fails jobs orphaned by a restart, this is a backstop)
+const IMPORT_POLL_TIMEOUT_MS = 30 * 60 * 1000;
+
+class ImportTimeoutError extends Error {}
+
 export const ImportExport = () => {
   const { t } = useTranslation();
   useAuth(); // Auth context required for API calls
@@ -151,6 +157,18 @@ export const ImportExport = () => {
       }
     }
   };
+  // Imports run as background jobs on the server; poll until the job finishes or the deadline passes
+  const waitForImportJob = async (jobId) => {
+    const deadline = Date.now() + IMPORT_POLL_TIMEOUT_MS;
+    while (Date.now() < deadline) {
+      const { data: job } = await api.get(`/import/jobs/${jobId}`);
+      if (job.status === 'completed') return job;
+      if (job.status === 'failed') throw new Error(job.error || 'Import failed');
+      await new Promise(resolve => setTimeout(resolve, IMPORT_POLL_INTERVAL_MS));
+    }
+    throw new ImportTimeoutError(`Import ${jobId} did not finish in time`);
+  };
+
   const handleCsvImport = async () => {
     if (!csvFile) return;
     
@@ -160,15 +178,18 @@ export const ImportExport = () => {
       formData.append('file', csvFile);
       
       const response = await api.post(`/import/members/csv`, formData);
-      toast.success(t('import_export_page.imported_count', {count: response.data.imported_count}));
-      if (response.data.errors.length > 0) {
-        toast.warning(t('import_export_page.errors_occurred', {count: response.data.errors.length}));
+      const job = await waitForImportJob(response.data.job_id);
+      toast.success(t('import_export_page.imported_count', {count: job.imported}));
+      if (job.failed > 0) {
+        toast.warning(t('import_export_page.errors_occurred', {count: job.failed}));
       }
       setCsvFile(null);
       setShowPreview(false);
       setCsvPreview(null);
     } catch (error) {
-      toast.error(t('import_export_page.import_failed'));
+      toast.error(t(error instanceof ImportTimeoutError
+        ? 'import_export_page.import_timed_out'
+        : 'import_export_page.import_failed'));
     } finally {
       setImporting(false);
     }
@@ -180,10 +201,16 @@ export const ImportExport = () => {
       setImporting(true);
       const members = JSON.parse(jsonData);
       const response = await api.post(`/import/members/json`, members);
-      toast.success(t('import_export_page.imported_count', {count: response.data.imported_count}));
+      const job = await waitForImportJob(response.data.job_id);
+      toast.success(t('import_export_page.imported_count', {count: job.imported}));
+      if (job.failed > 0) {
+        toast.warning(t('import_export_page.errors_occurred', {count: job.failed}));
+      }
       setJsonData('');
     } catch (error) {
-      toast.error(t('import_export_page.import_failed_json'));
+      toast.error(t(error instanceof ImportTimeoutError
+        ? 'import_export_page.import_timed_out'
+        : 'import_export_page.import_failed_json'));
     } finally {
       setImporting(false);
     }
@@ -45,6 +45,7 @@ export const MembersList = () => {
   const [currentPage, setCurrentPage] = useState(1);
   const [totalPages, setTotalPages] = useState(0);
   const [totalMembers, setTotalMembers] = useState(0);
+  const [totalTruncated, setTotalTruncated] = useState(false); // Search matched more members than are listed
   const [pageSize] = useState(25); // Industry standard: 25 items per page
   const [loading, setLoading] = useState(true);
   const [tableLoading, setTableLoading] = useState(false); // Separate table loading
@@ -165,6 +166,7 @@ export const MembersList = () => {
       // Get total count from header and calculate pages
       const total = parseInt(response.headers['x-total-count'] || '0', 10);
       setTotalMembers(total);
+      setTotalTruncated(response.headers['x-total-truncated'] === 'true');
       setTotalPages(Math.ceil(total / pageSize));
       setCurrentPage(page);
     } catch (error) {
@@ -291,7 +293,10 @@ export const MembersList = () => {
       <div className="flex flex-col sm:flex-row sm:items-center sm:justify-between gap-4">
         <div className="min-w-0 flex-1">
           <h1 className="text-3xl font-playfair font-bold text-foreground">{t('members')}</h1>
-          <p className="text-muted-foreground mt-1">{totalMembers} total members</p>
+          <p className="text-muted-foreground mt-1">{totalMembers}{totalTruncated ? '+' : ''} total members</p>
+          {totalTruncated && (
+            <p className="text-sm text-amber-600 mt-1">{t('members_list.search_truncated', { count: totalMembers })}</p>
+          )}
         </div>
         
         <Dialog open={addModalOpen} onOpenChange={setAddModalOpen}>
@@ -589,7 +594,7 @@ export const MembersList = () => {
       {/* Industry-Standard Pagination Controls */}
       <div className="flex items-center justify-between mt-6">
         <div className="text-sm text-muted-foreground">
-          Showing {totalMembers > 0 ? ((currentPage - 1) * pageSize) + 1 : 0}-{Math.min(currentPage * pageSize, totalMembers)} of {totalMembers} members
+          Showing {totalMembers > 0 ? ((currentPage - 1) * pageSize) + 1 : 0}-{Math.min(currentPage * pageSize, totalMembers)} of {totalMembers}{totalTruncated ? '+' : ''} members
         </div>
         <div className="flex items-center gap-2">
           <Button 
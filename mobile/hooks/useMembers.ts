@@ -20,47 +20,57 @@ import type { Member, MemberListItem, MemberFilters, CreateMemberRequest } from
 
 /**
  * Fetch paginated members list
+ *
+ * Uses the X-Next-Cursor header so deep scrolling stays as fast as the first page;
+ * the total is only requested once, on the first page.
  */
 export function useMembers(filters: MemberFilters = {}) {
   return useInfiniteQuery({
     queryKey: ['members', filters],
-    queryFn: async ({ pageParam = 1 }) => {
+    queryFn: async ({ pageParam }: { pageParam: { page: number; cursor?: string } }) => {
       if (USE_MOCK_DATA) {
         const result = await mockGetMembers({
           ...filters,
-          page: pageParam,
+          page: pageParam.page,
           limit: 20,
         });
         return {
           members: result.data,
           total: result.total,
-          page: pageParam,
+          page: pageParam.page,
+          nextCursor: undefined as string | undefined,
         };
       }
 
       const { data, headers } = await api.get<MemberListItem[]>(API_ENDPOINTS.MEMBERS.LIST, {
         params: {
-          page: pageParam,
+          ...(pageParam.cursor ? { cursor: pageParam.cursor } : { page: pageParam.page }),
           limit: 20,
           ...filters,
         },
       });
 
-      const total = parseInt(headers['x-total-count'] || '0', 10);
+      const total = headers['x-total-count'] ? parseInt(headers['x-total-count'], 10) : undefined;
 
       return {
         members: data,
         total,
-        page: pageParam,
+        page: pageParam.page,
+        nextCursor: (headers['x-next-cursor'] as string | undefined) || undefined,
       };
     },
-    initialPageParam: 1,
+    initialPageParam: { page: 1 } as { page: number; cursor?: string },
     getNextPageParam: (lastPage, allPages) => {
+      if (lastPage.nextCursor) {
+        return { page: lastPage.page + 1, cursor: lastPage.nextCursor };
+      }
+      // Mock data has no cursor; fall back to the total
+      const total = allPages[0]?.total;
       const loadedCount = allPages.flatMap((p) => p.members).length;
-      if (loadedCount >= lastPage.total) {
-        return undefined;
+      if (USE_MOCK_DATA && total !== undefined && loadedCount < total) {
+        return { page: lastPage.page + 1 };
       }
-      return lastPage.page + 1;
+      return undefined;
     },
   });
 }